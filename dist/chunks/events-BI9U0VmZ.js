@@ -3254,6 +3254,7 @@ var Bt = (e) => {
 	ASSET_INDEXING: "mjr.asset.indexing",
 	ASSET_INDEXED: "mjr.asset.indexed",
 	ASSET_INDEX_FAILED: "mjr.asset.index_failed",
+	ASSET_BATCH: "mjr.asset.batch",
 	SCAN_PROGRESS: "mjr.scan.progress",
 	RUNTIME_STATUS: "mjr.runtime.status",
 	WATCHER_STATUS: "mjr.watcher.status",
@@ -5546,7 +5546,7 @@ async function Bl(e, t, n, r, i, { requestId: a = 0, signal: o = null, cursor: s
 		let t = String(u || "").toLowerCase() === "output", c = Gc({
 			...l,
 			q: N
-		}), j = t && Number(r ?? 0) === 0 && N === "*" && !c && String(A || "mtime_desc").toLowerCase() === "mtime_desc", M = !(t && (Number(r ?? 0) > 0 || j)), P = !!l.groupStacks, F = Number(r ?? 0) > 0 ? null : s || null, ee = i.buildListURL({
+		}), j = t && Number(r ?? 0) === 0 && N === "*" && !c && String(A || "mtime_desc").toLowerCase() === "mtime_desc", M = !(t && (Number(r ?? 0) > 0 || j)), P = !!l.groupStacks, F = Number(r ?? 0) > 0 ? s || null : null, ee = i.buildListURL({
 			q: N,
 			limit: n,
 			offset: r,
@@ -6263,7 +6263,7 @@ function Su({ gridContainerRef: e, state: t, setLoadingMessage: n, clearLoadingM
 			total: null
 		} : e;
 	}
-	async function ce(e, n, r, { requestId: i = 0, signal: a = null } = {}) {
+	async function ce(e, n, r, { requestId: i = 0, signal: a = null, cursor: l = void 0 } = {}) {
 		let o = y();
 		if (!o) return {
 			ok: !1,
@@ -6316,7 +6316,7 @@ function Su({ gridContainerRef: e, state: t, setLoadingMessage: n, clearLoadingM
 		}, {
 			requestId: i,
 			signal: a ?? void 0,
-			cursor: t.cursor || null
+			cursor: (l === void 0 ? t.cursor : l) || null
 		}), {
 			query: e,
 			limit: n,
@@ -6339,12 +6339,13 @@ function Su({ gridContainerRef: e, state: t, setLoadingMessage: n, clearLoadingM
 			},
 			reset() {}
 		},
-		fetchPage: async ({ query: e, limit: n, offset: r, requestId: i }) => {
+		fetchPage: async ({ query: e, limit: n, offset: r, cursor: s, requestId: i }) => {
 			let a = _();
 			g.pagesRequested += 1;
 			let o = await ce(e, n, r, {
 				requestId: i,
-				signal: t.abortController?.signal || null
+				signal: t.abortController?.signal || null,
+				cursor: s ?? null
 			});
 			return g.apiTimeMs += Math.max(0, _() - a), o;
 		},
@@ -10966,7 +10967,25 @@ async function vp({ api: e, runtime: t, executionRuntime: n, appRef: r, liveStre
 		} catch (e) {
 			console.debug?.(e);
 		}
-	}, _(t, e, B.ASSET_INDEXED, e._mjrAssetIndexedHandler), e._mjrEnrichmentStatusHandler = (e) => {
+	}, _(t, e, B.ASSET_INDEXED, e._mjrAssetIndexedHandler), e._mjrAssetBatchHandler = (t) => {
+		try {
+			let n = t?.detail || {}, r = Number(n?.seq), i = Number(e._mjrLastAssetBatchSeq || 0), a = Number.isFinite(r) && i > 0 && r > i + 1;
+			Number.isFinite(r) && (e._mjrLastAssetBatchSeq = r);
+			let o = {
+				"mjr-asset-added": e._mjrAssetAddedHandler,
+				"mjr-asset-updated": e._mjrAssetUpdatedHandler,
+				[B.ASSET_INDEXED]: e._mjrAssetIndexedHandler
+			}[String(n?.event || "")], s = Array.isArray(n?.items) ? n.items : [];
+			if (typeof o == "function") for (let e of s) e && typeof e == "object" && o({ detail: e });
+			(a || Number(n?.dropped || 0) > 0) && window.dispatchEvent(new CustomEvent(B.RELOAD_GRID, { detail: {
+				reason: "asset-batch-overflow",
+				seq: r,
+				dropped: n?.dropped || 0
+			} }));
+		} catch (e) {
+			console.debug?.(e);
+		}
+	}, _(t, e, B.ASSET_BATCH, e._mjrAssetBatchHandler), e._mjrEnrichmentStatusHandler = (e) => {
 		try {
 			let t = e?.detail || {}, n = Number(t?.queued), r = Number(t?.queue_left), i = Number.isFinite(n) ? Math.max(0, Math.floor(n)) : Number.isFinite(r) ? Math.max(0, Math.floor(r)) : 0, a = !!t?.active || i > 0, o = f().active;
 			p(a, i), window.dispatchEvent(new CustomEvent(B.ENRICHMENT_STATUS, { detail: t })), o && !a && m(h("toast.enrichmentComplete", "Metadata enrichment complete"), "success", 2600);
@@ -24868,7 +24887,7 @@ function $C(e, t, { sidebarTabId: n }) {
 var ew = "__MJR_ENTRY_RUNTIME__";
 function tw(e, t) {
 	if (e) try {
-		e._mjrAssetUpdateReloadTimer &&= (clearTimeout(e._mjrAssetUpdateReloadTimer), null), e._mjrExecutedHandler && e.removeEventListener("executed", e._mjrExecutedHandler), e._mjrAssetAddedHandler && e.removeEventListener("mjr-asset-added", e._mjrAssetAddedHandler), e._mjrAssetUpdatedHandler && e.removeEventListener("mjr-asset-updated", e._mjrAssetUpdatedHandler), e._mjrStructuredEventHandler && e.removeEventListener(B.STRUCTURED_EVENT, e._mjrStructuredEventHandler), e._mjrScanCompleteHandler && e.removeEventListener(B.SCAN_COMPLETE, e._mjrScanCompleteHandler), e._mjrScanProgressHandler && e.removeEventListener(B.SCAN_PROGRESS, e._mjrScanProgressHandler), e._mjrAssetIndexingHandler && e.removeEventListener(B.ASSET_INDEXING, e._mjrAssetIndexingHandler), e._mjrAssetIndexedHandler && e.removeEventListener(B.ASSET_INDEXED, e._mjrAssetIndexedHandler), e._mjrExecutionStartHandler && e.removeEventListener("execution_start", e._mjrExecutionStartHandler), e._mjrExecutionEndHandler && (e.removeEventListener("execution_success", e._mjrExecutionEndHandler), e.removeEventListener("execution_error", e._mjrExecutionEndHandler), e.removeEventListener("execution_interrupted", e._mjrExecutionEndHandler)), e._mjrStacksUpdatedHandler && e.removeEventListener("mjr.stacks.updated", e._mjrStacksUpdatedHandler), e._mjrEnrichmentStatusHandler && e.removeEventListener(B.ENRICHMENT_STATUS, e._mjrEnrichmentStatusHandler), e._mjrDbRestoreStatusHandler && e.removeEventListener(B.DB_RESTORE_STATUS, e._mjrDbRestoreStatusHandler), e._mjrRuntimeStatusHandler && (e.removeEventListener("progress", e._mjrRuntimeStatusHandler), e.removeEventListener("status", e._mjrRuntimeStatusHandler), e.removeEventListener(B.RUNTIME_STATUS, e._mjrRuntimeStatusHandler), e.removeEventListener("execution_cached", e._mjrExecutionCachedHandler));
+		e._mjrAssetUpdateReloadTimer &&= (clearTimeout(e._mjrAssetUpdateReloadTimer), null), e._mjrExecutedHandler && e.removeEventListener("executed", e._mjrExecutedHandler), e._mjrAssetAddedHandler && e.removeEventListener("mjr-asset-added", e._mjrAssetAddedHandler), e._mjrAssetUpdatedHandler && e.removeEventListener("mjr-asset-updated", e._mjrAssetUpdatedHandler), e._mjrStructuredEventHandler && e.removeEventListener(B.STRUCTURED_EVENT, e._mjrStructuredEventHandler), e._mjrScanCompleteHandler && e.removeEventListener(B.SCAN_COMPLETE, e._mjrScanCompleteHandler), e._mjrScanProgressHandler && e.removeEventListener(B.SCAN_PROGRESS, e._mjrScanProgressHandler), e._mjrAssetIndexingHandler && e.removeEventListener(B.ASSET_INDEXING, e._mjrAssetIndexingHandler), e._mjrAssetIndexedHandler && e.removeEventListener(B.ASSET_INDEXED, e._mjrAssetIndexedHandler), e._mjrAssetBatchHandler && e.removeEventListener(B.ASSET_BATCH, e._mjrAssetBatchHandler), e._mjrExecutionStartHandler && e.removeEventListener("execution_start", e._mjrExecutionStartHandler), e._mjrExecutionEndHandler && (e.removeEventListener("execution_success", e._mjrExecutionEndHandler), e.removeEventListener("execution_error", e._mjrExecutionEndHandler), e.removeEventListener("execution_interrupted", e._mjrExecutionEndHandler)), e._mjrStacksUpdatedHandler && e.removeEventListener("mjr.stacks.updated", e._mjrStacksUpdatedHandler), e._mjrEnrichmentStatusHandler && e.removeEventListener(B.ENRICHMENT_STATUS, e._mjrEnrichmentStatusHandler), e._mjrDbRestoreStatusHandler && e.removeEventListener(B.DB_RESTORE_STATUS, e._mjrDbRestoreStatusHandler), e._mjrRuntimeStatusHandler && (e.removeEventListener("progress", e._mjrRuntimeStatusHandler), e.removeEventListener("status", e._mjrRuntimeStatusHandler), e.removeEventListener(B.RUNTIME_STATUS, e._mjrRuntimeStatusHandler), e.removeEventListener("execution_cached", e._mjrExecutionCachedHandler));
 	} catch (e) {
 		t?.(e, "entry.removeApiHandlers");
 	}
@@ -386,6 +386,37 @@ class ComfyCoreAdapter:
             logger.debug("Failed to emit ComfyUI event %s", safe_event, exc_info=True)
             return False
 
+    def websocket_session_ids(self) -> list[str] | None:
+        """Connected websocket client ids, or None when PromptServer does not expose them."""
+        try:
+            sockets = getattr(self.get_prompt_server_instance(), "sockets", None)
+            if not isinstance(sockets, dict):
+                return None
+            return [str(sid) for sid in list(sockets.keys())]
+        except Exception:
+            return None
+
+    def websocket_write_buffer_size(self, sid: str) -> int:
+        """Bytes queued in the transport of client ``sid`` (0 when unknown)."""
+        try:
+            sockets = getattr(self.get_prompt_server_instance(), "sockets", None)
+            ws = sockets.get(sid) if isinstance(sockets, dict) else None
+            writer = getattr(ws, "_writer", None)
+            transport = getattr(writer, "transport", None) or getattr(getattr(ws, "_req", None), "transport", None)
+            getter = getattr(transport, "get_write_buffer_size", None)
+            return int(getter()) if callable(getter) else 0
+        except Exception:
+            return 0
+
+    def pending_message_count(self) -> int:
+        """Messages waiting in PromptServer's outgoing queue (0 when unknown)."""
+        try:
+            queue = getattr(self.get_prompt_server_instance(), "messages", None)
+            qsize = getattr(queue, "qsize", None)
+            return int(qsize()) if callable(qsize) else 0
+        except Exception:
+            return 0
+
     def get_feature_flags(self) -> dict[str, Any]:
         try:
             from comfy_api.feature_flags import SERVER_FEATURE_FLAGS  # type: ignore
@@ -453,6 +484,18 @@ def send_event(event: str, data: Any, sid: str | None = None) -> bool:
     return _ADAPTER.send_event(event, data, sid)
 
 
+def websocket_session_ids() -> list[str] | None:
+    return _ADAPTER.websocket_session_ids()
+
+
+def websocket_write_buffer_size(sid: str) -> int:
+    return _ADAPTER.websocket_write_buffer_size(sid)
+
+
+def pending_message_count() -> int:
+    return _ADAPTER.pending_message_count()
+
+
 def get_capabilities() -> dict[str, Any]:
     return _ADAPTER.capabilities().as_dict()
 
@@ -600,6 +643,9 @@ __all__ = [
     "get_prompt_output_paths",
     "get_prompt_metadata_for_prompt",
     "get_workflow_id_for_prompt",
+    "pending_message_count",
     "send_event",
     "schedule_task",
+    "websocket_session_ids",
+    "websocket_write_buffer_size",
 ]
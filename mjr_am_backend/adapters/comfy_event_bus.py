@@ -0,0 +1,230 @@
+"""Coalescing websocket bus for high-volume asset notifications.
+
+Scans, enrichment and vector indexing report per-asset updates. Sending each
+one through ``PromptServer.send_sync`` floods every open tab with thousands of
+tiny frames, so asset events are buffered per client session instead:
+
+* updates to the same asset within the window are merged (latest fields win);
+* every window (``MJR_AM_EVENT_BATCH_MS``) each session receives at most one
+  ``mjr.asset.batch`` frame per event name, ``{seq, event, category, count,
+  items, dropped}``, where ``seq`` increases by one per frame and session;
+* a session whose socket still holds more than the high-water mark of unsent
+  bytes receives nothing until it drains, and the whole flush is postponed
+  while PromptServer's shared outgoing queue is backed up;
+* a session keeps at most ``max_pending`` items; the overflow is counted and
+  reported as ``dropped`` so the client reloads instead of replaying it.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from ..shared import get_logger
+
+logger = get_logger(__name__)
+
+BATCH_EVENT_NAME = "mjr.asset.batch"
+COALESCED_EVENTS = frozenset({"mjr-asset-added", "mjr-asset-updated", "mjr.asset.indexed"})
+
+# Upper bound on how long a flush may be postponed for a backed-up server queue.
+_MAX_DEFER_SECONDS = 2.0
+
+SendFn = Callable[[str, dict[str, Any], "str | None"], bool]
+
+
+class _SessionBuffer:
+    __slots__ = ("pending", "dropped", "seq")
+
+    def __init__(self) -> None:
+        self.pending: dict[str, OrderedDict[Any, dict[str, Any]]] = {}
+        self.dropped: dict[str, int] = {}
+        self.seq = 0
+
+    def size(self) -> int:
+        return sum(len(items) for items in self.pending.values())
+
+    def add(self, event: str, key: Any, payload: dict[str, Any], max_pending: int) -> bool:
+        items = self.pending.setdefault(event, OrderedDict())
+        previous = items.get(key)
+        if previous is not None:
+            items[key] = {**previous, **payload}
+            return True
+        if self.size() >= max_pending:
+            self.dropped[event] = self.dropped.get(event, 0) + 1
+            return False
+        items[key] = payload
+        return True
+
+    def merge_from(self, other: _SessionBuffer, max_pending: int) -> None:
+        for event, items in other.pending.items():
+            for key, payload in items.items():
+                self.add(event, key, payload, max_pending)
+        for event, count in other.dropped.items():
+            self.dropped[event] = self.dropped.get(event, 0) + count
+
+    def drain(self, max_items: int) -> list[dict[str, Any]]:
+        frames: list[dict[str, Any]] = []
+        for event in list(self.pending.keys()) + [e for e in self.dropped if e not in self.pending]:
+            items = self.pending.get(event) or OrderedDict()
+            batch = [items.popitem(last=False)[1] for _ in range(min(max_items, len(items)))]
+            if not items:
+                self.pending.pop(event, None)
+            dropped = self.dropped.pop(event, 0)
+            if not batch and not dropped:
+                continue
+            self.seq += 1
+            frames.append(
+                {
+                    "seq": self.seq,
+                    "event": event,
+                    "category": "asset",
+                    "count": len(batch),
+                    "items": batch,
+                    "dropped": dropped,
+                }
+            )
+        return frames
+
+
+class CoalescingEventBus:
+    """Per-session coalescing buffer flushed on a timer thread."""
+
+    def __init__(
+        self,
+        send: SendFn,
+        *,
+        window_ms: int,
+        max_items: int,
+        max_pending: int,
+        client_high_water_bytes: int,
+        queue_high_water: int,
+        session_ids: Callable[[], Iterable[str] | None] = lambda: None,
+        write_buffer_size: Callable[[str], int] = lambda _sid: 0,
+        queue_depth: Callable[[], int] = lambda: 0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._send = send
+        self._window_s = max(0, int(window_ms)) / 1000.0
+        self._max_items = max(1, int(max_items))
+        self._max_pending = max(1, int(max_pending))
+        self._client_high_water = max(0, int(client_high_water_bytes))
+        self._queue_high_water = max(0, int(queue_high_water))
+        self._session_ids = session_ids
+        self._write_buffer_size = write_buffer_size
+        self._queue_depth = queue_depth
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sessions: dict[str | None, _SessionBuffer] = {}
+        self._timer: threading.Timer | None = None
+        self._pending_since: float | None = None
+        self._anonymous_keys = itertools.count()
+
+    @property
+    def enabled(self) -> bool:
+        return self._window_s > 0
+
+    def publish(self, event: str, payload: dict[str, Any], *, key: Any = None, sid: str | None = None) -> bool:
+        """Buffer one event; items with the same ``key`` (default: ``payload["id"]``) are merged."""
+        if not self.enabled:
+            return self._send(event, payload, sid)
+        if key is None:
+            key = payload.get("id") if isinstance(payload, dict) else None
+        if key is None:
+            key = ("anon", next(self._anonymous_keys))
+        with self._lock:
+            buffer = self._sessions.setdefault(sid, _SessionBuffer())
+            accepted = buffer.add(event, key, payload, self._max_pending)
+            if self._pending_since is None:
+                self._pending_since = self._clock()
+            self._schedule_locked()
+        return accepted
+
+    def flush(self, *, force: bool = False) -> int:
+        """Send due frames now; returns the number of frames sent."""
+        with self._lock:
+            if self._timer is not None and self._timer is not threading.current_thread():
+                self._timer.cancel()
+            self._timer = None
+            if not force and self._should_defer_locked():
+                self._schedule_locked()
+                return 0
+            frames = self._collect_frames_locked(force=force)
+            if any(buffer.pending or buffer.dropped for buffer in self._sessions.values()):
+                self._pending_since = self._clock()
+                self._schedule_locked()
+            else:
+                self._pending_since = None
+        sent = 0
+        for sid, frame in frames:
+            try:
+                if self._send(BATCH_EVENT_NAME, frame, sid):
+                    sent += 1
+            except Exception as exc:
+                logger.debug("Failed to send %s frame: %s", BATCH_EVENT_NAME, exc)
+        return sent
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(buffer.size() for buffer in self._sessions.values())
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _schedule_locked(self) -> None:
+        if self._timer is not None:
+            return
+        timer = threading.Timer(self._window_s, self.flush)
+        timer.daemon = True
+        self._timer = timer
+        timer.start()
+
+    def _should_defer_locked(self) -> bool:
+        if self._pending_since is None or self._clock() - self._pending_since >= _MAX_DEFER_SECONDS:
+            return False
+        try:
+            return int(self._queue_depth() or 0) > self._queue_high_water
+        except Exception:
+            return False
+
+    def _fan_out_broadcast_locked(self) -> None:
+        try:
+            connected = self._session_ids()
+        except Exception:
+            connected = None
+        if connected is None:
+            return
+        connected_ids = {str(sid) for sid in connected}
+        broadcast = self._sessions.pop(None, None)
+        if broadcast is not None:
+            for sid in connected_ids:
+                self._sessions.setdefault(sid, _SessionBuffer()).merge_from(broadcast, self._max_pending)
+        for sid in [sid for sid in self._sessions if sid is not None and sid not in connected_ids]:
+            del self._sessions[sid]
+
+    def _is_congested(self, sid: str | None) -> bool:
+        if sid is None:
+            return False
+        try:
+            return int(self._write_buffer_size(sid) or 0) > self._client_high_water
+        except Exception:
+            return False
+
+    def _collect_frames_locked(self, *, force: bool) -> list[tuple[str | None, dict[str, Any]]]:
+        self._fan_out_broadcast_locked()
+        frames: list[tuple[str | None, dict[str, Any]]] = []
+        for sid, buffer in self._sessions.items():
+            if not force and self._is_congested(sid):
+                continue
+            frames.extend((sid, frame) for frame in buffer.drain(self._max_items))
+        return frames
+
+
+__all__ = ["BATCH_EVENT_NAME", "COALESCED_EVENTS", "CoalescingEventBus"]
@@ -2,17 +2,21 @@
 
 ComfyUI custom events are emitted with ``PromptServer.instance.send_sync``.
 This module keeps legacy event names intact while adding a stable ``mjr.event``
-envelope for consumers that want one normalized stream.
+envelope for consumers that want one normalized stream. Per-asset events go
+through ``queue_event`` so they are coalesced into ``mjr.asset.batch`` frames
+(see ``comfy_event_bus``).
 """
 
 from __future__ import annotations
 
+import threading
 import time
 from typing import Any
 
 from mjr_am_backend.utils import sanitize_for_json
 
 from . import comfy_core
+from .comfy_event_bus import BATCH_EVENT_NAME, COALESCED_EVENTS, CoalescingEventBus
 
 STRUCTURED_EVENT_NAME = "mjr.event"
 
@@ -54,6 +58,61 @@ def emit_event(event: str, payload: Any, *, category: str | None = None, sid: st
     return sent
 
 
+def queue_event(event: str, payload: Any, *, key: Any = None, sid: str | None = None) -> bool:
+    """
+    Emit a per-asset event through the coalescing bus.
+
+    Events outside ``COALESCED_EVENTS`` (and all events when batching is
+    disabled) are emitted immediately, exactly like ``emit_event``.
+    """
+    safe_event = str(event or "").strip()
+    if safe_event not in COALESCED_EVENTS:
+        return emit_event(safe_event, payload, sid=sid)
+    data = sanitize_for_json(payload if isinstance(payload, dict) else {"value": payload})
+    return get_event_bus().publish(safe_event, data, key=key, sid=sid)
+
+
+def _send_batch_frame(event: str, frame: dict[str, Any], sid: str | None) -> bool:
+    if event != BATCH_EVENT_NAME:
+        return emit_event(event, frame, sid=sid)
+    sent = _send_event(BATCH_EVENT_NAME, frame, sid)
+    summary = {
+        "seq": frame.get("seq"),
+        "event": frame.get("event"),
+        "count": frame.get("count"),
+        "dropped": frame.get("dropped"),
+        "ids": [item.get("id") for item in frame.get("items") or [] if isinstance(item, dict)],
+    }
+    _send_event(STRUCTURED_EVENT_NAME, build_event_payload(BATCH_EVENT_NAME, summary, category="asset"), sid)
+    return sent
+
+
+_BUS: CoalescingEventBus | None = None
+_BUS_LOCK = threading.Lock()
+
+
+def get_event_bus() -> CoalescingEventBus:
+    global _BUS
+    if _BUS is not None:
+        return _BUS
+    with _BUS_LOCK:
+        if _BUS is None:
+            from .. import config
+
+            _BUS = CoalescingEventBus(
+                _send_batch_frame,
+                window_ms=config.EVENT_BATCH_WINDOW_MS,
+                max_items=config.EVENT_BATCH_MAX_ITEMS,
+                max_pending=config.EVENT_BATCH_MAX_PENDING,
+                client_high_water_bytes=config.EVENT_BATCH_CLIENT_HIGH_WATER_BYTES,
+                queue_high_water=config.EVENT_BATCH_QUEUE_HIGH_WATER,
+                session_ids=comfy_core.websocket_session_ids,
+                write_buffer_size=comfy_core.websocket_write_buffer_size,
+                queue_depth=comfy_core.pending_message_count,
+            )
+        return _BUS
+
+
 def _send_event(event: str, payload: Any, sid: str | None) -> bool:
     if sid is None:
         return comfy_core.send_event(event, payload)
@@ -74,4 +133,4 @@ def _category_for_event(event: str) -> str:
     return "general"
 
 
-__all__ = ["STRUCTURED_EVENT_NAME", "build_event_payload", "emit_event"]
+__all__ = ["STRUCTURED_EVENT_NAME", "build_event_payload", "emit_event", "get_event_bus", "queue_event"]
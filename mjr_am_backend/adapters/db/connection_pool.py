@@ -73,6 +73,7 @@ def normalize_user_db_config(data: dict[str, Any]) -> dict[str, Any]:
     out: dict[str, Any] = {}
     maybe_set_config_number(out, data, "timeout", min_value=1.0, cast=float)
     maybe_set_config_number(out, data, "maxConnections", min_value=1, cast=int)
+    maybe_set_config_number(out, data, "readConnections", min_value=0, cast=int)
     maybe_set_config_number(out, data, "queryTimeout", min_value=0.0, cast=float)
     return out
 
@@ -234,9 +235,33 @@ def runtime_status(sqlite_obj: Any, *, busy_timeout_ms: int) -> dict[str, Any]:
         "max_connections": int(sqlite_obj._max_conn_limit),
         "query_timeout_s": float(sqlite_obj._query_timeout),
         "busy_timeout_ms": int(busy_timeout_ms),
+        "writer": writer_status(sqlite_obj),
+        "readers": reader_status(sqlite_obj),
     }
 
 
+def writer_status(sqlite_obj: Any) -> dict[str, Any]:
+    lock = getattr(sqlite_obj, "_write_lock", None)
+    try:
+        open_tx = len(sqlite_obj._tx_conns)
+    except Exception:
+        open_tx = 0
+    return {
+        "write_lock_held": bool(lock is not None and lock.locked()),
+        "open_transactions": int(open_tx),
+    }
+
+
+def reader_status(sqlite_obj: Any) -> dict[str, Any]:
+    readers = getattr(sqlite_obj, "_readers", None)
+    if readers is None:
+        return {"enabled": False, "max": 0}
+    try:
+        return {"enabled": True, **readers.status()}
+    except Exception:
+        return {"enabled": True, "max": 0}
+
+
 def diagnostics(sqlite_obj: Any) -> dict[str, Any]:
     with sqlite_obj._diag_lock:
         data = dict(sqlite_obj._diag)
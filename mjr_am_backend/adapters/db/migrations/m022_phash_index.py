@@ -0,0 +1,112 @@
+"""Migration v22 — multi-index hashing table for near-duplicate pHash lookups.
+
+Created objects:
+
+* ``asset_phash_index(asset_id PK, phash_int, band0..band3)`` — the 64-bit
+  perceptual hash as a signed integer plus its four 16-bit bands, with
+  cascade-delete on the asset side.
+* ``idx_asset_phash_band{0..3}`` — one index per band so candidate lookups
+  are index seeks rather than full scans.
+* ``trg_assets_phash_cleared`` — drops the index row whenever the indexer
+  resets ``assets.phash`` (file changed on disk).
+
+Backfill: every ``assets.phash`` already computed by earlier duplicate
+analyses is converted in Python (hex → int → bands) and inserted with
+``INSERT OR IGNORE``, so re-running the migration is a no-op.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ....shared import Result, get_logger
+from .base import Migration
+
+if TYPE_CHECKING:
+    from ..sqlite_facade import Sqlite
+
+logger = get_logger(__name__)
+
+_BACKFILL_CHUNK = 5000
+
+_CREATE_PHASH_INDEX = """
+CREATE TABLE IF NOT EXISTS asset_phash_index (
+    asset_id INTEGER PRIMARY KEY,
+    phash_int INTEGER NOT NULL,
+    band0 INTEGER NOT NULL,
+    band1 INTEGER NOT NULL,
+    band2 INTEGER NOT NULL,
+    band3 INTEGER NOT NULL,
+    FOREIGN KEY (asset_id) REFERENCES assets(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_asset_phash_band0 ON asset_phash_index(band0);
+CREATE INDEX IF NOT EXISTS idx_asset_phash_band1 ON asset_phash_index(band1);
+CREATE INDEX IF NOT EXISTS idx_asset_phash_band2 ON asset_phash_index(band2);
+CREATE INDEX IF NOT EXISTS idx_asset_phash_band3 ON asset_phash_index(band3);
+CREATE TRIGGER IF NOT EXISTS trg_assets_phash_cleared
+AFTER UPDATE OF phash ON assets
+WHEN COALESCE(new.phash, '') = ''
+BEGIN
+    DELETE FROM asset_phash_index WHERE asset_id = new.id;
+END;
+"""
+
+
+def _backfill_params(rows: list[dict]) -> list[tuple[int, ...]]:
+    # Same layout as ``features.duplicates.phash_index``: signed 64-bit hash
+    # followed by four 16-bit bands, lowest bits first.
+    out: list[tuple[int, ...]] = []
+    for row in rows:
+        try:
+            value = int(str(row.get("phash") or "").strip(), 16) & 0xFFFFFFFFFFFFFFFF
+        except ValueError:
+            continue
+        signed = value - (1 << 64) if value >= (1 << 63) else value
+        bands = tuple((value >> (16 * i)) & 0xFFFF for i in range(4))
+        out.append((int(row["id"]), signed, *bands))
+    return out
+
+
+class PhashIndexMigration(Migration):
+    """v22 — create ``asset_phash_index`` and backfill it from ``assets.phash``."""
+
+    version = 22
+    name = "phash_index"
+
+    async def upgrade(self, db: Sqlite) -> Result[bool]:
+        res = await db.aexecutescript(_CREATE_PHASH_INDEX)
+        if not res.ok:
+            return Result.Err("MIGRATION_DDL_FAILED", f"v22 create phash index failed: {res.error}")
+
+        last_id = 0
+        total = 0
+        while True:
+            rows = await db.aquery(
+                "SELECT id, phash FROM assets "
+                "WHERE id > ? AND COALESCE(phash, '') != '' ORDER BY id LIMIT ?",
+                (last_id, _BACKFILL_CHUNK),
+            )
+            if not rows.ok:
+                return Result.Err("MIGRATION_QUERY_FAILED", f"v22 backfill read failed: {rows.error}")
+            data = rows.data or []
+            if not data:
+                break
+            last_id = int(data[-1]["id"])
+            params = _backfill_params(data)
+            if params:
+                ins = await db.aexecutemany(
+                    "INSERT OR IGNORE INTO asset_phash_index "
+                    "(asset_id, phash_int, band0, band1, band2, band3) VALUES (?, ?, ?, ?, ?, ?)",
+                    params,
+                )
+                if not ins.ok:
+                    return Result.Err("MIGRATION_FAILED", f"v22 backfill failed: {ins.error}")
+                total += len(params)
+            if len(data) < _BACKFILL_CHUNK:
+                break
+        if total:
+            logger.info("v22: indexed %d existing perceptual hashes", total)
+        return Result.Ok(True)
+
+
+MIGRATION = PhashIndexMigration()
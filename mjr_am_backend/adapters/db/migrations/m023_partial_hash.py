@@ -0,0 +1,46 @@
+"""Migration v23 — head/tail partial hash for the duplicate-analysis prefilter.
+
+Created objects:
+
+* ``assets.partial_hash`` — ``"<algo>:<hex>"`` digest of the first and last
+  64 KiB of the file.  Only meaningful while ``hash_state`` matches the
+  file's current ``mtime:size``; the indexer resets both when a file changes.
+* ``idx_assets_size`` — lets the analyzer find size collisions
+  (``GROUP BY size HAVING COUNT > 1``) and their peers without a table scan.
+
+No backfill: the analyzer fills the column lazily, and only for files whose
+size collides with another asset.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ....shared import Result
+from .base import Migration
+
+if TYPE_CHECKING:
+    from ..sqlite_facade import Sqlite
+
+
+class PartialHashMigration(Migration):
+    """v23 — add ``assets.partial_hash`` and an index on ``assets.size``."""
+
+    version = 23
+    name = "partial_hash"
+
+    async def upgrade(self, db: Sqlite) -> Result[bool]:
+        columns = await db.aquery("PRAGMA table_info(assets)")
+        if not columns.ok:
+            return Result.Err("MIGRATION_QUERY_FAILED", f"v23 inspect assets failed: {columns.error}")
+        if "partial_hash" not in {str(row.get("name")) for row in (columns.data or [])}:
+            res = await db.aexecute("ALTER TABLE assets ADD COLUMN partial_hash TEXT")
+            if not res.ok:
+                return Result.Err("MIGRATION_DDL_FAILED", f"v23 add partial_hash failed: {res.error}")
+        res = await db.aexecute("CREATE INDEX IF NOT EXISTS idx_assets_size ON assets(size)")
+        if not res.ok:
+            return Result.Err("MIGRATION_DDL_FAILED", f"v23 create size index failed: {res.error}")
+        return Result.Ok(True)
+
+
+MIGRATION = PartialHashMigration()
@@ -0,0 +1,52 @@
+"""Migration v24 — expression indexes for keyset (cursor) pagination.
+
+Created objects:
+
+* ``idx_assets_size_keyset_desc`` / ``idx_assets_size_keyset_asc`` — match the
+  ``size_desc`` / ``size_asc`` orderings term for term
+  (``COALESCE(size, 0)``, ``mtime DESC``, ``id DESC``) so a size-sorted
+  page seeks past its cursor instead of sorting the whole table.
+* ``idx_assets_filename_lower_desc`` — same for ``name_desc``;
+  ``idx_assets_filename_lower`` only serves ``name_asc``.
+
+``mtime`` sorts already use ``idx_assets_mtime``.  ``rating_desc`` orders on
+``asset_metadata.rating`` through a join and cannot be served by an index on
+``assets``.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ....shared import Result
+from .base import Migration
+
+if TYPE_CHECKING:
+    from ..sqlite_facade import Sqlite
+
+
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_assets_size_keyset_desc "
+    "ON assets(COALESCE(size, 0) DESC, mtime DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_assets_size_keyset_asc "
+    "ON assets(COALESCE(size, 0) ASC, mtime DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_assets_filename_lower_desc "
+    "ON assets(LOWER(filename) DESC, id DESC)",
+)
+
+
+class KeysetIndexesMigration(Migration):
+    """v24 — add the expression indexes behind size and name_desc cursor pages."""
+
+    version = 24
+    name = "keyset_indexes"
+
+    async def upgrade(self, db: Sqlite) -> Result[bool]:
+        for ddl in _INDEXES:
+            res = await db.aexecute(ddl)
+            if not res.ok:
+                return Result.Err("MIGRATION_DDL_FAILED", f"v24 create keyset index failed: {res.error}")
+        return Result.Ok(True)
+
+
+MIGRATION = KeysetIndexesMigration()
@@ -0,0 +1,53 @@
+"""Migration v25 — per-directory snapshots for incremental scans.
+
+Created objects:
+
+* ``scan_dir_snapshots(scope, dir_path, mtime_ns, entry_count, scanned_at,
+  subdirs)`` — state of each directory at the last complete scan of a
+  ``source:root_id`` scope.  ``subdirs`` is a JSON array of child directory
+  paths so an unchanged directory can be descended without listing it.
+* ``idx_scan_dir_snapshots_dir`` — prefix lookups by ``dir_path`` when a scan
+  loads or replaces the snapshots below its root.
+
+No backfill: the next complete scan of each root fills the table.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ....shared import Result
+from .base import Migration
+
+if TYPE_CHECKING:
+    from ..sqlite_facade import Sqlite
+
+
+_CREATE_SCAN_DIR_SNAPSHOTS = """
+CREATE TABLE IF NOT EXISTS scan_dir_snapshots (
+    scope TEXT NOT NULL,
+    dir_path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    entry_count INTEGER NOT NULL DEFAULT 0,
+    scanned_at REAL NOT NULL,
+    subdirs TEXT NOT NULL DEFAULT '[]',
+    PRIMARY KEY (scope, dir_path)
+);
+CREATE INDEX IF NOT EXISTS idx_scan_dir_snapshots_dir ON scan_dir_snapshots(dir_path);
+"""
+
+
+class ScanDirSnapshotsMigration(Migration):
+    """v25 — create ``scan_dir_snapshots``."""
+
+    version = 25
+    name = "scan_dir_snapshots"
+
+    async def upgrade(self, db: Sqlite) -> Result[bool]:
+        res = await db.aexecutescript(_CREATE_SCAN_DIR_SNAPSHOTS)
+        if not res.ok:
+            return Result.Err("MIGRATION_DDL_FAILED", f"v25 create scan_dir_snapshots failed: {res.error}")
+        return Result.Ok(True)
+
+
+MIGRATION = ScanDirSnapshotsMigration()
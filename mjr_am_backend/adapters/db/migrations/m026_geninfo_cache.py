@@ -0,0 +1,51 @@
+"""Migration v26 — persistent cache of parsed geninfo.
+
+Created objects:
+
+* ``geninfo_cache(graph_hash PK, parser_version, geninfo_json, created_at)`` —
+  one parsed geninfo payload per distinct prompt/workflow pair.
+  ``graph_hash`` is the SHA-256 of the canonical JSON of the parser version,
+  prompt graph and workflow; ``geninfo_json`` is ``null`` when the graph
+  yielded nothing.
+* ``idx_geninfo_cache_created`` — lets the cache trim its oldest rows without
+  a full sort.
+
+No backfill: entries are written as assets are indexed.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ....shared import Result
+from .base import Migration
+
+if TYPE_CHECKING:
+    from ..sqlite_facade import Sqlite
+
+
+_CREATE_GENINFO_CACHE = """
+CREATE TABLE IF NOT EXISTS geninfo_cache (
+    graph_hash TEXT PRIMARY KEY,
+    parser_version TEXT NOT NULL,
+    geninfo_json TEXT NOT NULL DEFAULT 'null',
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_geninfo_cache_created ON geninfo_cache(created_at);
+"""
+
+
+class GeninfoCacheMigration(Migration):
+    """v26 — create ``geninfo_cache``."""
+
+    version = 26
+    name = "geninfo_cache"
+
+    async def upgrade(self, db: Sqlite) -> Result[bool]:
+        res = await db.aexecutescript(_CREATE_GENINFO_CACHE)
+        if not res.ok:
+            return Result.Err("MIGRATION_DDL_FAILED", f"v26 create geninfo_cache failed: {res.error}")
+        return Result.Ok(True)
+
+
+MIGRATION = GeninfoCacheMigration()
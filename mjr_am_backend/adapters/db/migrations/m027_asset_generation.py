@@ -0,0 +1,149 @@
+"""Migration v27 — normalized ``asset_generation`` side table.
+
+Created objects:
+
+* ``asset_generation(asset_id, model, models, sampler, scheduler, seed,
+  steps, cfg, loras)`` — one row per asset with the generation
+  parameters the search filters need, so ``model:``/``sampler:``/``lora:``
+  terms no longer run ``json_extract`` over ``asset_metadata.metadata_raw``.
+  ``models`` and ``loras`` are newline-joined name lists.  Rows cascade away
+  with their ``asset_metadata`` row.
+* One index per filterable column.  Text columns use ``NOCASE`` so ``LIKE``
+  matches stay case-insensitive and can be answered from the index.
+
+The indexer writes the table on every metadata write (see
+``features/index/asset_generation.write_asset_generation_row``).  Existing
+rows are backfilled here with a best-effort ``json_extract`` projection of
+parsed Gen Info and flat keys, as v21 does for ``metadata_text``;
+A1111 ``parameters`` parsing is filled in when an asset is next re-indexed.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ....shared import Result, get_logger
+from .base import Migration
+
+if TYPE_CHECKING:
+    from ..sqlite_facade import Sqlite
+
+logger = get_logger(__name__)
+
+_NAME_CAP = 256
+
+_CREATE_ASSET_GENERATION = """
+CREATE TABLE IF NOT EXISTS asset_generation (
+    asset_id INTEGER PRIMARY KEY REFERENCES asset_metadata(asset_id) ON DELETE CASCADE,
+    model TEXT COLLATE NOCASE,
+    models TEXT COLLATE NOCASE,
+    sampler TEXT COLLATE NOCASE,
+    scheduler TEXT COLLATE NOCASE,
+    seed INTEGER,
+    steps INTEGER,
+    cfg REAL,
+    loras TEXT COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS idx_asset_generation_model ON asset_generation(model);
+CREATE INDEX IF NOT EXISTS idx_asset_generation_models ON asset_generation(models);
+CREATE INDEX IF NOT EXISTS idx_asset_generation_sampler ON asset_generation(sampler);
+CREATE INDEX IF NOT EXISTS idx_asset_generation_scheduler ON asset_generation(scheduler);
+CREATE INDEX IF NOT EXISTS idx_asset_generation_seed ON asset_generation(seed);
+CREATE INDEX IF NOT EXISTS idx_asset_generation_steps ON asset_generation(steps);
+CREATE INDEX IF NOT EXISTS idx_asset_generation_cfg ON asset_generation(cfg);
+CREATE INDEX IF NOT EXISTS idx_asset_generation_loras ON asset_generation(loras) WHERE loras IS NOT NULL;
+"""
+
+
+def _name(path: str) -> str:
+    # Gen Info stores names as {"name": ...}; flat payloads store plain strings.
+    return (
+        f"NULLIF(TRIM(SUBSTR(COALESCE("
+        f"json_extract(metadata_raw, '{path}.name'), "
+        f"CASE WHEN json_type(metadata_raw, '{path}') = 'text' THEN json_extract(metadata_raw, '{path}') END"
+        f"), 1, {_NAME_CAP})), '')"
+    )
+
+
+def _number(path: str) -> str:
+    return (
+        f"COALESCE("
+        f"json_extract(metadata_raw, '{path}.value'), "
+        f"CASE WHEN json_type(metadata_raw, '{path}') IN ('integer', 'real') THEN json_extract(metadata_raw, '{path}') END"
+        f")"
+    )
+
+
+def _list_item_name() -> str:
+    return (
+        "NULLIF(TRIM(SUBSTR(COALESCE(json_extract(e.value, '$.name'), "
+        f"CASE WHEN e.type = 'text' THEN e.value END), 1, {_NAME_CAP})), '')"
+    )
+
+
+def _names_list(path: str, *, lead: str | None = None) -> str:
+    # Distinct names in document order, newline-joined; ``lead`` goes first.
+    items = (
+        f"SELECT e.id + 1 AS ord, {_list_item_name()} AS n "
+        f"FROM json_each(metadata_raw, '{path}') AS e "
+        f"WHERE json_type(metadata_raw, '{path}') IN ('array', 'object')"
+    )
+    if lead is not None:
+        items = f"SELECT 0 AS ord, {lead} AS n UNION ALL {items}"
+    return (
+        "(SELECT group_concat(n, char(10)) FROM ("
+        f"SELECT n FROM ({items}) WHERE n IS NOT NULL GROUP BY n ORDER BY MIN(ord)"
+        "))"
+    )
+
+
+def _backfill_sql() -> str:
+    model = f"COALESCE({_name('$.geninfo.checkpoint')}, {_name('$.model')}, {_name('$.checkpoint')})"
+    return f"""
+    INSERT OR IGNORE INTO asset_generation
+        (asset_id, model, models, sampler, scheduler, seed, steps, cfg, loras)
+    SELECT asset_id, model, models, sampler, scheduler, seed, steps, cfg, loras
+    FROM (
+        SELECT
+            asset_id,
+            {model} AS model,
+            {_names_list('$.geninfo.models', lead=model)} AS models,
+            COALESCE({_name('$.geninfo.sampler')}, {_name('$.sampler')}) AS sampler,
+            COALESCE({_name('$.geninfo.scheduler')}, {_name('$.scheduler')}) AS scheduler,
+            CAST(COALESCE({_number('$.geninfo.seed')}, {_number('$.seed')}) AS INTEGER) AS seed,
+            CAST(COALESCE({_number('$.geninfo.steps')}, {_number('$.steps')}) AS INTEGER) AS steps,
+            CAST(COALESCE({_number('$.geninfo.cfg')}, {_number('$.cfg')}) AS REAL) AS cfg,
+            {_names_list('$.geninfo.loras')} AS loras
+        FROM asset_metadata
+        WHERE json_valid(COALESCE(metadata_raw, ''))
+          AND TRIM(COALESCE(metadata_raw, '')) NOT IN ('', '{{}}', 'null')
+    )
+    WHERE COALESCE(model, models, sampler, scheduler, seed, steps, cfg, loras) IS NOT NULL
+    """
+
+
+class AssetGenerationMigration(Migration):
+    """v27 — create and backfill ``asset_generation``."""
+
+    version = 27
+    name = "asset_generation"
+
+    async def upgrade(self, db: Sqlite) -> Result[bool]:
+        res = await db.aexecutescript(_CREATE_ASSET_GENERATION)
+        if not res.ok:
+            return Result.Err("MIGRATION_DDL_FAILED", f"v27 create asset_generation failed: {res.error}")
+        has_table = await db.aquery(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='asset_metadata'"
+        )
+        if not has_table.ok:
+            return Result.Err("MIGRATION_QUERY_FAILED", f"v27 lookup failed: {has_table.error}")
+        if not has_table.data:
+            return Result.Ok(True)
+        res = await db.aexecute(_backfill_sql())
+        if not res.ok:
+            return Result.Err("MIGRATION_FAILED", f"v27 asset_generation backfill failed: {res.error}")
+        logger.info("v27: backfilled %s asset_generation row(s)", int(res.data or 0))
+        return Result.Ok(True)
+
+
+MIGRATION = AssetGenerationMigration()
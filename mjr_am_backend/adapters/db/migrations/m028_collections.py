@@ -0,0 +1,90 @@
+"""Migration v28 — collections move from JSON files into the index DB.
+
+Created objects:
+
+* ``collections(id, owner, name, created_at, updated_at, item_count)`` —
+  one row per collection.  ``owner`` is the sanitized user store segment
+  (empty for the single-user setup) and ``item_count`` is kept current by
+  triggers so listings never count members.
+* ``collection_items(id, collection_id, item_key, filepath, filename,
+  subfolder, type, root_id, kind, added_at)`` — one row per member.
+  ``item_key`` is the normalized filepath used for deduplication; the rowid
+  keeps insertion order for paging.  Rows cascade away with their collection.
+* ``idx_collection_items_collection`` — member pages in insertion order.
+* ``idx_collection_items_key`` / ``idx_collection_items_filepath`` — the
+  "which collections contain this asset" lookup.
+* ``trg_collection_items_count_ai`` / ``trg_collection_items_count_ad`` —
+  ``item_count`` maintenance.
+
+No backfill: the legacy JSON files live outside the DB and depend on the
+runtime collections directory, so ``CollectionsService`` imports them the
+first time each owner's collections are accessed.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ....shared import Result
+from .base import Migration
+
+if TYPE_CHECKING:
+    from ..sqlite_facade import Sqlite
+
+
+_CREATE_COLLECTIONS = """
+CREATE TABLE IF NOT EXISTS collections (
+    id TEXT PRIMARY KEY,
+    owner TEXT NOT NULL DEFAULT '',
+    name TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL DEFAULT '',
+    item_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_collections_owner_updated ON collections(owner, updated_at DESC);
+
+CREATE TABLE IF NOT EXISTS collection_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    collection_id TEXT NOT NULL REFERENCES collections(id) ON DELETE CASCADE,
+    item_key TEXT NOT NULL,
+    filepath TEXT NOT NULL,
+    filename TEXT NOT NULL DEFAULT '',
+    subfolder TEXT NOT NULL DEFAULT '',
+    type TEXT NOT NULL DEFAULT 'output',
+    root_id TEXT,
+    kind TEXT NOT NULL DEFAULT 'unknown',
+    added_at TEXT NOT NULL DEFAULT '',
+    UNIQUE (collection_id, item_key)
+);
+CREATE INDEX IF NOT EXISTS idx_collection_items_collection ON collection_items(collection_id, id);
+CREATE INDEX IF NOT EXISTS idx_collection_items_key ON collection_items(item_key);
+CREATE INDEX IF NOT EXISTS idx_collection_items_filepath ON collection_items(filepath);
+
+CREATE TRIGGER IF NOT EXISTS trg_collection_items_count_ai
+AFTER INSERT ON collection_items
+BEGIN
+    UPDATE collections SET item_count = item_count + 1 WHERE id = NEW.collection_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_collection_items_count_ad
+AFTER DELETE ON collection_items
+BEGIN
+    UPDATE collections SET item_count = MAX(0, item_count - 1) WHERE id = OLD.collection_id;
+END;
+"""
+
+
+class CollectionsMigration(Migration):
+    """v28 — create ``collections`` and ``collection_items``."""
+
+    version = 28
+    name = "collections"
+
+    async def upgrade(self, db: Sqlite) -> Result[bool]:
+        res = await db.aexecutescript(_CREATE_COLLECTIONS)
+        if not res.ok:
+            return Result.Err("MIGRATION_DDL_FAILED", f"v28 create collections failed: {res.error}")
+        return Result.Ok(True)
+
+
+MIGRATION = CollectionsMigration()
@@ -0,0 +1,54 @@
+"""Migration v29 — durable queue for rating/tags write-back to files.
+
+Created objects:
+
+* ``rating_tags_sync_queue(filepath, rating, tags, mode, revision,
+  enqueued_at)`` — one row per file with a pending ExifTool / Windows Shell
+  write.  ``filepath`` is the primary key, so repeated edits to the same file
+  collapse into one row (last write wins).  ``tags`` is a JSON array.
+  ``revision`` increases on every upsert; the worker only deletes a row when
+  its revision is unchanged, so an edit made while a batch is being written
+  is not lost.
+* ``idx_rating_tags_sync_queue_revision`` — oldest-first draining.
+
+No backfill: writes queued in memory by earlier versions were never persisted.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ....shared import Result
+from .base import Migration
+
+if TYPE_CHECKING:
+    from ..sqlite_facade import Sqlite
+
+
+_CREATE_QUEUE = """
+CREATE TABLE IF NOT EXISTS rating_tags_sync_queue (
+    filepath TEXT PRIMARY KEY,
+    rating INTEGER NOT NULL DEFAULT 0,
+    tags TEXT NOT NULL DEFAULT '[]',
+    mode TEXT NOT NULL DEFAULT 'on',
+    revision INTEGER NOT NULL DEFAULT 0,
+    enqueued_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_rating_tags_sync_queue_revision ON rating_tags_sync_queue(revision);
+"""
+
+
+class RatingTagsSyncQueueMigration(Migration):
+    """v29 — create ``rating_tags_sync_queue``."""
+
+    version = 29
+    name = "rating_tags_sync_queue"
+
+    async def upgrade(self, db: Sqlite) -> Result[bool]:
+        res = await db.aexecutescript(_CREATE_QUEUE)
+        if not res.ok:
+            return Result.Err("MIGRATION_DDL_FAILED", f"v29 create rating_tags_sync_queue failed: {res.error}")
+        return Result.Ok(True)
+
+
+MIGRATION = RatingTagsSyncQueueMigration()
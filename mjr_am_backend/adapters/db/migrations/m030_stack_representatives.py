@@ -0,0 +1,115 @@
+"""Migration v30 — materialized stack representatives.
+
+Grouped listings used to read every raw row, group members in Python and
+pick the representative per stack before slicing the requested page.  Each
+``asset_stacks`` row now carries its representative so grouped browse is a
+single filtered query over ``assets``.
+
+Created objects:
+
+* ``asset_stacks.rep_asset_id`` — the member shown for the stack in grouped
+  listings, picked by the rule in ``adapters.db.stack_representative``.
+* ``trg_assets_stack_summary_ad`` — keeps ``asset_count`` and
+  ``rep_asset_id`` current when a stacked asset row is deleted (pruning and
+  rescans remove rows outside ``StacksService``).
+* ``trg_assets_stack_rep_au`` / ``trg_asset_metadata_stack_rep_ai`` /
+  ``trg_asset_metadata_stack_rep_au`` — re-pick ``rep_asset_id`` when a
+  member's ``kind``, ``filename``, ``mtime``, ``size`` or
+  ``has_generation_data`` changes, since rescans update those in place.
+
+Backfill recomputes ``asset_count`` and ``rep_asset_id`` for every stack.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ....shared import Result, get_logger
+from ..stack_representative import representative_sql
+from .base import Migration
+
+if TYPE_CHECKING:
+    from ..sqlite_facade import Sqlite
+
+logger = get_logger(__name__)
+
+
+def _summary_set_sql(stack_id_expr: str) -> str:
+    """SET clause recomputing ``asset_count`` and ``rep_asset_id`` for one stack."""
+    return f"""
+    asset_count = (SELECT COUNT(*) FROM assets WHERE stack_id = {stack_id_expr}),
+    {_representative_set_sql(stack_id_expr)}
+    """
+
+
+def _representative_set_sql(stack_id_expr: str) -> str:
+    """SET clause re-picking ``rep_asset_id`` for one stack."""
+    return f"rep_asset_id = ({representative_sql(stack_id_expr)})"
+
+
+_CREATE_TRIGGER = f"""
+CREATE TRIGGER IF NOT EXISTS trg_assets_stack_summary_ad
+AFTER DELETE ON assets
+WHEN OLD.stack_id IS NOT NULL
+BEGIN
+    UPDATE asset_stacks SET {_summary_set_sql("OLD.stack_id")}
+    WHERE id = OLD.stack_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_assets_stack_rep_au
+AFTER UPDATE OF kind, filename, mtime, size ON assets
+WHEN NEW.stack_id IS NOT NULL
+ AND (OLD.kind IS NOT NEW.kind OR OLD.filename IS NOT NEW.filename
+      OR OLD.mtime IS NOT NEW.mtime OR OLD.size IS NOT NEW.size)
+BEGIN
+    UPDATE asset_stacks SET {_representative_set_sql("asset_stacks.id")}
+    WHERE id = NEW.stack_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_metadata_stack_rep_ai
+AFTER INSERT ON asset_metadata
+WHEN COALESCE(NEW.has_generation_data, 0)
+BEGIN
+    UPDATE asset_stacks SET {_representative_set_sql("asset_stacks.id")}
+    WHERE id = (SELECT stack_id FROM assets WHERE id = NEW.asset_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_metadata_stack_rep_au
+AFTER UPDATE OF has_generation_data ON asset_metadata
+WHEN COALESCE(OLD.has_generation_data, 0) != COALESCE(NEW.has_generation_data, 0)
+BEGIN
+    UPDATE asset_stacks SET {_representative_set_sql("asset_stacks.id")}
+    WHERE id = (SELECT stack_id FROM assets WHERE id = NEW.asset_id);
+END;
+"""
+
+
+def _backfill_sql() -> str:
+    return f"UPDATE asset_stacks SET {_summary_set_sql('asset_stacks.id')}"
+
+
+class StackRepresentativesMigration(Migration):
+    """v30 — add ``asset_stacks.rep_asset_id`` and the triggers keeping it current."""
+
+    version = 30
+    name = "stack_representatives"
+
+    async def upgrade(self, db: Sqlite) -> Result[bool]:
+        columns_res = await db.aquery("PRAGMA table_info(asset_stacks)")
+        if not columns_res.ok:
+            return Result.Err("MIGRATION_QUERY_FAILED", f"v30 column lookup failed: {columns_res.error}")
+        if "rep_asset_id" not in {str(row.get("name")) for row in (columns_res.data or [])}:
+            res = await db.aexecute("ALTER TABLE asset_stacks ADD COLUMN rep_asset_id INTEGER")
+            if not res.ok:
+                return Result.Err("MIGRATION_DDL_FAILED", f"v30 add rep_asset_id failed: {res.error}")
+        res = await db.aexecutescript(_CREATE_TRIGGER)
+        if not res.ok:
+            return Result.Err("MIGRATION_DDL_FAILED", f"v30 create triggers failed: {res.error}")
+        res = await db.aexecute(_backfill_sql())
+        if not res.ok:
+            return Result.Err("MIGRATION_FAILED", f"v30 backfill failed: {res.error}")
+        logger.info("v30: stack representatives backfilled")
+        return Result.Ok(True)
+
+
+MIGRATION = StackRepresentativesMigration()
@@ -0,0 +1,180 @@
+"""Migration v31 — trigger-maintained asset counters.
+
+``/mjr/am/health/counters`` and ``/mjr/am/date-histogram`` used to count
+``assets`` rows with root ``LIKE`` predicates on every poll.  Both now read
+pre-aggregated tallies that SQLite keeps current as rows change.
+
+Created objects:
+
+* ``asset_counters(source, root_id, kind, day, total, rated, with_workflow,
+  with_generation)`` — one row per ``(source, root_id, kind, day)`` bucket.
+  ``source`` is lower-cased, ``root_id`` is ``''`` outside custom roots and
+  ``day`` is the UTC ``YYYY-MM-DD`` of ``mtime`` (``''`` when unknown).  The
+  flag columns count members with ``rating > 0``, ``has_workflow = 1`` and
+  ``has_generation_data = 1``.
+* ``trg_asset_counters_ai`` / ``_bd`` / ``_au`` on ``assets`` — add, remove or
+  move the row's bucket; emptied buckets are dropped.  The delete trigger
+  runs *before* the row goes away so the metadata flags are still readable
+  whether or not the ``asset_metadata`` cascade fires first.
+* ``trg_asset_counters_meta_ai`` / ``_au`` / ``_ad`` on ``asset_metadata`` —
+  adjust the flag columns of the owning asset's bucket.
+
+Backfill rebuilds every bucket from ``assets`` and ``asset_metadata``.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ....shared import Result, get_logger
+from .base import Migration
+
+if TYPE_CHECKING:
+    from ..sqlite_facade import Sqlite
+
+logger = get_logger(__name__)
+
+
+def _key(row: str) -> str:
+    return (
+        f"LOWER(COALESCE({row}.source, '')), COALESCE({row}.root_id, ''), COALESCE({row}.kind, ''), "
+        f"COALESCE(strftime('%Y-%m-%d', {row}.mtime, 'unixepoch'), '')"
+    )
+
+
+def _flag(row: str, column: str) -> str:
+    """0/1 flag of an ``asset_metadata`` row (alias *row*)."""
+    if column == "rating":
+        return f"(CASE WHEN COALESCE({row}.rating, 0) > 0 THEN 1 ELSE 0 END)"
+    return f"(CASE WHEN COALESCE({row}.{column}, 0) = 1 THEN 1 ELSE 0 END)"
+
+
+def _asset_flag(asset: str, column: str) -> str:
+    """Current metadata flag of the asset row aliased *asset*."""
+    return f"COALESCE((SELECT {_flag('m', column)} FROM asset_metadata m WHERE m.asset_id = {asset}.id), 0)"
+
+
+_FLAG_COLUMNS = (("rating", "rated"), ("has_workflow", "with_workflow"), ("has_generation_data", "with_generation"))
+
+
+def _bump_bucket(asset: str, sign: str) -> str:
+    flags = ", ".join(f"{sign}{_asset_flag(asset, column)}" for column, _ in _FLAG_COLUMNS)
+    return f"""
+    INSERT INTO asset_counters (source, root_id, kind, day, total, rated, with_workflow, with_generation)
+    VALUES ({_key(asset)}, {sign}1, {flags})
+    ON CONFLICT(source, root_id, kind, day) DO UPDATE SET
+        total = total + excluded.total,
+        rated = rated + excluded.rated,
+        with_workflow = with_workflow + excluded.with_workflow,
+        with_generation = with_generation + excluded.with_generation;
+    """ + (
+        f"DELETE FROM asset_counters WHERE (source, root_id, kind, day) = ({_key(asset)}) AND total <= 0;"
+        if sign == "-"
+        else ""
+    )
+
+
+def _bump_flags(delta: dict[str, str], asset_id: str) -> str:
+    sets = ", ".join(f"{counter} = {counter} + ({delta[column]})" for column, counter in _FLAG_COLUMNS)
+    return f"""
+    UPDATE asset_counters SET {sets}
+    WHERE (source, root_id, kind, day) = (SELECT {_key('a')} FROM assets a WHERE a.id = {asset_id});
+    """
+
+
+def _flags_differ(old: str, new: str) -> str:
+    return " OR ".join(f"{_flag(old, column)} != {_flag(new, column)}" for column, _ in _FLAG_COLUMNS)
+
+
+def _flags_any(row: str) -> str:
+    return " OR ".join(f"{_flag(row, column)} = 1" for column, _ in _FLAG_COLUMNS)
+
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS asset_counters (
+    source TEXT NOT NULL DEFAULT '',
+    root_id TEXT NOT NULL DEFAULT '',
+    kind TEXT NOT NULL DEFAULT '',
+    day TEXT NOT NULL DEFAULT '',
+    total INTEGER NOT NULL DEFAULT 0,
+    rated INTEGER NOT NULL DEFAULT 0,
+    with_workflow INTEGER NOT NULL DEFAULT 0,
+    with_generation INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (source, root_id, kind, day)
+) WITHOUT ROWID;
+"""
+
+_CREATE_TRIGGERS = f"""
+CREATE TRIGGER IF NOT EXISTS trg_asset_counters_ai
+AFTER INSERT ON assets
+BEGIN
+    {_bump_bucket("NEW", "+")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_counters_bd
+BEFORE DELETE ON assets
+BEGIN
+    {_bump_bucket("OLD", "-")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_counters_au
+AFTER UPDATE OF source, root_id, kind, mtime ON assets
+WHEN ({_key("OLD")}) != ({_key("NEW")})
+BEGIN
+    {_bump_bucket("OLD", "-")}
+    {_bump_bucket("NEW", "+")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_counters_meta_ai
+AFTER INSERT ON asset_metadata
+WHEN {_flags_any("NEW")}
+BEGIN
+    {_bump_flags({column: _flag("NEW", column) for column, _ in _FLAG_COLUMNS}, "NEW.asset_id")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_counters_meta_au
+AFTER UPDATE OF rating, has_workflow, has_generation_data ON asset_metadata
+WHEN {_flags_differ("OLD", "NEW")}
+BEGIN
+    {_bump_flags({column: f"{_flag('NEW', column)} - {_flag('OLD', column)}" for column, _ in _FLAG_COLUMNS}, "NEW.asset_id")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_counters_meta_ad
+AFTER DELETE ON asset_metadata
+WHEN {_flags_any("OLD")}
+BEGIN
+    {_bump_flags({column: f"-{_flag('OLD', column)}" for column, _ in _FLAG_COLUMNS}, "OLD.asset_id")}
+END;
+"""
+
+
+def _backfill_sql() -> str:
+    sums = ", ".join(f"COALESCE(SUM({_flag('m', column)}), 0)" for column, _ in _FLAG_COLUMNS)
+    return f"""
+    DELETE FROM asset_counters;
+    INSERT INTO asset_counters (source, root_id, kind, day, total, rated, with_workflow, with_generation)
+    SELECT {_key('a')}, COUNT(*), {sums}
+    FROM assets a
+    LEFT JOIN asset_metadata m ON m.asset_id = a.id
+    GROUP BY 1, 2, 3, 4;
+    """
+
+
+class AssetCountersMigration(Migration):
+    """v31 — create ``asset_counters`` and its maintenance triggers."""
+
+    version = 31
+    name = "asset_counters"
+
+    async def upgrade(self, db: Sqlite) -> Result[bool]:
+        res = await db.aexecutescript(_CREATE_TABLE + _CREATE_TRIGGERS)
+        if not res.ok:
+            return Result.Err("MIGRATION_DDL_FAILED", f"v31 create asset_counters failed: {res.error}")
+        res = await db.aexecutescript(_backfill_sql())
+        if not res.ok:
+            return Result.Err("MIGRATION_FAILED", f"v31 backfill failed: {res.error}")
+        logger.info("v31: asset counters backfilled")
+        return Result.Ok(True)
+
+
+MIGRATION = AssetCountersMigration()
@@ -0,0 +1,173 @@
+"""Migration v32 — incrementally maintained metadata key catalog.
+
+``/mjr/am/metadata/keys`` used to ``json.loads`` up to 5000 ``metadata_raw``
+rows and walk them on every request, so large libraries were only sampled.
+Keys are now recorded when metadata is written and the endpoint reads the
+catalog tables directly.
+
+Created objects:
+
+* ``metadata_keys(id, node_type, path, occurrences, last_seen)`` — one row per
+  ``(node_type, path)``; ``node_type`` is ``''`` for dotted metadata paths.
+  ``occurrences`` counts the assets carrying the key and ``last_seen`` is the
+  epoch second an asset last gained it.
+* ``metadata_key_sets(id, signature, key_ids, asset_count)`` — each distinct
+  key combination once, ``key_ids`` a JSON array of ``metadata_keys.id``.
+  Sets that drop to zero assets are kept for reuse.
+* ``asset_key_sets(asset_id, set_id)`` — the key set of each asset's stored
+  metadata; cascades with ``assets``.
+* ``trg_asset_key_sets_ai`` / ``_au`` / ``_ad`` — move ``asset_count`` and
+  ``occurrences`` when an asset gains, changes or loses its set.
+* ``trg_asset_key_sets_meta_ad`` — drops the assignment with the
+  ``asset_metadata`` row.
+
+Backfill walks the stored ``metadata_raw`` once, in ``asset_id`` batches.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+from ....shared import Result, get_logger
+from .base import Migration
+
+if TYPE_CHECKING:
+    from ..sqlite_facade import Sqlite
+
+logger = get_logger(__name__)
+
+_BACKFILL_BATCH = 500
+
+
+def _bump_set(set_id: str, sign: str) -> str:
+    seen = ", last_seen = CAST(strftime('%s', 'now') AS INTEGER)" if sign == "+" else ""
+    return f"""
+    UPDATE metadata_key_sets SET asset_count = asset_count {sign} 1 WHERE id = {set_id};
+    UPDATE metadata_keys SET occurrences = occurrences {sign} 1{seen}
+    WHERE id IN (SELECT value FROM json_each((SELECT key_ids FROM metadata_key_sets WHERE id = {set_id})));
+    """
+
+
+_CREATE_TABLES = """
+CREATE TABLE IF NOT EXISTS metadata_keys (
+    id INTEGER PRIMARY KEY,
+    node_type TEXT NOT NULL DEFAULT '',
+    path TEXT NOT NULL,
+    occurrences INTEGER NOT NULL DEFAULT 0,
+    last_seen INTEGER,
+    UNIQUE (node_type, path)
+);
+
+CREATE TABLE IF NOT EXISTS metadata_key_sets (
+    id INTEGER PRIMARY KEY,
+    signature TEXT NOT NULL UNIQUE,
+    key_ids TEXT NOT NULL DEFAULT '[]',
+    asset_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS asset_key_sets (
+    asset_id INTEGER PRIMARY KEY REFERENCES assets(id) ON DELETE CASCADE,
+    set_id INTEGER NOT NULL REFERENCES metadata_key_sets(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_asset_key_sets_set ON asset_key_sets(set_id);
+"""
+
+_CREATE_TRIGGERS = f"""
+CREATE TRIGGER IF NOT EXISTS trg_asset_key_sets_ai
+AFTER INSERT ON asset_key_sets
+BEGIN
+    {_bump_set("NEW.set_id", "+")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_key_sets_au
+AFTER UPDATE OF set_id ON asset_key_sets
+WHEN OLD.set_id != NEW.set_id
+BEGIN
+    {_bump_set("OLD.set_id", "-")}
+    {_bump_set("NEW.set_id", "+")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_key_sets_ad
+AFTER DELETE ON asset_key_sets
+BEGIN
+    {_bump_set("OLD.set_id", "-")}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_asset_key_sets_meta_ad
+AFTER DELETE ON asset_metadata
+BEGIN
+    DELETE FROM asset_key_sets WHERE asset_id = OLD.asset_id;
+END;
+"""
+
+
+async def backfill_metadata_keys(db: Sqlite) -> Result[int]:
+    """Assign a key set to every asset with stored metadata; returns the count."""
+    from ....data.repositories.metadata_keys_repository import (
+        MetadataKeysRepository,
+        key_set_signature,
+    )
+    from ....features.metadata.key_aggregator import metadata_key_pairs
+
+    repo = MetadataKeysRepository(db)
+    set_ids: dict[str, int] = {}
+    assigned = 0
+    last_id = 0
+    while True:
+        rows_res = await db.aquery(
+            """
+            SELECT asset_id, metadata_raw FROM asset_metadata
+            WHERE asset_id > ? AND metadata_raw IS NOT NULL
+              AND TRIM(metadata_raw) NOT IN ('', '{}', 'null', 'NULL')
+            ORDER BY asset_id LIMIT ?
+            """,
+            (last_id, _BACKFILL_BATCH),
+        )
+        if not rows_res.ok:
+            return Result.Err(rows_res.code, rows_res.error or "metadata_raw read failed")
+        rows = rows_res.data or []
+        if not rows:
+            return Result.Ok(assigned)
+        last_id = int(rows[-1]["asset_id"])
+        batch: list[tuple[int, int]] = []
+        for row in rows:
+            try:
+                meta = json.loads(row.get("metadata_raw") or "")
+            except (TypeError, ValueError):
+                continue
+            pairs = metadata_key_pairs(meta) if isinstance(meta, dict) else set()
+            if not pairs:
+                continue
+            signature = key_set_signature(pairs)
+            if signature not in set_ids:
+                set_res = await repo.ensure_key_set(pairs, signature)
+                if not set_res.ok:
+                    return Result.Err(set_res.code, set_res.error or "Key set insert failed")
+                set_ids[signature] = int(set_res.data or 0)
+            batch.append((int(row["asset_id"]), set_ids[signature]))
+        res = await repo.assign_many(batch)
+        if not res.ok:
+            return Result.Err(res.code, res.error or "Key set assignment failed")
+        assigned += len(batch)
+
+
+class MetadataKeysMigration(Migration):
+    """v32 — create the metadata key catalog and backfill it."""
+
+    version = 32
+    name = "metadata_keys"
+
+    async def upgrade(self, db: Sqlite) -> Result[bool]:
+        res = await db.aexecutescript(_CREATE_TABLES + _CREATE_TRIGGERS)
+        if not res.ok:
+            return Result.Err("MIGRATION_DDL_FAILED", f"v32 create metadata_keys failed: {res.error}")
+        backfill = await backfill_metadata_keys(db)
+        if not backfill.ok:
+            return Result.Err("MIGRATION_FAILED", f"v32 backfill failed: {backfill.error}")
+        logger.info("v32: metadata key catalog backfilled for %d assets", backfill.data)
+        return Result.Ok(True)
+
+
+MIGRATION = MetadataKeysMigration()
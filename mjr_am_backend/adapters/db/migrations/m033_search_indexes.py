@@ -0,0 +1,151 @@
+"""Migration v33 — trigram filename index and materialized autocomplete terms.
+
+``assets_fts`` tokenizes names on word boundaries, so substrings such as
+``_00042_`` or ``fyui`` never match, and autocomplete ran a ``LIKE`` over the
+whole ``fts5vocab`` table on every keystroke.
+
+Created objects:
+
+* ``assets_name_trigram`` — external-content FTS5 table over
+  ``assets(filename, subfolder)`` with the ``trigram`` tokenizer (SQLite
+  3.34+).  Skipped with a log line when the tokenizer is unavailable; search
+  then keeps its word-level behaviour.
+* ``assets_name_trigram_insert`` / ``_delete`` / ``_update`` on ``assets`` —
+  keep the trigram index in step with ``assets_fts``.  Deletes pass the old
+  values, as external-content FTS5 tables require.
+* ``asset_metadata_vocab`` — ``fts5vocab`` view of ``asset_metadata_fts``.
+* ``search_terms(term, doc)`` — every vocabulary term with its document
+  frequency, keyed by term so a prefix lookup is a B-tree range scan.
+* ``search_terms_state`` — single row holding the ``dirty`` flag and the
+  epoch second of the last refresh.
+* ``trg_search_terms_*`` on ``asset_metadata`` and ``asset_tags`` — flag
+  ``search_terms`` dirty whenever the text feeding ``asset_metadata_fts``
+  changes.  FTS5 tokens cannot be computed in SQL, so the table itself is
+  re-materialized by ``SearchTermsRepository.refresh``.
+
+Backfill rebuilds the trigram index from ``assets`` and materializes the
+terms once.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ....shared import Result, get_logger
+from .base import Migration
+
+if TYPE_CHECKING:
+    from ..sqlite_facade import Sqlite
+
+logger = get_logger(__name__)
+
+_CREATE_TRIGRAM = """
+CREATE VIRTUAL TABLE IF NOT EXISTS assets_name_trigram USING fts5(
+    filename,
+    subfolder,
+    content='assets',
+    content_rowid='id',
+    tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS assets_name_trigram_insert AFTER INSERT ON assets BEGIN
+    INSERT INTO assets_name_trigram(rowid, filename, subfolder)
+    VALUES (new.id, new.filename, new.subfolder);
+END;
+
+CREATE TRIGGER IF NOT EXISTS assets_name_trigram_delete AFTER DELETE ON assets BEGIN
+    INSERT INTO assets_name_trigram(assets_name_trigram, rowid, filename, subfolder)
+    VALUES ('delete', old.id, old.filename, old.subfolder);
+END;
+
+CREATE TRIGGER IF NOT EXISTS assets_name_trigram_update
+AFTER UPDATE OF filename, subfolder ON assets
+WHEN old.filename IS NOT new.filename OR old.subfolder IS NOT new.subfolder
+BEGIN
+    INSERT INTO assets_name_trigram(assets_name_trigram, rowid, filename, subfolder)
+    VALUES ('delete', old.id, old.filename, old.subfolder);
+    INSERT INTO assets_name_trigram(rowid, filename, subfolder)
+    VALUES (new.id, new.filename, new.subfolder);
+END;
+"""
+
+_MARK_DIRTY = "UPDATE search_terms_state SET dirty = 1 WHERE id = 1 AND dirty = 0;"
+
+_CREATE_TERMS = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS asset_metadata_vocab USING fts5vocab('asset_metadata_fts', 'row');
+
+CREATE TABLE IF NOT EXISTS search_terms (
+    term TEXT PRIMARY KEY,
+    doc INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS search_terms_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    dirty INTEGER NOT NULL DEFAULT 1,
+    refreshed_at REAL NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO search_terms_state (id, dirty, refreshed_at) VALUES (1, 1, 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_search_terms_meta_ai
+AFTER INSERT ON asset_metadata
+WHEN COALESCE(NEW.metadata_text, '') != ''
+BEGIN
+    {_MARK_DIRTY}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_terms_meta_au
+AFTER UPDATE OF metadata_text ON asset_metadata
+WHEN OLD.metadata_text IS NOT NEW.metadata_text
+BEGIN
+    {_MARK_DIRTY}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_terms_meta_ad
+AFTER DELETE ON asset_metadata
+BEGIN
+    {_MARK_DIRTY}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_terms_tags_ai
+AFTER INSERT ON asset_tags
+BEGIN
+    {_MARK_DIRTY}
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_search_terms_tags_ad
+AFTER DELETE ON asset_tags
+BEGIN
+    {_MARK_DIRTY}
+END;
+"""
+
+
+class SearchIndexesMigration(Migration):
+    """v33 — create the trigram name index and the autocomplete term table."""
+
+    version = 33
+    name = "search_indexes"
+
+    async def upgrade(self, db: Sqlite) -> Result[bool]:
+        from ....data.repositories.search_terms_repository import SearchTermsRepository
+
+        res = await db.aexecutescript(_CREATE_TRIGRAM)
+        if res.ok:
+            res = await db.aexecute("INSERT INTO assets_name_trigram(assets_name_trigram) VALUES('rebuild')")
+            if not res.ok:
+                return Result.Err("MIGRATION_FAILED", f"v33 trigram rebuild failed: {res.error}")
+        else:
+            logger.info("v33: trigram tokenizer unavailable, substring name search disabled (%s)", res.error)
+
+        res = await db.aexecutescript(_CREATE_TERMS)
+        if not res.ok:
+            return Result.Err("MIGRATION_DDL_FAILED", f"v33 create search_terms failed: {res.error}")
+        refresh = await SearchTermsRepository(db).refresh()
+        if not refresh.ok:
+            return Result.Err("MIGRATION_FAILED", f"v33 search_terms backfill failed: {refresh.error}")
+        logger.info("v33: %d autocomplete terms materialized", refresh.data)
+        return Result.Ok(True)
+
+
+MIGRATION = SearchIndexesMigration()
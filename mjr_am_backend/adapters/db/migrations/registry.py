@@ -13,5 +13,17 @@ from .m018_fts_from_normalized_tags import MIGRATION as M018
 from .m019_drop_legacy_tag_columns import MIGRATION as M019
 from .m020_workflow_library_tables import MIGRATION as M020
 from .m021_backfill_metadata_text import MIGRATION as M021
+from .m022_phash_index import MIGRATION as M022
+from .m023_partial_hash import MIGRATION as M023
+from .m024_keyset_indexes import MIGRATION as M024
+from .m025_scan_dir_snapshots import MIGRATION as M025
+from .m026_geninfo_cache import MIGRATION as M026
+from .m027_asset_generation import MIGRATION as M027
+from .m028_collections import MIGRATION as M028
+from .m029_rating_tags_sync_queue import MIGRATION as M029
+from .m030_stack_representatives import MIGRATION as M030
+from .m031_asset_counters import MIGRATION as M031
+from .m032_metadata_keys import MIGRATION as M032
+from .m033_search_indexes import MIGRATION as M033
 
-MIGRATIONS: list[Migration] = [M017, M018, M019, M020, M021]
+MIGRATIONS: list[Migration] = [M017, M018, M019, M020, M021, M022, M023, M024, M025, M026, M027, M028, M029, M030, M031, M032, M033]
@@ -19,6 +19,7 @@ from .schema_sql import (
     CURRENT_SCHEMA_VERSION,
     INDEXES_AND_TRIGGERS,
     SCHEMA_V1,
+    VEC_CHANGE_LOG,
     VEC_SCHEMA,
     _db_path,
     _is_safe_identifier,
@@ -119,6 +120,14 @@ async def ensure_vec_schema(db) -> Result[bool]:
     return result
 
 
+async def ensure_vec_change_log(db) -> Result[bool]:
+    """Create the embedding change log and the triggers that feed it."""
+    result = await db.aexecutescript(VEC_CHANGE_LOG)
+    if not result.ok:
+        logger.error("Failed to ensure vec change log: %s", result.error)
+    return result
+
+
 async def _migrate_embeddings_to_vec(db) -> Result[bool]:
     """Move rows from main.asset_embeddings TABLE into vec.asset_embeddings.
 
@@ -252,6 +261,10 @@ async def _ensure_schema(db) -> Result[bool]:
     if not result.ok:
         return result
 
+    result = await ensure_vec_change_log(db)
+    if not result.ok:
+        return result
+
     # Purge orphan embeddings (no cascade trigger across attached DBs).
     await purge_orphan_vec_embeddings(db)
 
@@ -320,6 +333,12 @@ async def rebuild_fts(db) -> Result[bool]:
         logger.error(f"Failed to rebuild assets_fts: {result.error}")
         return result
 
+    if await db.ahas_table("assets_name_trigram"):
+        result = await db.aexecute("INSERT INTO assets_name_trigram(assets_name_trigram) VALUES('rebuild')")
+        if not result.ok:
+            logger.error(f"Failed to rebuild assets_name_trigram: {result.error}")
+            return result
+
     repair_result = await _repair_asset_metadata_fts(db)
     if repair_result is not None and not repair_result.ok:
         logger.error(f"Failed to rebuild asset_metadata_fts: {repair_result.error}")
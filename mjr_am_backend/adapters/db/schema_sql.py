@@ -277,6 +277,37 @@ CREATE UNIQUE INDEX IF NOT EXISTS vec.idx_asset_embeddings_asset_id ON asset_emb
 CREATE INDEX IF NOT EXISTS vec.idx_asset_embeddings_auto_tags_nonempty ON asset_embeddings(auto_tags) WHERE auto_tags IS NOT NULL AND auto_tags NOT IN ('', '[]');
 """
 
+# Append-only log of embedding writes and deletes.  The vector searcher
+# replays entries past the ``seq`` its Faiss index reflects and prunes the
+# ones it has persisted.  Installed after the vec layout repair, which
+# recreates ``asset_embeddings`` and drops its triggers.
+VEC_CHANGE_LOG = """
+CREATE TABLE IF NOT EXISTS vec.asset_embedding_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    asset_id INTEGER NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS vec.trg_asset_embeddings_change_ai
+AFTER INSERT ON asset_embeddings
+BEGIN
+    INSERT INTO asset_embedding_changes (asset_id) VALUES (new.asset_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS vec.trg_asset_embeddings_change_au
+AFTER UPDATE OF asset_id, vector ON asset_embeddings
+BEGIN
+    INSERT INTO asset_embedding_changes (asset_id)
+    SELECT old.asset_id WHERE old.asset_id IS NOT new.asset_id;
+    INSERT INTO asset_embedding_changes (asset_id) VALUES (new.asset_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS vec.trg_asset_embeddings_change_ad
+AFTER DELETE ON asset_embeddings
+BEGIN
+    INSERT INTO asset_embedding_changes (asset_id) VALUES (old.asset_id);
+END;
+"""
+
 _SAFE_IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
 _SAFE_COLUMN_DEF_SUFFIX_RE = re.compile(r"^[A-Za-z0-9_(),{}\[\]'\s]+$")
 
@@ -30,7 +30,7 @@ from typing import Any
 
 import aiosqlite
 
-from ...config import DB_MAX_CONNECTIONS, DB_QUERY_TIMEOUT, DB_TIMEOUT
+from ...config import DB_MAX_CONNECTIONS, DB_QUERY_TIMEOUT, DB_READ_CONNECTIONS, DB_TIMEOUT
 from ...shared import ErrorCode, Result, get_logger
 from . import sqlite_connections as conn_runtime
 from . import sqlite_execution as exec_runtime
@@ -114,6 +114,7 @@ from .db_recovery import (
 from .db_recovery import (
     set_recovery_state as recovery_set_recovery_state,
 )
+from .sqlite_readers import ReaderPool
 from .transaction_manager import (
     begin_stmt_for_mode as tx_begin_stmt_for_mode,
 )
@@ -132,6 +133,9 @@ from .transaction_manager import (
 from .transaction_manager import (
     is_missing_table_error as tx_is_missing_table_error,
 )
+from .transaction_manager import (
+    is_read_only_sql as tx_is_read_only_sql,
+)
 from .transaction_manager import (
     is_write_sql as tx_is_write_sql,
 )
@@ -416,6 +420,26 @@ class Sqlite:
         )
         return max(1, max_conn)
 
+    def _init_readers(self, read_connections: int | None, user_config: dict[str, Any], run_timeout_s: float) -> None:
+        count = (
+            int(read_connections)
+            if read_connections is not None
+            else int(user_config.get("readConnections", DB_READ_CONNECTIONS))
+        )
+        self._readers: ReaderPool | None = None
+        if count <= 0 or str(self.db_path) == ":memory:":
+            return
+        self._readers = ReaderPool(
+            self.db_path,
+            count,
+            loop_thread=_AsyncLoopThread(run_timeout_s=run_timeout_s),
+            attach=self._attach_dbs,
+            timeout=self._timeout,
+            query_timeout=self._query_timeout,
+            cache_size_kib=SQLITE_CACHE_SIZE_KIB,
+            busy_timeout_ms=SQLITE_BUSY_TIMEOUT_MS,
+        )
+
     def _init_reset_state(self) -> None:
         self._resetting = False
         self._active_conns: set[aiosqlite.Connection] = set()
@@ -444,7 +468,15 @@ class Sqlite:
             "last_auto_reset_error": None,
         }
 
-    def __init__(self, db_path: str, max_connections: int | None = None, timeout: float = 30.0, *, attach: dict[str, str] | None = None):
+    def __init__(
+        self,
+        db_path: str,
+        max_connections: int | None = None,
+        timeout: float = 30.0,
+        *,
+        attach: dict[str, str] | None = None,
+        read_connections: int | None = None,
+    ):
         self.db_path = Path(db_path)
         self._attach_dbs: dict[str, str] = dict(attach) if attach else {}
         self._init_vec_attach()
@@ -468,6 +500,7 @@ class Sqlite:
 
         loop_run_timeout = self._query_timeout if self._query_timeout and self._query_timeout > 0 else ASYNC_LOOP_RUN_TIMEOUT_S
         self._loop_thread = _AsyncLoopThread(run_timeout_s=loop_run_timeout)
+        self._init_readers(read_connections, user_config, loop_run_timeout)
         self._write_lock: asyncio.Lock | None = None
         self._tx_write_lock_tokens: set[str] = set()
         self._tx_state_lock = threading.Lock()
@@ -764,9 +797,24 @@ class Sqlite:
     def _cursor_write_result(cursor: Any) -> Result[Any]:
         return tx_cursor_write_result(cursor)
 
+    def _can_use_reader(self, query: str, token: str | None) -> bool:
+        # Transactions keep read-your-writes on their own connection; uninitialized
+        # or resetting databases must go through the writer's checks.
+        if token or getattr(self, "_readers", None) is None:
+            return False
+        if not self._initialized or self._resetting:
+            return False
+        return tx_is_read_only_sql(query) and _find_unresolved_sql_template(query) is None
+
     async def aexecute(self, query: str, params: tuple | None = None, fetch: bool = False) -> Result[Any]:
-        """Execute SQL on the DB loop thread (async)."""
+        """Execute SQL on the DB loop thread (async); plain reads go to the read-only pool."""
         token = _TX_TOKEN.get()
+        if fetch and self._can_use_reader(query, token):
+            readers = self._readers
+            if readers is not None:
+                res = await readers.aquery(query, params)
+                if res is not None:
+                    return res
         fut = self._loop_thread.submit(self._execute_async(query, params, fetch, tx_token=token))
         return await asyncio.wrap_future(fut)
 
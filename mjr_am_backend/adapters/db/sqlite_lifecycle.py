@@ -197,6 +197,10 @@ async def close_all_async(self):
     self._active_conns_idle.set()
     self._async_sem = None
 
+    readers = getattr(self, "_readers", None)
+    if readers is not None:
+        await readers.aclose()
+
 
 async def aclose_async(self):
     if getattr(self, "_closing", False):
@@ -0,0 +1,224 @@
+"""
+Read-only connection pool used by ``Sqlite.aquery`` outside transactions.
+
+The writer pool serializes every write behind ``_write_lock`` on the main DB
+loop thread.  Listing/search reads routed there queue behind scan batches and
+``atransaction("immediate")`` blocks even though WAL lets them run
+concurrently.  ``ReaderPool`` keeps N connections opened with
+``mode=ro`` + ``PRAGMA query_only`` on a separate loop thread (each aiosqlite
+connection additionally runs on its own worker thread), so grid reads never
+wait for the writer.
+
+Readers never self-heal: any SQLite error closes the connection and the
+caller re-runs the query on the writer path, which owns schema repair and
+corruption recovery.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+import aiosqlite
+
+from ...shared import ErrorCode, Result, get_logger
+from .transaction_manager import rows_to_dicts
+
+logger = get_logger(__name__)
+
+
+def _ro_uri(path: str | Path) -> str:
+    return Path(path).resolve(strict=False).as_uri() + "?mode=ro"
+
+
+class ReaderPool:
+    """Lazily opened pool of read-only SQLite connections on a dedicated loop thread."""
+
+    def __init__(
+        self,
+        db_path: Path,
+        size: int,
+        *,
+        loop_thread: Any,
+        attach: dict[str, str] | None = None,
+        timeout: float = 30.0,
+        query_timeout: float = 0.0,
+        cache_size_kib: int,
+        busy_timeout_ms: int,
+    ):
+        self.db_path = Path(db_path)
+        self.size = max(1, int(size))
+        self._loop_thread = loop_thread
+        self._attach = dict(attach or {})
+        self._timeout = float(timeout)
+        self._query_timeout = float(query_timeout or 0.0)
+        self._cache_size_kib = int(cache_size_kib)
+        self._busy_timeout_ms = int(busy_timeout_ms)
+        # Only touched from the reader loop thread.
+        self._idle: list[aiosqlite.Connection] = []
+        self._open: set[aiosqlite.Connection] = set()
+        self._sem: asyncio.Semaphore | None = None
+        self._stats_lock = threading.Lock()
+        self._busy = 0
+        self._waiting = 0
+        self._queries = 0
+        self._fallbacks = 0
+        self._peak_busy = 0
+
+    # --- public API ------------------------------------------------------------
+
+    async def aquery(self, query: str, params: tuple | None = None) -> Result[list[dict[str, Any]]] | None:
+        """
+        Run a read-only query on a reader connection.
+
+        Returns ``None`` when the reader could not serve the query (schema not
+        attached, locked, malformed...) so the caller falls back to the writer.
+        """
+        fut = self._loop_thread.submit(self._query_async(query, params))
+        result = await asyncio.wrap_future(fut)
+        if result is None:
+            with self._stats_lock:
+                self._fallbacks += 1
+        return result
+
+    def status(self) -> dict[str, Any]:
+        with self._stats_lock:
+            busy = self._busy
+            return {
+                "max": self.size,
+                "open": len(self._open),
+                "busy": busy,
+                "waiting": self._waiting,
+                "peak_busy": self._peak_busy,
+                "utilization": round(busy / self.size, 3),
+                "queries": self._queries,
+                "fallbacks": self._fallbacks,
+            }
+
+    async def aclose(self) -> None:
+        """Close every reader connection and stop the reader loop (restarted on next query)."""
+        try:
+            fut = self._loop_thread.submit(self._close_all_async())
+            await asyncio.wrap_future(fut)
+        except Exception as exc:
+            logger.debug("Reader pool close failed: %s", exc)
+        self._loop_thread.stop()
+
+    # --- loop-thread internals ------------------------------------------------
+
+    async def _query_async(self, query: str, params: tuple | None) -> Result[list[dict[str, Any]]] | None:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.size)
+        with self._stats_lock:
+            self._waiting += 1
+        async with self._sem:
+            with self._stats_lock:
+                self._waiting -= 1
+                self._busy += 1
+                self._queries += 1
+                self._peak_busy = max(self._peak_busy, self._busy)
+            conn: aiosqlite.Connection | None = None
+            try:
+                conn = await self._acquire()
+                rows = await self._fetch(conn, query, params)
+            except asyncio.TimeoutError:
+                if conn is not None:
+                    await self._interrupt(conn)
+                return Result.Err(ErrorCode.TIMEOUT, "Database operation timed out")
+            except sqlite3.Error as exc:
+                logger.debug("Reader query failed, falling back to writer: %s", exc)
+                await self._discard(conn)
+                conn = None
+                return None
+            except Exception as exc:
+                logger.debug("Reader unavailable, falling back to writer: %s", exc)
+                await self._discard(conn)
+                conn = None
+                return None
+            finally:
+                if conn is not None:
+                    self._idle.append(conn)
+                with self._stats_lock:
+                    self._busy -= 1
+        return Result.Ok(rows_to_dicts(rows))
+
+    async def _fetch(self, conn: aiosqlite.Connection, query: str, params: tuple | None) -> list[Any]:
+        async def _run() -> list[Any]:
+            cursor = await conn.execute(query, params or ())
+            try:
+                return list(await cursor.fetchall())
+            finally:
+                try:
+                    await cursor.close()
+                except Exception:
+                    pass
+
+        if self._query_timeout > 0:
+            return await asyncio.wait_for(_run(), timeout=self._query_timeout)
+        return await _run()
+
+    async def _acquire(self) -> aiosqlite.Connection:
+        while self._idle:
+            conn = self._idle.pop()
+            missing = getattr(conn, "_mjr_missing_attach", ())
+            # A database attached later (e.g. vectors.sqlite) needs a fresh connection.
+            if missing and any(Path(p).exists() for p in missing):
+                await self._discard(conn)
+                continue
+            return conn
+        conn = await self._connect()
+        self._open.add(conn)
+        return conn
+
+    async def _connect(self) -> aiosqlite.Connection:
+        conn = await aiosqlite.connect(_ro_uri(self.db_path), uri=True, timeout=self._timeout, isolation_level=None)
+        try:
+            conn.row_factory = sqlite3.Row
+            await conn.execute("PRAGMA query_only=ON")
+            await conn.execute(f"PRAGMA cache_size={self._cache_size_kib}")
+            await conn.execute("PRAGMA temp_store=MEMORY")
+            await conn.execute(f"PRAGMA busy_timeout={self._busy_timeout_ms}")
+            missing: list[str] = []
+            for schema_name, attach_path in self._attach.items():
+                # Read-only attach fails on a missing file; those queries fall back instead.
+                if not Path(attach_path).exists():
+                    missing.append(str(attach_path))
+                    continue
+                await conn.execute(f"ATTACH DATABASE ? AS [{schema_name}]", (_ro_uri(attach_path),))
+            conn._mjr_missing_attach = tuple(missing)  # type: ignore[attr-defined]
+        except Exception:
+            try:
+                await conn.close()
+            except Exception:
+                pass
+            raise
+        return conn
+
+    async def _interrupt(self, conn: aiosqlite.Connection) -> None:
+        try:
+            await conn.interrupt()
+        except Exception:
+            pass
+
+    async def _discard(self, conn: aiosqlite.Connection | None) -> None:
+        if conn is None:
+            return
+        self._open.discard(conn)
+        try:
+            await conn.close()
+        except Exception:
+            pass
+
+    async def _close_all_async(self) -> None:
+        conns = list(self._open)
+        self._idle.clear()
+        self._open.clear()
+        self._sem = None
+        for conn in conns:
+            try:
+                await conn.close()
+            except Exception:
+                pass
@@ -86,13 +86,15 @@ async def run_recovery_pragma(
 
 
 async def rebuild_assets_fts(self, rec_conn: aiosqlite.Connection) -> None:
-    try:
-        await run_recovery_pragma(self, rec_conn, "INSERT INTO assets_fts(assets_fts) VALUES('rebuild')")
-    except sqlite3.OperationalError as fts_exc:
-        if not tx_is_missing_table_error(fts_exc):
-            logger.warning("FTS rebuild skipped during recovery: %s", fts_exc)
-    except Exception as fts_exc:
-        logger.warning("FTS rebuild error during recovery: %s", fts_exc)
+    # assets_name_trigram (v33) shares the assets content table.
+    for table in ("assets_fts", "assets_name_trigram"):
+        try:
+            await run_recovery_pragma(self, rec_conn, f"INSERT INTO {table}({table}) VALUES('rebuild')")
+        except sqlite3.OperationalError as fts_exc:
+            if not tx_is_missing_table_error(fts_exc):
+                logger.warning("FTS rebuild of %s skipped during recovery: %s", table, fts_exc)
+        except Exception as fts_exc:
+            logger.warning("FTS rebuild error of %s during recovery: %s", table, fts_exc)
 
 
 async def reindex_asset_metadata_fts(self, rec_conn: aiosqlite.Connection) -> None:
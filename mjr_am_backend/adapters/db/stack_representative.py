@@ -0,0 +1,67 @@
+"""
+Which member of a stack represents it in grouped listings.
+
+Members rank video with audio > video > anything else, then most recent
+``mtime``, generation data and size; the lowest id breaks remaining ties.
+The rule is written once here and rendered twice: as the SQL that fills
+``asset_stacks.rep_asset_id`` (``StacksService`` and the v30 triggers) and
+as the sort key grouped search uses when it picks representatives in memory.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def is_video_with_audio(asset: dict[str, Any]) -> bool:
+    """Videos with audio carry an ``-audio`` / ``_audio`` marker in the filename."""
+    if str(asset.get("kind") or "").strip().lower() != "video":
+        return False
+    filename = str(asset.get("filename") or "").lower()
+    return "-audio" in filename or "_audio" in filename
+
+
+def representative_key(asset: dict[str, Any]) -> tuple[int, int, int, int, int]:
+    """Sort key of a stack member; the member with the largest key represents the stack."""
+    if is_video_with_audio(asset):
+        kind_priority = 2
+    elif str(asset.get("kind") or "").strip().lower() == "video":
+        kind_priority = 1
+    else:
+        kind_priority = 0
+    return (
+        kind_priority,
+        int(asset.get("mtime") or 0),
+        1 if int(asset.get("has_generation_data") or 0) else 0,
+        int(asset.get("size") or 0),
+        -int(asset.get("id") or 0),
+    )
+
+
+# ``representative_key`` as an ORDER BY over ``assets a`` LEFT JOIN
+# ``asset_metadata m``, term for term.
+REPRESENTATIVE_ORDER_BY = """
+    CASE
+        WHEN LOWER(TRIM(COALESCE(a.kind, ''))) = 'video'
+             AND (LOWER(a.filename) LIKE '%-audio%' OR LOWER(a.filename) LIKE '%\\_audio%' ESCAPE '\\')
+            THEN 2
+        WHEN LOWER(TRIM(COALESCE(a.kind, ''))) = 'video' THEN 1
+        ELSE 0
+    END DESC,
+    CAST(COALESCE(a.mtime, 0) AS INTEGER) DESC,
+    CASE WHEN COALESCE(m.has_generation_data, 0) THEN 1 ELSE 0 END DESC,
+    COALESCE(a.size, 0) DESC,
+    a.id ASC
+"""
+
+
+def representative_sql(stack_id_expr: str) -> str:
+    """Scalar subquery selecting the representative id of stack *stack_id_expr*."""
+    return f"""
+    SELECT a.id
+    FROM assets a
+    LEFT JOIN asset_metadata m ON m.asset_id = a.id
+    WHERE a.stack_id = {stack_id_expr}
+    ORDER BY {REPRESENTATIVE_ORDER_BY}
+    LIMIT 1
+    """
@@ -17,6 +17,10 @@ _IN_QUERY_FORBIDDEN = re.compile(
     r"(--|/\*|\*/|;|\bpragma\b|\battach\b|\bdetach\b|\bvacuum\b|\balter\b|\bdrop\b|\binsert\b|\bupdate\b|\bdelete\b)",
     re.IGNORECASE,
 )
+# Data-modifying statements a leading CTE (``WITH ... DELETE``) can hide.
+_CTE_WRITE_PATTERN = re.compile(r"\b(insert|update|delete|replace)\b", re.IGNORECASE)
+# Per-connection state a separate reader connection cannot observe.
+_CONNECTION_STATE_PATTERN = re.compile(r"\b(last_insert_rowid|changes|total_changes)\s*\(", re.IGNORECASE)
 
 
 def tx_token(ctx_var: Any) -> str | None:
@@ -52,6 +56,18 @@ def is_write_sql(query: str) -> bool:
     return True
 
 
+def is_read_only_sql(query: str) -> bool:
+    """True for plain SELECT/WITH queries that a ``query_only`` reader can serve."""
+    q = str(query or "").lstrip()
+    if not q or is_write_sql(q) or _CONNECTION_STATE_PATTERN.search(q):
+        return False
+    head = q.split(None, 1)[0].upper()
+    if head == "SELECT":
+        return True
+    # Conservative: a CTE mentioning any DML keyword stays on the writer.
+    return head == "WITH" and not _CTE_WRITE_PATTERN.search(q)
+
+
 def begin_stmt_for_mode(mode: str) -> str:
     mode_l = str(mode or "").strip().lower()
     if mode_l in ("immediate", "write"):
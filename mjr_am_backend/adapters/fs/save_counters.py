@@ -0,0 +1,193 @@
+"""
+In-process ``prefix_NNNNN`` counter allocation for the Majoor save nodes.
+
+Finding the next free counter by listing the target folder costs a full
+directory read per save, which dominates save latency on output folders with
+hundreds of thousands of files (especially on network shares).  Counters are
+seeded once per (folder, prefix) and then advanced under a lock; each
+allocation reserves its file names with an exclusive create, so files written
+by other processes or nodes are stepped over instead of overwritten.
+
+Coherence with external changes (deleted or foreign files) uses the
+list-cache token from :mod:`list_cache_watcher`: when the folder's token moves,
+a rate-limited background re-listing refreshes the counter without blocking
+the save that noticed it.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from mjr_am_backend.shared import get_logger
+
+from .list_cache_watcher import ensure_fs_list_cache_watching, get_fs_list_cache_token
+
+logger = get_logger(__name__)
+
+_RESEED_MIN_INTERVAL_S = 30.0
+_MAX_RESERVE_ATTEMPTS = 64
+
+
+@dataclass
+class _Counter:
+    next: int
+    token: int
+    seeded_at: float
+    allocations: int = 0
+    refreshing: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _key(directory: str, prefix: str) -> tuple[str, str]:
+    return os.path.normcase(os.path.abspath(directory)), os.path.normcase(prefix)
+
+
+def scan_max_counter(directory: str, prefix: str) -> int:
+    """Highest ``prefix_NNNNN`` counter present in *directory* (0 when none)."""
+    matcher = re.compile(rf"{re.escape(prefix)}_(\d+)(?:\D.*)?", re.IGNORECASE)
+    highest = 0
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                m = matcher.fullmatch(entry.name)
+                if m:
+                    highest = max(highest, int(m.group(1)))
+    except FileNotFoundError:
+        pass
+    return highest
+
+
+class SaveCounterCache:
+    """Per-(directory, prefix) counters, seeded once and advanced in-process."""
+
+    def __init__(self, *, reseed_interval_s: float = _RESEED_MIN_INTERVAL_S):
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, str], _Counter] = {}
+        self._reseed_interval_s = float(reseed_interval_s)
+
+    def reserve(
+        self,
+        directory: str,
+        prefix: str,
+        names_for: Callable[[int], list[str]],
+        count: int = 1,
+    ) -> int:
+        """
+        Allocate *count* consecutive counters and exclusively create ``names_for(first)``.
+
+        The created files are empty placeholders the caller overwrites.  A name
+        that already exists moves the allocation past it.
+        """
+        count = max(1, int(count))
+        counter = self._counter(directory, prefix)
+        for round_number in range(2):
+            if round_number:
+                # Heavy foreign writes into the same prefix: resync with one full listing.
+                with counter.lock:
+                    counter.next = max(counter.next, scan_max_counter(directory, prefix) + 1)
+            for _attempt in range(_MAX_RESERVE_ATTEMPTS):
+                with counter.lock:
+                    value = counter.next
+                    counter.next += count
+                    counter.allocations += 1
+                if _create_exclusive(directory, names_for(value)):
+                    return value
+                logger.debug("Save counter %s_%05d taken in %s, advancing", prefix, value, directory)
+        raise FileExistsError(f"No free save counter for prefix {prefix!r} in {directory}")
+
+    def forget(self, directory: str | None = None) -> None:
+        with self._lock:
+            if directory is None:
+                self._counters.clear()
+                return
+            folder = _key(directory, "")[0]
+            for key in [k for k in self._counters if k[0] == folder]:
+                self._counters.pop(key, None)
+
+    def _counter(self, directory: str, prefix: str) -> _Counter:
+        key = _key(directory, prefix)
+        with self._lock:
+            counter = self._counters.get(key)
+        if counter is None:
+            return self._seed(key, directory, prefix)
+        token = get_fs_list_cache_token(directory)
+        if token != counter.token:
+            self._maybe_refresh(counter, token, directory, prefix)
+        return counter
+
+    def _seed(self, key: tuple[str, str], directory: str, prefix: str) -> _Counter:
+        ensure_fs_list_cache_watching(directory)
+        token = get_fs_list_cache_token(directory)
+        seeded = _Counter(next=scan_max_counter(directory, prefix) + 1, token=token, seeded_at=time.monotonic())
+        with self._lock:
+            # A concurrent first save may have seeded the same key meanwhile.
+            return self._counters.setdefault(key, seeded)
+
+    def _maybe_refresh(self, counter: _Counter, token: int, directory: str, prefix: str) -> None:
+        with counter.lock:
+            if counter.refreshing or time.monotonic() - counter.seeded_at < self._reseed_interval_s:
+                return
+            counter.refreshing = True
+            counter.token = token
+            start_allocations = counter.allocations
+        thread = threading.Thread(
+            target=self._refresh,
+            args=(counter, start_allocations, directory, prefix),
+            name="mjr-save-counter",
+            daemon=True,
+        )
+        thread.start()
+
+    def _refresh(self, counter: _Counter, start_allocations: int, directory: str, prefix: str) -> None:
+        try:
+            listed = scan_max_counter(directory, prefix) + 1
+        except Exception as exc:
+            logger.debug("Save counter refresh failed for %s: %s", directory, exc)
+            listed = None
+        with counter.lock:
+            if listed is not None:
+                # Follow deletions only if nothing was allocated while listing.
+                idle = counter.allocations == start_allocations
+                counter.next = listed if idle else max(counter.next, listed)
+            counter.seeded_at = time.monotonic()
+            counter.refreshing = False
+
+
+def _create_exclusive(directory: str, names: list[str]) -> bool:
+    created: list[str] = []
+    try:
+        for name in names:
+            path = os.path.join(directory, name)
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+            os.close(fd)
+            created.append(path)
+        return True
+    except FileExistsError:
+        for path in created:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        return False
+
+
+_CACHE = SaveCounterCache()
+
+
+def reserve_save_counter(
+    directory: str,
+    prefix: str,
+    names_for: Callable[[int], list[str]],
+    count: int = 1,
+) -> int:
+    """Allocate the next free ``prefix`` counter(s) in *directory* (see :class:`SaveCounterCache`)."""
+    return _CACHE.reserve(directory, prefix, names_for, count)
+
+
+def get_save_counter_cache() -> SaveCounterCache:
+    return _CACHE
@@ -7,12 +7,15 @@ import os
 import re
 import shutil
 import subprocess
+import tempfile
+import threading
 from pathlib import Path
 from typing import Any
 
-from ...config import EXIFTOOL_TIMEOUT, TOOL_LOW_PRIORITY_SUBPROCESSES
+from ...config import EXIFTOOL_POOL_SIZE, EXIFTOOL_TIMEOUT, TOOL_LOW_PRIORITY_SUBPROCESSES
 from ...shared import ErrorCode, Result, get_logger
 from ...tool_candidates import iter_exiftool_candidates
+from .exiftool_pool import ExifToolPool, ExifToolPoolUnavailable, stay_open_args
 
 logger = get_logger(__name__)
 
@@ -20,6 +23,10 @@ _TAG_SAFE_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_:-]*$")
 _EXIFTOOL_EXECUTABLE_RE = re.compile(r"^exiftool(?:\(-k\))?(?:\.exe)?$", re.IGNORECASE)
 _WINDOWS_CMDLINE_TOO_LONG = 206
 _MAX_WRITE_VALUE_CHARS = 8192
+# Printed to stderr after each ``-execute`` section of a batched write so
+# errors can be attributed to the file of that section.
+_BATCH_WRITE_MARKER = "==mjr-write-done:"
+_BATCH_WRITE_MARKER_RE = re.compile(r"==mjr-write-done:(\d+)==")
 
 
 def _low_priority_creationflags() -> int:
@@ -200,16 +207,25 @@ class ExifTool:
     Never raises exceptions - always returns Result.
     """
 
-    def __init__(self, bin_name: str = "exiftool", timeout: float | None = None):
+    def __init__(
+        self,
+        bin_name: str = "exiftool",
+        timeout: float | None = None,
+        pool_size: int | None = None,
+    ):
         """
         Initialize ExifTool adapter.
 
         Args:
             bin_name: ExifTool binary name or path
             timeout: Command timeout in seconds
+            pool_size: Stay-open workers to keep (0 = one process per call)
         """
         self.bin = bin_name
         self.timeout = float(timeout) if timeout is not None else float(EXIFTOOL_TIMEOUT)
+        self.pool_size = int(EXIFTOOL_POOL_SIZE if pool_size is None else pool_size)
+        self._pool: ExifToolPool | None = None
+        self._pool_lock = threading.Lock()
         self._available = self._check_available()
 
     def _resolve_executable(self, bin_name: str) -> str | None:
@@ -316,6 +332,64 @@ class ExifTool:
         """Check if ExifTool is available."""
         return self._ensure_available()
 
+    def _get_pool(self) -> ExifToolPool | None:
+        if self.pool_size <= 0:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ExifToolPool(
+                    [self.bin],
+                    self.pool_size,
+                    creationflags=_low_priority_creationflags(),
+                )
+            return self._pool
+
+    def _execute(
+        self,
+        cmd: list[str],
+        *,
+        timeout: float,
+        stdin_input: bytes | None = None,
+    ) -> subprocess.CompletedProcess:
+        """Run an ExifTool command line, on a stay-open worker when possible.
+
+        Falls back to a one-shot process when the pool is disabled, the
+        arguments can't be framed for ``-stay_open``, or no worker starts.
+        """
+        pool = self._get_pool() if cmd and cmd[0] == self.bin else None
+        args = stay_open_args(cmd[1:], stdin_input) if pool is not None else None
+        if pool is not None and args is not None:
+            try:
+                return pool.execute(args, timeout)
+            except ExifToolPoolUnavailable as exc:
+                logger.debug("ExifTool pool unavailable, running one-shot: %s", exc)
+        return self._run_one_shot(cmd, timeout=timeout, stdin_input=stdin_input)
+
+    @staticmethod
+    def _run_one_shot(
+        cmd: list[str],
+        *,
+        timeout: float,
+        stdin_input: bytes | None = None,
+    ) -> subprocess.CompletedProcess:
+        return subprocess.run(
+            cmd,
+            capture_output=True,
+            text=False,
+            check=False,
+            timeout=timeout,
+            input=stdin_input,
+            shell=False,
+            creationflags=_low_priority_creationflags(),
+        )
+
+    def close(self) -> None:
+        """Stop the stay-open workers (they are restarted on next use)."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+
     @staticmethod
     def _assign_result_for_paths(
         paths: list[str],
@@ -388,22 +462,13 @@ class ExifTool:
         timeout_s = self.timeout * len(cmd_paths)
         return cmd, stdin_input, timeout_s
 
-    @staticmethod
     def _run_batch_subprocess(
+        self,
         cmd: list[str],
         timeout_s: float,
         stdin_input: bytes | None,
     ) -> subprocess.CompletedProcess:
-        return subprocess.run(
-            cmd,
-            capture_output=True,
-            text=False,
-            check=False,
-            timeout=timeout_s,
-            input=stdin_input,
-            shell=False,
-            creationflags=_low_priority_creationflags(),
-        )
+        return self._execute(cmd, timeout=timeout_s, stdin_input=stdin_input)
 
     def _retry_windows_batch_file_not_found(
         self,
@@ -575,8 +640,8 @@ class ExifTool:
             return Result.Ok(tags_res.data or [])
         return Result.Err(tags_res.code, tags_res.error or "Invalid tags", **(tags_res.meta or {}))
 
-    @staticmethod
     def _run_exiftool_process(
+        self,
         cmd: list[str],
         *,
         timeout: float,
@@ -587,16 +652,7 @@ class ExifTool:
             stdin_bytes = None
         else:
             stdin_bytes = str(stdin_input).encode("utf-8", errors="replace")
-        return subprocess.run(
-            cmd,
-            capture_output=True,
-            text=False,
-            check=False,
-            timeout=timeout,
-            input=stdin_bytes,
-            shell=False,
-            creationflags=_low_priority_creationflags(),
-        )
+        return self._execute(cmd, timeout=timeout, stdin_input=stdin_bytes)
 
     def _build_single_read_command(
         self,
@@ -919,15 +975,10 @@ class ExifTool:
         return cmd, stdin_input
 
     def _run_write_command(self, cmd: list[str], stdin_input: str | None):
-        return subprocess.run(
+        return self._execute(
             cmd,
-            capture_output=True,
-            text=False,
-            check=False,
             timeout=self.timeout,
-            input=(stdin_input.encode("utf-8", errors="replace") if stdin_input is not None else None),
-            shell=False,
-            creationflags=_low_priority_creationflags(),
+            stdin_input=(stdin_input.encode("utf-8", errors="replace") if stdin_input is not None else None),
         )
 
     def _handle_write_process_result(self, process: subprocess.CompletedProcess, path: str) -> Result[bool]:
@@ -946,6 +997,114 @@ class ExifTool:
         logger.debug(f"Metadata written to {path}")
         return Result.Ok(True)
 
+    def write_batch(
+        self,
+        items: list[tuple[str, dict]],
+        preserve_workflow: bool = True,
+    ) -> dict[str, Result[bool]]:
+        """
+        Write per-file metadata for many files with a single ExifTool process.
+
+        Each file becomes one ``-execute`` section of an argument file, so the
+        interpreter starts once instead of once per file. Files that cannot be
+        framed as argument-file lines are written one by one.
+
+        Args:
+            items: ``(path, metadata)`` pairs; later pairs for a path win
+            preserve_workflow: Copy original metadata fields before writing
+
+        Returns:
+            Dict mapping each path to its write result
+        """
+        results: dict[str, Result[bool]] = {}
+        sections: list[tuple[str, list[str]]] = []
+        for path, metadata in dict(items or []).items():
+            pre = self._validate_write_preconditions(path)
+            if pre is not None:
+                results[path] = pre
+                continue
+            invalid_keys = self._invalid_write_keys(metadata)
+            if invalid_keys:
+                results[path] = Result.Err(
+                    ErrorCode.INVALID_INPUT,
+                    "Invalid ExifTool tag format",
+                    invalid_tags=invalid_keys,
+                )
+                continue
+            args = ["-tagsFromFile", "@"] if preserve_workflow else []
+            self._append_metadata_write_args(args, metadata)
+            args.extend(["-overwrite_original", str(path)])
+            if all(arg == arg.strip() and not arg.startswith("#") for arg in args):
+                sections.append((path, args))
+            else:
+                results[path] = self.write(path, metadata, preserve_workflow)
+        if sections:
+            results.update(self._run_write_batch(sections))
+        return results
+
+    def _run_write_batch(self, sections: list[tuple[str, list[str]]]) -> dict[str, Result[bool]]:
+        lines: list[str] = []
+        for index, (_path, args) in enumerate(sections):
+            if index:
+                lines.append("-execute")
+            lines.extend(args)
+            lines.extend(["-echo4", f"{_BATCH_WRITE_MARKER}{index}=="])
+        paths = [path for path, _args in sections]
+        argfile: str | None = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", suffix=".args", prefix="mjr_exif_", delete=False
+            ) as handle:
+                handle.write("\n".join(lines) + "\n")
+                argfile = handle.name
+            # ``-common_args`` re-applies the charset option to every section.
+            cmd = [self.bin, "-@", argfile, "-common_args", "-charset", "filename=utf8"]
+            process = self._run_one_shot(cmd, timeout=self.timeout * len(sections))
+            return self._parse_write_batch_output(process, paths)
+        except subprocess.TimeoutExpired:
+            logger.error(f"ExifTool batch write timeout for {len(sections)} files")
+            return {path: Result.Err(ErrorCode.TIMEOUT, "ExifTool batch write timeout") for path in paths}
+        except Exception as e:
+            logger.error(f"ExifTool batch write error: {e}")
+            return {path: Result.Err(ErrorCode.EXIFTOOL_ERROR, str(e)) for path in paths}
+        finally:
+            if argfile:
+                try:
+                    os.unlink(argfile)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _parse_write_batch_output(
+        process: subprocess.CompletedProcess,
+        paths: list[str],
+    ) -> dict[str, Result[bool]]:
+        stderr, _rep = _decode_bytes_best_effort(process.stderr)
+        chunks: dict[int, str] = {}
+        start = 0
+        for match in _BATCH_WRITE_MARKER_RE.finditer(stderr):
+            chunks[int(match.group(1))] = stderr[start : match.start()]
+            start = match.end()
+        results: dict[str, Result[bool]] = {}
+        for index, path in enumerate(paths):
+            chunk = chunks.get(index)
+            if chunk is None:
+                # No marker: the run stopped before this section finished, so
+                # the write is unconfirmed whatever the exit status says.
+                results[path] = Result.Err(
+                    ErrorCode.EXIFTOOL_ERROR,
+                    stderr[start:].strip() or "ExifTool batch write did not complete",
+                    return_code=int(process.returncode),
+                )
+                continue
+            errors = [line.strip() for line in chunk.splitlines() if line.strip().startswith("Error")]
+            if errors:
+                logger.warning(f"ExifTool write error for {path}: {errors[0]}")
+                results[path] = Result.Err(ErrorCode.EXIFTOOL_ERROR, errors[0])
+            else:
+                results[path] = Result.Ok(True)
+        return results
+
     async def aread(self, path: str, tags: list[str] | None = None) -> Result[dict[str, Any]]:
         """Async wrapper for read() executed off the event loop thread."""
         return await asyncio.to_thread(self.read, path, tags)
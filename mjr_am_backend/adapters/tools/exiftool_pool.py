@@ -0,0 +1,279 @@
+"""
+Pool of long-lived ``exiftool -stay_open True -@ -`` worker processes.
+
+Starting Perl and loading ExifTool's modules costs far more than reading the
+tags of a single image, so instead of one process per call each worker reads
+argument lines from its stdin and runs one command per ``-executeNUM``.  The
+framing is:
+
+* stdin:  one argument per line, then ``-echo4``/``{readyNUM}${status}`` and
+  ``-executeNUM``;
+* stdout: command output terminated by a ``{readyNUM}`` line;
+* stderr: warnings/errors terminated by the ``-echo4`` marker, which also
+  carries the command's exit status (ExifTool 12.10+).
+
+Results are returned as ``subprocess.CompletedProcess`` so the adapter keeps a
+single parsing path for pooled and one-shot invocations.  A worker that dies,
+times out or returns a malformed frame is killed and replaced on next use.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import itertools
+import queue
+import subprocess
+import threading
+import time
+from collections.abc import Callable
+from typing import IO
+
+from ...shared import get_logger
+
+logger = get_logger(__name__)
+
+# Recycle workers periodically so a leak in a Perl module can't grow forever.
+_MAX_REQUESTS_PER_WORKER = 2000
+# Workers idle for longer than this are pinged before being handed out.
+_PING_AFTER_IDLE_S = 300.0
+_PING_TIMEOUT_S = 5.0
+_CLOSE_TIMEOUT_S = 2.0
+
+
+class ExifToolPoolUnavailable(RuntimeError):
+    """Raised when no stay-open worker can be started; callers fall back to one-shot runs."""
+
+
+def stay_open_args(cmd_args: list[str], stdin_input: bytes | None) -> list[str] | None:
+    """Translate one-shot CLI arguments to stay-open argument lines.
+
+    One-shot calls pass file names through ``-@ -`` on Windows; in stay-open
+    mode stdin already *is* the argument file, so those names are spliced in
+    where ``-@ -`` stood.  Returns ``None`` when an argument can't be framed
+    as a line (embedded newline, or whitespace ExifTool would trim).
+    """
+    args = list(cmd_args)
+    if stdin_input is not None:
+        try:
+            at = next(i for i in range(len(args) - 1) if args[i] == "-@" and args[i + 1] == "-")
+        except StopIteration:
+            return None
+        lines = stdin_input.decode("utf-8", errors="replace").splitlines()
+        args[at : at + 2] = [line for line in lines if line]
+    for arg in args:
+        if "\n" in arg or "\r" in arg or arg != arg.strip() or arg.startswith("#"):
+            return None
+    return args
+
+
+def _pump(stream: IO[bytes], sink: queue.Queue[bytes | None]) -> None:
+    try:
+        for line in iter(stream.readline, b""):
+            sink.put(line)
+    except Exception:
+        pass
+    finally:
+        sink.put(None)
+
+
+class _Worker:
+    """One ``exiftool -stay_open`` process with line readers on stdout/stderr."""
+
+    def __init__(self, base_cmd: list[str], creationflags: int = 0):
+        self.proc = subprocess.Popen(
+            [*base_cmd, "-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            shell=False,
+            creationflags=creationflags,
+        )
+        self._stdout: queue.Queue[bytes | None] = queue.Queue()
+        self._stderr: queue.Queue[bytes | None] = queue.Queue()
+        for stream, sink in ((self.proc.stdout, self._stdout), (self.proc.stderr, self._stderr)):
+            threading.Thread(target=_pump, args=(stream, sink), daemon=True).start()
+        self._seq = itertools.count(1)
+        self.requests = 0
+        self.last_used = time.monotonic()
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def execute(self, args: list[str], timeout: float) -> subprocess.CompletedProcess:
+        seq = next(self._seq)
+        ready = f"{{ready{seq}}}".encode()
+        lines = [*args, "-echo4", f"{{ready{seq}}}${{status}}", f"-execute{seq}"]
+        payload = "".join(f"{line}\n" for line in lines).encode("utf-8", errors="replace")
+        deadline = time.monotonic() + max(0.1, float(timeout))
+        if self.proc.stdin is None:
+            raise ExifToolPoolUnavailable("ExifTool worker has no stdin")
+        try:
+            self.proc.stdin.write(payload)
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as exc:
+            raise ExifToolPoolUnavailable(f"ExifTool worker stdin closed: {exc}") from exc
+
+        stdout = self._read_until(self._stdout, lambda line: line.rstrip(b"\r\n") == ready, deadline, args)
+        stderr = self._read_until(self._stderr, lambda line: line.startswith(ready), deadline, args)
+        marker = stderr.pop().rstrip(b"\r\n")[len(ready):]
+        stdout.pop()
+        self.requests += 1
+        self.last_used = time.monotonic()
+        err = b"".join(stderr)
+        return subprocess.CompletedProcess(
+            args=args,
+            returncode=self._returncode(marker, err),
+            stdout=b"".join(stdout),
+            stderr=err,
+        )
+
+    def _read_until(
+        self,
+        sink: queue.Queue[bytes | None],
+        is_end: Callable[[bytes], bool],
+        deadline: float,
+        args: list[str],
+    ) -> list[bytes]:
+        out: list[bytes] = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(cmd=args, timeout=0)
+            try:
+                line = sink.get(timeout=remaining)
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(cmd=args, timeout=0) from None
+            if line is None:
+                raise ExifToolPoolUnavailable("ExifTool worker exited mid-request")
+            out.append(line)
+            if is_end(line):
+                return out
+
+    @staticmethod
+    def _returncode(marker: bytes, stderr: bytes) -> int:
+        text = marker.strip()
+        if text.isdigit():
+            return int(text)
+        # ExifTool < 12.10 echoes "${status}" verbatim; infer from stderr.
+        return 1 if b"Error" in stderr else 0
+
+    def close(self) -> None:
+        with contextlib.suppress(Exception):
+            if self.alive() and self.proc.stdin is not None:
+                self.proc.stdin.write(b"-stay_open\nFalse\n")
+                self.proc.stdin.flush()
+                self.proc.wait(timeout=_CLOSE_TIMEOUT_S)
+        self.kill()
+
+    def kill(self) -> None:
+        with contextlib.suppress(Exception):
+            if self.alive():
+                self.proc.kill()
+                self.proc.wait(timeout=_CLOSE_TIMEOUT_S)
+        for stream in (self.proc.stdin, self.proc.stdout, self.proc.stderr):
+            with contextlib.suppress(Exception):
+                if stream is not None:
+                    stream.close()
+
+
+class ExifToolPool:
+    """Bounded set of stay-open workers, created lazily and shared across threads."""
+
+    def __init__(self, base_cmd: list[str], size: int, *, creationflags: int = 0):
+        self.base_cmd = list(base_cmd)
+        self.size = max(1, int(size))
+        self._creationflags = creationflags
+        self._idle: queue.LifoQueue[_Worker] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._count = 0
+        self._closed = False
+        atexit.register(self.close)
+
+    @property
+    def worker_count(self) -> int:
+        return self._count
+
+    def execute(self, args: list[str], timeout: float) -> subprocess.CompletedProcess:
+        """Run one command on a pooled worker.
+
+        Raises ``subprocess.TimeoutExpired`` (the hung worker is killed) or
+        ``ExifToolPoolUnavailable`` when no worker could serve the request.
+        """
+        worker = self._acquire(timeout)
+        healthy = False
+        try:
+            result = worker.execute(args, timeout)
+            healthy = True
+            return result
+        finally:
+            self._release(worker, healthy=healthy)
+
+    def _acquire(self, timeout: float) -> _Worker:
+        deadline = time.monotonic() + max(0.1, float(timeout))
+        while True:
+            if self._closed:
+                raise ExifToolPoolUnavailable("ExifTool pool is closed")
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                worker = self._spawn_or_wait(deadline)
+            if self._healthy(worker):
+                return worker
+            self._discard(worker)
+
+    def _spawn_or_wait(self, deadline: float) -> _Worker:
+        with self._lock:
+            can_spawn = self._count < self.size
+            if can_spawn:
+                self._count += 1
+        if can_spawn:
+            try:
+                return _Worker(self.base_cmd, self._creationflags)
+            except Exception as exc:
+                with self._lock:
+                    self._count -= 1
+                raise ExifToolPoolUnavailable(f"Failed to start ExifTool worker: {exc}") from exc
+        try:
+            return self._idle.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            raise subprocess.TimeoutExpired(cmd="exiftool (pool)", timeout=0) from None
+
+    @staticmethod
+    def _healthy(worker: _Worker) -> bool:
+        if not worker.alive():
+            return False
+        if time.monotonic() - worker.last_used < _PING_AFTER_IDLE_S:
+            return True
+        try:
+            return worker.execute(["-ver"], _PING_TIMEOUT_S).returncode == 0
+        except Exception:
+            return False
+
+    def _release(self, worker: _Worker, *, healthy: bool) -> None:
+        if healthy and not self._closed and worker.alive() and worker.requests < _MAX_REQUESTS_PER_WORKER:
+            self._idle.put(worker)
+            return
+        if not healthy:
+            logger.warning("Restarting unresponsive ExifTool worker (pid %s)", worker.proc.pid)
+        self._discard(worker, graceful=healthy)
+
+    def _discard(self, worker: _Worker, *, graceful: bool = False) -> None:
+        if graceful:
+            worker.close()
+        else:
+            worker.kill()
+        with self._lock:
+            self._count = max(0, self._count - 1)
+
+    def close(self) -> None:
+        """Stop every idle worker; busy ones are stopped when released."""
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(worker, graceful=True)
+        with contextlib.suppress(Exception):
+            atexit.unregister(self.close)
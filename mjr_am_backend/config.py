@@ -434,6 +434,8 @@ MEDIA_PROBE_BACKEND = str(_env_raw("MJR_AM_MEDIA_PROBE_BACKEND", "MAJOOR_MEDIA_P
 # Tool timeouts.
 # 15s/10s are conservative defaults that keep UI responsive while allowing slow media probes.
 EXIFTOOL_TIMEOUT = _env_int(15, "MJR_AM_EXIFTOOL_TIMEOUT", "MAJOOR_EXIFTOOL_TIMEOUT", min_value=1, max_value=120)
+# Long-lived `exiftool -stay_open` workers shared by reads and writes (0 = one process per call).
+EXIFTOOL_POOL_SIZE = _env_int(2, "MJR_AM_EXIFTOOL_POOL_SIZE", "MAJOOR_EXIFTOOL_POOL_SIZE", min_value=0, max_value=16)
 FFPROBE_TIMEOUT = _env_int(10, "MJR_AM_FFPROBE_TIMEOUT", "MAJOOR_FFPROBE_TIMEOUT", min_value=1, max_value=120)
 TOOL_LOW_PRIORITY_SUBPROCESSES = _env_bool(
     True,
@@ -445,6 +447,8 @@ TOOL_LOW_PRIORITY_SUBPROCESSES = _env_bool(
 # 2 MiB default metadata JSON cap limits DB bloat from oversized embedded metadata blobs.
 DB_TIMEOUT = _env_float(10.0, "MJR_AM_DB_TIMEOUT", "MAJOOR_DB_TIMEOUT", min_value=1.0, max_value=300.0)
 DB_MAX_CONNECTIONS = _env_int(8, "MJR_AM_DB_MAX_CONNECTIONS", "MAJOOR_DB_MAX_CONNECTIONS", min_value=1, max_value=64)
+# Read-only WAL connections that serve SELECTs outside transactions (0 = share the writer pool).
+DB_READ_CONNECTIONS = _env_int(4, "MJR_AM_DB_READ_CONNECTIONS", "MAJOOR_DB_READ_CONNECTIONS", min_value=0, max_value=32)
 DB_QUERY_TIMEOUT = _env_float(60.0, "MJR_AM_DB_QUERY_TIMEOUT", "MAJOOR_DB_QUERY_TIMEOUT", min_value=1.0, max_value=600.0)
 TO_THREAD_TIMEOUT_S = _env_float(30.0, "MJR_AM_TO_THREAD_TIMEOUT", "MAJOOR_TO_THREAD_TIMEOUT", min_value=1.0, max_value=300.0)
 EXECUTION_IDLE_GRACE_SECONDS = _env_float(
@@ -459,11 +463,48 @@ METADATA_CACHE_MAX = _env_int(100_000, "MJR_AM_METADATA_CACHE_MAX", "MAJOOR_META
 METADATA_CACHE_TTL_SECONDS = _env_float(90.0 * 24.0 * 3600.0, "MJR_AM_METADATA_CACHE_TTL_SECONDS", "MAJOOR_METADATA_CACHE_TTL_SECONDS", min_value=60.0, max_value=3650.0 * 24.0 * 3600.0)
 METADATA_CACHE_CLEANUP_INTERVAL_SECONDS = _env_float(300.0, "MJR_AM_METADATA_CACHE_CLEANUP_INTERVAL_SECONDS", "MAJOOR_METADATA_CACHE_CLEANUP_INTERVAL_SECONDS", min_value=5.0, max_value=3600.0)
 METADATA_EXTRACT_CONCURRENCY = _env_int(1, "MJR_AM_METADATA_EXTRACT_CONCURRENCY", "MAJOOR_METADATA_EXTRACT_CONCURRENCY", min_value=1, max_value=16)
+# Read PNG/WebP/MP4 metadata in-process and only call ExifTool when generation data or dimensions are missing.
+METADATA_NATIVE_READER = _env_bool(True, "MJR_AM_METADATA_NATIVE_READER", "MAJOOR_METADATA_NATIVE_READER")
+
+# Parsed geninfo cache keyed by prompt/workflow hash: in-memory LRU entries and persisted rows (0 disables either tier).
+GENINFO_CACHE_SIZE = _env_int(512, "MJR_AM_GENINFO_CACHE_SIZE", "MAJOOR_GENINFO_CACHE_SIZE", min_value=0, max_value=100_000)
+GENINFO_CACHE_PERSIST_MAX = _env_int(50_000, "MJR_AM_GENINFO_CACHE_PERSIST_MAX", "MAJOOR_GENINFO_CACHE_PERSIST_MAX", min_value=0, max_value=5_000_000)
 
 # Max number of newly-added asset IDs pushed as mjr-asset-added events in one index_paths call.
 # Increase via MAJOOR_BATCH_ASSET_PUSH_LIMIT for large batch workflows (NL-4).
 BATCH_ASSET_PUSH_LIMIT = _env_int(50, "MAJOOR_BATCH_ASSET_PUSH_LIMIT", min_value=1, max_value=500)
 
+# Asset websocket updates are coalesced per client over this window and sent as
+# one mjr.asset.batch frame (0 = send every event immediately).
+EVENT_BATCH_WINDOW_MS = _env_int(150, "MJR_AM_EVENT_BATCH_MS", min_value=0, max_value=5000)
+# Items per batch frame, and pending items kept per client before they are dropped
+# (the client is told how many were dropped and reloads its grid instead).
+EVENT_BATCH_MAX_ITEMS = _env_int(200, "MJR_AM_EVENT_BATCH_MAX_ITEMS", min_value=1, max_value=5000)
+EVENT_BATCH_MAX_PENDING = _env_int(2000, "MJR_AM_EVENT_BATCH_MAX_PENDING", min_value=1, max_value=100_000)
+# A client whose socket has more than this many unsent bytes gets no new frames
+# until it drains; PromptServer's shared queue is held to the message count.
+EVENT_BATCH_CLIENT_HIGH_WATER_BYTES = _env_int(
+    1024 * 1024, "MJR_AM_EVENT_BATCH_CLIENT_HIGH_WATER_BYTES", min_value=1024, max_value=256 * 1024 * 1024
+)
+EVENT_BATCH_QUEUE_HIGH_WATER = _env_int(500, "MJR_AM_EVENT_BATCH_QUEUE_HIGH_WATER", min_value=1, max_value=1_000_000)
+
+# Threads that pre-generate grid thumbnails for newly indexed assets (0 = render on request only).
+THUMB_PREGEN_WORKERS = _env_int(
+    max(1, min(8, os.cpu_count() or 1)),
+    "MJR_AM_THUMB_WORKERS",
+    "MAJOOR_THUMB_WORKERS",
+    min_value=0,
+    max_value=32,
+)
+
+# Threads hashing files during duplicate analysis (0 = Python's shared default executor).
+DUPLICATES_HASH_WORKERS = _env_int(
+    max(1, min(4, (os.cpu_count() or 2) - 1)), "MJR_AM_DUP_HASH_WORKERS", min_value=0, max_value=32
+)
+
+# Threads re-deriving geninfo from stored metadata after a parser change (0 = one shared thread).
+METADATA_BACKFILL_WORKERS = _env_int(2, "MJR_AM_METADATA_BACKFILL_WORKERS", min_value=0, max_value=32)
+
 # Index dedupe (avoid double-indexing bursts from multiple event sources).
 # 2s window catches duplicate watcher + scan events for the same file update burst.
 INDEX_DEDUPE_TTL_SECONDS = _env_float(2.0, "MJR_AM_INDEX_DEDUPE_TTL_SECONDS", "MAJOOR_INDEX_DEDUPE_TTL_SECONDS", min_value=0.1, max_value=60.0)
@@ -775,9 +816,15 @@ VECTOR_SIMILAR_MIN_SCORE = _env_float(
     max_value=1.0,
 )
 
-# Number of threads used by Faiss for search (0 = automatic).
+# IVF cells probed per Faiss query (0 = built-in default).
 VECTOR_FAISS_NPROBE = _env_int(0, "MJR_AM_VECTOR_FAISS_NPROBE", min_value=0, max_value=128)
 
+# Memory budget for the in-memory Faiss index. Libraries whose full float32
+# vectors exceed it switch to a product-quantized IVF index (exact re-rank).
+VECTOR_INDEX_RAM_BUDGET_MB = _env_int(
+    1024, "MJR_AM_VECTOR_INDEX_RAM_MB", min_value=64, max_value=65_536
+)
+
 # Video key-frame extraction interval in seconds.
 VECTOR_VIDEO_KEYFRAME_INTERVAL = _env_float(
     5.0,
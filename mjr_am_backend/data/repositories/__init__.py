@@ -12,7 +12,20 @@ rules, validation, and orchestration belong in service classes.
 
 from __future__ import annotations
 
+from .asset_counters_repository import AssetCountersRepository, CounterScope, counter_scopes_for
 from .base import Repository
+from .metadata_keys_repository import KeyPair, MetadataKeysRepository, key_set_signature
+from .search_terms_repository import SearchTermsRepository
 from .tags_repository import TagsRepository
 
-__all__ = ["Repository", "TagsRepository"]
+__all__ = [
+    "AssetCountersRepository",
+    "CounterScope",
+    "KeyPair",
+    "MetadataKeysRepository",
+    "Repository",
+    "SearchTermsRepository",
+    "TagsRepository",
+    "counter_scopes_for",
+    "key_set_signature",
+]
@@ -0,0 +1,99 @@
+"""Repository for the trigger-maintained ``asset_counters`` table (v31+).
+
+Buckets are keyed by ``(source, root_id, kind, day)`` and kept current by
+SQLite triggers on ``assets`` and ``asset_metadata``, so reads cost the same
+whatever the library size. A *scope* selects buckets by indexed source:
+``("output", None)`` matches every output bucket, ``("custom", "abc")`` only
+the buckets of custom root ``abc``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from ...shared import Result
+from .base import Repository
+
+CounterScope = tuple[str, str | None]
+
+_SCOPE_SOURCES = {"output": ("output",), "input": ("input",), "all": ("output", "input")}
+
+
+def counter_scopes_for(scope: str, root_id: str | None = None) -> list[CounterScope] | None:
+    """Map a UI scope name to counter scopes (``None`` when it has no mapping)."""
+    name = str(scope or "").strip().lower()
+    if name == "custom":
+        rid = str(root_id or "").strip()
+        return [("custom", rid)] if rid else None
+    sources = _SCOPE_SOURCES.get(name)
+    if sources is None:
+        return None
+    return [(source, None) for source in sources]
+
+
+def _scope_where(scopes: Sequence[CounterScope]) -> tuple[str, list[str]]:
+    clauses: list[str] = []
+    params: list[str] = []
+    for source, root_id in scopes:
+        if root_id is None:
+            clauses.append("source = ?")
+            params.append(str(source).lower())
+        else:
+            clauses.append("(source = ? AND root_id = ?)")
+            params.extend([str(source).lower(), str(root_id)])
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+class AssetCountersRepository(Repository):
+    """Read access to the pre-aggregated asset counters."""
+
+    async def totals(self, scopes: Sequence[CounterScope]) -> Result[dict]:
+        """Return ``total``, ``by_kind``, ``rated``, ``with_workflow`` and ``with_generation_data``."""
+        if not scopes:
+            return Result.Err("INVALID_INPUT", "At least one counter scope is required")
+        where_sql, params = _scope_where(scopes)
+        res = await self._db.aquery(
+            f"""
+            SELECT kind, SUM(total) AS total, SUM(rated) AS rated,
+                   SUM(with_workflow) AS with_workflow, SUM(with_generation) AS with_generation
+            FROM asset_counters
+            WHERE {where_sql}
+            GROUP BY kind
+            """,
+            tuple(params),
+        )
+        if not res.ok:
+            return Result.Err(res.code, res.error or "Counter query failed")
+        by_kind: dict[str, int] = {}
+        totals = {"total": 0, "rated": 0, "with_workflow": 0, "with_generation_data": 0}
+        for row in res.data or []:
+            count = max(0, int(row.get("total") or 0))
+            if count:
+                by_kind[str(row.get("kind") or "")] = count
+            totals["total"] += count
+            totals["rated"] += max(0, int(row.get("rated") or 0))
+            totals["with_workflow"] += max(0, int(row.get("with_workflow") or 0))
+            totals["with_generation_data"] += max(0, int(row.get("with_generation") or 0))
+        return Result.Ok({**totals, "by_kind": by_kind})
+
+    async def day_histogram(
+        self,
+        scopes: Sequence[CounterScope],
+        start_day: str,
+        end_day: str,
+        *,
+        kind: str | None = None,
+    ) -> Result[dict[str, int]]:
+        """Return ``{day: count}`` for UTC days in ``[start_day, end_day)`` (``YYYY-MM-DD``)."""
+        if not scopes:
+            return Result.Err("INVALID_INPUT", "At least one counter scope is required")
+        where_sql, params = _scope_where(scopes)
+        sql = f"SELECT day, SUM(total) AS count FROM asset_counters WHERE {where_sql} AND day >= ? AND day < ?"
+        params.extend([start_day, end_day])
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        res = await self._db.aquery(sql + " GROUP BY day HAVING SUM(total) > 0 ORDER BY day ASC", tuple(params))
+        if not res.ok:
+            return Result.Err(res.code, res.error or "Histogram query failed")
+        return Result.Ok({str(row["day"]): int(row["count"]) for row in res.data or [] if row.get("day")})
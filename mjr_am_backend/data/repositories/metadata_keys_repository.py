@@ -0,0 +1,165 @@
+"""Repository for the incrementally maintained metadata key catalog (v32+).
+
+Every distinct combination of metadata keys is stored once in
+``metadata_key_sets`` and each asset points at its set through
+``asset_key_sets``. Triggers on ``asset_key_sets`` keep
+``metadata_keys.occurrences`` equal to the number of assets whose metadata
+carries the key, so reading the catalog never parses ``metadata_raw``.
+
+A key is a ``(node_type, path)`` pair: ``node_type`` is ``''`` for dotted
+metadata paths, otherwise a workflow node type with one of its parameter
+names (``''`` for the node type itself).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Iterable, Sequence
+
+from ...shared import Result
+from .base import Repository
+
+KeyPair = tuple[str, str]
+
+
+def key_set_signature(pairs: Iterable[KeyPair]) -> str:
+    """Stable digest of a key set, independent of iteration order."""
+    canonical = "\n".join(f"{node_type}\x1f{path}" for node_type, path in sorted(set(pairs)))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MetadataKeysRepository(Repository):
+    """Read and assign metadata key sets."""
+
+    async def current_signature(self, asset_id: int) -> Result[str | None]:
+        res = await self._db.aquery(
+            "SELECT s.signature FROM asset_key_sets k JOIN metadata_key_sets s ON s.id = k.set_id WHERE k.asset_id = ?",
+            (int(asset_id),),
+        )
+        if not res.ok:
+            return Result.Err(res.code, res.error or "Key set lookup failed")
+        return Result.Ok(str(res.data[0]["signature"]) if res.data else None)
+
+    async def ensure_key_set(self, pairs: Iterable[KeyPair], signature: str | None = None) -> Result[int]:
+        """Return the id of the set holding exactly *pairs*, creating it if needed."""
+        unique = sorted(set(pairs))
+        signature = signature or key_set_signature(unique)
+        existing = await self._set_id(signature)
+        if not existing.ok:
+            return Result.Err(existing.code, existing.error or "Key set lookup failed")
+        if existing.data is not None:
+            return Result.Ok(existing.data)
+        res = await self._db.aexecutemany(
+            "INSERT OR IGNORE INTO metadata_keys (node_type, path) VALUES (?, ?)",
+            [(node_type, path) for node_type, path in unique],
+        )
+        if not res.ok:
+            return Result.Err(res.code, res.error or "Key insert failed")
+        res = await self._db.aexecute(
+            """
+            INSERT OR IGNORE INTO metadata_key_sets (signature, key_ids)
+            SELECT ?, json_group_array(k.id)
+            FROM json_each(?) j
+            JOIN metadata_keys k
+              ON k.node_type = json_extract(j.value, '$[0]') AND k.path = json_extract(j.value, '$[1]')
+            """,
+            (signature, json.dumps(unique, ensure_ascii=False)),
+        )
+        if not res.ok:
+            return Result.Err(res.code, res.error or "Key set insert failed")
+        created = await self._set_id(signature)
+        if not created.ok:
+            return Result.Err(created.code, created.error or "Key set lookup failed")
+        if created.data is None:
+            return Result.Err("NOT_FOUND", "Key set was not created")
+        return Result.Ok(created.data)
+
+    async def assign(self, asset_id: int, set_id: int) -> Result[bool]:
+        return await self.assign_many([(asset_id, set_id)])
+
+    async def assign_many(self, assignments: Sequence[tuple[int, int]]) -> Result[bool]:
+        """Point each asset at a key set; occurrence counts follow via triggers."""
+        if not assignments:
+            return Result.Ok(True)
+        res = await self._db.aexecutemany(
+            "INSERT INTO asset_key_sets (asset_id, set_id) VALUES (?, ?) "
+            "ON CONFLICT(asset_id) DO UPDATE SET set_id = excluded.set_id",
+            [(int(asset_id), int(set_id)) for asset_id, set_id in assignments],
+        )
+        if not res.ok:
+            return Result.Err(res.code, res.error or "Key set assignment failed")
+        return Result.Ok(True)
+
+    async def clear(self, asset_id: int) -> Result[bool]:
+        res = await self._db.aexecute("DELETE FROM asset_key_sets WHERE asset_id = ?", (int(asset_id),))
+        if not res.ok:
+            return Result.Err(res.code, res.error or "Key set removal failed")
+        return Result.Ok(True)
+
+    async def catalog(self, max_keys: int | None = None, max_node_types: int | None = None) -> Result[dict]:
+        """Return the most common keys and workflow node types.
+
+        ``keys`` maps dotted paths to their asset count, ``key_last_seen`` to
+        the epoch second they were last assigned, and ``workflow_nodes`` maps
+        node types to ``{param: count}``. Both are ranked by occurrences and
+        capped at *max_keys* / *max_node_types*; ``truncated`` tells whether
+        either cap dropped entries.
+        """
+        key_rows = await self._ranked(
+            "SELECT path, occurrences, last_seen FROM metadata_keys "
+            "WHERE node_type = '' AND occurrences > 0 ORDER BY occurrences DESC, path LIMIT ?",
+            max_keys,
+        )
+        if not key_rows.ok:
+            return Result.Err(key_rows.code, key_rows.error or "Key catalog query failed")
+        type_rows = await self._ranked(
+            "SELECT node_type FROM metadata_keys "
+            "WHERE node_type != '' AND path = '' AND occurrences > 0 ORDER BY occurrences DESC, node_type LIMIT ?",
+            max_node_types,
+        )
+        if not type_rows.ok:
+            return Result.Err(type_rows.code, type_rows.error or "Key catalog query failed")
+        keys, keys_truncated = key_rows.data or ([], False)
+        types, types_truncated = type_rows.data or ([], False)
+        node_types = [str(row["node_type"]) for row in types]
+        params_res = await self._db.aquery(
+            "SELECT node_type, path, occurrences FROM metadata_keys "
+            "WHERE node_type IN (SELECT value FROM json_each(?)) AND path != '' AND occurrences > 0",
+            (json.dumps(node_types, ensure_ascii=False),),
+        )
+        if not params_res.ok:
+            return Result.Err(params_res.code, params_res.error or "Key catalog query failed")
+        total = await self._db.aquery("SELECT COALESCE(SUM(asset_count), 0) AS assets FROM metadata_key_sets")
+        if not total.ok:
+            return Result.Err(total.code, total.error or "Key catalog query failed")
+        nodes: dict[str, dict[str, int]] = {node_type: {} for node_type in node_types}
+        for row in params_res.data or []:
+            nodes[str(row["node_type"])][str(row["path"])] = int(row["occurrences"])
+        return Result.Ok(
+            {
+                "assets": int(total.data[0]["assets"] or 0) if total.data else 0,
+                "keys": {str(row["path"]): int(row["occurrences"]) for row in keys},
+                "key_last_seen": {str(row["path"]): int(row["last_seen"] or 0) for row in keys},
+                "workflow_nodes": nodes,
+                "truncated": keys_truncated or types_truncated,
+            }
+        )
+
+    async def _ranked(self, sql: str, limit: int | None) -> Result[tuple[list[dict], bool]]:
+        """Run a ranked ``LIMIT ?`` query; also report whether *limit* dropped rows."""
+        capped = limit is not None
+        cap = max(0, int(limit)) if limit is not None else -1
+        res = await self._db.aquery(sql, (cap + 1 if capped else -1,))
+        if not res.ok:
+            return Result.Err(res.code, res.error or "Key catalog query failed")
+        rows = list(res.data or [])
+        if capped and len(rows) > cap:
+            return Result.Ok((rows[:cap], True))
+        return Result.Ok((rows, False))
+
+    async def _set_id(self, signature: str) -> Result[int | None]:
+        res = await self._db.aquery("SELECT id FROM metadata_key_sets WHERE signature = ?", (signature,))
+        if not res.ok:
+            return Result.Err(res.code, res.error or "Key set lookup failed")
+        return Result.Ok(int(res.data[0]["id"]) if res.data else None)
@@ -0,0 +1,127 @@
+"""Repository for the materialized autocomplete vocabulary (v33+).
+
+``search_terms`` holds every ``asset_metadata_fts`` term with its document
+frequency, keyed by term so a prefix lookup is a B-tree range scan instead
+of a walk over the ``fts5vocab`` table. Triggers on ``asset_metadata`` and
+``asset_tags`` flag the table dirty when indexed text changes;
+:meth:`SearchTermsRepository.refresh` re-materializes it from
+``asset_metadata_vocab`` page by page, only touching rows whose frequency
+changed.
+"""
+
+from __future__ import annotations
+
+import time
+
+from ...shared import Result
+from .base import Repository
+
+# Longer tokens are hashes, seeds and base64 noise, never typed prefixes.
+_MAX_TERM_LENGTH = 64
+# Vocabulary rows diffed and written per transaction during a refresh.
+_REFRESH_PAGE_SIZE = 2000
+# Sorts after every character the FTS tokenizer can emit.
+_PREFIX_UPPER_BOUND = "\U0010ffff"
+
+
+class SearchTermsRepository(Repository):
+    """Prefix lookups and refreshes of the ``search_terms`` table."""
+
+    async def suggest(self, prefix: str, limit: int = 10) -> Result[list[str]]:
+        """Return up to *limit* terms starting with *prefix*, most frequent first."""
+        low = str(prefix or "").lower()
+        if not low:
+            return Result.Ok([])
+        res = await self._db.aquery(
+            "SELECT term FROM search_terms WHERE term >= ? AND term < ? ORDER BY doc DESC, term LIMIT ?",
+            (low, low + _PREFIX_UPPER_BOUND, max(1, int(limit))),
+        )
+        if not res.ok:
+            return Result.Err(res.code, res.error or "Search term lookup failed")
+        return Result.Ok([str(row["term"]) for row in res.data or []])
+
+    async def needs_refresh(self, min_age_s: float = 0.0) -> Result[bool]:
+        """True when the terms are dirty and were last refreshed over *min_age_s* ago."""
+        res = await self._db.aquery("SELECT dirty, refreshed_at FROM search_terms_state WHERE id = 1")
+        if not res.ok:
+            return Result.Err(res.code, res.error or "Search term state lookup failed")
+        row = (res.data or [{}])[0]
+        if not int(row.get("dirty") or 0):
+            return Result.Ok(False)
+        return Result.Ok(time.time() - float(row.get("refreshed_at") or 0.0) >= float(min_age_s))
+
+    async def refresh(self) -> Result[int]:
+        """Re-materialize the terms from ``asset_metadata_vocab``; returns the term count.
+
+        The vocabulary is walked in term order one page at a time, outside any
+        write transaction, and each page's differences are applied in a short
+        transaction of its own. The dirty flag is cleared first, so text
+        indexed during the walk flags the terms again.
+        """
+        res = await self._db.aexecute(
+            "UPDATE search_terms_state SET dirty = 0, refreshed_at = ? WHERE id = 1", (time.time(),)
+        )
+        if not res.ok:
+            return Result.Err(res.code, res.error or "Search term state update failed")
+        after = ""
+        while True:
+            page = await self._db.aquery(
+                "SELECT term, doc FROM asset_metadata_vocab WHERE term > ? ORDER BY term LIMIT ?",
+                (after, _REFRESH_PAGE_SIZE),
+            )
+            if not page.ok:
+                return Result.Err(page.code, page.error or "Search term vocabulary read failed")
+            rows = page.data or []
+            upper = str(rows[-1]["term"]) if len(rows) >= _REFRESH_PAGE_SIZE else None
+            vocab = {
+                str(row["term"]): int(row["doc"] or 0)
+                for row in rows
+                if 2 <= len(str(row["term"])) <= _MAX_TERM_LENGTH
+            }
+            applied = await self._apply_page(after, upper, vocab)
+            if not applied.ok:
+                return Result.Err(applied.code, applied.error or "Search term refresh failed")
+            if upper is None:
+                break
+            after = upper
+        count = await self._db.aquery("SELECT COUNT(*) AS n FROM search_terms")
+        if not count.ok:
+            return Result.Err(count.code, count.error or "Search term count failed")
+        return Result.Ok(int((count.data or [{}])[0].get("n") or 0))
+
+    async def _apply_page(self, after: str, upper: str | None, vocab: dict[str, int]) -> Result[bool]:
+        """Sync ``search_terms`` rows in ``(after, upper]`` with one vocabulary page."""
+        if upper is None:
+            current = await self._db.aquery("SELECT term, doc FROM search_terms WHERE term > ?", (after,))
+        else:
+            current = await self._db.aquery(
+                "SELECT term, doc FROM search_terms WHERE term > ? AND term <= ?", (after, upper)
+            )
+        if not current.ok:
+            return Result.Err(current.code, current.error or "Search term read failed")
+        stored = {str(row["term"]): int(row["doc"] or 0) for row in current.data or []}
+        stale = [(term,) for term in stored if term not in vocab]
+        changed = [(term, doc) for term, doc in vocab.items() if stored.get(term) != doc]
+        if not stale and not changed:
+            return Result.Ok(False)
+        try:
+            async with self._db.atransaction(mode="immediate") as tx:
+                if not tx.ok:
+                    return Result.Err("DB_ERROR", tx.error or "Failed to begin search term refresh")
+                if stale:
+                    res = await self._db.aexecutemany("DELETE FROM search_terms WHERE term = ?", stale)
+                    if not res.ok:
+                        raise RuntimeError(res.error or "Search term refresh failed")
+                if changed:
+                    res = await self._db.aexecutemany(
+                        "INSERT INTO search_terms (term, doc) VALUES (?, ?) "
+                        "ON CONFLICT(term) DO UPDATE SET doc = excluded.doc",
+                        changed,
+                    )
+                    if not res.ok:
+                        raise RuntimeError(res.error or "Search term refresh failed")
+        except RuntimeError as exc:
+            return Result.Err("DB_ERROR", str(exc))
+        if not tx.ok:
+            return Result.Err("DB_ERROR", tx.error or "Failed to commit search term refresh")
+        return Result.Ok(True)
@@ -200,7 +200,7 @@ async def _record_tag_drift_bootstrap_counter(db: Sqlite) -> None:
 
 def _attach_rating_tags_sync_worker(services: dict, exiftool: ExifTool) -> None:
     try:
-        services["rating_tags_sync"] = RatingTagsSyncWorker(exiftool)
+        services["rating_tags_sync"] = RatingTagsSyncWorker(exiftool, services.get("db"))
     except Exception as exc:
         logger.debug("RatingTagsSyncWorker disabled: %s", exc)
 
@@ -259,6 +259,7 @@ async def build_services(db_path: str | None = None) -> Result[dict]:
         exiftool=exiftool,
         ffprobe=ffprobe,
         settings=settings_service,
+        db=db,
     )
 
     health_service = HealthService(
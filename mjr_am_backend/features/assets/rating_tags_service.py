@@ -104,7 +104,11 @@ async def enqueue_rating_tags_sync(
     rating, tags = await fetch_asset_rating_tags(db, asset_id)
 
     try:
-        worker.enqueue(filepath, rating, tags, mode)
+        aenqueue = getattr(worker, "aenqueue", None)
+        if callable(aenqueue):
+            await aenqueue(filepath, rating, tags, mode)
+        else:
+            worker.enqueue(filepath, rating, tags, mode)
     except Exception as exc:
         logger.debug("Failed to enqueue rating/tags sync for asset_id=%s: %s", asset_id, exc)
 
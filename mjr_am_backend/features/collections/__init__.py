@@ -1,4 +1,7 @@
-from .service import CollectionsService
-
-__all__ = ["CollectionsService"]
+from .service import (
+    CollectionsService,
+    export_collections_to_legacy_dir,
+    import_collections_from_legacy_dir,
+)
 
+__all__ = ["CollectionsService", "export_collections_to_legacy_dir", "import_collections_from_legacy_dir"]
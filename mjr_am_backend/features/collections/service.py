@@ -1,24 +1,28 @@
 """
 Collections service - persistent user-curated sets of assets.
 
-Collections are stored as JSON files under `config.COLLECTIONS_DIR`.
+Collections live in the index DB (``collections`` / ``collection_items``,
+migration v28). Collections written by older versions as JSON files under
+`config.COLLECTIONS_DIR` are imported the first time each user's
+collections are accessed; imported files are renamed to ``*.json.migrated``.
 """
 
 from __future__ import annotations
 
+import asyncio
 import builtins
 import hashlib
 import json
 import os
 import re
 import tempfile
-import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
+from ...adapters.db.sqlite import Sqlite
 from ...config import COLLECTIONS_DIR_PATH
 from ...shared import ErrorCode, Result, classify_file, get_logger
 
@@ -41,6 +45,12 @@ except Exception:
     _MAX_COLLECTION_ITEMS = _DEFAULT_MAX_ITEMS
 _MAX_COLLECTION_ITEMS = max(MIN_COLLECTION_ITEMS, min(HARD_MAX_COLLECTION_ITEMS, int(_MAX_COLLECTION_ITEMS or _DEFAULT_MAX_ITEMS)))
 
+DEFAULT_ITEMS_PAGE_LIMIT = 500
+MAX_ITEMS_PAGE_LIMIT = 5000
+# Stay well under SQLite's bound-parameter limit for IN (...) lists.
+_IN_CHUNK = 500
+_LEGACY_MIGRATED_SUFFIX = ".migrated"
+
 
 def _now_iso() -> str:
     try:
@@ -124,22 +134,26 @@ def collections_base_dir_for_user(
     return base / "users" / segment
 
 
-def _collection_path_for_base(collection_id: str, base_dir: str | Path) -> Path | None:
-    cid = _safe_id(collection_id)
-    if not cid:
-        return None
-    try:
-        base = Path(base_dir).resolve(strict=False)
-        p = (base / f"{cid}.json").resolve(strict=False)
-        if p.parent != base:
-            return None
-        return p
-    except Exception:
-        return None
+def _chunks(values: builtins.list[Any], size: int = _IN_CHUNK) -> builtins.list[builtins.list[Any]]:
+    return [values[i : i + size] for i in range(0, len(values), size)]
+
 
+def _placeholders(count: int) -> str:
+    return ",".join("?" for _ in range(count))
 
-def _collection_path(collection_id: str) -> Path | None:
-    return _collection_path_for_base(collection_id, COLLECTIONS_DIR_PATH)
+
+def _clamp_page(limit: Any, offset: Any) -> tuple[int | None, int]:
+    try:
+        off = max(0, int(offset or 0))
+    except (TypeError, ValueError):
+        off = 0
+    if limit is None or limit == "":
+        return None, off
+    try:
+        lim = int(limit)
+    except (TypeError, ValueError):
+        lim = DEFAULT_ITEMS_PAGE_LIMIT
+    return max(1, min(MAX_ITEMS_PAGE_LIMIT, lim)), off
 
 
 @dataclass(frozen=True)
@@ -151,176 +165,466 @@ class CollectionSummary:
     updated_at: str
 
 
-def _read_collection_summary_row(path: Path) -> CollectionSummary | None:
+def _summary_from_row(row: dict[str, Any]) -> CollectionSummary:
+    cid = str(row.get("id") or "")
+    return CollectionSummary(
+        cid,
+        str(row.get("name") or "").strip() or cid,
+        int(row.get("item_count") or 0),
+        str(row.get("updated_at") or ""),
+    )
+
+
+_ITEM_COLUMNS = ("item_key", "filepath", "filename", "subfolder", "type", "root_id", "kind", "added_at")
+
+_INSERT_ITEM_SQL = f"""
+    INSERT OR IGNORE INTO collection_items (collection_id, {", ".join(_ITEM_COLUMNS)})
+    VALUES (?, {_placeholders(len(_ITEM_COLUMNS))})
+"""
+
+_ITEM_PAGE_SQL = """
+    SELECT
+        ci.filepath, ci.filename, ci.subfolder, ci.type, ci.root_id, ci.kind, ci.added_at,
+        a.id AS asset_id,
+        a.root_id AS asset_root_id,
+        a.size AS asset_size,
+        a.mtime AS asset_mtime,
+        a.width AS asset_width,
+        a.height AS asset_height,
+        a.duration AS asset_duration,
+        COALESCE(m.rating, 0) AS asset_rating,
+        m.has_workflow AS asset_has_workflow,
+        m.has_generation_data AS asset_has_generation_data,
+        CASE WHEN a.id IS NULL THEN '[]' ELSE COALESCE((
+            SELECT '[' || group_concat(json_quote(name)) || ']'
+            FROM (
+                SELECT t.name AS name
+                FROM asset_tags at
+                JOIN tags t ON t.id = at.tag_id
+                WHERE at.asset_id = a.id
+                ORDER BY t.name
+            )
+        ), '[]') END AS asset_tags
+    FROM collection_items ci
+    LEFT JOIN assets a ON a.filepath = ci.filepath
+    LEFT JOIN asset_metadata m ON m.asset_id = a.id
+    WHERE ci.collection_id = ?
+    ORDER BY ci.id
+    LIMIT ? OFFSET ?
+"""
+
+
+def _item_from_row(row: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "filepath": str(row.get("filepath") or ""),
+        "filename": str(row.get("filename") or ""),
+        "subfolder": str(row.get("subfolder") or ""),
+        "type": str(row.get("type") or "output"),
+        "root_id": row.get("root_id") or None,
+        "kind": str(row.get("kind") or "unknown"),
+        "added_at": str(row.get("added_at") or ""),
+    }
+
+
+def _joined_asset_from_row(row: dict[str, Any]) -> dict[str, Any] | None:
+    if row.get("asset_id") is None:
+        return None
     try:
-        data = json.loads(path.read_text(encoding="utf-8"))
+        tags = json.loads(row.get("asset_tags") or "[]")
+    except (TypeError, ValueError):
+        tags = []
+    return {
+        "id": int(row["asset_id"]),
+        "root_id": row.get("asset_root_id"),
+        "size": int(row.get("asset_size") or 0),
+        "mtime": int(row.get("asset_mtime") or 0),
+        "width": row.get("asset_width"),
+        "height": row.get("asset_height"),
+        "duration": row.get("asset_duration"),
+        "rating": int(row.get("asset_rating") or 0),
+        "tags": tags if isinstance(tags, list) else [],
+        "has_workflow": row.get("asset_has_workflow"),
+        "has_generation_data": row.get("asset_has_generation_data"),
+    }
+
+
+def _item_params(collection_id: str, item: dict[str, Any]) -> tuple[Any, ...]:
+    return (collection_id, *(item.get(column) for column in _ITEM_COLUMNS))
+
+
+def _legacy_collection_files(base: Path) -> builtins.list[Path]:
+    try:
+        return sorted(p for p in base.glob("*.json") if p.is_file())
     except Exception:
+        return []
+
+
+def _read_legacy_collection(path: Path) -> dict[str, Any] | None:
+    """Parse one legacy JSON collection into a row plus keyed items (blocking)."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception as exc:
+        logger.warning("Skipping unreadable legacy collection %s: %s", path, exc)
         return None
     if not isinstance(data, dict):
         return None
-    cid = str(data.get("id") or path.stem)
-    if not _safe_id(cid):
+    cid = _safe_id(str(data.get("id") or path.stem))
+    if not cid:
         return None
-    name = str(data.get("name") or "").strip() or cid
-    count = int(len(data.get("items") or []))
-    updated_at = str(data.get("updated_at") or "")
-    return CollectionSummary(cid, name, count, updated_at)
+    items: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    raw_items = data.get("items")
+    for raw in raw_items if isinstance(raw_items, list) else []:
+        item = CollectionsService._normalize_add_asset_item(raw)
+        if item is None or item["item_key"] in seen:
+            continue
+        if isinstance(raw, dict) and raw.get("added_at"):
+            item["added_at"] = str(raw.get("added_at"))
+        seen.add(item["item_key"])
+        items.append(item)
+        if len(items) >= _MAX_COLLECTION_ITEMS:
+            break
+    now = _now_iso()
+    return {
+        "id": cid,
+        "name": _safe_name(str(data.get("name") or "")) or cid,
+        "created_at": str(data.get("created_at") or now),
+        "updated_at": str(data.get("updated_at") or now),
+        "items": items,
+    }
+
+
+def _write_legacy_collection(path: Path, payload: dict[str, Any]) -> None:
+    """Atomically write one collection in the legacy JSON layout (blocking)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+async def export_collections_to_legacy_dir(db: Sqlite, legacy_dir: str | Path | None = None) -> Result[int]:
+    """
+    Write every collection back out as a legacy JSON file.
+
+    Used before the DB file is deleted or replaced so collections survive
+    "Delete DB" and backup restores; a fresh ``CollectionsService`` imports
+    the files again on first access.
+    """
+    root = Path(legacy_dir) if legacy_dir is not None else Path(COLLECTIONS_DIR_PATH)
+    rows = await db.aquery("SELECT id, owner, name, created_at, updated_at FROM collections ORDER BY id")
+    if not rows.ok:
+        return Result.Err(ErrorCode.DB_ERROR, rows.error or "Failed to read collections")
+    written = 0
+    for row in rows.data or []:
+        cid = _safe_id(str(row.get("id") or ""))
+        if not cid:
+            continue
+        items = await db.aquery(
+            "SELECT filepath, filename, subfolder, type, root_id, kind, added_at "
+            "FROM collection_items WHERE collection_id = ? ORDER BY id",
+            (cid,),
+        )
+        if not items.ok:
+            return Result.Err(ErrorCode.DB_ERROR, items.error or "Failed to read collection items")
+        payload = {
+            "id": cid,
+            "name": str(row.get("name") or cid),
+            "created_at": str(row.get("created_at") or ""),
+            "updated_at": str(row.get("updated_at") or ""),
+            "items": [_item_from_row(item) for item in items.data or []],
+        }
+        base = collections_base_dir_for_user(str(row.get("owner") or ""), base_dir=root)
+        try:
+            await asyncio.to_thread(_write_legacy_collection, base / f"{cid}.json", payload)
+        except Exception as exc:
+            return Result.Err(ErrorCode.DB_ERROR, f"Failed to export collection {cid}: {exc}")
+        written += 1
+    return Result.Ok(written)
+
+
+def _mark_legacy_imported(path: Path) -> None:
+    try:
+        os.replace(path, path.with_name(path.name + _LEGACY_MIGRATED_SUFFIX))
+    except Exception as exc:
+        logger.warning("Failed to mark legacy collection %s as imported: %s", path, exc)
+
+
+def _legacy_owner_dirs(root: Path) -> builtins.list[tuple[str, Path]]:
+    """Every ``(owner, directory)`` pair written by :func:`export_collections_to_legacy_dir` (blocking)."""
+    pairs = [("", root)]
+    try:
+        pairs.extend((p.name, p) for p in sorted((root / "users").iterdir()) if p.is_dir())
+    except Exception:
+        pass
+    return pairs
+
+
+async def _insert_legacy_collection(
+    db: Sqlite, owner: str, payload: dict[str, Any], *, replace: bool = False
+) -> Result[bool]:
+    cid = payload["id"]
+    async with db.atransaction(mode="immediate") as tx:
+        if not tx.ok:
+            return Result.Err(ErrorCode.DB_ERROR, tx.error or "Failed to begin transaction")
+        if replace:
+            for sql in ("DELETE FROM collection_items WHERE collection_id = ?", "DELETE FROM collections WHERE id = ?"):
+                res = await db.aexecute(sql, (cid,))
+                if not res.ok:
+                    return Result.Err(ErrorCode.DB_ERROR, res.error or "Failed to replace collection")
+        else:
+            existing = await db.aquery("SELECT 1 FROM collections WHERE id = ?", (cid,))
+            if not existing.ok:
+                return Result.Err(ErrorCode.DB_ERROR, existing.error or "Collection lookup failed")
+            if existing.data:
+                # Imported before the file could be renamed; don't duplicate it.
+                return Result.Ok(False)
+        res = await db.aexecute(
+            "INSERT INTO collections (id, owner, name, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (cid, owner, payload["name"], payload["created_at"], payload["updated_at"]),
+        )
+        if not res.ok:
+            return Result.Err(ErrorCode.DB_ERROR, res.error or "Failed to import collection")
+        if payload["items"]:
+            res = await db.aexecutemany(_INSERT_ITEM_SQL, [_item_params(cid, item) for item in payload["items"]])
+            if not res.ok:
+                return Result.Err(ErrorCode.DB_ERROR, res.error or "Failed to import collection items")
+    return Result.Ok(True)
+
+
+async def import_collections_from_legacy_dir(db: Sqlite, legacy_dir: str | Path | None = None) -> Result[int]:
+    """
+    Import every exported collection file now, for all owners.
+
+    Used after a backup restore: the files were exported from the live DB
+    just before the swap, so they replace same-id collections restored from
+    the (older) backup instead of being skipped.
+    """
+    root = Path(legacy_dir) if legacy_dir is not None else Path(COLLECTIONS_DIR_PATH)
+    imported = 0
+    for owner, base in await asyncio.to_thread(_legacy_owner_dirs, root):
+        for path in await asyncio.to_thread(_legacy_collection_files, base):
+            payload = await asyncio.to_thread(_read_legacy_collection, path)
+            if payload is None:
+                continue
+            res = await _insert_legacy_collection(db, owner, payload, replace=True)
+            if not res.ok:
+                return Result.Err(res.code, f"Failed to import collection {payload['id']}: {res.error}")
+            await asyncio.to_thread(_mark_legacy_imported, path)
+            imported += 1
+    return Result.Ok(imported)
 
 
 class CollectionsService:
-    """Filesystem-backed collections service (JSON files under `COLLECTIONS_DIR`)."""
+    """DB-backed collections service (``collections`` / ``collection_items`` tables)."""
 
-    def __init__(self, base_dir: str | Path | None = None, *, user_id: str | None = None):
-        self._base_root = Path(base_dir) if base_dir is not None else Path(COLLECTIONS_DIR_PATH)
+    def __init__(
+        self,
+        db: Sqlite,
+        *,
+        legacy_dir: str | Path | None = None,
+        user_id: str | None = None,
+    ):
+        self.db = db
+        self._legacy_root = Path(legacy_dir) if legacy_dir is not None else Path(COLLECTIONS_DIR_PATH)
         self._forced_user_id = str(user_id or "").strip()
-        self._lock = threading.Lock()
-        try:
-            self._base_root.mkdir(parents=True, exist_ok=True)
-        except Exception:
-            pass
+        self._imported_owners: set[str] = set()
+        self._import_lock = asyncio.Lock()
 
     def _effective_user_id(self) -> str:
         if self._forced_user_id:
             return self._forced_user_id
         return _current_user_id()
 
-    def _effective_base_dir(self) -> Path:
-        base = collections_base_dir_for_user(self._effective_user_id(), base_dir=self._base_root)
-        try:
-            base.mkdir(parents=True, exist_ok=True)
-        except Exception:
-            pass
-        return base
+    async def _owner(self) -> str:
+        """Return the current owner key, importing their legacy JSON collections once."""
+        user_id = self._effective_user_id()
+        owner = _safe_user_store_segment(user_id)
+        if owner not in self._imported_owners:
+            async with self._import_lock:
+                if owner not in self._imported_owners:
+                    await self._import_legacy_collections(owner, user_id)
+                    self._imported_owners.add(owner)
+        return owner
+
+    async def _import_legacy_collections(self, owner: str, user_id: str) -> None:
+        base = collections_base_dir_for_user(user_id, base_dir=self._legacy_root)
+        paths = await asyncio.to_thread(_legacy_collection_files, base)
+        imported = 0
+        for path in paths:
+            payload = await asyncio.to_thread(_read_legacy_collection, path)
+            if payload is None:
+                continue
+            res = await self._insert_legacy_collection(owner, payload)
+            if not res.ok:
+                logger.warning("Failed to import legacy collection %s: %s", path, res.error)
+                continue
+            await asyncio.to_thread(_mark_legacy_imported, path)
+            imported += 1
+        if imported:
+            logger.info("Imported %d legacy collection file(s) from %s", imported, base)
+
+    async def _insert_legacy_collection(self, owner: str, payload: dict[str, Any]) -> Result[bool]:
+        return await _insert_legacy_collection(self.db, owner, payload)
 
-    def _collection_path(self, collection_id: str) -> Path | None:
-        return _collection_path_for_base(collection_id, self._effective_base_dir())
+    async def _collection_row(self, collection_id: str, owner: str) -> Result[dict[str, Any]]:
+        cid = _safe_id(collection_id)
+        if not cid:
+            return Result.Err(ErrorCode.INVALID_INPUT, "Invalid collection id")
+        res = await self.db.aquery(
+            "SELECT id, name, created_at, updated_at, item_count FROM collections WHERE id = ? AND owner = ?",
+            (cid, owner),
+        )
+        if not res.ok:
+            return Result.Err(ErrorCode.DB_ERROR, res.error or "Failed to read collection")
+        if not res.data:
+            return Result.Err(ErrorCode.NOT_FOUND, "Collection not found")
+        return Result.Ok(res.data[0])
 
-    def list(self) -> Result[builtins.list[dict[str, Any]]]:
+    async def list(self) -> Result[builtins.list[dict[str, Any]]]:
         """List collections with basic metadata and item counts."""
-        base_res = self._resolve_collections_base_dir()
-        if not base_res.ok:
-            return Result.Err(base_res.code or ErrorCode.DB_ERROR, base_res.error or "Collections dir unavailable")
-        base = base_res.data
-        if not isinstance(base, Path):
-            return Result.Err(ErrorCode.DB_ERROR, "Collections dir unavailable")
-
-        items: list[CollectionSummary] = []
-        with self._lock:
-            try:
-                for p in base.glob("*.json"):
-                    summary = _read_collection_summary_row(p)
-                    if summary is not None:
-                        items.append(summary)
-            except Exception as exc:
-                return Result.Err(ErrorCode.DB_ERROR, f"Failed to list collections: {exc}")
-
-        # Sort newest-ish first (fallback to id)
-        items.sort(key=lambda x: (x.updated_at or "", x.id), reverse=True)
-        return Result.Ok([i.__dict__ for i in items])
-
-    def _resolve_collections_base_dir(self) -> Result[Path]:
-        try:
-            return Result.Ok(self._effective_base_dir().resolve(strict=False))
-        except Exception as exc:
-            return Result.Err(ErrorCode.DB_ERROR, f"Collections dir unavailable: {exc}")
+        owner = await self._owner()
+        res = await self.db.aquery(
+            "SELECT id, name, item_count, updated_at FROM collections "
+            "WHERE owner = ? ORDER BY updated_at DESC, id DESC",
+            (owner,),
+        )
+        if not res.ok:
+            return Result.Err(ErrorCode.DB_ERROR, f"Failed to list collections: {res.error}")
+        return Result.Ok([_summary_from_row(row).__dict__ for row in res.data or []])
 
-    def create(self, name: str) -> Result[dict[str, Any]]:
+    async def create(self, name: str) -> Result[dict[str, Any]]:
         """Create a new empty collection."""
         cname = _safe_name(name)
         if not cname:
             return Result.Err(ErrorCode.INVALID_INPUT, "Missing collection name")
-
+        owner = await self._owner()
         cid = uuid4().hex[:12]
-        path = self._collection_path(cid)
-        if not path:
-            return Result.Err(ErrorCode.DB_ERROR, "Failed to allocate collection id")
-
-        payload: dict[str, Any] = {
-            "id": cid,
-            "name": cname,
-            "created_at": _now_iso(),
-            "updated_at": _now_iso(),
-            "items": [],
-        }
-
-        with self._lock:
-            try:
-                path.parent.mkdir(parents=True, exist_ok=True)
-                path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
-            except Exception as exc:
-                return Result.Err(ErrorCode.DB_ERROR, f"Failed to create collection: {exc}")
-
+        now = _now_iso()
+        res = await self.db.aexecute(
+            "INSERT INTO collections (id, owner, name, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (cid, owner, cname, now, now),
+        )
+        if not res.ok:
+            return Result.Err(ErrorCode.DB_ERROR, f"Failed to create collection: {res.error}")
         return Result.Ok({"id": cid, "name": cname})
 
-    def get(self, collection_id: str) -> Result[dict[str, Any]]:
-        """Get a collection by id (including items)."""
-        path = self._collection_path(collection_id)
-        if not path:
+    async def get(self, collection_id: str) -> Result[dict[str, Any]]:
+        """Get a collection by id (including all items, in insertion order)."""
+        owner = await self._owner()
+        row_res = await self._collection_row(collection_id, owner)
+        if not row_res.ok:
+            return row_res
+        row = row_res.data or {}
+        cid = str(row.get("id"))
+        items = await self.db.aquery(
+            "SELECT filepath, filename, subfolder, type, root_id, kind, added_at "
+            "FROM collection_items WHERE collection_id = ? ORDER BY id",
+            (cid,),
+        )
+        if not items.ok:
+            return Result.Err(ErrorCode.DB_ERROR, items.error or "Failed to read collection items")
+        return Result.Ok(
+            {
+                "id": cid,
+                "name": str(row.get("name") or "").strip() or cid,
+                "created_at": row.get("created_at") or "",
+                "updated_at": row.get("updated_at") or "",
+                "items": [_item_from_row(item) for item in items.data or []],
+            }
+        )
+
+    async def delete(self, collection_id: str) -> Result[bool]:
+        """Delete a collection (its items cascade)."""
+        cid = _safe_id(collection_id)
+        if not cid:
             return Result.Err(ErrorCode.INVALID_INPUT, "Invalid collection id")
-        loaded = self._load_collection_data(path)
-        if not loaded.ok:
-            return loaded
-        return self._build_collection_get_result(loaded.data or {}, collection_id)
+        owner = await self._owner()
+        res = await self.db.aexecute("DELETE FROM collections WHERE id = ? AND owner = ?", (cid, owner))
+        if not res.ok:
+            return Result.Err(ErrorCode.DB_ERROR, f"Failed to delete collection: {res.error}")
+        return Result.Ok(True)
 
-    @staticmethod
-    def _load_collection_data(path: Path) -> Result[dict[str, Any]]:
-        try:
-            return Result.Ok(json.loads(path.read_text(encoding="utf-8")))
-        except FileNotFoundError:
-            return Result.Err(ErrorCode.NOT_FOUND, "Collection not found")
-        except Exception as exc:
-            return Result.Err(ErrorCode.PARSE_ERROR, f"Failed to read collection: {exc}")
+    async def list_items(
+        self,
+        collection_id: str,
+        *,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> Result[dict[str, Any]]:
+        """
+        Return one page of members joined against the index.
 
-    @staticmethod
-    def _build_collection_get_result(data: dict[str, Any], collection_id: str) -> Result[dict[str, Any]]:
-        cid = str(data.get("id") or collection_id)
-        if not _safe_id(cid):
-            return Result.Err(ErrorCode.PARSE_ERROR, "Collection file is corrupted (bad id)")
+        Each item carries its stored fields plus ``asset`` (the matching
+        ``assets`` row with rating/tags, or None when the file is not indexed).
+        ``limit=None`` returns every member.
+        """
+        owner = await self._owner()
+        row_res = await self._collection_row(collection_id, owner)
+        if not row_res.ok:
+            return row_res
+        row = row_res.data or {}
+        cid = str(row.get("id"))
+        lim, off = _clamp_page(limit, offset)
+        res = await self.db.aquery(_ITEM_PAGE_SQL, (cid, -1 if lim is None else lim, off))
+        if not res.ok:
+            return Result.Err(ErrorCode.DB_ERROR, res.error or "Failed to read collection items")
+        items = []
+        for item_row in res.data or []:
+            item = _item_from_row(item_row)
+            item["asset"] = _joined_asset_from_row(item_row)
+            items.append(item)
         return Result.Ok(
             {
                 "id": cid,
-                "name": str(data.get("name") or "").strip() or cid,
-                "created_at": data.get("created_at") or "",
-                "updated_at": data.get("updated_at") or "",
-                "items": data.get("items") if isinstance(data.get("items"), list) else [],
+                "name": str(row.get("name") or "").strip() or cid,
+                "total": int(row.get("item_count") or 0),
+                "limit": lim,
+                "offset": off,
+                "items": items,
             }
         )
 
-    def delete(self, collection_id: str) -> Result[bool]:
-        """Delete a collection file by id."""
-        path = self._collection_path(collection_id)
-        if not path:
-            return Result.Err(ErrorCode.INVALID_INPUT, "Invalid collection id")
-        with self._lock:
+    async def collections_for_asset(
+        self,
+        *,
+        filepath: str | None = None,
+        asset_id: int | None = None,
+    ) -> Result[builtins.list[dict[str, Any]]]:
+        """List the current user's collections that contain an asset (by filepath or asset id)."""
+        fp = str(filepath or "").strip()
+        if not fp and asset_id is not None:
             try:
-                path.unlink(missing_ok=True)  # py3.8+; safe on 3.11+
-            except TypeError:
-                try:
-                    if path.exists():
-                        path.unlink()
-                except Exception as exc:
-                    return Result.Err(ErrorCode.DB_ERROR, f"Failed to delete collection: {exc}")
-            except Exception as exc:
-                return Result.Err(ErrorCode.DB_ERROR, f"Failed to delete collection: {exc}")
-        return Result.Ok(True)
-
-    def _load_for_update(self, collection_id: str) -> tuple[Path | None, dict[str, Any] | None, Result[Any] | None]:
-        path = self._collection_path(collection_id)
-        if not path:
-            return None, None, Result.Err(ErrorCode.INVALID_INPUT, "Invalid collection id")
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-        except FileNotFoundError:
-            return path, None, Result.Err(ErrorCode.NOT_FOUND, "Collection not found")
-        except Exception as exc:
-            return path, None, Result.Err(ErrorCode.PARSE_ERROR, f"Failed to read collection: {exc}")
-        if not isinstance(data, dict):
-            return path, None, Result.Err(ErrorCode.PARSE_ERROR, "Invalid collection format")
-        if not _safe_id(str(data.get("id") or collection_id)):
-            return path, None, Result.Err(ErrorCode.PARSE_ERROR, "Collection file is corrupted (bad id)")
-        if not isinstance(data.get("items"), list):
-            data["items"] = []
-        return path, data, None
+                aid = int(asset_id)
+            except (TypeError, ValueError):
+                return Result.Err(ErrorCode.INVALID_INPUT, "Invalid asset id")
+            found = await self.db.aquery("SELECT filepath FROM assets WHERE id = ?", (aid,))
+            if not found.ok:
+                return Result.Err(ErrorCode.DB_ERROR, found.error or "Asset lookup failed")
+            if not found.data:
+                return Result.Err(ErrorCode.NOT_FOUND, "Asset not found")
+            fp = str(found.data[0].get("filepath") or "")
+        if not fp:
+            return Result.Err(ErrorCode.INVALID_INPUT, "Missing filepath or asset_id")
+        owner = await self._owner()
+        key = await asyncio.to_thread(_normalize_fp, fp)
+        res = await self.db.aquery(
+            "SELECT c.id, c.name, c.item_count, c.updated_at FROM collections c "
+            "WHERE c.owner = ? AND c.id IN ("
+            "SELECT ci.collection_id FROM collection_items ci WHERE ci.item_key = ? OR ci.filepath = ?"
+            ") ORDER BY c.updated_at DESC, c.id DESC",
+            (owner, key, fp),
+        )
+        if not res.ok:
+            return Result.Err(ErrorCode.DB_ERROR, res.error or "Collection lookup failed")
+        return Result.Ok([_summary_from_row(row).__dict__ for row in res.data or []])
 
     @staticmethod
     def _normalize_add_asset_item(asset: dict[str, Any]) -> dict[str, Any] | None:
@@ -332,6 +636,7 @@ class CollectionsService:
         root_id = CollectionsService._normalize_asset_root_id(asset)
         kind = CollectionsService._normalize_asset_kind(asset, fp)
         return {
+            "item_key": _normalize_fp(fp),
             "filepath": fp,
             "filename": str(asset.get("filename") or "").strip(),
             "subfolder": str(asset.get("subfolder") or "").strip(),
@@ -355,177 +660,140 @@ class CollectionsService:
     def _normalize_asset_kind(asset: dict[str, Any], filepath: str) -> str:
         return str(asset.get("kind") or classify_file(filepath) or "unknown").strip().lower()
 
-    def _clean_add_assets_input(self, assets: builtins.list[dict[str, Any]]) -> builtins.list[dict[str, Any]]:
+    @classmethod
+    def _clean_add_assets_input(cls, assets: builtins.list[dict[str, Any]]) -> builtins.list[dict[str, Any]]:
         cleaned: list[dict[str, Any]] = []
         for asset in assets:
-            item = self._normalize_add_asset_item(asset)
+            item = cls._normalize_add_asset_item(asset)
             if item is None:
                 continue
             cleaned.append(item)
         return cleaned
 
-    @staticmethod
-    def _existing_items_with_indexes(raw_items: Any) -> tuple[builtins.list[dict[str, Any]], set[str], set[str]]:
-        existing: list[dict[str, Any]] = (
-            [it for it in raw_items if isinstance(it, dict)] if isinstance(raw_items, list) else []
-        )
-        seen: set[str] = set()
-        existing_seen: set[str] = set()
-        for item in existing:
-            existing_fp = item.get("filepath")
-            if not existing_fp:
-                continue
-            key = _normalize_fp(str(existing_fp))
-            seen.add(key)
-            existing_seen.add(key)
-        return existing, seen, existing_seen
+    async def _existing_item_keys(self, collection_id: str, keys: builtins.list[str]) -> Result[set[str]]:
+        found: set[str] = set()
+        for chunk in _chunks(keys):
+            res = await self.db.aquery(
+                f"SELECT item_key FROM collection_items WHERE collection_id = ? AND item_key IN ({_placeholders(len(chunk))})",
+                (collection_id, *chunk),
+            )
+            if not res.ok:
+                return Result.Err(ErrorCode.DB_ERROR, res.error or "Failed to read collection items")
+            found.update(str(row.get("item_key")) for row in res.data or [])
+        return Result.Ok(found)
 
-    def _append_collection_items(
-        self,
-        existing: builtins.list[dict[str, Any]],
+    @staticmethod
+    def _plan_new_items(
         cleaned: builtins.list[dict[str, Any]],
-        seen: set[str],
-        existing_seen: set[str],
-    ) -> dict[str, int]:
-        added = 0
+        existing_keys: set[str],
+        current_count: int,
+    ) -> tuple[builtins.list[dict[str, Any]], dict[str, int]]:
+        new_items: list[dict[str, Any]] = []
+        seen: set[str] = set()
         skipped_existing = 0
         skipped_duplicate = 0
         skipped_limit = 0
         for item in cleaned:
-            if len(existing) >= _MAX_COLLECTION_ITEMS:
-                skipped_limit += 1
+            key = item["item_key"]
+            if key in existing_keys:
+                skipped_existing += 1
                 continue
-            key = _normalize_fp(item["filepath"])
             if key in seen:
-                if key in existing_seen:
-                    skipped_existing += 1
-                else:
-                    skipped_duplicate += 1
+                skipped_duplicate += 1
                 continue
-            existing.append(item)
+            if current_count + len(new_items) >= _MAX_COLLECTION_ITEMS:
+                skipped_limit += 1
+                continue
+            new_items.append(item)
             seen.add(key)
-            added += 1
-        return {
-            "added": int(added),
+        return new_items, {
+            "added": len(new_items),
             "skipped_existing": int(skipped_existing),
             "skipped_duplicate": int(skipped_duplicate),
             "skipped_limit": int(skipped_limit),
         }
 
-    @staticmethod
-    def _write_collection_payload(path: Path, data: dict[str, Any]) -> Result[Any] | None:
-        """Atomically write collection JSON: write to a temp file then os.replace() into place.
-
-        Using a temp file in the same directory guarantees the rename is atomic on the same
-        filesystem (single-device rename), preventing partial-write corruption if the process
-        is killed mid-write.
-        """
-        try:
-            payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
-            dir_path = path.parent
-            fd, tmp_path = tempfile.mkstemp(dir=dir_path, suffix=".tmp")
-            try:
-                with os.fdopen(fd, "w", encoding="utf-8") as fh:
-                    fh.write(payload)
-                os.replace(tmp_path, path)
-            except Exception:
-                # Clean up the temp file if the rename or write failed.
-                try:
-                    os.unlink(tmp_path)
-                except OSError:
-                    pass
-                raise
-        except Exception as exc:
-            return Result.Err(ErrorCode.DB_ERROR, f"Failed to update collection: {exc}")
-        return None
-
-    def _add_assets_sync(self, collection_id: str, cleaned: builtins.list[dict[str, Any]]) -> Result[dict[str, Any]]:
-        """Synchronous core of add_assets — must be called from a thread (not the event loop).
-
-        Holds ``self._lock`` for the entire read-mutate-write sequence so that no two
-        concurrent callers can read the same state and then overwrite each other (lost-update
-        race, H-15/H-16).
-        """
-        with self._lock:
-            path, data, err = self._load_for_update(collection_id)
-            if err:
-                return err
-            if path is None or data is None:
-                return Result.Err(ErrorCode.INVALID_INPUT, "Collection load failed: missing path or data")
-
-            existing, seen, existing_seen = self._existing_items_with_indexes(data.get("items"))
-            counts = self._append_collection_items(existing, cleaned, seen, existing_seen)
-
-            data["items"] = existing
-            data["updated_at"] = _now_iso()
-
-            write_err = self._write_collection_payload(path, data)
-            if write_err:
-                return write_err
-
-        return Result.Ok(
-            {
-                "id": str(data.get("id") or collection_id),
-                "added": counts["added"],
-                "skipped_existing": counts["skipped_existing"],
-                "skipped_duplicate": counts["skipped_duplicate"],
-                "skipped_limit": counts["skipped_limit"],
-                "max_items": int(_MAX_COLLECTION_ITEMS),
-                "count": len(existing),
-            }
-        )
-
-    def add_assets(self, collection_id: str, assets: builtins.list[dict[str, Any]]) -> Result[dict[str, Any]]:
+    async def add_assets(self, collection_id: str, assets: builtins.list[dict[str, Any]]) -> Result[dict[str, Any]]:
         """Add assets (by filepath) to a collection (deduplicated, bounded).
 
-        Synchronous; callers in an async context should wrap with ``asyncio.to_thread``.
-        ``self._lock`` inside ``_add_assets_sync`` ensures the read-mutate-write
-        sequence is atomic with respect to other concurrent callers (H-14/H-15/H-16).
+        Only the new member rows are written; the existing membership is
+        probed by key and ``item_count`` comes from the collection row.
         """
         if not isinstance(assets, list) or not assets:
             return Result.Err(ErrorCode.INVALID_INPUT, "No assets provided")
+        cid = _safe_id(collection_id)
+        if not cid:
+            return Result.Err(ErrorCode.INVALID_INPUT, "Invalid collection id")
 
-        cleaned = self._clean_add_assets_input(assets)
+        # Path normalization touches the filesystem; keep it off the event loop.
+        cleaned = await asyncio.to_thread(self._clean_add_assets_input, assets)
         if not cleaned:
             return Result.Err(ErrorCode.INVALID_INPUT, "No valid assets provided")
 
-        return self._add_assets_sync(collection_id, cleaned)
+        owner = await self._owner()
+        async with self.db.atransaction(mode="immediate") as tx:
+            if not tx.ok:
+                return Result.Err(ErrorCode.DB_ERROR, tx.error or "Failed to begin transaction")
+            row_res = await self._collection_row(cid, owner)
+            if not row_res.ok:
+                return row_res
+            current_count = int((row_res.data or {}).get("item_count") or 0)
+            existing_res = await self._existing_item_keys(cid, list({item["item_key"] for item in cleaned}))
+            if not existing_res.ok:
+                return Result.Err(existing_res.code, existing_res.error or "Collection item lookup failed")
+            new_items, counts = self._plan_new_items(cleaned, existing_res.data or set(), current_count)
+            if new_items:
+                ins = await self.db.aexecutemany(_INSERT_ITEM_SQL, [_item_params(cid, item) for item in new_items])
+                if not ins.ok:
+                    return Result.Err(ErrorCode.DB_ERROR, f"Failed to update collection: {ins.error}")
+                upd = await self.db.aexecute("UPDATE collections SET updated_at = ? WHERE id = ?", (_now_iso(), cid))
+                if not upd.ok:
+                    return Result.Err(ErrorCode.DB_ERROR, f"Failed to update collection: {upd.error}")
 
-    def _remove_filepaths_sync(self, collection_id: str, targets: set[str]) -> Result[dict[str, Any]]:
-        """Synchronous core of remove_filepaths — must be called from a thread (not the event loop).
+        return Result.Ok(
+            {
+                "id": cid,
+                **counts,
+                "max_items": int(_MAX_COLLECTION_ITEMS),
+                "count": current_count + counts["added"],
+            }
+        )
 
-        Holds ``self._lock`` for the entire read-mutate-write sequence (H-15/H-16).
-        """
-        with self._lock:
-            path, data, err = self._load_for_update(collection_id)
-            if err:
-                return err
-            if path is None or data is None:
-                return Result.Err(ErrorCode.INVALID_INPUT, "Collection load failed: missing path or data")
-
-            existing = self._collection_items_as_dicts(data.get("items"))
-            kept, removed = self._partition_removed_items(existing, targets)
-            data["items"] = kept
-            data["updated_at"] = _now_iso()
-            write_err = self._write_collection_payload(path, data)
-            if write_err:
-                return write_err
-
-        return Result.Ok({"id": str(data.get("id") or collection_id), "removed": int(removed), "count": len(kept)})
-
-    def remove_filepaths(self, collection_id: str, filepaths: builtins.list[str]) -> Result[dict[str, Any]]:
-        """Remove items from a collection by filepath.
-
-        Synchronous; callers in an async context should wrap with ``asyncio.to_thread``.
-        ``self._lock`` inside ``_remove_filepaths_sync`` ensures the read-mutate-write
-        sequence is atomic with respect to other concurrent callers (H-14/H-15/H-16).
-        """
-        targets_res = self._remove_targets(filepaths)
+    async def remove_filepaths(self, collection_id: str, filepaths: builtins.list[str]) -> Result[dict[str, Any]]:
+        """Remove items from a collection by filepath."""
+        if not isinstance(filepaths, list) or not filepaths:
+            return Result.Err(ErrorCode.INVALID_INPUT, "No filepaths provided")
+        cid = _safe_id(collection_id)
+        if not cid:
+            return Result.Err(ErrorCode.INVALID_INPUT, "Invalid collection id")
+        targets_res = await asyncio.to_thread(self._remove_targets, filepaths)
         if not targets_res.ok:
             return Result.Err(targets_res.code or ErrorCode.INVALID_INPUT, targets_res.error or "No valid filepaths provided")
-        targets = targets_res.data or set()
-
-        return self._remove_filepaths_sync(collection_id, targets)
+        targets = sorted(targets_res.data or set())
+
+        owner = await self._owner()
+        async with self.db.atransaction(mode="immediate") as tx:
+            if not tx.ok:
+                return Result.Err(ErrorCode.DB_ERROR, tx.error or "Failed to begin transaction")
+            row_res = await self._collection_row(cid, owner)
+            if not row_res.ok:
+                return row_res
+            before = int((row_res.data or {}).get("item_count") or 0)
+            for chunk in _chunks(targets):
+                res = await self.db.aexecute(
+                    f"DELETE FROM collection_items WHERE collection_id = ? AND item_key IN ({_placeholders(len(chunk))})",
+                    (cid, *chunk),
+                )
+                if not res.ok:
+                    return Result.Err(ErrorCode.DB_ERROR, f"Failed to update collection: {res.error}")
+            after_res = await self._collection_row(cid, owner)
+            if not after_res.ok:
+                return after_res
+            after = int((after_res.data or {}).get("item_count") or 0)
+            if after != before:
+                await self.db.aexecute("UPDATE collections SET updated_at = ? WHERE id = ?", (_now_iso(), cid))
+
+        return Result.Ok({"id": cid, "removed": int(before - after), "count": after})
 
     @staticmethod
     def _remove_targets(filepaths: builtins.list[str]) -> Result[set[str]]:
@@ -535,19 +803,3 @@ class CollectionsService:
         if not targets:
             return Result.Err(ErrorCode.INVALID_INPUT, "No valid filepaths provided")
         return Result.Ok(targets)
-
-    @staticmethod
-    def _collection_items_as_dicts(raw_items: Any) -> builtins.list[dict[str, Any]]:
-        return [it for it in raw_items if isinstance(it, dict)] if isinstance(raw_items, list) else []
-
-    @staticmethod
-    def _partition_removed_items(existing: builtins.list[dict[str, Any]], targets: set[str]) -> tuple[builtins.list[Any], int]:
-        kept: list[Any] = []
-        removed = 0
-        for item in existing:
-            fp = item.get("filepath")
-            if fp and _normalize_fp(str(fp)) in targets:
-                removed += 1
-                continue
-            kept.append(item)
-        return kept, removed
@@ -1,3 +1,4 @@
+from .content_lookup import ContentHashBackfill
 from .service import DuplicatesService
 
-__all__ = ["DuplicatesService"]
+__all__ = ["ContentHashBackfill", "DuplicatesService"]
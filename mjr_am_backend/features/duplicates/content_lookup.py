@@ -0,0 +1,116 @@
+"""
+Background content hashing for hash-addressed lookups.
+
+Duplicate analysis only computes ``content_hash`` for files whose size and
+head/tail digest collide with another file, so hash-addressed lookups
+(``blake3:<hex>`` ids in the v2 assets API, ``/mjr/am/view/by-hash``) miss
+every other asset.  Those lookups answer immediately and call
+:meth:`ContentHashBackfill.schedule`, which hashes the remaining assets in a
+single background task; later lookups then find them in the index.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any
+
+from mjr_am_shared.hashing import compute_file_hash, preferred_algo
+
+from ...adapters.db.sqlite import Sqlite
+from ...shared import Result, get_logger
+
+logger = get_logger(__name__)
+
+BACKFILL_BATCH = 16
+# A finished backfill is not restarted by further misses for this long.
+BACKFILL_COOLDOWN_S = 60.0
+
+
+def _hash_file(filepath: str) -> str | None:
+    path = Path(filepath)
+    try:
+        if not path.is_file():
+            return None
+        digest, _algo = compute_file_hash(path)
+    except OSError as exc:
+        logger.debug("Background content hash failed for %s: %s", filepath, exc)
+        return None
+    return digest
+
+
+class ContentHashBackfill:
+    """Hashes, in the background, assets that duplicate analysis left unhashed."""
+
+    def __init__(self, db: Sqlite):
+        self.db = db
+        self._task: asyncio.Task | None = None
+        self._finished_at = 0.0
+
+    def schedule(self) -> bool:
+        """Start the backfill unless it is running or just finished; True if started."""
+        if self._task is not None and not self._task.done():
+            return False
+        if time.monotonic() - self._finished_at < BACKFILL_COOLDOWN_S:
+            return False
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    async def _run(self) -> None:
+        try:
+            res = await self.run()
+            if not res.ok:
+                logger.warning("Background content hashing failed: %s", res.error)
+        except Exception as exc:
+            logger.warning("Background content hashing failed: %s", exc)
+        finally:
+            self._finished_at = time.monotonic()
+
+    async def run(self) -> Result[int]:
+        """Hash every unhashed asset, newest first; returns how many were stored."""
+        algo = preferred_algo()
+        after_id: int | None = None
+        stored = 0
+        while True:
+            rows = await self.db.aquery(
+                "SELECT id, filepath, size, mtime FROM assets "
+                "WHERE content_hash IS NULL AND (? IS NULL OR id < ?) ORDER BY id DESC LIMIT ?",
+                (after_id, after_id, BACKFILL_BATCH),
+            )
+            if not rows.ok:
+                return Result.Err(rows.code, rows.error or "Unhashed asset query failed")
+            batch = rows.data or []
+            if not batch:
+                return Result.Ok(stored)
+            res = await self._hash_batch(batch, algo)
+            if not res.ok:
+                return Result.Err(res.code, res.error or "Content hash update failed")
+            stored += int(res.data or 0)
+            after_id = int(batch[-1]["id"])
+
+    async def _hash_batch(self, rows: list[dict[str, Any]], algo: str) -> Result[int]:
+        digests = await asyncio.gather(*(asyncio.to_thread(_hash_file, str(row.get("filepath") or "")) for row in rows))
+        updates: list[tuple[Any, ...]] = []
+        for row, digest in zip(rows, digests, strict=True):
+            if not digest:
+                continue
+            state = f"{int(row.get('mtime') or 0)}:{int(row.get('size') or 0)}"
+            updates.append((digest, algo, state, state, state, int(row["id"])))
+        if not updates:
+            return Result.Ok(0)
+        # A stale hash_state also invalidates the partial hash and pHash, which
+        # duplicate analysis recomputes once the state no longer matches them.
+        res = await self.db.aexecutemany(
+            """
+            UPDATE assets
+            SET content_hash = ?, hash_algo = ?,
+                partial_hash = CASE WHEN hash_state IS ? THEN partial_hash ELSE NULL END,
+                phash = CASE WHEN hash_state IS ? THEN phash ELSE NULL END,
+                hash_state = ?
+            WHERE id = ? AND content_hash IS NULL
+            """,
+            updates,
+        )
+        if not res.ok:
+            return Result.Err(res.code, res.error or "Content hash update failed")
+        return Result.Ok(len(updates))
@@ -0,0 +1,246 @@
+"""
+Multi-index hashing (MIH) over 64-bit perceptual hashes.
+
+Each pHash is stored once in ``asset_phash_index`` as a signed 64-bit
+integer plus four 16-bit bands (``band0`` … ``band3``), each with its own
+B-tree index.  By the pigeonhole principle, two hashes within Hamming
+distance ``d`` agree within ``d // 4`` bits on at least one band, so the
+candidate set for a hash is the union of four small band buckets instead of
+the whole library.  Candidates are then verified with an integer popcount.
+
+Band neighbour enumeration stays cheap up to a per-band radius of 2, so
+distances are capped at :data:`MAX_PHASH_DISTANCE` (11); larger requests
+are clamped rather than answered with a full-library sweep.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable, Iterator
+from itertools import combinations
+from typing import Any
+
+from ...adapters.db.sqlite import Sqlite
+from ...shared import Result, get_logger
+
+logger = get_logger(__name__)
+
+BAND_COUNT = 4
+BAND_BITS = 16
+_BAND_MASK = (1 << BAND_BITS) - 1
+_U64_MASK = (1 << 64) - 1
+
+# Above this per-band radius neighbour enumeration (Σ C(16, k)) stops
+# narrowing the candidate set.
+_MIH_MAX_BAND_RADIUS = 2
+
+# Largest Hamming distance the band indexes answer: d // 4 <= 2.
+MAX_PHASH_DISTANCE = BAND_COUNT * (_MIH_MAX_BAND_RADIUS + 1) - 1
+
+
+def phash_hex_to_int(value: Any) -> int | None:
+    """Parse a 16-hex-digit pHash into an unsigned 64-bit int."""
+    text = str(value or "").strip()
+    if not text:
+        return None
+    try:
+        parsed = int(text, 16)
+    except ValueError:
+        return None
+    return parsed & _U64_MASK
+
+
+def to_signed64(value: int) -> int:
+    """Map an unsigned 64-bit value onto SQLite's signed INTEGER range."""
+    value &= _U64_MASK
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def from_signed64(value: int) -> int:
+    return int(value) & _U64_MASK
+
+
+def split_bands(value: int) -> tuple[int, ...]:
+    """Split an unsigned 64-bit hash into ``BAND_COUNT`` 16-bit bands."""
+    return tuple((value >> (BAND_BITS * i)) & _BAND_MASK for i in range(BAND_COUNT))
+
+
+def band_neighbors(value: int, radius: int) -> list[int]:
+    """All 16-bit values within Hamming *radius* of *value* (including itself)."""
+    out = [value]
+    for r in range(1, max(0, radius) + 1):
+        for bits in combinations(range(BAND_BITS), r):
+            flipped = value
+            for bit in bits:
+                flipped ^= 1 << bit
+            out.append(flipped)
+    return out
+
+
+def clamp_distance(max_distance: Any) -> int:
+    """Bound a requested Hamming distance to ``0 … MAX_PHASH_DISTANCE``."""
+    return max(0, min(MAX_PHASH_DISTANCE, int(max_distance)))
+
+
+def find_pairs_within(
+    entries: Iterable[tuple[int, int]],
+    max_distance: int,
+    *,
+    limit: int | None = None,
+) -> list[tuple[int, int, int]]:
+    """Return ``(distance, left_id, right_id)`` for every pair within *max_distance*.
+
+    *entries* are ``(asset_id, unsigned_phash)`` tuples.  Results are sorted
+    by distance then ids; *limit* keeps only the closest pairs, holding at
+    most *limit* of them in memory while scanning.  *max_distance* is clamped
+    to :data:`MAX_PHASH_DISTANCE`.
+    """
+    items = [(int(aid), int(h)) for aid, h in entries]
+    max_distance = clamp_distance(max_distance)
+    if len(items) < 2:
+        return []
+    pairs = _pairs_multi_index(items, max_distance)
+    if limit is not None:
+        return _closest_pairs(pairs, max(0, int(limit)))
+    return sorted(pairs)
+
+
+def _closest_pairs(pairs: Iterator[tuple[int, int, int]], limit: int) -> list[tuple[int, int, int]]:
+    """The *limit* smallest pairs, kept in a bounded max-heap of negated tuples."""
+    if limit <= 0:
+        return []
+    heap: list[tuple[int, int, int]] = []
+    for distance, left, right in pairs:
+        item = (-distance, -left, -right)
+        if len(heap) < limit:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    return sorted((-d, -left, -right) for d, left, right in heap)
+
+
+def _pairs_multi_index(items: list[tuple[int, int]], max_distance: int) -> Iterator[tuple[int, int, int]]:
+    radius = max_distance // BAND_COUNT
+    tables: list[dict[int, list[int]]] = [{} for _ in range(BAND_COUNT)]
+    for pos, (_aid, value) in enumerate(items):
+        for band, band_value in enumerate(split_bands(value)):
+            tables[band].setdefault(band_value, []).append(pos)
+
+    neighbor_cache: dict[int, list[int]] = {}
+    for pos, (aid, value) in enumerate(items):
+        seen: set[int] = set()
+        for band, band_value in enumerate(split_bands(value)):
+            neighbors = neighbor_cache.get(band_value)
+            if neighbors is None:
+                neighbors = band_neighbors(band_value, radius)
+                neighbor_cache[band_value] = neighbors
+            table = tables[band]
+            for candidate_value in neighbors:
+                for other in table.get(candidate_value, ()):
+                    # Each unordered pair is emitted once, from its lower position.
+                    if other <= pos or other in seen:
+                        continue
+                    seen.add(other)
+                    other_aid, other_value = items[other]
+                    distance = (value ^ other_value).bit_count()
+                    if distance <= max_distance:
+                        yield (distance, aid, other_aid)
+
+
+def _row_values(phash_hex: Any) -> tuple[int, ...] | None:
+    value = phash_hex_to_int(phash_hex)
+    if value is None:
+        return None
+    return (to_signed64(value), *split_bands(value))
+
+
+async def upsert_phash(db: Sqlite, asset_id: int, phash_hex: Any) -> Result[Any]:
+    """Write (or clear) the MIH row for *asset_id* from its hex pHash."""
+    values = _row_values(phash_hex)
+    if values is None:
+        return await db.aexecute("DELETE FROM asset_phash_index WHERE asset_id = ?", (int(asset_id),))
+    return await db.aexecute(
+        """
+        INSERT INTO asset_phash_index (asset_id, phash_int, band0, band1, band2, band3)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(asset_id) DO UPDATE SET
+            phash_int = excluded.phash_int,
+            band0 = excluded.band0,
+            band1 = excluded.band1,
+            band2 = excluded.band2,
+            band3 = excluded.band3
+        """,
+        (int(asset_id), *values),
+    )
+
+
+async def find_similar_to(
+    db: Sqlite,
+    phash_hex: Any,
+    max_distance: int,
+    *,
+    exclude_id: int | None = None,
+    limit: int = 50,
+) -> Result[list[dict[str, Any]]]:
+    """Look up near-duplicates of one hash through the band indexes.
+
+    *max_distance* is clamped to :data:`MAX_PHASH_DISTANCE`.
+    """
+    value = phash_hex_to_int(phash_hex)
+    if value is None:
+        return Result.Ok([])
+    max_distance = clamp_distance(max_distance)
+    radius = max_distance // BAND_COUNT
+    clauses: list[str] = []
+    params: list[Any] = []
+    for band, band_value in enumerate(split_bands(value)):
+        neighbors = band_neighbors(band_value, radius)
+        clauses.append(f"band{band} IN ({','.join('?' for _ in neighbors)})")
+        params.extend(neighbors)
+    rows = await db.aquery(
+        f"SELECT asset_id, phash_int FROM asset_phash_index WHERE {' OR '.join(clauses)}",
+        tuple(params),
+    )
+    if not rows.ok:
+        return Result.Err("DB_ERROR", rows.error or "pHash lookup failed")
+    hits: list[tuple[int, int]] = []
+    for row in rows.data or []:
+        aid = int(row.get("asset_id") or 0)
+        if not aid or aid == exclude_id:
+            continue
+        distance = (value ^ from_signed64(int(row.get("phash_int") or 0))).bit_count()
+        if distance <= max_distance:
+            hits.append((distance, aid))
+    hits.sort()
+    return Result.Ok([{"asset_id": aid, "distance": d} for d, aid in hits[: max(1, int(limit))]])
+
+
+async def upsert_phashes(db: Sqlite, items: Iterable[tuple[int, Any]]) -> Result[Any]:
+    """Batch form of :func:`upsert_phash` for ``(asset_id, phash_hex)`` pairs."""
+    upserts: list[tuple[int, ...]] = []
+    deletes: list[tuple[int]] = []
+    for asset_id, phash_hex in items:
+        values = _row_values(phash_hex)
+        if values is None:
+            deletes.append((int(asset_id),))
+        else:
+            upserts.append((int(asset_id), *values))
+    if deletes:
+        res = await db.aexecutemany("DELETE FROM asset_phash_index WHERE asset_id = ?", deletes)
+        if not res.ok:
+            return res
+    if upserts:
+        return await db.aexecutemany(
+            """
+            INSERT INTO asset_phash_index (asset_id, phash_int, band0, band1, band2, band3)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(asset_id) DO UPDATE SET
+                phash_int = excluded.phash_int,
+                band0 = excluded.band0,
+                band1 = excluded.band1,
+                band2 = excluded.band2,
+                band3 = excluded.band3
+            """,
+            upserts,
+        )
+    return Result.Ok(0)
@@ -6,18 +6,34 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import json
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from mjr_am_shared.hashing import compute_file_hash as _shared_compute_file_hash
+from mjr_am_shared.hashing import compute_partial_hash as _shared_compute_partial_hash
+from mjr_am_shared.hashing import preferred_algo
 from PIL import Image
 
 from ...adapters.db.sqlite import Sqlite
+from ...config import DUPLICATES_HASH_WORKERS
 from ...data.repositories import TagsRepository
 from ...shared import Result, get_logger
+from .content_lookup import ContentHashBackfill
+from .phash_index import (
+    clamp_distance,
+    find_pairs_within,
+    find_similar_to,
+    from_signed64,
+    phash_hex_to_int,
+    upsert_phashes,
+)
 
 logger = get_logger(__name__)
 
+_SIZE_QUERY_CHUNK = 500
+
 
 def _safe_int(value: Any, default: int = 0) -> int:
     try:
@@ -38,17 +54,9 @@ def _compute_file_hash_with_algo(path: Path) -> tuple[str, str]:
     return digest, algo
 
 
-# Legacy SHA-256 helper retained for tests / external callers that depend on
-# the deterministic SHA-256 output (e.g. comparing against pre-blake3 hashes).
-def _compute_file_sha256(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        while True:
-            chunk = f.read(1024 * 1024)
-            if not chunk:
-                break
-            h.update(chunk)
-    return h.hexdigest()
+def _compute_partial_hash(path: Path) -> str:
+    digest, algo = _shared_compute_partial_hash(path)
+    return f"{algo}:{digest}"
 
 
 def _compute_phash_hex(path: Path) -> str | None:
@@ -68,11 +76,52 @@ def _compute_phash_hex(path: Path) -> str | None:
         return None
 
 
-def _hamming_hex(a: str, b: str) -> int:
+def _partial_is_current(value: Any) -> bool:
+    """A stored partial hash is only comparable if made with today's algorithm."""
+    return str(value or "").startswith(f"{preferred_algo()}:")
+
+
+def _partial_job(path: str) -> dict[str, Any]:
     try:
-        return (int(a, 16) ^ int(b, 16)).bit_count()
-    except Exception:
-        return 64
+        return {"partial": _compute_partial_hash(Path(path))}
+    except Exception as exc:
+        return {"error": str(exc)}
+
+
+def _hash_job(path: str, want_content: bool, want_phash: bool) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    try:
+        if want_content:
+            out["content_hash"], out["hash_algo"] = _compute_file_hash_with_algo(Path(path))
+        if want_phash:
+            out["phash"] = _compute_phash_hex(Path(path))
+    except Exception as exc:
+        out["error"] = str(exc)
+    return out
+
+
+# Legacy SHA-256 helper retained for tests / external callers that depend on
+# the deterministic SHA-256 output (e.g. comparing against pre-blake3 hashes).
+def _compute_file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        while True:
+            chunk = f.read(1024 * 1024)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _phash_int_value(row: dict[str, Any]) -> int | None:
+    """Unsigned pHash of a similarity row (``phash_int`` preferred, hex fallback)."""
+    raw = (row or {}).get("phash_int")
+    if raw is not None:
+        try:
+            return from_signed64(int(raw))
+        except (TypeError, ValueError):
+            return None
+    return phash_hex_to_int((row or {}).get("phash"))
 
 
 def _build_known_hash_fields(row: dict[str, Any]) -> tuple[str, str, str]:
@@ -109,10 +158,6 @@ def _similar_pair_row(distance: int, left: dict[str, Any], right: dict[str, Any]
     }
 
 
-def _phash_value(row: dict[str, Any]) -> str:
-    return str((row or {}).get("phash") or "")
-
-
 def _parse_positive_int(value: Any) -> int:
     try:
         candidate = int(value or 0)
@@ -136,11 +181,17 @@ class DuplicatesService:
         self.db = db
         self._lock = asyncio.Lock()
         self._task: asyncio.Task | None = None
+        self._pool: ThreadPoolExecutor | None = None
+        self._content_backfill = ContentHashBackfill(db)
         self._status: dict[str, Any] = {
             "running": False,
+            "phase": "idle",
+            "total": 0,
             "processed": 0,
             "updated": 0,
             "errors": 0,
+            "partial_hashed": 0,
+            "full_hashed": 0,
             "last_error": None,
         }
 
@@ -151,13 +202,28 @@ class DuplicatesService:
             pass
 
     async def start_background_analysis(self, limit: int = 250) -> Result[dict[str, Any]]:
+        """Hash the whole library in pages of *limit* rows (newest first)."""
         async with self._lock:
             if self._task and not self._task.done():
                 return Result.Ok({"started": False, "running": True, "status": self._status})
-            self._set_status(running=True, processed=0, updated=0, errors=0, last_error=None)
+            self._set_status(
+                running=True,
+                phase="starting",
+                total=0,
+                processed=0,
+                updated=0,
+                errors=0,
+                partial_hashed=0,
+                full_hashed=0,
+                last_error=None,
+            )
             self._task = asyncio.create_task(self._run_background(limit=max(10, min(5000, int(limit or 250)))))
             return Result.Ok({"started": True, "running": True, "status": self._status})
 
+    def queue_content_hashing(self) -> bool:
+        """Hash unhashed assets in the background after a content-hash lookup missed."""
+        return self._content_backfill.schedule()
+
     async def get_status(self) -> Result[dict[str, Any]]:
         # Fix C-8: read _task under the lock so we don't race with
         # start_background_analysis replacing the reference.
@@ -167,38 +233,83 @@ class DuplicatesService:
             return Result.Ok(dict(self._status))
 
     async def _run_background(self, limit: int) -> None:
+        """Size → head/tail digest → full hash pipeline.
+
+        Files whose size is unique in the library cannot have an exact
+        duplicate, and files of equal size whose first/last 64 KiB differ
+        cannot either, so only the remaining ``(size, partial)`` collisions
+        are read in full.  pHashes are still computed for every image.
+        """
         try:
-            rows_res = await self._fetch_analysis_rows(limit)
-            if not rows_res.ok:
-                self._set_status(running=False, last_error=rows_res.error or "Query failed")
+            sizes_res = await self._fetch_collision_sizes()
+            if not sizes_res.ok:
+                self._set_status(running=False, last_error=sizes_res.error or "Query failed")
                 return
-
-            rows = rows_res.data or []
-            for row in rows:
-                item = self._build_row_context(row)
-                self._inc_status("processed")
-                if item is None or not self._is_row_processable(item):
-                    self._inc_status("errors")
-                    continue
-                if self._row_is_up_to_date(item):
-                    continue
-                await self._process_hash_update(item)
+            collisions: set[int] = sizes_res.data or set()
+            total_res = await self.db.aquery("SELECT COUNT(1) AS n FROM assets")
+            if total_res.ok and total_res.data:
+                self._set_status(total=_safe_int(total_res.data[0].get("n")))
+            self._set_status(phase="hashing")
+
+            partial_cache: dict[int, str] = {}
+            after_id: int | None = None
+            while True:
+                rows_res = await self._fetch_analysis_rows(limit, after_id=after_id)
+                if not rows_res.ok:
+                    self._set_status(running=False, last_error=rows_res.error or "Query failed")
+                    return
+                rows = rows_res.data or []
+                if not rows:
+                    break
+                await self._process_page(rows, collisions, partial_cache)
+                if len(rows) < limit:
+                    break
+                after_id = _safe_int(rows[-1].get("id"))
         except Exception as exc:
             self._set_status(last_error=str(exc))
         finally:
-            self._set_status(running=False)
+            self._shutdown_pool()
+            self._set_status(running=False, phase="done")
+
+    async def _fetch_collision_sizes(self) -> Result[set[int]]:
+        res = await self.db.aquery(
+            "SELECT size FROM assets WHERE size IS NOT NULL GROUP BY size HAVING COUNT(1) > 1"
+        )
+        if not res.ok:
+            return Result.Err("DB_ERROR", res.error or "Size query failed")
+        return Result.Ok({_safe_int(row.get("size"), -1) for row in res.data or []} - {-1})
 
-    async def _fetch_analysis_rows(self, limit: int):
+    async def _fetch_analysis_rows(self, limit: int, *, after_id: int | None = None):
         return await self.db.aquery(
             """
-            SELECT id, filepath, filename, kind, size, mtime, content_hash, phash, hash_state
+            SELECT id, filepath, filename, kind, size, mtime,
+                   content_hash, partial_hash, phash, hash_state, hash_algo
             FROM assets
-            ORDER BY indexed_at DESC, id DESC
+            WHERE (? IS NULL OR id < ?)
+            ORDER BY id DESC
             LIMIT ?
             """,
-            (int(limit),),
+            (after_id, after_id, int(limit)),
         )
 
+    async def _fetch_size_peers(self, sizes: list[int]) -> Result[list[dict[str, Any]]]:
+        out: list[dict[str, Any]] = []
+        for start in range(0, len(sizes), _SIZE_QUERY_CHUNK):
+            chunk = sizes[start : start + _SIZE_QUERY_CHUNK]
+            res = await self.db.aquery(
+                f"""
+                SELECT id, filepath, filename, kind, size, mtime,
+                       content_hash, partial_hash, phash, hash_state, hash_algo
+                FROM assets
+                WHERE size IN ({",".join("?" for _ in chunk)})
+                """,
+                tuple(chunk),
+            )
+            if not res.ok:
+                return Result.Err("DB_ERROR", res.error or "Peer query failed")
+            out.extend(res.data or [])
+        return Result.Ok(out)
+
     def _build_row_context(self, row: dict[str, Any]) -> dict[str, Any] | None:
         row_data = row or {}
         if not row_data.get("id") or not row_data.get("filepath") or not row_data.get("filename"):
@@ -213,14 +324,19 @@ class DuplicatesService:
         size = _safe_int(row_data.get("size"))
         mtime = _safe_int(row_data.get("mtime"))
         known_state, known_content, known_phash = _build_known_hash_fields(row_data)
+        current_state = f"{mtime}:{size}"
         return {
             "aid": aid,
             "fp": fp,
             "kind": kind,
+            "size": size,
             "path": Path(fp),
-            "current_state": f"{mtime}:{size}",
+            "current_state": current_state,
+            "state_ok": known_state == current_state,
             "known_state": known_state,
             "known_content": known_content,
+            "known_algo": str(row_data.get("hash_algo") or ""),
+            "known_partial": str(row_data.get("partial_hash") or ""),
             "known_phash": known_phash,
         }
 
@@ -228,35 +344,209 @@ class DuplicatesService:
         path = item["path"]
         return bool(item["aid"] and item["fp"] and path.exists() and path.is_file())
 
-    def _row_is_up_to_date(self, item: dict[str, Any]) -> bool:
+    def _row_is_up_to_date(self, item: dict[str, Any], collision_sizes: set[int] | None = None) -> bool:
         if item["known_state"] != item["current_state"]:
             return False
-        if not item["known_content"]:
-            return False
         if item["kind"] == "image" and not item["known_phash"]:
             return False
-        return True
+        if item["known_content"]:
+            return True
+        # No content hash is needed while nothing else has this size, or once
+        # the head/tail digest has been recorded for the current file state.
+        if item["size"] not in (collision_sizes or set()):
+            return True
+        return _partial_is_current(item["known_partial"])
+
+    async def _process_page(
+        self,
+        rows: list[dict[str, Any]],
+        collision_sizes: set[int],
+        partial_cache: dict[int, str],
+    ) -> None:
+        stale: list[dict[str, Any]] = []
+        for row in rows:
+            item = self._build_row_context(row)
+            self._inc_status("processed")
+            if item is None or not self._is_row_processable(item):
+                self._inc_status("errors")
+                continue
+            if self._row_is_up_to_date(item, collision_sizes):
+                continue
+            stale.append(item)
+        if not stale:
+            return
+
+        candidates = [item for item in stale if item["size"] in collision_sizes]
+        need_full: set[int] = set()
+        peers: list[dict[str, Any]] = []
+        if candidates:
+            need_full, peers = await self._resolve_exact_candidates(candidates, partial_cache)
+
+        jobs: list[tuple[dict[str, Any], bool, bool]] = []
+        for item in stale:
+            want_content = item["aid"] in need_full and not (item["state_ok"] and item["known_content"])
+            want_phash = item["kind"] == "image" and not (item["state_ok"] and item["known_phash"])
+            jobs.append((item, want_content, want_phash))
+        for peer in peers:
+            if peer["aid"] in need_full:
+                jobs.append((peer, True, False))
+
+        hashed = [job for job in jobs if job[1] or job[2]]
+        results = await self._run_jobs(
+            _hash_job,
+            [(str(item["path"]), want_content, want_phash) for item, want_content, want_phash in hashed],
+        )
+        by_aid = {item["aid"]: res for (item, _c, _p), res in zip(hashed, results, strict=True)}
+        self._inc_status("full_hashed", sum(1 for _item, want_content, _p in hashed if want_content))
+        await self._write_page(stale, peers, by_aid)
 
-    async def _process_hash_update(self, item: dict[str, Any]) -> None:
-        try:
-            content_hash, hash_algo = await asyncio.to_thread(_compute_file_hash_with_algo, item["path"])
-            phash = await asyncio.to_thread(_compute_phash_hex, item["path"]) if item["kind"] == "image" else None
-            upd = await self.db.aexecute(
+    async def _resolve_exact_candidates(
+        self,
+        candidates: list[dict[str, Any]],
+        partial_cache: dict[int, str],
+    ) -> tuple[set[int], list[dict[str, Any]]]:
+        """Return ids that need a full hash, plus the size peers examined."""
+        candidate_ids = {item["aid"] for item in candidates}
+        peers_res = await self._fetch_size_peers(sorted({item["size"] for item in candidates}))
+        peer_rows = (peers_res.data or []) if peers_res.ok else []
+        peers: list[dict[str, Any]] = []
+        for row in peer_rows:
+            peer = self._build_row_context(row)
+            if peer is None or peer["aid"] in candidate_ids or not self._is_row_processable(peer):
+                continue
+            peers.append(peer)
+
+        pending: list[dict[str, Any]] = []
+        for item in (*candidates, *peers):
+            cached = partial_cache.get(item["aid"])
+            if cached:
+                item["partial"] = cached
+            elif (
+                item["aid"] not in candidate_ids
+                and item["state_ok"]
+                and _partial_is_current(item["known_partial"])
+            ):
+                item["partial"] = item["known_partial"]
+            else:
+                pending.append(item)
+        results = await self._run_jobs(_partial_job, [(str(item["path"]),) for item in pending])
+        for item, res in zip(pending, results, strict=True):
+            partial = res.get("partial")
+            if partial:
+                item["partial"] = partial
+                item["partial_fresh"] = True
+                partial_cache[item["aid"]] = partial
+                self._inc_status("partial_hashed")
+
+        groups: dict[tuple[int, str], list[dict[str, Any]]] = {}
+        for item in (*candidates, *peers):
+            if item.get("partial"):
+                groups.setdefault((item["size"], item["partial"]), []).append(item)
+        need_full: set[int] = set()
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            for item in members:
+                if item["aid"] in candidate_ids:
+                    need_full.add(item["aid"])
+                elif item["state_ok"] and not item["known_content"]:
+                    # Stale peers get hashed when their own page comes up.
+                    need_full.add(item["aid"])
+        return need_full, peers
+
+    def _hash_pool(self) -> ThreadPoolExecutor | None:
+        # Threads, not processes: hashing is I/O-bound and hashlib/blake3/PIL
+        # release the GIL, while spawned children would re-import ComfyUI's
+        # main.py. The pool bounds how many files are read at once.
+        if DUPLICATES_HASH_WORKERS <= 0:
+            return None
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=DUPLICATES_HASH_WORKERS, thread_name_prefix="mjr-dup-hash")
+        return self._pool
+
+    def _shutdown_pool(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def _run_jobs(
+        self,
+        job_fn: Callable[..., dict[str, Any]],
+        args_list: list[tuple[Any, ...]],
+    ) -> list[dict[str, Any]]:
+        if not args_list:
+            return []
+        loop = asyncio.get_running_loop()
+        pool = self._hash_pool()
+        return list(await asyncio.gather(*(loop.run_in_executor(pool, job_fn, *args) for args in args_list)))
+
+    async def _write_page(
+        self,
+        stale: list[dict[str, Any]],
+        peers: list[dict[str, Any]],
+        results: dict[int, dict[str, Any]],
+    ) -> None:
+        updates: list[tuple[Any, ...]] = []
+        phashes: list[tuple[int, Any]] = []
+        for item in stale:
+            res = results.get(item["aid"], {})
+            if res.get("error"):
+                self._inc_status("errors")
+                self._status["last_error"] = str(res["error"])
+                continue
+            content_hash = res.get("content_hash") or (item["known_content"] if item["state_ok"] else None)
+            hash_algo = res.get("hash_algo") or (item["known_algo"] if content_hash else None)
+            partial = item.get("partial") or (item["known_partial"] if item["state_ok"] else None)
+            phash = res["phash"] if "phash" in res else item["known_phash"] or None
+            updates.append((content_hash, partial, phash, item["current_state"], hash_algo, item["aid"]))
+            if "phash" in res:
+                phashes.append((item["aid"], phash))
+
+        peer_updates: list[tuple[Any, ...]] = []
+        for peer in peers:
+            res = results.get(peer["aid"], {})
+            if not peer["state_ok"] or res.get("error"):
+                continue
+            if not peer.get("partial_fresh") and "content_hash" not in res:
+                continue
+            peer_updates.append((
+                peer.get("partial"),
+                res.get("content_hash"),
+                res.get("hash_algo"),
+                peer["aid"],
+                peer["current_state"],
+            ))
+
+        if updates:
+            upd = await self.db.aexecutemany(
                 """
                 UPDATE assets
-                SET content_hash = ?, phash = ?, hash_state = ?, hash_algo = ?,
+                SET content_hash = ?, partial_hash = ?, phash = ?, hash_state = ?, hash_algo = ?,
                     enrichment_level = MAX(COALESCE(enrichment_level, 0), 1)
                 WHERE id = ?
                 """,
-                (content_hash, phash, item["current_state"], hash_algo, item["aid"]),
+                updates,
             )
-            if upd.ok:
-                self._inc_status("updated")
-            else:
-                self._inc_status("errors")
-        except Exception as exc:
-            self._inc_status("errors")
-            self._status["last_error"] = str(exc)
+            if not upd.ok:
+                self._inc_status("errors", len(updates))
+                self._status["last_error"] = upd.error
+                return
+            self._inc_status("updated", len(updates))
+        if peer_updates:
+            await self.db.aexecutemany(
+                """
+                UPDATE assets
+                SET partial_hash = COALESCE(?, partial_hash),
+                    content_hash = COALESCE(?, content_hash),
+                    hash_algo = COALESCE(?, hash_algo)
+                WHERE id = ? AND hash_state = ?
+                """,
+                peer_updates,
+            )
+        if phashes:
+            index_res = await upsert_phashes(self.db, phashes)
+            if not index_res.ok:
+                logger.debug("pHash index update failed: %s", index_res.error)
 
     def _inc_status(self, key: str, amount: int = 1) -> None:
         self._status[key] = _safe_int(self._status.get(key)) + int(amount)
@@ -330,23 +620,21 @@ class DuplicatesService:
 
     @staticmethod
     def _similarity_query(where: str) -> str:
+        # Only ids and integer hashes are loaded: the whole library fits in
+        # memory this way; names are fetched for the reported pairs only.
         if where:
             return f"""
-                SELECT a.id, a.filepath, a.filename, a.phash
-                FROM assets a
+                SELECT p.asset_id AS id, p.phash_int
+                FROM asset_phash_index p
+                JOIN assets a ON a.id = p.asset_id
                 {where}
                 AND a.kind = 'image'
-                AND a.phash IS NOT NULL
-                ORDER BY a.id DESC
-                LIMIT 800
             """
         return """
-            SELECT a.id, a.filepath, a.filename, a.phash
-            FROM assets a
+            SELECT p.asset_id AS id, p.phash_int
+            FROM asset_phash_index p
+            JOIN assets a ON a.id = p.asset_id
             WHERE a.kind = 'image'
-            AND a.phash IS NOT NULL
-            ORDER BY a.id DESC
-            LIMIT 800
         """
 
     @staticmethod
@@ -374,47 +662,21 @@ class DuplicatesService:
         phash_distance: int,
         max_pairs: int,
     ) -> list[dict[str, Any]]:
-        similar_pairs: list[dict[str, Any]] = []
-        for i, left_raw in enumerate(images):
-            left = left_raw or {}
-            lp = _phash_value(left)
-            if not lp:
-                continue
-            reached_limit = DuplicatesService._append_similar_pairs_for_left(
-                similar_pairs,
-                left,
-                lp,
-                images[i + 1:],
-                phash_distance=phash_distance,
-                max_pairs=max_pairs,
-            )
-            if reached_limit:
-                break
-        similar_pairs.sort(key=lambda p: _safe_int(p.get("distance"), 64))
-        return similar_pairs
-
-    @staticmethod
-    def _append_similar_pairs_for_left(
-        similar_pairs: list[dict[str, Any]],
-        left: dict[str, Any],
-        left_phash: str,
-        right_rows: list[dict[str, Any]],
-        *,
-        phash_distance: int,
-        max_pairs: int,
-    ) -> bool:
-        for right_raw in right_rows:
-            right = right_raw or {}
-            right_phash = _phash_value(right)
-            if not right_phash:
-                continue
-            distance = _hamming_hex(left_phash, right_phash)
-            if distance > phash_distance:
+        by_id: dict[int, dict[str, Any]] = {}
+        entries: list[tuple[int, int]] = []
+        for row in images or []:
+            row_data = row or {}
+            aid = _safe_int(row_data.get("id"))
+            value = _phash_int_value(row_data)
+            if not aid or value is None:
                 continue
-            similar_pairs.append(_similar_pair_row(distance, left, right))
-            if len(similar_pairs) >= max_pairs:
-                return True
-        return False
+            by_id[aid] = row_data
+            entries.append((aid, value))
+        pairs = find_pairs_within(entries, phash_distance, limit=max_pairs)
+        return [
+            _similar_pair_row(distance, by_id[left], by_id[right])
+            for distance, left, right in pairs
+        ]
 
     async def get_alerts(
         self,
@@ -441,6 +703,7 @@ class DuplicatesService:
             phash_distance=phash_distance,
             max_pairs=max_pairs,
         )
+        await self._hydrate_pair_names(similar_pairs)
         return Result.Ok({
             "exact_groups": exact_groups_res.data or [],
             "similar_pairs": similar_pairs,
@@ -459,7 +722,7 @@ class DuplicatesService:
             roots or [],
             max(1, min(50, int(max_groups or 6))),
             max(1, min(100, int(max_pairs or 10))),
-            max(0, min(32, int(phash_distance or 6))),
+            clamp_distance(phash_distance or 6),
         )
 
     async def _query_exact_groups(
@@ -480,6 +743,54 @@ class DuplicatesService:
             return Result.Err("DB_ERROR", sim_rows.error or "Similarity query failed")
         return Result.Ok(sim_rows.data or [])
 
+    async def _hydrate_pair_names(self, pairs: list[dict[str, Any]]) -> None:
+        ids = sorted({
+            _safe_int(side.get("id"))
+            for pair in pairs
+            for side in (pair.get("left") or {}, pair.get("right") or {})
+            if not side.get("filepath")
+        } - {0})
+        if not ids:
+            return
+        placeholders = ",".join("?" for _ in ids)
+        rows = await self.db.aquery(
+            f"SELECT id, filepath, filename FROM assets WHERE id IN ({placeholders})",
+            tuple(ids),
+        )
+        if not rows.ok:
+            return
+        names = {_safe_int(r.get("id")): r for r in rows.data or []}
+        for pair in pairs:
+            for key in ("left", "right"):
+                side = pair.get(key) or {}
+                found = names.get(_safe_int(side.get("id")))
+                if found and not side.get("filepath"):
+                    side["filepath"] = found.get("filepath")
+                    side["filename"] = found.get("filename")
+
+    async def find_similar_to_asset(
+        self,
+        asset_id: int,
+        phash_distance: int = 6,
+        limit: int = 50,
+    ) -> Result[list[dict[str, Any]]]:
+        """Near-duplicates of one image, looked up through the pHash band indexes."""
+        row = await self.db.aquery(
+            "SELECT phash_int FROM asset_phash_index WHERE asset_id = ?", (int(asset_id),)
+        )
+        if not row.ok:
+            return Result.Err("DB_ERROR", row.error or "pHash lookup failed")
+        if not row.data:
+            return Result.Ok([])
+        phash_hex = f"{from_signed64(int(row.data[0].get('phash_int') or 0)):016x}"
+        return await find_similar_to(
+            self.db,
+            phash_hex,
+            clamp_distance(phash_distance),
+            exclude_id=int(asset_id),
+            limit=max(1, min(500, int(limit))),
+        )
+
     async def merge_tags_for_group(self, keep_asset_id: int, merge_asset_ids: list[int]) -> Result[dict[str, Any]]:
         keep_asset_id = int(keep_asset_id or 0)
         merge_ids = self._normalize_merge_ids(keep_asset_id, merge_asset_ids)
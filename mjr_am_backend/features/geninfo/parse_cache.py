@@ -0,0 +1,221 @@
+"""
+Memoized geninfo parsing keyed by a canonical hash of the prompt graph.
+
+Every image of a batch and every frame of an image sequence carries the same
+prompt/workflow JSON, so the graph traversal only needs to run once per distinct
+graph. Parses are kept in a bounded in-memory LRU and, when a database is given,
+in the ``geninfo_cache`` table so they survive restarts.
+
+The key includes ``PARSER_FAMILY_VERSION``, the same constant that marks stored
+metadata for the parser-version backfill: bumping it invalidates every cached
+parse without touching the table, so the backfill never reads a stale parse.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from ...config import GENINFO_CACHE_PERSIST_MAX, GENINFO_CACHE_SIZE
+from ...shared import Result, get_logger
+from ..metadata.section_catalog import PARSER_FAMILY_VERSION
+from .parser_impl import parse_geninfo_from_prompt
+
+logger = get_logger(__name__)
+
+# Persisted rows are trimmed back under the cap after this many inserts.
+_PERSIST_TRIM_EVERY = 256
+
+
+def geninfo_cache_key(prompt_graph: Any, workflow: Any = None) -> str | None:
+    """Return the cache key for a prompt/workflow pair, or None when there is nothing to parse."""
+    if prompt_graph is None and workflow is None:
+        return None
+    try:
+        canonical = json.dumps(
+            [PARSER_FAMILY_VERSION, prompt_graph, workflow],
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+            default=str,
+        )
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(canonical.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class GeninfoParseCache:
+    """Thread-safe bounded LRU of parsed geninfo payloads (``None`` = nothing parsed)."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max(0, int(max_entries))
+        self._entries: OrderedDict[str, dict[str, Any] | None] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> tuple[bool, dict[str, Any] | None]:
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, copy.deepcopy(self._entries[key])
+
+    def put(self, key: str, data: dict[str, Any] | None) -> None:
+        if self._max_entries <= 0:
+            return
+        stored = copy.deepcopy(data)
+        with self._lock:
+            self._entries[key] = stored
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "max_entries": self._max_entries, "hits": self.hits, "misses": self.misses}
+
+
+_CACHE = GeninfoParseCache(GENINFO_CACHE_SIZE)
+_INFLIGHT: dict[str, asyncio.Future] = {}
+_persist_state = {"inserts": 0, "purged_versions": False}
+
+
+def get_geninfo_parse_cache() -> GeninfoParseCache:
+    return _CACHE
+
+
+def parse_geninfo_cached(prompt_graph: Any, workflow: Any = None) -> Result[dict[str, Any] | None]:
+    """Synchronous ``parse_geninfo_from_prompt`` backed by the in-memory LRU."""
+    key = geninfo_cache_key(prompt_graph, workflow)
+    if key is None:
+        return parse_geninfo_from_prompt(prompt_graph, workflow=workflow)
+    found, data = _CACHE.get(key)
+    if found:
+        return Result.Ok(data)
+    result = parse_geninfo_from_prompt(prompt_graph, workflow=workflow)
+    if result.ok:
+        _CACHE.put(key, result.data)
+    return result
+
+
+async def _load_persisted(db: Any, key: str) -> tuple[bool, dict[str, Any] | None]:
+    res = await db.aquery("SELECT geninfo_json FROM geninfo_cache WHERE graph_hash = ?", (key,))
+    if not res.ok or not res.data:
+        return False, None
+    try:
+        data = json.loads(res.data[0].get("geninfo_json") or "null")
+    except (TypeError, ValueError):
+        return False, None
+    return True, data if isinstance(data, dict) else None
+
+
+async def _store_persisted(db: Any, key: str, data: dict[str, Any] | None) -> None:
+    if not _persist_state["purged_versions"]:
+        _persist_state["purged_versions"] = True
+        await db.aexecute("DELETE FROM geninfo_cache WHERE parser_version != ?", (PARSER_FAMILY_VERSION,))
+    res = await db.aexecute(
+        "INSERT OR REPLACE INTO geninfo_cache (graph_hash, parser_version, geninfo_json, created_at) VALUES (?, ?, ?, ?)",
+        (key, PARSER_FAMILY_VERSION, json.dumps(data, ensure_ascii=False, default=str), time.time()),
+    )
+    if not res.ok:
+        logger.debug("Failed to persist parsed geninfo: %s", res.error)
+        return
+    _persist_state["inserts"] += 1
+    if _persist_state["inserts"] % _PERSIST_TRIM_EVERY == 0:
+        await db.aexecute(
+            """
+            DELETE FROM geninfo_cache WHERE graph_hash IN (
+                SELECT graph_hash FROM geninfo_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (int(GENINFO_CACHE_PERSIST_MAX),),
+        )
+
+
+async def _resolve(prompt_graph: Any, workflow: Any, key: str, db: Any | None) -> Result[dict[str, Any] | None]:
+    persist = db is not None and GENINFO_CACHE_PERSIST_MAX > 0
+    if persist:
+        try:
+            found, data = await _load_persisted(db, key)
+        except Exception:
+            logger.debug("Parsed geninfo lookup failed", exc_info=True)
+            found, data = False, None
+        if found:
+            _CACHE.put(key, data)
+            return Result.Ok(data)
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(None, lambda: parse_geninfo_from_prompt(prompt_graph, workflow=workflow))
+    if result.ok:
+        _CACHE.put(key, result.data)
+        if persist:
+            try:
+                await _store_persisted(db, key, result.data)
+            except Exception:
+                logger.debug("Parsed geninfo persist failed", exc_info=True)
+    return result
+
+
+async def aparse_geninfo_cached(
+    prompt_graph: Any,
+    workflow: Any = None,
+    *,
+    db: Any | None = None,
+) -> Result[dict[str, Any] | None]:
+    """
+    Parse geninfo once per distinct prompt graph.
+
+    Lookup order: in-memory LRU, then ``geninfo_cache`` (when ``db`` is given),
+    then the parser on the default executor. Concurrent calls for the same graph
+    wait for the first parse instead of repeating it.
+    """
+    loop = asyncio.get_running_loop()
+    key = await loop.run_in_executor(None, geninfo_cache_key, prompt_graph, workflow)
+    if key is None:
+        return await loop.run_in_executor(None, lambda: parse_geninfo_from_prompt(prompt_graph, workflow=workflow))
+    found, data = _CACHE.get(key)
+    if found:
+        return Result.Ok(data)
+    pending = _INFLIGHT.get(key)
+    if pending is not None and pending.get_loop() is loop:
+        await asyncio.wait([pending])
+        if not pending.cancelled() and pending.exception() is None:
+            shared = pending.result()
+            return Result.Ok(copy.deepcopy(shared.data)) if shared.ok else shared
+        return await _resolve(prompt_graph, workflow, key, db)
+    future: asyncio.Future = loop.create_future()
+    _INFLIGHT[key] = future
+    try:
+        result = await _resolve(prompt_graph, workflow, key, db)
+        # Waiters copy from a private snapshot, never from the caller's payload.
+        future.set_result(Result.Ok(copy.deepcopy(result.data)) if result.ok else result)
+        return result
+    except BaseException:
+        future.cancel()
+        raise
+    finally:
+        if _INFLIGHT.get(key) is future:
+            del _INFLIGHT[key]
+
+
+__all__ = [
+    "GeninfoParseCache",
+    "aparse_geninfo_cached",
+    "geninfo_cache_key",
+    "get_geninfo_parse_cache",
+    "parse_geninfo_cached",
+]
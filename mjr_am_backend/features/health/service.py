@@ -9,6 +9,7 @@ from ...adapters.comfy_core import get_capabilities as get_comfy_core_capabiliti
 from ...adapters.db.sqlite import Sqlite
 from ...adapters.tools import ExifTool, FFProbe
 from ...config import get_tool_paths
+from ...data.repositories import AssetCountersRepository, CounterScope
 from ...shared import Result, get_logger
 
 logger = get_logger(__name__)
@@ -189,25 +190,35 @@ class HealthService:
         except Exception:
             return 0
 
-    async def get_counters(self, roots: Sequence[str] | None = None) -> Result[dict]:
+    async def get_counters(
+        self,
+        roots: Sequence[str] | None = None,
+        *,
+        scopes: Sequence[CounterScope] | None = None,
+    ) -> Result[dict]:
         """
         Get database counters.
 
+        Args:
+            roots: Filesystem roots for the live ``COUNT(*)`` fallback
+            scopes: Counter scopes; when given, tallies come from the
+                trigger-maintained ``asset_counters`` table instead
+
         Returns:
             Result with counters dict containing asset counts
         """
         try:
-            where_sql, where_params = self._roots_where(roots) if roots else ("1=1", [])
-            params = tuple(where_params)
-            counts = await self._counter_query_results(where_sql, params)
+            tallies = await self._counter_tallies(scopes) if scopes else None
+            if tallies is None:
+                tallies = await self._live_counter_tallies(roots)
             last_scan_end = await self._metadata_value("last_scan_end")
             last_index_end = await self._metadata_value("last_index_end")
 
-            by_kind = self._kind_counts(counts["kind"])
-            total_count = self._result_count(counts["total"])
-            rated_count = self._result_count(counts["rated"])
-            workflow_count = self._result_count(counts["workflow"])
-            generation_count = self._result_count(counts["generation"])
+            by_kind = tallies["by_kind"]
+            total_count = tallies["total"]
+            rated_count = tallies["rated"]
+            workflow_count = tallies["with_workflow"]
+            generation_count = tallies["with_generation_data"]
 
             counters = {
                 "total_assets": total_count,
@@ -236,6 +247,25 @@ class HealthService:
                 logger.error(f"Failed to get counters: {e}")
             return Result.Err("DB_ERROR", str(e))
 
+    async def _counter_tallies(self, scopes: Sequence[CounterScope]) -> dict | None:
+        """Read pre-aggregated tallies; ``None`` falls back to live counting."""
+        res = await AssetCountersRepository(self.db).totals(scopes)
+        if not res.ok:
+            logger.debug("Asset counters unavailable, counting live: %s", res.error)
+            return None
+        return res.data
+
+    async def _live_counter_tallies(self, roots: Sequence[str] | None) -> dict:
+        where_sql, where_params = self._roots_where(roots) if roots else ("1=1", [])
+        counts = await self._counter_query_results(where_sql, tuple(where_params))
+        return {
+            "by_kind": self._kind_counts(counts["kind"]),
+            "total": self._result_count(counts["total"]),
+            "rated": self._result_count(counts["rated"]),
+            "with_workflow": self._result_count(counts["workflow"]),
+            "with_generation_data": self._result_count(counts["generation"]),
+        }
+
     async def _counter_query_results(self, where_sql: str, params: tuple[str, ...]) -> dict:
         """Run all counter queries concurrently (fix H-17).
 
@@ -0,0 +1,257 @@
+"""
+Normalized generation parameters for indexed assets.
+
+``asset_generation`` keeps one row per asset with the model, sampler,
+scheduler, seed, steps, CFG and LoRA names, extracted once at index time.
+Search filters on these columns use the per-column indexes instead of
+running ``json_extract`` over ``asset_metadata.metadata_raw`` for every
+candidate row.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+from ...shared import Result
+from .metadata_helpers import (
+    _best_effort_model_name,
+    _best_effort_sampler_name,
+    _compact_named_value,
+    _compact_text_value,
+    _resolve_key_path,
+)
+
+# Multi-valued columns (all model names, LoRA names) are newline-joined so a
+# substring filter cannot match across two names.
+GENERATION_VALUE_SEPARATOR = "\n"
+
+_NAME_BUDGET = 256
+_MAX_NAMES = 16
+
+_A1111_STEPS_RE = re.compile(r"(?:^|[\n,])\s*Steps\s*:\s*(\d+)", re.IGNORECASE)
+_A1111_SEED_RE = re.compile(r"(?:^|[\n,])\s*Seed\s*:\s*(-?\d+)", re.IGNORECASE)
+_A1111_CFG_RE = re.compile(r"(?:^|[\n,])\s*CFG scale\s*:\s*(-?\d+(?:\.\d+)?)", re.IGNORECASE)
+_A1111_SCHEDULER_RE = re.compile(r"(?:^|[\n,])\s*Schedule type\s*:\s*([^\n,]+)", re.IGNORECASE)
+# The shared helpers only read "Model:"/"Sampler:" at line starts; A1111
+# writes them inline on the comma-separated settings line.
+_A1111_MODEL_RE = re.compile(r"(?:^|[\n,])\s*Model\s*:\s*([^\n,]+)", re.IGNORECASE)
+_A1111_SAMPLER_RE = re.compile(r"(?:^|[\n,])\s*Sampler\s*:\s*([^\n,]+)", re.IGNORECASE)
+_A1111_LORA_RE = re.compile(r"<lora:([^:>]+)", re.IGNORECASE)
+
+GENERATION_COLUMNS = (
+    "model",
+    "models",
+    "sampler",
+    "scheduler",
+    "seed",
+    "steps",
+    "cfg",
+    "loras",
+)
+
+
+def _scalar(value: Any) -> Any:
+    if isinstance(value, dict):
+        value = value.get("value")
+    if isinstance(value, (list, tuple)) and len(value) == 1:
+        value = value[0]
+    return value
+
+
+def _as_int(value: Any) -> int | None:
+    value = _scalar(value)
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if number != number or abs(number) >= 2**63:
+        return None
+    return int(number)
+
+
+def _as_float(value: Any) -> float | None:
+    value = _scalar(value)
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if number != number:
+        return None
+    return number
+
+
+def _first_value(meta: dict[str, Any], key_paths: tuple[str, ...]) -> Any:
+    for key_path in key_paths:
+        value = _resolve_key_path(meta, key_path)
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def _parameters_match(meta: dict[str, Any], pattern: re.Pattern[str]) -> str | None:
+    parameters = meta.get("parameters")
+    if not isinstance(parameters, str):
+        return None
+    match = pattern.search(parameters)
+    return match.group(1).strip() if match else None
+
+
+def _numeric_field(meta: dict[str, Any], key_paths: tuple[str, ...], pattern: re.Pattern[str], caster: Any) -> Any:
+    value = _first_value(meta, key_paths)
+    if value is None:
+        value = _parameters_match(meta, pattern)
+    return caster(value)
+
+
+def _append_name(names: list[str], value: Any) -> None:
+    name = _compact_named_value(value, max_chars=_NAME_BUDGET)
+    if name and name not in names and len(names) < _MAX_NAMES:
+        names.append(name)
+
+
+def _iter_named(container: Any) -> list[Any]:
+    if isinstance(container, dict):
+        return list(container.values())
+    if isinstance(container, list):
+        return list(container)
+    if container not in (None, ""):
+        return [container]
+    return []
+
+
+def _collect_model_names(meta: dict[str, Any], primary: str | None) -> list[str]:
+    names: list[str] = []
+    if primary:
+        _append_name(names, primary)
+    geninfo = meta.get("geninfo")
+    if isinstance(geninfo, dict):
+        for key in ("checkpoint", "vae", "clip"):
+            _append_name(names, geninfo.get(key))
+        for item in _iter_named(geninfo.get("models")):
+            _append_name(names, item)
+    for key in ("model", "checkpoint"):
+        _append_name(names, meta.get(key))
+    for item in _iter_named(meta.get("models")):
+        _append_name(names, item)
+    return names
+
+
+def _collect_lora_names(meta: dict[str, Any]) -> list[str]:
+    names: list[str] = []
+    geninfo = meta.get("geninfo")
+    sources = [meta.get("loras"), meta.get("lora")]
+    if isinstance(geninfo, dict):
+        sources = [geninfo.get("loras"), geninfo.get("lora"), *sources]
+    for source in sources:
+        for item in _iter_named(source):
+            _append_name(names, item)
+    parameters = meta.get("parameters")
+    if isinstance(parameters, str):
+        for match in _A1111_LORA_RE.finditer(parameters):
+            _append_name(names, match.group(1))
+    return names
+
+
+def extract_generation_fields(meta: Any) -> dict[str, Any] | None:
+    """
+    Project a metadata payload onto the ``asset_generation`` columns.
+
+    Parsed Gen Info wins over flat keys, which win over A1111 ``parameters``
+    text. Returns None when the payload carries no generation parameters.
+    """
+    if not isinstance(meta, dict):
+        return None
+    model = _best_effort_model_name(meta, text_budget=_NAME_BUDGET) or _compact_text_value(
+        _parameters_match(meta, _A1111_MODEL_RE), max_chars=_NAME_BUDGET
+    )
+    models = _collect_model_names(meta, model)
+    loras = _collect_lora_names(meta)
+    scheduler = _compact_named_value(
+        _first_value(meta, ("geninfo.scheduler", "scheduler", "scheduler_name")),
+        max_chars=_NAME_BUDGET,
+    ) or _compact_text_value(_parameters_match(meta, _A1111_SCHEDULER_RE), max_chars=_NAME_BUDGET)
+    row: dict[str, Any] = {
+        "model": model or (models[0] if models else None),
+        "models": GENERATION_VALUE_SEPARATOR.join(models) or None,
+        "sampler": _best_effort_sampler_name(meta, text_budget=_NAME_BUDGET)
+        or _compact_text_value(_parameters_match(meta, _A1111_SAMPLER_RE), max_chars=_NAME_BUDGET),
+        "scheduler": scheduler,
+        "seed": _numeric_field(meta, ("geninfo.seed", "seed", "noise_seed"), _A1111_SEED_RE, _as_int),
+        "steps": _numeric_field(meta, ("geninfo.steps", "steps"), _A1111_STEPS_RE, _as_int),
+        "cfg": _numeric_field(meta, ("geninfo.cfg", "cfg", "cfg_scale"), _A1111_CFG_RE, _as_float),
+        "loras": GENERATION_VALUE_SEPARATOR.join(loras) or None,
+    }
+    if all(value is None for value in row.values()):
+        return None
+    return row
+
+
+def generation_row_params(asset_id: int, fields: dict[str, Any]) -> tuple[Any, ...]:
+    return (int(asset_id), *(fields.get(column) for column in GENERATION_COLUMNS))
+
+
+_UPSERT_ASSET_GENERATION_SQL = f"""
+    INSERT INTO asset_generation (asset_id, {", ".join(GENERATION_COLUMNS)})
+    SELECT ?, {", ".join("?" for _ in GENERATION_COLUMNS)}
+    WHERE EXISTS (SELECT 1 FROM asset_metadata WHERE asset_id = ?)
+    ON CONFLICT(asset_id) DO UPDATE SET
+        {", ".join(f"{column} = excluded.{column}" for column in GENERATION_COLUMNS)}
+"""
+
+
+async def write_asset_generation_row(
+    db: Any,
+    asset_id: int,
+    metadata_result: Result[dict[str, Any]],
+) -> Result[Any]:
+    """
+    Upsert the ``asset_generation`` row for ``asset_id`` from an extraction result.
+
+    Results without generation parameters (degraded or tool failures) leave
+    the existing row alone, mirroring how ``metadata_raw`` is never downgraded.
+    """
+    if not (metadata_result and metadata_result.ok and isinstance(metadata_result.data, dict)):
+        return Result.Ok(0)
+    fields = extract_generation_fields(metadata_result.data)
+    if fields is None:
+        return Result.Ok(0)
+    params = generation_row_params(asset_id, fields)
+    return await db.aexecute(_UPSERT_ASSET_GENERATION_SQL, (*params, int(asset_id)))
+
+
+async def write_asset_generation_rows(db: Any, rows: list[tuple[int, dict[str, Any]]]) -> Result[Any]:
+    """Upsert already-extracted ``(asset_id, fields)`` pairs in one statement batch."""
+    if not rows:
+        return Result.Ok(0)
+    return await db.aexecutemany(
+        _UPSERT_ASSET_GENERATION_SQL,
+        [(*generation_row_params(asset_id, fields), int(asset_id)) for asset_id, fields in rows],
+    )
+
+
+def generation_fields_from_raw(metadata_raw: Any) -> dict[str, Any] | None:
+    """Decode a stored ``metadata_raw`` payload and project it (backfill helper)."""
+    if not isinstance(metadata_raw, str) or not metadata_raw.strip():
+        return None
+    try:
+        meta = json.loads(metadata_raw)
+    except (TypeError, ValueError):
+        return None
+    return extract_generation_fields(meta)
+
+
+__all__ = [
+    "GENERATION_COLUMNS",
+    "GENERATION_VALUE_SEPARATOR",
+    "extract_generation_fields",
+    "generation_fields_from_raw",
+    "generation_row_params",
+    "write_asset_generation_row",
+    "write_asset_generation_rows",
+]
@@ -0,0 +1,351 @@
+"""
+Direct ingest of files written by the Majoor save nodes.
+
+The save node already holds everything the extractor would recover from the
+file it just wrote (prompt graph, workflow, geninfo override, execution ids,
+dimensions).  It hands that record over and the asset, metadata/FTS row,
+metadata cache entry and scan journal entry are written in one immediate
+transaction, so the watcher, ``/index-files`` and post-execution ingest see a
+journal hit instead of re-reading the PNG chunks (or spawning ExifTool).
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+from ...shared import Result, classify_file, get_logger
+from .entry_builder import safe_relative_path
+from .index_file_ops import build_index_file_state
+from .metadata_helpers import MetadataHelpers
+from .scan_batch_utils import compute_state_hash
+
+logger = get_logger(__name__)
+
+DIRECT_INGEST_SOURCE = "majoor_save_node"
+
+# Paths handed to direct ingest and not yet failed.  Post-execution ingest
+# consults this so it neither re-indexes nor rewrites their metadata, and
+# awaits each claim's future so it only touches rows the ingest committed.
+_CLAIM_TTL_S = 120.0
+_CLAIM_HARD_CAP = 2000
+_CLAIMS_LOCK = threading.Lock()
+_CLAIMS: dict[str, tuple[float, Future]] = {}
+
+_EXECUTION_KEYS = ("job_id", "prompt_id", "workflow_id", "source_node_id", "source_node_type", "asset_id")
+
+
+class _DirectIngestAbort(Exception):
+    """Raised inside the transaction to roll back a partial write."""
+
+
+def _claim_key(path: Any) -> str:
+    try:
+        return os.path.normcase(os.path.normpath(str(path)))
+    except Exception:
+        return str(path or "")
+
+
+def claim_paths(paths: list[str]) -> Future:
+    """Mark *paths* as owned by direct ingest (thread-safe, called from the node thread).
+
+    The caller resolves the returned future once the ingest, including any
+    fallback indexing, has finished.
+    """
+    now = time.time()
+    done: Future = Future()
+    with _CLAIMS_LOCK:
+        if len(_CLAIMS) >= _CLAIM_HARD_CAP:
+            for key in [k for k, (ts, _f) in _CLAIMS.items() if now - ts > _CLAIM_TTL_S]:
+                _CLAIMS.pop(key, None)
+        if len(_CLAIMS) >= _CLAIM_HARD_CAP:
+            for key, _claim in sorted(_CLAIMS.items(), key=lambda kv: kv[1][0])[: _CLAIM_HARD_CAP // 2]:
+                _CLAIMS.pop(key, None)
+        for path in paths:
+            key = _claim_key(path)
+            if key:
+                _CLAIMS[key] = (now, done)
+    return done
+
+
+def release_paths(paths: list[str]) -> None:
+    with _CLAIMS_LOCK:
+        for path in paths:
+            _CLAIMS.pop(_claim_key(path), None)
+
+
+def is_claimed(path: Any) -> bool:
+    key = _claim_key(path)
+    with _CLAIMS_LOCK:
+        claim = _CLAIMS.get(key)
+        if claim is None:
+            return False
+        if time.time() - claim[0] > _CLAIM_TTL_S:
+            _CLAIMS.pop(key, None)
+            return False
+        return True
+
+
+async def wait_for_claims(paths: list[Any], timeout: float) -> bool:
+    """Wait until the direct ingest of every claimed path in *paths* has finished.
+
+    Returns False when *timeout* seconds pass first.
+    """
+    with _CLAIMS_LOCK:
+        claims = (_CLAIMS.get(_claim_key(path)) for path in paths)
+        pending = {id(claim[1]): claim[1] for claim in claims if claim is not None and not claim[1].done()}
+    if not pending:
+        return True
+    _done, still_pending = await asyncio.wait(
+        [asyncio.wrap_future(fut) for fut in pending.values()], timeout=max(0.0, float(timeout))
+    )
+    return not still_pending
+
+
+def _clean_text(value: Any, max_len: int = 255) -> str | None:
+    if value is None:
+        return None
+    text = str(value).strip()
+    return text[:max_len] if text else None
+
+
+def _mapping(value: Any) -> dict[str, Any]:
+    return value if isinstance(value, dict) else {}
+
+
+def _positive_int(value: Any) -> int | None:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+def build_generated_metadata(record: dict[str, Any], *, filepath: str, mtime: int, size: int) -> dict[str, Any]:
+    """Shape a save-node record like the PNG extractor's output (before geninfo enrichment)."""
+    extra = _mapping(record.get("extra_pnginfo"))
+    workflow = record.get("workflow", extra.get("workflow"))
+    name = Path(filepath).name
+    meta: dict[str, Any] = {
+        "file_info": {
+            "filename": name,
+            "filepath": filepath,
+            "size": size,
+            "mtime": mtime,
+            "kind": classify_file(name),
+            "ext": Path(name).suffix.lower(),
+        },
+        "workflow": workflow if isinstance(workflow, dict) else None,
+        "prompt": record.get("prompt") if isinstance(record.get("prompt"), dict) else None,
+        "parameters": None,
+        "quality": "full",
+    }
+    for key, value in extra.items():
+        if key != "workflow" and key not in meta:
+            meta[key] = value
+    gen_time = record.get("generation_time_ms")
+    if isinstance(gen_time, int) and gen_time >= 0:
+        meta["generation_time_ms"] = gen_time
+    execution = _mapping(record.get("execution"))
+    for key in _EXECUTION_KEYS:
+        text = _clean_text(execution.get(key))
+        if text:
+            meta[key] = text
+    if isinstance(record.get("geninfo_override"), dict):
+        meta["majoor_geninfo"] = record["geninfo_override"]
+    width, height = _positive_int(record.get("width")), _positive_int(record.get("height"))
+    if width and height:
+        meta["width"] = width
+        meta["height"] = height
+    return meta
+
+
+async def ingest_generated_file(
+    scanner: Any,
+    record: dict[str, Any],
+    *,
+    base_dir: str,
+    source: str = "output",
+    root_id: str | None = None,
+) -> Result[dict[str, Any]]:
+    """Write one save-node output (asset + metadata + journal) without extraction."""
+    raw_path = str(record.get("filepath") or "").strip()
+    if not raw_path:
+        return Result.Err("INVALID_INPUT", "filepath is required")
+    state = await build_index_file_state(scanner, file_path=Path(raw_path))
+    if isinstance(state, Result):
+        return state
+    file_path, filepath, state_hash, mtime, size = state
+
+    expected = _expected_state_hash(record, filepath)
+    if expected and expected != state_hash:
+        # The file changed after the node wrote it: its contents no longer match the record.
+        return Result.Err("STATE_CHANGED", "File changed since it was saved")
+
+    combined = build_generated_metadata(record, filepath=filepath, mtime=mtime, size=size)
+    await scanner.metadata.enrich_generation_metadata(combined)
+    metadata_result: Result[dict[str, Any]] = Result.Ok(combined, quality="full", source=DIRECT_INGEST_SOURCE)
+
+    rel_path = safe_relative_path(file_path, base_dir)
+    subfolder = str(rel_path.parent) if rel_path.parent != Path(".") else ""
+    try:
+        async with scanner.db.atransaction(mode="immediate") as tx:
+            if not tx.ok:
+                return Result.Err("DB_ERROR", tx.error or "Failed to begin transaction")
+            action, asset_id = await _write_asset_row(
+                scanner,
+                filename=file_path.name,
+                subfolder=subfolder,
+                filepath=filepath,
+                file_path=file_path,
+                mtime=mtime,
+                size=size,
+                metadata_result=metadata_result,
+                source=source,
+                root_id=root_id,
+            )
+            await _write_generated_rows(
+                scanner,
+                asset_id=asset_id,
+                filepath=filepath,
+                base_dir=base_dir,
+                state_hash=state_hash,
+                mtime=mtime,
+                size=size,
+                metadata_result=metadata_result,
+                source_node_type=_clean_text(combined.get("source_node_type")),
+            )
+    except _DirectIngestAbort as exc:
+        return Result.Err("DB_ERROR", str(exc))
+    if not tx.ok:
+        return Result.Err("DB_ERROR", tx.error or "Commit failed")
+    return Result.Ok({"action": action, "asset_id": asset_id, "filepath": filepath})
+
+
+def _expected_state_hash(record: dict[str, Any], filepath: str) -> str | None:
+    explicit = _clean_text(record.get("state_hash"), max_len=128)
+    if explicit:
+        return explicit
+    try:
+        mtime_ns = int(record["mtime_ns"])
+        size = int(record["size"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return compute_state_hash(filepath, mtime_ns, size)
+
+
+async def _write_asset_row(
+    scanner: Any,
+    *,
+    filename: str,
+    subfolder: str,
+    filepath: str,
+    file_path: Path,
+    mtime: int,
+    size: int,
+    metadata_result: Result[dict[str, Any]],
+    source: str,
+    root_id: str | None,
+) -> tuple[str, int]:
+    existing = await scanner.db.aquery("SELECT id FROM assets WHERE filepath = ? LIMIT 1", (filepath,))
+    if not existing.ok:
+        raise _DirectIngestAbort(existing.error or "Asset lookup failed")
+    if existing.data:
+        asset_id = int(existing.data[0]["id"])
+        result = await scanner._update_asset(
+            asset_id=asset_id,
+            file_path=file_path,
+            mtime=mtime,
+            size=size,
+            metadata_result=metadata_result,
+            source=source,
+            root_id=root_id,
+            write_metadata=False,
+            skip_lock=True,
+        )
+        action = "updated"
+    else:
+        result = await scanner._add_asset(
+            filename=filename,
+            subfolder=subfolder,
+            filepath=filepath,
+            kind=classify_file(filename),
+            mtime=mtime,
+            size=size,
+            file_path=file_path,
+            metadata_result=metadata_result,
+            source=source,
+            root_id=root_id,
+            write_metadata=False,
+            skip_lock=True,
+        )
+        action = "added"
+    if not result.ok or not isinstance(result.data, dict) or result.data.get("asset_id") is None:
+        raise _DirectIngestAbort(result.error or "Asset write failed")
+    return action, int(result.data["asset_id"])
+
+
+async def _write_generated_rows(
+    scanner: Any,
+    *,
+    asset_id: int,
+    filepath: str,
+    base_dir: str,
+    state_hash: str,
+    mtime: int,
+    size: int,
+    metadata_result: Result[dict[str, Any]],
+    source_node_type: str | None,
+) -> None:
+    # asset_metadata triggers keep assets_fts in sync with this row.
+    metadata_write = await MetadataHelpers.write_asset_metadata_row(
+        scanner.db, asset_id, metadata_result, filepath=filepath
+    )
+    if not metadata_write.ok:
+        raise _DirectIngestAbort(metadata_write.error or "Metadata write failed")
+    if source_node_type:
+        await scanner.db.aexecute(
+            "UPDATE assets SET source_node_type = ? WHERE id = ?",
+            (source_node_type, asset_id),
+        )
+    await MetadataHelpers.store_metadata_cache(scanner.db, filepath, state_hash, metadata_result)
+    journal = await scanner._write_scan_journal_entry(
+        filepath=filepath, base_dir=base_dir, state_hash=state_hash, mtime=mtime, size=size
+    )
+    if not journal.ok:
+        raise _DirectIngestAbort(journal.error or "Scan journal write failed")
+
+
+async def ingest_generated_files(
+    scanner: Any,
+    records: list[dict[str, Any]],
+    *,
+    base_dir: str,
+    source: str = "output",
+    root_id: str | None = None,
+) -> Result[dict[str, Any]]:
+    """Ingest a batch of save-node records; failures are reported, not raised."""
+    stats: dict[str, Any] = {"scanned": len(records), "added": 0, "updated": 0, "errors": 0}
+    added_ids: list[int] = []
+    failed: list[str] = []
+    for record in records:
+        try:
+            res = await ingest_generated_file(scanner, record, base_dir=base_dir, source=source, root_id=root_id)
+        except Exception as exc:
+            res = Result.Err("DIRECT_INGEST_FAILED", str(exc))
+        if res.ok and isinstance(res.data, dict):
+            action = str(res.data.get("action") or "")
+            stats[action] = int(stats.get(action) or 0) + 1
+            if action == "added":
+                added_ids.append(int(res.data["asset_id"]))
+            continue
+        stats["errors"] += 1
+        failed.append(str(record.get("filepath") or ""))
+        logger.debug("Direct ingest fell back for %s: %s", record.get("filepath"), res.error)
+    if added_ids:
+        stats["added_ids"] = added_ids
+        scanner._schedule_added_image_vector_index(prev_added_count=0, added_ids=added_ids)
+    stats["failed_paths"] = [p for p in failed if p]
+    return Result.Ok(stats)
@@ -369,10 +369,10 @@ class MetadataEnricher:
             )
             if res.ok and res.data:
                 payload = dict(res.data[0])
-                from ...adapters.comfy_core import send_event
+                from ...adapters.comfy_events import queue_event
                 from ...utils import sanitize_for_json
 
-                send_event("mjr-asset-updated", sanitize_for_json(payload))
+                queue_event("mjr-asset-updated", sanitize_for_json(payload))
         except Exception:
             pass
 
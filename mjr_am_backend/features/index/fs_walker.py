@@ -2,15 +2,18 @@
 FileSystemWalker — handles filesystem traversal and I/O throttling for directory scans.
 
 The walker runs on a thread-pool executor and pushes discovered file paths into a
-thread-safe Queue consumed by the async scan loop.
+thread-safe Queue consumed by the async scan loop. Directory listings fan out to a
+bounded pool of lister threads; with ``WalkSnapshots`` a directory whose mtime
+has not changed since the last complete scan is not listed again.
 """
 import os
 import threading
 import time
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from queue import Empty, Queue
+from queue import Empty, Full, Queue
 from typing import Any
 
 from ...shared import EXTENSIONS, FileKind, classify_file, get_logger
@@ -60,6 +63,57 @@ def scan_candidate_stat(candidate: ScanCandidate | Path) -> Any | None:
 def scan_candidate_kind(candidate: ScanCandidate | Path) -> FileKind | None:
     return candidate.kind if isinstance(candidate, ScanCandidate) else None
 
+
+
+@dataclass(frozen=True, slots=True)
+class DirSnapshot:
+    """Directory state captured when it was last listed completely."""
+
+    mtime_ns: int
+    entry_count: int
+    scanned_at: float
+    subdirs: tuple[str, ...] = ()
+
+
+# Directory mtimes written within this many seconds of the previous listing are
+# not trusted: coarse filesystem clocks (FAT, some SMB shares) could hide a write
+# that landed in the same tick as the listing.
+_SNAPSHOT_RACY_WINDOW_S = 2.0
+
+
+@dataclass(slots=True)
+class WalkSnapshots:
+    """
+    Per-directory snapshots for one walk.
+
+    ``previous`` comes from the last complete scan. A directory whose mtime still
+    matches is skipped: its files are not listed or stat'ed, and the walk descends
+    into the subdirectories recorded with it. ``current`` collects the state to
+    persist once the scan finishes cleanly.
+    """
+
+    previous: dict[str, DirSnapshot] = field(default_factory=dict)
+    current: dict[str, DirSnapshot] = field(default_factory=dict)
+    unchanged_dirs: set[str] = field(default_factory=set)
+    complete: bool = False
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def unchanged_subdirs(self, key: str, mtime_ns: int) -> tuple[str, ...] | None:
+        prev = self.previous.get(key)
+        if prev is None or prev.mtime_ns != int(mtime_ns):
+            return None
+        if int(mtime_ns) / 1e9 >= prev.scanned_at - _SNAPSHOT_RACY_WINDOW_S:
+            return None
+        with self._lock:
+            self.current[key] = prev
+            self.unchanged_dirs.add(key)
+        return prev.subdirs
+
+    def record(self, key: str, snapshot: DirSnapshot) -> None:
+        with self._lock:
+            self.current[key] = snapshot
+
+
 # ---------------------------------------------------------------------------
 # Module-level globals (previously in scanner.py)
 # ---------------------------------------------------------------------------
@@ -74,6 +128,21 @@ _FS_WALK_EXECUTOR = ThreadPoolExecutor(
     max_workers=_FS_WALK_MAX_WORKERS, thread_name_prefix="mjr-fs-walk"
 )
 
+try:
+    _FS_WALK_DIR_WORKERS = max(1, int(os.getenv("MAJOOR_FS_WALK_DIR_WORKERS", "4") or 4))
+except Exception:
+    _FS_WALK_DIR_WORKERS = 4
+
+# Directory listings for all walks share one bounded pool, so concurrent scans
+# cannot multiply the number of in-flight scandir calls on a NAS share.
+_FS_LIST_EXECUTOR = ThreadPoolExecutor(
+    max_workers=_FS_WALK_DIR_WORKERS, thread_name_prefix="mjr-fs-list"
+)
+
+# Candidates travel from lister threads to the walk generator in chunks.
+_WALK_CHUNK_SIZE = 256
+_WALK_QUEUE_CHUNKS = 64
+
 try:
     SCAN_IOPS_LIMIT = float(os.getenv("MAJOOR_SCAN_IOPS_LIMIT", "0") or 0.0)
 except Exception:
@@ -112,6 +181,7 @@ class FileSystemWalker:
     def __init__(self, scan_iops_limit: float) -> None:
         self._scan_iops_limit = scan_iops_limit
         self._scan_iops_next_ts = 0.0
+        self._scan_iops_lock = threading.Lock()
 
     # ------------------------------------------------------------------
     # I/O throttling
@@ -120,63 +190,135 @@ class FileSystemWalker:
     def _scan_iops_wait(self) -> None:
         """
         Best-effort I/O pacing for directory scans.
-        Runs in the walk producer thread to avoid blocking the event loop.
+        Runs in the lister threads to avoid blocking the event loop; the budget is
+        shared by all listers of the walk, so parallel listing keeps the same rate.
         """
         limit = self._scan_iops_limit
         if limit <= 0.0:
             return
-        now = time.perf_counter()
-        next_ts = self._scan_iops_next_ts
-        if next_ts > now:
-            time.sleep(next_ts - now)
+        step = 1.0 / limit
+        with self._scan_iops_lock:
             now = time.perf_counter()
-        step = 1.0 / limit if limit > 0.0 else 0.0
-        self._scan_iops_next_ts = max(next_ts, now) + step
+            slot = max(self._scan_iops_next_ts, now)
+            self._scan_iops_next_ts = slot + step
+        if slot > now:
+            time.sleep(slot - now)
 
     # ------------------------------------------------------------------
     # File iteration
     # ------------------------------------------------------------------
 
-    def iter_files(self, directory: Path, recursive: bool):
+    def iter_files(self, directory: Path, recursive: bool, snapshots: WalkSnapshots | None = None):
         """
         Generator — iterate over all asset files from directory (streaming).
 
+        Directories are listed on ``_FS_LIST_EXECUTOR`` (at most
+        ``_FS_WALK_DIR_WORKERS`` at a time); candidates are yielded as listings
+        complete, so order across directories is not deterministic.
+
         Args:
             directory: Directory to scan
             recursive: Scan subdirectories
+            snapshots: Optional per-directory snapshots used to skip unchanged
+                directories and to record the new state
 
         Yields:
             Scan candidates one by one
         """
-        if recursive:
-            # Iterative scandir is generally faster than os.walk on large trees/NAS shares.
-            stack: list[Path] = [directory]
-            while stack:
-                current = stack.pop()
+        out: Queue[tuple[str, Any]] = Queue(maxsize=_WALK_QUEUE_CHUNKS)
+        stop = threading.Event()
+
+        def _put(item: tuple[str, Any]) -> bool:
+            while not stop.is_set():
                 try:
-                    with os.scandir(current) as it:
-                        for entry in it:
-                            self._scan_iops_wait()
-                            next_dir = self._next_dir(entry)
-                            if isinstance(next_dir, Path):
-                                stack.append(next_dir)
-                                continue
-                            file_path = self._candidate(entry)
-                            if file_path is not None:
-                                yield file_path
-                except (OSError, PermissionError) as exc:
-                    logger.debug("Scan skipped inaccessible directory %s: %s", current, exc)
+                    out.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        def _list(current: Path) -> None:
+            subdirs: list[Path] = []
+            try:
+                subdirs = self._list_dir(current, snapshots, lambda chunk: _put(("files", chunk)))
+            except Exception:
+                logger.debug("Scan listing failed for %s", current, exc_info=True)
+            finally:
+                _put(("dir", subdirs))
+
+        pending: deque[Path] = deque([directory])
+        running = 0
+        try:
+            while pending or running:
+                while pending and running < _FS_WALK_DIR_WORKERS:
+                    _FS_LIST_EXECUTOR.submit(_list, pending.popleft())
+                    running += 1
+                kind, payload = out.get()
+                if kind == "files":
+                    yield from payload
                     continue
-        else:
+                running -= 1
+                if recursive:
+                    pending.extend(payload)
+        finally:
+            stop.set()
+
+    def _list_dir(self, current: Path, snapshots: WalkSnapshots | None, emit: Any) -> list[Path]:
+        """List one directory, emitting candidate chunks. Returns its subdirectories."""
+        key = str(current)
+        mtime_ns: int | None = None
+        scanned_at = time.time()
+        if snapshots is not None:
+            # Stat before listing: an entry added mid-listing changes the mtime
+            # we record, so the next walk lists this directory again.
+            self._scan_iops_wait()
             try:
-                with os.scandir(directory) as it:
-                    for entry in it:
-                        self._scan_iops_wait()
-                        candidate = self._candidate(entry)
-                        if candidate is not None:
-                            yield candidate
+                mtime_ns = os.stat(current).st_mtime_ns
             except (OSError, PermissionError) as exc:
-                logger.debug("Scan skipped inaccessible directory %s: %s", directory, exc)
+                logger.debug("Scan skipped inaccessible directory %s: %s", current, exc)
+                return []
+            known = snapshots.unchanged_subdirs(key, mtime_ns)
+            if known is not None:
+                return [Path(p) for p in known]
+        subdirs: list[Path] = []
+        chunk: list[ScanCandidate] = []
+        entry_count = 0
+        try:
+            # Iterative scandir is generally faster than os.walk on large trees/NAS shares.
+            with os.scandir(current) as it:
+                for entry in it:
+                    entry_count += 1
+                    self._scan_iops_wait()
+                    next_dir = self._next_dir(entry)
+                    if isinstance(next_dir, Path):
+                        subdirs.append(next_dir)
+                        continue
+                    candidate = self._candidate(entry)
+                    if candidate is None:
+                        continue
+                    chunk.append(candidate)
+                    if len(chunk) >= _WALK_CHUNK_SIZE:
+                        if not emit(chunk):
+                            return []
+                        chunk = []
+        except (OSError, PermissionError) as exc:
+            logger.debug("Scan skipped inaccessible directory %s: %s", current, exc)
+            if chunk:
+                emit(chunk)
+            return subdirs
+        if chunk and not emit(chunk):
+            return []
+        if snapshots is not None and mtime_ns is not None:
+            snapshots.record(
+                key,
+                DirSnapshot(
+                    mtime_ns=int(mtime_ns),
+                    entry_count=entry_count,
+                    scanned_at=scanned_at,
+                    subdirs=tuple(str(p) for p in subdirs),
+                ),
+            )
+        return subdirs
 
     @staticmethod
     def is_supported_file(path: Path) -> bool:
@@ -231,19 +373,31 @@ class FileSystemWalker:
         recursive: bool,
         stop_event: threading.Event,
         q: "Queue[ScanQueueItem]",
+        snapshots: WalkSnapshots | None = None,
     ) -> None:
         """Producer running on executor: walks filesystem and pushes paths into queue."""
         # Reset pacing window for each full walk.
         self._scan_iops_next_ts = 0.0
         try:
-            for fp in self.iter_files(dir_path, recursive):
-                if stop_event.is_set():
-                    break
-                try:
-                    q.put(fp)
-                except Exception:
-                    logger.debug("Walk queue push failed; stopping producer for %s", dir_path, exc_info=True)
-                    break
+            finished = True
+            files = self.iter_files(dir_path, recursive, snapshots)
+            try:
+                for fp in files:
+                    if stop_event.is_set():
+                        finished = False
+                        break
+                    try:
+                        q.put(fp)
+                    except Exception:
+                        logger.debug("Walk queue push failed; stopping producer for %s", dir_path, exc_info=True)
+                        finished = False
+                        break
+            finally:
+                close = getattr(files, "close", None)
+                if callable(close):
+                    close()
+            if snapshots is not None:
+                snapshots.complete = finished and not stop_event.is_set()
         except Exception:
             logger.debug("Filesystem walk failed for %s", dir_path, exc_info=True)
         finally:
@@ -230,6 +230,7 @@ async def update_asset(
                     workflow_id = COALESCE(?, workflow_id),
                     source_node_id = COALESCE(?, source_node_id),
                     content_hash = NULL,
+                    partial_hash = NULL,
                     phash = NULL,
                     hash_state = NULL,
                     indexed_at = CURRENT_TIMESTAMP
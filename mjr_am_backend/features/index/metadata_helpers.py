@@ -851,6 +851,23 @@ def _metadata_fts_text_for_result(
     return _build_metadata_fts_text(meta, extracted_tags_text, extras)
 
 
+def derived_metadata_columns(meta: dict[str, Any]) -> dict[str, Any]:
+    """Project a metadata payload onto the denormalized ``asset_metadata`` columns."""
+    metadata_result = Result.Ok(meta)
+    has_workflow, has_generation_data = _metadata_presence_flags(meta)
+    _rating, _tags_json, extracted_tags_text = _extract_rating_and_tags(metadata_result)
+    extracted_tags_text = _enrich_tags_text_with_metadata(metadata_result, extracted_tags_text)
+    workflow_type, generation_time_ms, positive_prompt = _denormalized_metadata_fields(metadata_result)
+    return {
+        "has_workflow": MetadataHelpers._bool_to_db(has_workflow),
+        "has_generation_data": MetadataHelpers._bool_to_db(has_generation_data),
+        "workflow_type": workflow_type,
+        "generation_time_ms": generation_time_ms,
+        "positive_prompt": positive_prompt,
+        "metadata_text": _metadata_fts_text_for_result(metadata_result, extracted_tags_text),
+    }
+
+
 def _graph_has_sampler(graph: Any) -> bool:
     try:
         # Workflow export: dict with `nodes: []` and nodes have `type`.
@@ -1205,6 +1222,35 @@ class MetadataHelpers:
                     asset_id,
                     exc,
                 )
+            # Keep the normalized generation columns used by metadata-term
+            # filters in step with the row just written.
+            try:
+                from .asset_generation import write_asset_generation_row
+
+                generation_res = await write_asset_generation_row(db, asset_id, metadata_result)
+                if not generation_res.ok:
+                    logger.debug(
+                        "asset_generation write failed for asset %s: %s",
+                        asset_id,
+                        generation_res.error,
+                    )
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.debug("asset_generation write raised for asset %s: %s", asset_id, exc)
+            # Record the payload's keys in the metadata key catalog.
+            try:
+                from ..metadata.key_aggregator import record_asset_metadata_keys
+
+                truncated = bool((metadata_result.meta or {}).get("truncated"))
+                keys_res = await record_asset_metadata_keys(
+                    db,
+                    asset_id,
+                    metadata_raw_json,
+                    None if truncated else metadata_result.data,
+                )
+                if not keys_res.ok:
+                    logger.debug("metadata key catalog write failed for asset %s: %s", asset_id, keys_res.error)
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.debug("metadata key catalog write raised for asset %s: %s", asset_id, exc)
             # Stamp the ComfyUI-core-aligned enrichment level on the assets row.
             # Level 2 = "metadata enriched"; never downgrade from a higher value.
             try:
@@ -0,0 +1,133 @@
+"""Load and persist per-directory walk snapshots for incremental scans."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from ...shared import Result, get_logger
+from .fs_walker import DirSnapshot, WalkSnapshots
+from .scan_prune import _escape_like
+
+logger = get_logger(__name__)
+
+
+def snapshot_scope(source: str, root_id: str | None) -> str:
+    return f"{str(source or 'output').strip().lower() or 'output'}:{root_id or ''}"
+
+
+def _subtree_clause(root: str, recursive: bool) -> tuple[str, tuple[Any, ...]]:
+    if not recursive:
+        return "dir_path = ?", (root,)
+    prefix = root.rstrip(os.sep) + os.sep
+    return "(dir_path = ? OR dir_path LIKE ? ESCAPE '\\')", (root, f"{_escape_like(prefix)}%")
+
+
+def _row_to_snapshot(row: dict[str, Any]) -> DirSnapshot | None:
+    try:
+        subdirs = json.loads(row.get("subdirs") or "[]")
+        return DirSnapshot(
+            mtime_ns=int(row["mtime_ns"]),
+            entry_count=int(row.get("entry_count") or 0),
+            scanned_at=float(row["scanned_at"]),
+            subdirs=tuple(str(p) for p in subdirs if p),
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+async def load_walk_snapshots(
+    scanner: Any,
+    *,
+    dir_path: Path,
+    recursive: bool,
+    incremental: bool,
+    source: str,
+    root_id: str | None,
+) -> WalkSnapshots:
+    """
+    Return the snapshots of ``dir_path`` (and its subtree when recursive).
+
+    Full scans start from an empty ``previous`` so every directory is listed,
+    while still recording fresh snapshots for the next incremental scan.
+    """
+    snapshots = WalkSnapshots()
+    if not incremental:
+        return snapshots
+    clause, params = _subtree_clause(str(dir_path), recursive)
+    res = await scanner.db.aquery(
+        f"SELECT dir_path, mtime_ns, entry_count, scanned_at, subdirs FROM scan_dir_snapshots WHERE scope = ? AND {clause}",
+        (snapshot_scope(source, root_id), *params),
+    )
+    if not res.ok:
+        logger.debug("Directory snapshots unavailable for %s: %s", dir_path, res.error)
+        return snapshots
+    for row in res.data or []:
+        snapshot = _row_to_snapshot(row)
+        if snapshot is not None:
+            snapshots.previous[str(row.get("dir_path") or "")] = snapshot
+    return snapshots
+
+
+async def persist_walk_snapshots(
+    scanner: Any,
+    *,
+    dir_path: Path,
+    recursive: bool,
+    source: str,
+    root_id: str | None,
+    snapshots: WalkSnapshots,
+) -> Result[int]:
+    """Replace the stored snapshots under ``dir_path`` with those of a complete walk."""
+    if not snapshots.complete:
+        return Result.Ok(0)
+    scope = snapshot_scope(source, root_id)
+    clause, params = _subtree_clause(str(dir_path), recursive)
+    rows = [
+        (scope, key, snap.mtime_ns, snap.entry_count, snap.scanned_at, json.dumps(list(snap.subdirs)))
+        for key, snap in snapshots.current.items()
+    ]
+    async with scanner.db.atransaction(mode="immediate") as tx:
+        if not tx.ok:
+            return Result.Err("DB_ERROR", tx.error or "Failed to begin transaction")
+        deleted = await scanner.db.aexecute(
+            f"DELETE FROM scan_dir_snapshots WHERE scope = ? AND {clause}",
+            (scope, *params),
+        )
+        if not deleted.ok:
+            return Result.Err("DB_ERROR", deleted.error or "Failed to clear directory snapshots")
+        if rows:
+            inserted = await scanner.db.aexecutemany(
+                "INSERT OR REPLACE INTO scan_dir_snapshots "
+                "(scope, dir_path, mtime_ns, entry_count, scanned_at, subdirs) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if not inserted.ok:
+                return Result.Err("DB_ERROR", inserted.error or "Failed to write directory snapshots")
+    if not tx.ok:
+        return Result.Err("DB_ERROR", tx.error or "Commit failed")
+    return Result.Ok(len(rows))
+
+
+async def clear_dir_snapshots(db: Any) -> Result[int]:
+    """
+    Forget every snapshot so the next scan lists all directories again.
+
+    Used when journal or asset rows are reset. Snapshot keys are not resolved
+    paths, so a partial reset clears all scopes rather than risk skipping a
+    directory whose assets were just removed.
+    """
+    res = await db.aexecute("DELETE FROM scan_dir_snapshots")
+    if not res.ok:
+        return res
+    return Result.Ok(int(res.data or 0))
+
+
+__all__ = [
+    "clear_dir_snapshots",
+    "load_walk_snapshots",
+    "persist_walk_snapshots",
+    "snapshot_scope",
+]
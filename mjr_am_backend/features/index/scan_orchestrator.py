@@ -13,6 +13,7 @@ from .fs_walker import _EXT_TO_KIND
 from .index_batching import finalize_index_paths, index_paths_batches
 from .metadata_helpers import MetadataHelpers
 from .scan_batch_utils import empty_index_stats, new_index_stats, new_scan_stats
+from .scan_dir_snapshots import load_walk_snapshots, persist_walk_snapshots
 from .scan_prune import prune_missing_assets_after_scan
 from .scan_streaming import run_scan_streaming_loop
 
@@ -67,6 +68,14 @@ async def scan_directory(
 
         stats: dict[str, Any] = new_scan_stats()
         try:
+            snapshots = await load_walk_snapshots(
+                scanner,
+                dir_path=dir_path,
+                recursive=recursive,
+                incremental=incremental,
+                source=source,
+                root_id=root_id,
+            )
             await run_scan_streaming_loop(
                 scanner,
                 dir_path=dir_path,
@@ -79,19 +88,34 @@ async def scan_directory(
                 stats=stats,
                 to_enrich=to_enrich,
                 added_ids=added_ids,
+                snapshots=snapshots,
             )
+            stats["dirs_unchanged"] = len(snapshots.unchanged_dirs)
             prune_res = await prune_missing_assets_after_scan(
                 scanner,
                 directory=directory,
                 recursive=recursive,
                 source=source,
                 root_id=root_id,
+                unchanged_dirs=snapshots.unchanged_dirs if snapshots.complete else None,
             )
             if prune_res.ok:
                 stats["pruned"] = int(prune_res.data or 0)
             else:
                 stats["errors"] += 1
                 logger.warning("Failed to prune stale scan rows: %s", prune_res.error)
+            # A directory is only trusted next time if all of its files were indexed.
+            if not stats["errors"]:
+                snap_res = await persist_walk_snapshots(
+                    scanner,
+                    dir_path=dir_path,
+                    recursive=recursive,
+                    source=source,
+                    root_id=root_id,
+                    snapshots=snapshots,
+                )
+                if not snap_res.ok:
+                    logger.debug("Failed to persist directory snapshots: %s", snap_res.error)
         finally:
             stats["end_time"] = datetime.now().isoformat()
             duration = time.perf_counter() - scan_start
@@ -100,7 +100,16 @@ async def prune_missing_assets_after_scan(
     recursive: bool,
     source: str,
     root_id: str | None,
+    unchanged_dirs: set[str] | None = None,
 ) -> Result[int]:
+    """
+    Delete asset rows under ``directory`` whose file no longer exists.
+
+    ``unchanged_dirs`` are directories the walk found unmodified since the last
+    complete scan: their entries cannot have disappeared, so their rows are kept
+    without a per-file ``exists()`` probe.
+    """
+    unchanged = {normalize_filepath_str(d) for d in unchanged_dirs or ()}
     rows_res = await _candidate_rows(
         scanner,
         directory=directory,
@@ -118,6 +127,8 @@ async def prune_missing_assets_after_scan(
             continue
         if not recursive and not _is_direct_child(filepath, root):
             continue
+        if unchanged and normalize_filepath_str(str(Path(filepath).parent)) in unchanged:
+            continue
         try:
             asset_id = int(row.get("id") or 0)
         except (TypeError, ValueError):
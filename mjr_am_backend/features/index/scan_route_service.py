@@ -14,6 +14,7 @@ from aiohttp import web
 
 from ...shared import Result, get_logger
 from ...utils import parse_bool
+from .scan_dir_snapshots import clear_dir_snapshots
 
 _log = get_logger(__name__)
 
@@ -431,6 +432,12 @@ async def _run_enabled_reset_clears(
         if not res.ok:
             return Result.Err(res.code, res.error or f"Failed to clear {key}")
         cleared[key] = int(res.data or 0)
+    if flags.get("scan_journal") or flags.get("assets"):
+        # Directory snapshots let incremental scans skip unchanged folders; once
+        # their journal/asset rows are gone those folders must be listed again.
+        snap_res = await clear_dir_snapshots(db)
+        if not snap_res.ok:
+            _log.debug("Failed to clear directory snapshots: %s", snap_res.error)
     return Result.Ok(cleared)
 
 
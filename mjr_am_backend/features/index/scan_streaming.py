@@ -13,7 +13,7 @@ from queue import Queue
 from typing import Any
 
 from ...config import SCAN_BATCH_XL, SCAN_LOG_PROGRESS_EVERY, SCAN_LOG_PROGRESS_MIN_SECONDS
-from .fs_walker import _FS_WALK_EXECUTOR, ScanQueueItem, scan_candidate_path
+from .fs_walker import _FS_WALK_EXECUTOR, ScanQueueItem, WalkSnapshots, scan_candidate_path
 from .index_batching import BatchCandidate, existing_map_for_batch, index_batch
 from .scan_batch_utils import normalize_filepath_str, stream_batch_target
 from .scan_storage_ops import get_journal_entries
@@ -32,6 +32,7 @@ async def run_scan_streaming_loop(
     stats: dict[str, Any],
     to_enrich: list[str],
     added_ids: list[int] | None = None,
+    snapshots: WalkSnapshots | None = None,
 ) -> None:
     loop = asyncio.get_running_loop()
     stop_event = threading.Event()
@@ -43,6 +44,7 @@ async def run_scan_streaming_loop(
         recursive,
         stop_event,
         q,
+        snapshots,
     )
     try:
         await consume_scan_queue(
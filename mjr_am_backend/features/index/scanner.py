@@ -660,9 +660,9 @@ class IndexScanner:
         payload = dict(row)
         self._parse_row_auto_tags(payload)
         try:
-            from ...adapters.comfy_core import send_event
+            from ...adapters.comfy_events import queue_event
 
-            send_event("mjr-asset-updated", sanitize_for_json(payload))
+            queue_event("mjr-asset-updated", sanitize_for_json(payload))
         except Exception as exc:
             logger.debug(
                 "Failed to emit vector asset update for asset_id=%s: %s",
@@ -1,6 +1,7 @@
 """
 Index searcher - handles asset search and retrieval operations.
 """
+import asyncio
 import base64
 import json
 import os
@@ -11,6 +12,7 @@ from pathlib import Path
 from typing import Any
 
 from ...adapters.db.sqlite import Sqlite
+from ...adapters.db.stack_representative import representative_key
 from ...config import (
     SEARCH_MAX_BATCH_IDS,
     SEARCH_MAX_FILEPATH_LOOKUP,
@@ -20,6 +22,7 @@ from ...config import (
     SEARCH_MAX_TOKEN_LENGTH,
     SEARCH_MAX_TOKENS,
 )
+from ...data.repositories import AssetCountersRepository, CounterScope, SearchTermsRepository
 from ...shared import Result, get_logger
 from . import search_hydration as _hydr
 
@@ -49,6 +52,12 @@ MAX_FILEPATH_LOOKUP = SEARCH_MAX_FILEPATH_LOOKUP
 VALID_SORT_KEYS = {"mtime_desc", "mtime_asc", "name_asc", "name_desc", "rating_desc", "size_desc", "size_asc"}
 _SAFE_SQL_FRAGMENT_RE = re.compile(r"^[\s\w\.\(\)=<>\?!,'\\%:$-]+$")
 _FTS_RESERVED = {"AND", "OR", "NOT", "NEAR"}
+# Internal filter key: restrict rows to unstacked assets and stack representatives.
+_STACK_REPRESENTATIVES_ONLY = "stack_representatives_only"
+# Internal filter key: drop members of stacks an earlier grouped page emitted.
+_EMITTED_STACK_IDS = "emitted_stack_ids"
+# Filters that never split a stack (members share source and output root).
+_STACK_NEUTRAL_FILTER_KEYS = frozenset({"group_stacks", "source", "exclude_root"})
 _LONG_QUERY_OR_THRESHOLD = 7
 _MAX_PREFIX_TOKENS = 16
 _STOPWORDS_FR_EN = {
@@ -146,6 +155,48 @@ def _build_token_match_expression(tokens: list[str]) -> str:
     return " ".join(terms)
 
 
+# The trigram tokenizer cannot match anything shorter than three characters.
+_NAME_SUBSTRING_MIN_LENGTH = 3
+# Substring-only name hits rank after word matches on names (bm25) and metadata (+2.0).
+_NAME_SUBSTRING_RANK_ARM = """
+                UNION ALL
+
+                SELECT rowid AS asset_id, (bm25(assets_name_trigram) + 4.0) AS rank
+                FROM assets_name_trigram
+                WHERE assets_name_trigram MATCH ?
+"""
+_NAME_SUBSTRING_COUNT_ARM = """
+                UNION
+
+                SELECT rowid AS asset_id
+                FROM assets_name_trigram
+                WHERE assets_name_trigram MATCH ?
+"""
+# Autocomplete checks (and at most refreshes) ``search_terms`` this often.
+_SEARCH_TERMS_REFRESH_INTERVAL_S = 60.0
+
+
+def _build_name_substring_query(query: str) -> str:
+    """
+    Build an ``assets_name_trigram`` MATCH expression from a raw query.
+
+    Every whitespace-separated token must occur as a substring of the
+    filename or subfolder. Returns ``""`` when a token is too short for the
+    trigram index, since dropping it would widen the match.
+    """
+    text = re.sub(r"[\"'\x00-\x1f\x7f]+", " ", query)
+    tokens = _dedupe_tokens([tok.strip("*").lower() for tok in text.split() if tok.strip("*")])
+    if not tokens or any(len(tok) < _NAME_SUBSTRING_MIN_LENGTH for tok in tokens):
+        return ""
+    return " ".join(f'"{tok}"' for tok in tokens[:_MAX_PREFIX_TOKENS])
+
+
+def _name_substring_arm(name_query: str, *, count: bool = False) -> tuple[str, list[Any]]:
+    if not name_query:
+        return "", []
+    return (_NAME_SUBSTRING_COUNT_ARM if count else _NAME_SUBSTRING_RANK_ARM), [name_query]
+
+
 def _is_meaningful_token(token: str) -> bool:
     if not token or len(token) <= 1:
         return False
@@ -159,47 +210,102 @@ def _is_meaningful_token(token: str) -> bool:
 _SAFE_ALIAS_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_.]{0,60}$")
 
 
-def _build_sort_sql(sort: str | None, *, table_alias: str = "a", rank_alias: str | None = None) -> str:
+# Keyset (seek) pagination: every ORDER BY is described by its terms so the
+# cursor predicate always matches the ordering it continues.
+# Each term is (cursor payload field, SQL expression template, "ASC"/"DESC");
+# ``{t}`` is the asset table alias and ``{r}`` the FTS rank expression.
+_RANK_SORT = "rank"
+_SORT_TERMS: dict[str, tuple[tuple[str, str, str], ...]] = {
+    "name_asc": (("filename", "LOWER({t}.filename)", "ASC"), ("id", "{t}.id", "DESC")),
+    "name_desc": (("filename", "LOWER({t}.filename)", "DESC"), ("id", "{t}.id", "DESC")),
+    "mtime_asc": (("mtime", "{t}.mtime", "ASC"), ("id", "{t}.id", "ASC")),
+    "rating_desc": (
+        ("rating", "COALESCE(m.rating, 0)", "DESC"),
+        ("mtime", "{t}.mtime", "DESC"),
+        ("id", "{t}.id", "DESC"),
+    ),
+    "size_desc": (
+        ("size", "COALESCE({t}.size, 0)", "DESC"),
+        ("mtime", "{t}.mtime", "DESC"),
+        ("id", "{t}.id", "DESC"),
+    ),
+    "size_asc": (
+        ("size", "COALESCE({t}.size, 0)", "ASC"),
+        ("mtime", "{t}.mtime", "DESC"),
+        ("id", "{t}.id", "DESC"),
+    ),
+    "mtime_desc": (("mtime", "{t}.mtime", "DESC"), ("id", "{t}.id", "DESC")),
+    # FTS orderings: relevance only (global search) and newest-first with
+    # relevance as the tie-break (scoped default sort).
+    _RANK_SORT: (("rank", "{r}", "ASC"), ("id", "{t}.id", "DESC")),
+    "mtime_desc:rank": (("mtime", "{t}.mtime", "DESC"), ("rank", "{r}", "ASC"), ("id", "{t}.id", "DESC")),
+}
+_CURSOR_FIELD_TYPES: dict[str, Any] = {
+    "id": int,
+    "mtime": int,
+    "size": int,
+    "rating": int,
+    "rank": float,
+    "filename": lambda v: str(v or "").lower(),
+}
+
+
+def _sort_plan(sort: str | None, *, rank_alias: str | None = None) -> str:
+    """Return the ``_SORT_TERMS`` key for *sort*, honouring the FTS rank pseudo-sort."""
+    if sort == _RANK_SORT:
+        return _RANK_SORT if rank_alias else "mtime_desc"
+    key = _normalize_sort_key(sort)
+    if key == "mtime_desc" and rank_alias:
+        return "mtime_desc:rank"
+    return key
+
+
+def _sort_terms(
+    sort: str | None, *, table_alias: str = "a", rank_alias: str | None = None
+) -> tuple[str, list[tuple[str, str, str]]]:
     if not _SAFE_ALIAS_RE.fullmatch(table_alias):
         raise ValueError(f"Unsafe table_alias: {table_alias!r}")
     if rank_alias is not None and not _SAFE_ALIAS_RE.fullmatch(rank_alias):
         raise ValueError(f"Unsafe rank_alias: {rank_alias!r}")
-    key = _normalize_sort_key(sort)
-    if key == "name_asc":
-        return f"ORDER BY LOWER({table_alias}.filename) ASC, {table_alias}.id DESC"
-    if key == "name_desc":
-        return f"ORDER BY LOWER({table_alias}.filename) DESC, {table_alias}.id DESC"
-    if key == "mtime_asc":
-        return f"ORDER BY {table_alias}.mtime ASC, {table_alias}.id ASC"
-    if key == "rating_desc":
-        return f"ORDER BY COALESCE(m.rating, 0) DESC, {table_alias}.mtime DESC, {table_alias}.id DESC"
-    if key == "size_desc":
-        return f"ORDER BY COALESCE({table_alias}.size, 0) DESC, {table_alias}.mtime DESC, {table_alias}.id DESC"
-    if key == "size_asc":
-        return f"ORDER BY COALESCE({table_alias}.size, 0) ASC, {table_alias}.mtime DESC, {table_alias}.id DESC"
-    if rank_alias:
-        return f"ORDER BY {table_alias}.mtime DESC, {rank_alias} ASC, {table_alias}.id DESC"
-    return f"ORDER BY {table_alias}.mtime DESC, {table_alias}.id DESC"
-
-
-def _encode_page_cursor(asset: dict[str, Any], sort: str | None) -> str | None:
+    plan = _sort_plan(sort, rank_alias=rank_alias)
+    terms = [
+        (field, expr.format(t=table_alias, r=rank_alias or ""), direction)
+        for field, expr, direction in _SORT_TERMS[plan]
+    ]
+    return plan, terms
+
+
+def _build_sort_sql(sort: str | None, *, table_alias: str = "a", rank_alias: str | None = None) -> str:
+    _plan, terms = _sort_terms(sort, table_alias=table_alias, rank_alias=rank_alias)
+    return "ORDER BY " + ", ".join(f"{expr} {direction}" for _field, expr, direction in terms)
+
+
+def _encode_page_cursor(
+    asset: dict[str, Any],
+    sort: str | None,
+    *,
+    rank_alias: str | None = None,
+    stack_ids: set[int] | None = None,
+) -> str | None:
+    """Encode the seek position after *asset*; grouped pages also carry emitted *stack_ids*."""
     if not isinstance(asset, dict):
         return None
-    sort_key = _normalize_sort_key(sort)
-    payload: dict[str, Any] = {"sort": sort_key, "id": int(asset.get("id") or 0)}
+    plan = _sort_plan(sort, rank_alias=rank_alias)
+    payload: dict[str, Any] = {"sort": plan}
+    try:
+        for field, _expr, _direction in _SORT_TERMS[plan]:
+            payload[field] = _CURSOR_FIELD_TYPES[field](asset.get(field) or 0)
+    except (TypeError, ValueError):
+        return None
     if payload["id"] <= 0:
         return None
-    if sort_key in {"name_asc", "name_desc"}:
-        payload["filename"] = str(asset.get("filename") or "").lower()
-    elif sort_key == "mtime_asc":
-        payload["mtime"] = int(asset.get("mtime") or 0)
-    else:
-        payload["mtime"] = int(asset.get("mtime") or 0)
+    if stack_ids:
+        payload["stacks"] = sorted(stack_ids)
     raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
     return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
 
 
-def _decode_page_cursor(cursor: str | None, sort: str | None) -> dict[str, Any] | None:
+def _decode_page_cursor(cursor: str | None, sort: str | None, *, rank_alias: str | None = None) -> dict[str, Any] | None:
     text = str(cursor or "").strip()
     if not text:
         return None
@@ -210,44 +316,71 @@ def _decode_page_cursor(cursor: str | None, sort: str | None) -> dict[str, Any]
         return None
     if not isinstance(payload, dict):
         return None
-    if payload.get("sort") != _normalize_sort_key(sort):
+    plan = _sort_plan(sort, rank_alias=rank_alias)
+    if payload.get("sort") != plan:
         return None
     try:
-        payload["id"] = int(payload.get("id") or 0)
-        payload["mtime"] = int(payload.get("mtime") or 0)
-    except Exception:
+        for field, _expr, _direction in _SORT_TERMS[plan]:
+            payload[field] = _CURSOR_FIELD_TYPES[field](payload.get(field) or 0)
+    except (TypeError, ValueError):
         return None
     return payload if payload["id"] > 0 else None
 
 
-def _build_cursor_where_clause(cursor: str | None, sort: str | None, *, table_alias: str = "a") -> tuple[str, list[Any]]:
-    payload = _decode_page_cursor(cursor, sort)
+def _cursor_stack_ids(payload: dict[str, Any] | None) -> set[int]:
+    """Stack ids a grouped cursor carries over from the pages before it."""
+    raw = (payload or {}).get("stacks")
+    if not isinstance(raw, list):
+        return set()
+    return {sid for sid in (_safe_positive_int(v) for v in raw) if sid is not None}
+
+
+def _plan_uses_rank(sort: str | None, rank_alias: str | None) -> bool:
+    return any(field == "rank" for field, _expr, _direction in _SORT_TERMS[_sort_plan(sort, rank_alias=rank_alias)])
+
+
+def _build_cursor_where_clause(
+    cursor: str | None,
+    sort: str | None,
+    *,
+    table_alias: str = "a",
+    rank_alias: str | None = None,
+) -> tuple[str, list[Any]]:
+    """
+    Build the ``AND (...)`` seek predicate selecting rows strictly after *cursor*.
+
+    Expands the sort terms lexicographically: ``e1 > ? OR (e1 = ? AND (e2 > ? OR ...))``,
+    prefixed with the redundant bound ``e1 >= ?`` so SQLite can turn the
+    leading term into an index range seek instead of scanning from the start.
+    """
+    payload = _decode_page_cursor(cursor, sort, rank_alias=rank_alias)
     if not payload:
         return "", []
-    key = _normalize_sort_key(sort)
-    if key == "name_asc":
-        filename = str(payload.get("filename") or "")
-        return (
-            f"AND (LOWER({table_alias}.filename) > ? OR (LOWER({table_alias}.filename) = ? AND {table_alias}.id < ?))",
-            [filename, filename, payload["id"]],
-        )
-    if key == "name_desc":
-        filename = str(payload.get("filename") or "")
-        return (
-            f"AND (LOWER({table_alias}.filename) < ? OR (LOWER({table_alias}.filename) = ? AND {table_alias}.id < ?))",
-            [filename, filename, payload["id"]],
-        )
-    if key == "mtime_asc":
-        mtime = int(payload.get("mtime") or 0)
-        return (
-            f"AND ({table_alias}.mtime > ? OR ({table_alias}.mtime = ? AND {table_alias}.id > ?))",
-            [mtime, mtime, payload["id"]],
-        )
-    mtime = int(payload.get("mtime") or 0)
-    return (
-        f"AND ({table_alias}.mtime < ? OR ({table_alias}.mtime = ? AND {table_alias}.id < ?))",
-        [mtime, mtime, payload["id"]],
-    )
+    _plan, terms = _sort_terms(sort, table_alias=table_alias, rank_alias=rank_alias)
+    clause = ""
+    params: list[Any] = []
+    for field, expr, direction in reversed(terms):
+        op = "<" if direction == "DESC" else ">"
+        value = payload[field]
+        if not clause:
+            clause = f"{expr} {op} ?"
+            params = [value]
+            continue
+        inner = clause if len(params) == 1 else f"({clause})"
+        clause = f"{expr} {op} ? OR ({expr} = ? AND {inner})"
+        params = [value, value, *params]
+    _field, lead_expr, lead_direction = terms[0]
+    lead_op = "<=" if lead_direction == "DESC" else ">="
+    return f"AND {lead_expr} {lead_op} ? AND ({clause})", [params[0], *params]
+
+
+def _cursor_sort_for(query: str, sort: str | None, roots: list[str] | None) -> tuple[str | None, str | None]:
+    """Return the ``(sort, rank_alias)`` pair the listing path for *query* pages with."""
+    if query.strip() == "*":
+        return sort, None
+    if roots is None:
+        return _RANK_SORT, "best.rank"
+    return sort, "best.rank"
 
 
 def _append_tag_filter(filters: dict[str, Any], clauses: list[str], params: list[Any]) -> None:
@@ -284,9 +417,11 @@ def _build_filter_clauses(filters: dict[str, Any] | None, alias: str = "a") -> t
     _append_workflow_id_filter(filters, alias, clauses, params)
     _append_workflow_type_filter(filters, clauses, params)
     _append_has_workflow_filter(filters, clauses)
-    _append_metadata_terms_filter(filters, clauses, params)
+    _append_metadata_terms_filter(filters, clauses, params, alias)
     _append_mtime_filters(filters, alias, clauses, params)
     _append_exclude_root_filter(filters, alias, clauses, params)
+    _append_stack_representative_filter(filters, alias, clauses)
+    _append_emitted_stacks_filter(filters, alias, clauses, params)
     return clauses, params
 
 
@@ -384,6 +519,69 @@ def _metadata_term_paths(field: str) -> list[str]:
         return []
 
 
+def _canonical_metadata_term_field(field: str) -> str:
+    try:
+        from mjr_am_backend.features.metadata.section_catalog import iter_search_aliases
+
+        return iter_search_aliases().get(field, field)
+    except Exception:
+        return field
+
+
+# Metadata-term fields answered from the normalized ``asset_generation``
+# columns (indexed, no JSON parsing). ``prompt`` text already lives in
+# ``metadata_text``; fields and aliases without a column (``denoise``,
+# ``control``, ...) still probe ``metadata_raw``.
+_GENERATION_TERM_TEXT_COLUMNS: dict[str, tuple[str, ...]] = {
+    "model": ("models",),
+    "lora": ("loras",),
+    "sampler": ("sampler", "scheduler"),
+    "scheduler": ("scheduler",),
+}
+_GENERATION_TERM_NUMERIC_COLUMNS: dict[str, tuple[str, ...]] = {
+    "sampler": ("seed", "steps", "cfg"),
+    "seed": ("seed",),
+    "steps": ("steps",),
+    "cfg": ("cfg",),
+}
+_GENERATION_TERM_ALIASES: dict[str, str] = {
+    "checkpoint": "model",
+    "ckpt": "model",
+    "vae": "model",
+    "clip": "model",
+    "loras": "lora",
+    "lycoris": "lora",
+    "sampling": "sampler",
+}
+
+
+def _numeric_term_value(value: str) -> int | float | None:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if number != number or number in (float("inf"), float("-inf")):
+        return None
+    return int(number) if number.is_integer() else number
+
+
+def _generation_term_clause(field: str, value: str, alias: str) -> tuple[str, list[Any]] | None:
+    field = _GENERATION_TERM_ALIASES.get(field, field)
+    text_columns = _GENERATION_TERM_TEXT_COLUMNS.get(field, ())
+    pattern = f"%{_escape_like_pattern(value)}%"
+    predicates = [f"g.{column} LIKE ? ESCAPE '\\'" for column in text_columns]
+    term_params: list[Any] = [pattern] * len(text_columns)
+    numeric = _numeric_term_value(value)
+    if numeric is not None:
+        for column in _GENERATION_TERM_NUMERIC_COLUMNS.get(field, ()):
+            predicates.append(f"g.{column} = ?")
+            term_params.append(numeric)
+    if not predicates:
+        return None
+    sql = f"{alias}.id IN (SELECT g.asset_id FROM asset_generation g WHERE {' OR '.join(predicates)})"
+    return sql, term_params
+
+
 def _metadata_text_expr_for_field(field: str) -> str:
     paths = _metadata_term_paths(field)
     if not paths:
@@ -391,10 +589,26 @@ def _metadata_text_expr_for_field(field: str) -> str:
     pieces = ["COALESCE(m.metadata_text, '')"]
     for path in paths[:12]:
         pieces.append(f"COALESCE(CAST({_safe_metadata_json_extract(path)} AS TEXT), '')")
-    return " || ' ' || ".join(pieces)
+    # printf() rather than ``||``, which the SQL fragment guard rejects.
+    return f"printf('{' '.join(['%s'] * len(pieces))}', {', '.join(pieces)})"
+
 
+def _metadata_term_clause(field: str, value: str, alias: str) -> tuple[str, list[Any]]:
+    canonical = _canonical_metadata_term_field(field)
+    generation = _generation_term_clause(field, value, alias)
+    if generation is not None:
+        return generation
+    if canonical == "prompt":
+        return "LOWER(COALESCE(m.metadata_text, '')) LIKE ?", [f"%{value.lower()}%"]
+    return f"LOWER({_metadata_text_expr_for_field(canonical)}) LIKE ?", [f"%{value.lower()}%"]
 
-def _append_metadata_terms_filter(filters: dict[str, Any], clauses: list[str], params: list[Any]) -> None:
+
+def _append_metadata_terms_filter(
+    filters: dict[str, Any],
+    clauses: list[str],
+    params: list[Any],
+    alias: str = "a",
+) -> None:
     terms = filters.get("metadata_terms")
     if not isinstance(terms, list) or not terms:
         return
@@ -409,12 +623,11 @@ def _append_metadata_terms_filter(filters: dict[str, Any], clauses: list[str], p
         field = str(term.get("field") or "").strip().lower()
         if not value:
             continue
-        expr = _metadata_text_expr_for_field(field)
-        clause = f"LOWER({expr}) LIKE ?"
+        clause, clause_params = _metadata_term_clause(field, value, alias)
         if bool(term.get("exclude")):
             clause = f"NOT ({clause})"
         term_clauses.append(f"({clause})")
-        term_params.append(f"%{value.lower()}%")
+        term_params.extend(clause_params)
     if not term_clauses:
         return
     clauses.append(f"AND ({joiner.join(term_clauses)})")
@@ -422,23 +635,23 @@ def _append_metadata_terms_filter(filters: dict[str, Any], clauses: list[str], p
 
 
 def _safe_positive_prompt_extract(max_len: int = 250) -> str:
-    """Extract positive prompt from metadata_raw across multiple storage formats.
+    """Return the positive prompt for a result row.
 
-    - ComfyUI workflow images store it at $.positive_prompt
-    - A1111/geninfo images store it at $.geninfo.positive.value
-    Gen Info is authoritative when available. The denormalized database field
-    remains a fallback for older indexed assets.
+    The denormalized ``m.positive_prompt`` column is written at index time
+    from Gen Info first (``$.geninfo.positive.value``) and then the ComfyUI
+    ``$.positive_prompt`` key, so it is read directly. ``metadata_raw`` is
+    only parsed for legacy rows whose column is still empty.
     """
     n = int(max_len)
     return (
         "COALESCE("
+        f"SUBSTR(NULLIF(TRIM(COALESCE(m.positive_prompt, '')), ''), 1, {n}), "
         "CASE WHEN json_valid(COALESCE(m.metadata_raw, '')) THEN "
         f"SUBSTR(COALESCE("
         f"NULLIF(TRIM(COALESCE(json_extract(m.metadata_raw, '$.geninfo.positive.value'), '')), ''), "
         f"NULLIF(TRIM(COALESCE(json_extract(m.metadata_raw, '$.positive_prompt'), '')), '')"
         f"), 1, {n}) "
-        "ELSE NULL END, "
-        "NULLIF(TRIM(COALESCE(m.positive_prompt, '')), '')"
+        "ELSE NULL END"
         ")"
     )
 
@@ -570,6 +783,42 @@ def _assert_safe_sql_fragment(fragment: str, *, label: str = "sql_fragment") ->
         raise ValueError(f"Unsafe {label}")
 
 
+def _append_stack_representative_filter(filters: dict[str, Any], alias: str, clauses: list[str]) -> None:
+    """Keep unstacked assets and the materialized representative of each stack."""
+    if not filters.get(_STACK_REPRESENTATIVES_ONLY):
+        return
+    clauses.append(
+        f"AND ({alias}.stack_id IS NULL OR {alias}.id = COALESCE("
+        f"(SELECT s.rep_asset_id FROM asset_stacks s WHERE s.id = {alias}.stack_id), {alias}.id))"
+    )
+
+
+def _append_emitted_stacks_filter(
+    filters: dict[str, Any], alias: str, clauses: list[str], params: list[Any]
+) -> None:
+    """Skip members of stacks whose group an earlier cursor page already returned."""
+    stack_ids = filters.get(_EMITTED_STACK_IDS)
+    if not stack_ids:
+        return
+    clauses.append(f"AND ({alias}.stack_id IS NULL OR {alias}.stack_id NOT IN (SELECT value FROM json_each(?)))")
+    params.append(json.dumps(sorted(int(sid) for sid in stack_ids)))
+
+
+def _can_group_stacks_in_sql(query: str, filters: dict[str, Any] | None) -> bool:
+    """
+    Return True when grouped results can come straight from ``rep_asset_id``.
+
+    Representatives are chosen over all members, so this only holds for
+    browse listings whose filters keep or drop whole stacks; text search and
+    per-asset filters still group the matching rows in Python.
+    """
+    if query.strip() != "*":
+        return False
+    remaining = {k: v for k, v in (filters or {}).items() if k not in _STACK_NEUTRAL_FILTER_KEYS}
+    clauses, _params = _build_filter_clauses(remaining)
+    return not clauses
+
+
 def _normalize_pagination(limit: int, offset: int) -> tuple[int, int]:
     limit_i = max(0, min(SEARCH_MAX_LIMIT, int(limit)))
     offset_i = max(0, min(SEARCH_MAX_OFFSET, int(offset)))
@@ -652,6 +901,26 @@ def _build_histogram_query(
     return " ".join(sql_parts), tuple(params)
 
 
+def _histogram_counter_days(start_i: int, end_i: int, filters: dict[str, Any] | None) -> tuple[str, str] | None:
+    """
+    Return the ``[start_day, end_day)`` counter range when ``asset_counters`` can answer.
+
+    Counters are bucketed by UTC day and kind, so the bounds must sit on day
+    boundaries and no filter other than ``kind`` may be present.
+    """
+    if start_i % 86400 or end_i % 86400:
+        return None
+    remaining = _sanitize_histogram_filters(filters)
+    remaining.pop("kind", None)
+    clauses, _params = _build_filter_clauses(remaining)
+    if clauses:
+        return None
+    return (
+        time.strftime("%Y-%m-%d", time.gmtime(start_i)),
+        time.strftime("%Y-%m-%d", time.gmtime(end_i)),
+    )
+
+
 def _coerce_histogram_days(rows: Any) -> dict[str, int]:
     days: dict[str, int] = {}
     for row in rows or []:
@@ -759,38 +1028,9 @@ def _stack_group_key(asset: dict[str, Any]) -> str:
     return f"asset:{_safe_positive_int(asset.get('id')) or 0}"
 
 
-def _is_video_with_audio(asset: dict[str, Any]) -> bool:
-    """Check if asset is a video that contains audio (detected by filename pattern)."""
-    kind = str(asset.get("kind") or "").strip().lower()
-    if kind != "video":
-        return False
-    filename = str(asset.get("filename") or "").lower()
-    # Videos with audio typically have "-audio" or "_audio" suffix before extension
-    # e.g., "video_00001-audio.mp4", "clip_audio.mp4"
-    return "-audio" in filename or "_audio" in filename
-
-
-def _group_priority(asset: dict[str, Any]) -> tuple[int, int, int, int]:
-    kind = str(asset.get("kind") or "").strip().lower()
-    # Priority for stack representatives:
-    # - Video with audio (2) > Video (1) > Image (0)
-    # This ensures video with audio is shown as the stack cover in the grid
-    if _is_video_with_audio(asset):
-        kind_priority = 2
-    elif kind == "video":
-        kind_priority = 1
-    else:
-        kind_priority = 0
-    has_generation = 1 if int(asset.get("has_generation_data") or 0) else 0
-    size = int(asset.get("size") or 0)
-    mtime = int(asset.get("mtime") or 0)
-    # Prioritize: video_with_audio > video > image, then most recent, generation data, size
-    return (kind_priority, mtime, has_generation, size)
-
-
 def _select_group_representative(current: dict[str, Any], candidate: dict[str, Any]) -> dict[str, Any]:
-    current_priority = _group_priority(current)
-    candidate_priority = _group_priority(candidate)
+    current_priority = representative_key(current)
+    candidate_priority = representative_key(candidate)
     if candidate_priority > current_priority:
         return candidate
     return current
@@ -882,8 +1122,20 @@ async def _paginate_grouped_assets(
     limit: int,
     offset: int,
     include_total: bool,
+    encode_cursor=None,
 ) -> Result[dict[str, Any]]:
+    """
+    Merge raw rows into stack groups until the requested page is covered.
+
+    With *encode_cursor*, one extra group is looked ahead: the raw row just
+    before its first member becomes ``next_cursor``, so the next page seeks
+    straight to the unconsumed rows instead of regrouping from the start.
+    ``encode_cursor(row, stack_ids)`` is awaited with the stack ids of every
+    group up to the page end, so the next page can skip members of those
+    stacks that sort after the cursor.
+    """
     target = max(0, offset) + max(0, limit)
+    boundary: dict[str, Any] | None = {"groups": target} if encode_cursor is not None and limit > 0 else None
     raw_offset = 0
     raw_chunk = max(200, min(2000, max(limit, 1) * 10))
     grouped_assets: list[dict[str, Any]] = []
@@ -899,6 +1151,7 @@ async def _paginate_grouped_assets(
         raw_chunk=raw_chunk,
         raw_offset=raw_offset,
         include_total=include_total,
+        boundary=boundary,
     )
     if not result.ok:
         return Result.Err(result.code, result.error or "Grouped search query failed")
@@ -907,7 +1160,12 @@ async def _paginate_grouped_assets(
 
     total = len(grouped_assets) if include_total else None
     page_assets = grouped_assets[offset: offset + limit] if limit > 0 else []
-    return Result.Ok({"assets": page_assets, "total": total})
+    payload: dict[str, Any] = {"assets": page_assets, "total": total}
+    if boundary is not None:
+        last_row = boundary.get("row")
+        emitted = {sid for sid in (_safe_positive_int(a.get("stack_id")) for a in grouped_assets[:target]) if sid}
+        payload["next_cursor"] = await encode_cursor(last_row, emitted) if last_row else ""
+    return Result.Ok(payload)
 
 
 async def _collect_grouped_assets(
@@ -921,9 +1179,10 @@ async def _collect_grouped_assets(
     raw_chunk: int,
     raw_offset: int,
     include_total: bool,
+    boundary: dict[str, Any] | None = None,
 ) -> Result[None]:
     while True:
-        if not include_total and len(grouped_assets) >= target:
+        if not include_total and len(grouped_assets) >= target and (boundary is None or "row" in boundary):
             return Result.Ok(None)
         raw_chunk = _adapt_raw_chunk(raw_chunk, len(grouped_assets), raw_offset, target)
         rows_res = await fetch_rows(raw_chunk, raw_offset)
@@ -932,7 +1191,7 @@ async def _collect_grouped_assets(
         rows = _rows_from_grouped_result(rows_res.data)
         if not rows:
             return Result.Ok(None)
-        _merge_grouped_rows(rows, hydrate_rows, grouped_assets, grouped_by_key, stack_counts)
+        _merge_grouped_rows(rows, hydrate_rows, grouped_assets, grouped_by_key, stack_counts, boundary)
         row_count = len(rows)
         raw_offset += row_count
         if row_count < raw_chunk:
@@ -951,10 +1210,21 @@ def _merge_grouped_rows(
     grouped_assets: list[dict[str, Any]],
     grouped_by_key: dict[str, dict[str, Any]],
     stack_counts: dict[str, int],
+    boundary: dict[str, Any] | None = None,
 ) -> None:
     for asset in hydrate_rows(rows):
-        if isinstance(asset, dict):
-            _merge_asset_into_group(asset, grouped_assets, grouped_by_key, stack_counts)
+        if not isinstance(asset, dict):
+            continue
+        if (
+            boundary is not None
+            and "row" not in boundary
+            and len(grouped_assets) == boundary["groups"]
+            and _stack_group_key(asset) not in grouped_by_key
+        ):
+            boundary["row"] = boundary.get("last")
+        _merge_asset_into_group(asset, grouped_assets, grouped_by_key, stack_counts)
+        if boundary is not None:
+            boundary["last"] = asset
 
 
 def _build_grouped_search_result(
@@ -984,6 +1254,15 @@ def _safe_positive_int(value: Any) -> int | None:
     return None
 
 
+def _log_search_terms_refresh_failure(task: asyncio.Task[None]) -> None:
+    """Retrieve the background refresh's exception so asyncio does not report it unhandled."""
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.warning("Search terms refresh failed: %s", exc)
+
+
 class IndexSearcher:
     """
     Handles asset search and retrieval operations.
@@ -1003,6 +1282,9 @@ class IndexSearcher:
         self.db = db
         self._has_tags_text_column = False
         self.fts_vocab_ready = False
+        self._name_trigram_ready = False
+        self._search_terms_checked_at = float("-inf")
+        self._search_terms_task: asyncio.Task[None] | None = None
         # Lightweight total-count cache: avoids expensive COUNT(*)
         # on every search-as-you-type keystroke. Entries expire after
         # _BROWSE_COUNT_TTL seconds.
@@ -1025,16 +1307,25 @@ class IndexSearcher:
 
     async def autocomplete(self, prefix: str, limit: int = 10) -> Result[list[str]]:
         """
-        Suggest completions for the given prefix using FTS5 vocabulary.
-        """
-        await self.ensure_vocab()
-        if not self.fts_vocab_ready:
-            return Result.Ok([])
+        Suggest completions for the given prefix, most frequent terms first.
 
+        Reads the materialized ``search_terms`` table (v33+), refreshing it in
+        the background when indexed text changed; falls back to the FTS5
+        vocabulary on databases without it.
+        """
         clean_prefix = prefix.strip()
         if not clean_prefix or len(clean_prefix) < 2:
             return Result.Ok([])
 
+        suggested = await SearchTermsRepository(self.db).suggest(_strip_diacritics(clean_prefix), limit)
+        if suggested.ok:
+            self._schedule_search_terms_refresh()
+            return suggested
+        logger.debug("Search terms unavailable, reading the FTS vocabulary: %s", suggested.error)
+
+        await self.ensure_vocab()
+        if not self.fts_vocab_ready:
+            return Result.Ok([])
         try:
             escaped_prefix = _escape_like_pattern(clean_prefix)
             res = await self.db.aquery(
@@ -1049,6 +1340,38 @@ class IndexSearcher:
         except Exception:
             return Result.Ok([])
 
+    def _schedule_search_terms_refresh(self) -> None:
+        task = self._search_terms_task
+        if task is not None and not task.done():
+            return
+        now = time.monotonic()
+        if now - self._search_terms_checked_at < _SEARCH_TERMS_REFRESH_INTERVAL_S:
+            return
+        self._search_terms_checked_at = now
+        self._search_terms_task = asyncio.create_task(self._refresh_search_terms())
+        self._search_terms_task.add_done_callback(_log_search_terms_refresh_failure)
+
+    async def _refresh_search_terms(self) -> None:
+        repo = SearchTermsRepository(self.db)
+        stale = await repo.needs_refresh(_SEARCH_TERMS_REFRESH_INTERVAL_S)
+        if not stale.ok or not stale.data:
+            return
+        res = await repo.refresh()
+        if not res.ok:
+            logger.debug("Search terms refresh failed: %s", res.error)
+
+    async def _name_substring_query(self, query: str) -> str:
+        """Trigram MATCH expression for *query*, or ``""`` without the v33 index."""
+        name_query = _build_name_substring_query(query)
+        if not name_query:
+            return ""
+        if not self._name_trigram_ready:
+            try:
+                self._name_trigram_ready = bool(await self.db.ahas_table("assets_name_trigram"))
+            except Exception:
+                self._name_trigram_ready = False
+        return name_query if self._name_trigram_ready else ""
+
     def _validate_search_query(self, query: str) -> Result[Any] | None:
         if not query or not query.strip():
             return Result.Err("EMPTY_QUERY", "Search query cannot be empty")
@@ -1223,20 +1546,29 @@ class IndexSearcher:
         filters: dict[str, Any] | None,
         include_total: bool,
         metadata_tags_text_clause: str,
+        cursor: str | None = None,
+        name_query: str = "",
     ) -> Result[dict[str, Any]]:
         # Never use COUNT(*) OVER() here — on large result sets the window
         # function forces SQLite to materialise every matching row before it
         # can return page 1, making first-page loads slow at scale.
         # _global_fts_total_count runs a lean UNION count query instead.
-        sql_parts = [self._global_fts_select_sql("", metadata_tags_text_clause)]
-        params: list[Any] = [fts_query, fts_query]
+        name_arm, name_params = _name_substring_arm(name_query)
+        sql_parts = [self._global_fts_select_sql("", metadata_tags_text_clause, name_arm)]
+        params: list[Any] = [fts_query, fts_query, *name_params]
 
         filter_clauses, filter_params = self._filter_clauses(filters)
         sql_parts.extend(filter_clauses)
         params.extend(filter_params)
-        sql_parts.append("ORDER BY rank")
+        cursor_clause, cursor_params = _build_cursor_where_clause(
+            cursor, _RANK_SORT, table_alias="a", rank_alias="best.rank"
+        )
+        if cursor_clause:
+            sql_parts.append(cursor_clause)
+            params.extend(cursor_params)
+        sql_parts.append(_build_sort_sql(_RANK_SORT, table_alias="a", rank_alias="best.rank"))
         sql_parts.append("LIMIT ? OFFSET ?")
-        params.extend([limit, offset])
+        params.extend([limit + 1 if limit > 0 else limit, offset])
 
         rows_res = await self._run_search_query_rows(
             " ".join(sql_parts),
@@ -1246,14 +1578,18 @@ class IndexSearcher:
         if not rows_res.ok:
             return Result.Err(rows_res.code, rows_res.error or "Search query failed")
         rows = rows_res.data or []
+        next_cursor = "" if limit > 0 else None
+        if limit > 0 and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_page_cursor(rows[-1], _RANK_SORT, rank_alias="best.rank")
 
         total: int | None = None
         if include_total:
-            total = await self._global_fts_total_count(fts_query, filter_clauses, filter_params)
-        return Result.Ok({"rows": rows, "total": total})
+            total = await self._global_fts_total_count(fts_query, filter_clauses, filter_params, name_query)
+        return Result.Ok({"rows": rows, "total": total, "next_cursor": next_cursor})
 
     @staticmethod
-    def _global_fts_select_sql(total_field: str, metadata_tags_text_clause: str) -> str:
+    def _global_fts_select_sql(total_field: str, metadata_tags_text_clause: str, name_arm: str = "") -> str:
         return f"""
             WITH matches AS (
                 SELECT rowid AS asset_id, bm25(assets_fts, 8.0, 1.25) AS rank
@@ -1265,7 +1601,7 @@ class IndexSearcher:
                 SELECT rowid AS asset_id, (bm25(asset_metadata_fts, 7.0, 4.0, 1.5) + 2.0) AS rank
                 FROM asset_metadata_fts
                 WHERE asset_metadata_fts MATCH ?
-            ),
+{name_arm}            ),
             best AS (
                 SELECT asset_id, MIN(rank) AS rank
                 FROM matches
@@ -1297,8 +1633,10 @@ class IndexSearcher:
         fts_query: str,
         filter_clauses: list[str],
         filter_params: list[Any],
+        name_query: str = "",
     ) -> int:
-        count_sql = """
+        name_arm, name_params = _name_substring_arm(name_query, count=True)
+        count_sql = f"""
             WITH matches AS (
                 SELECT rowid AS asset_id
                 FROM assets_fts
@@ -1309,14 +1647,14 @@ class IndexSearcher:
                 SELECT rowid AS asset_id
                 FROM asset_metadata_fts
                 WHERE asset_metadata_fts MATCH ?
-            )
+{name_arm}            )
             SELECT COUNT(*) as total
             FROM (SELECT DISTINCT asset_id FROM matches) t
             JOIN assets a ON t.asset_id = a.id
             LEFT JOIN asset_metadata m ON a.id = m.asset_id
             WHERE 1=1
         """
-        count_params: list[Any] = [fts_query, fts_query]
+        count_params: list[Any] = [fts_query, fts_query, *name_params]
         if filter_clauses:
             count_sql += " " + " ".join(filter_clauses)
             count_params.extend(filter_params)
@@ -1414,7 +1752,10 @@ class IndexSearcher:
         include_total: bool,
         metadata_tags_text_clause: str,
         sort: str | None,
+        cursor: str | None = None,
+        name_query: str = "",
     ) -> Result[dict[str, Any]]:
+        name_arm, name_params = _name_substring_arm(name_query)
         sql_parts = [
             f"""
             WITH matches AS (
@@ -1427,7 +1768,7 @@ class IndexSearcher:
                 SELECT rowid AS asset_id, (bm25(asset_metadata_fts, 7.0, 4.0, 1.5) + 2.0) AS rank
                 FROM asset_metadata_fts
                 WHERE asset_metadata_fts MATCH ?
-            ),
+{name_arm}            ),
             best AS (
                 SELECT asset_id, MIN(rank) AS rank
                 FROM matches
@@ -1452,15 +1793,21 @@ class IndexSearcher:
             WHERE {roots_clause}
             """
         ]
-        params: list[Any] = [fts_query, fts_query]
+        params: list[Any] = [fts_query, fts_query, *name_params]
         params.extend(roots_params)
 
         filter_clauses, filter_params = self._filter_clauses(filters, assert_safe=True)
         sql_parts.extend(filter_clauses)
         params.extend(filter_params)
+        cursor_clause, cursor_params = _build_cursor_where_clause(
+            cursor, sort, table_alias="a", rank_alias="best.rank"
+        )
+        if cursor_clause:
+            sql_parts.append(cursor_clause)
+            params.extend(cursor_params)
         sql_parts.append(_build_sort_sql(sort, table_alias="a", rank_alias="best.rank"))
         sql_parts.append("LIMIT ? OFFSET ?")
-        params.extend([limit, offset])
+        params.extend([limit + 1 if limit > 0 else limit, offset])
 
         rows_res = await self._run_search_query_rows(
             " ".join(sql_parts),
@@ -1470,9 +1817,14 @@ class IndexSearcher:
         if not rows_res.ok:
             return Result.Err(rows_res.code, rows_res.error or "Scoped search query failed")
         rows = rows_res.data or []
+        next_cursor = "" if limit > 0 else None
+        if limit > 0 and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_page_cursor(rows[-1], sort, rank_alias="best.rank")
 
         total: int | None = None
         if include_total:
+            count_arm, _ = _name_substring_arm(name_query, count=True)
             count_sql = f"""
                 WITH matches AS (
                     SELECT rowid AS asset_id
@@ -1484,21 +1836,21 @@ class IndexSearcher:
                     SELECT rowid AS asset_id
                     FROM asset_metadata_fts
                     WHERE asset_metadata_fts MATCH ?
-                )
+{count_arm}                )
                 SELECT COUNT(*) as total
                 FROM (SELECT DISTINCT asset_id FROM matches) t
                 JOIN assets a ON t.asset_id = a.id
                 LEFT JOIN asset_metadata m ON a.id = m.asset_id
                 WHERE {roots_clause}
             """
-            count_params: list[Any] = [fts_query, fts_query]
+            count_params: list[Any] = [fts_query, fts_query, *name_params]
             count_params.extend(roots_params)
             if filter_clauses:
                 count_sql += " " + " ".join(filter_clauses)
                 count_params.extend(filter_params)
             count_result = await self.db.aquery(count_sql, tuple(count_params))
             total = count_result.data[0]["total"] if count_result.ok and count_result.data else 0
-        return Result.Ok({"rows": rows, "total": total})
+        return Result.Ok({"rows": rows, "total": total, "next_cursor": next_cursor})
     async def search(
         self,
         query: str,
@@ -1506,9 +1858,13 @@ class IndexSearcher:
         offset: int = 0,
         filters: dict[str, Any] | None = None,
         include_total: bool = False,
+        cursor: str | None = None,
     ) -> Result[dict[str, Any]]:
         """
         Search assets using FTS5 or browse mode when query is '*'.
+
+        Pass the previous page's ``next_cursor`` as *cursor* to seek past it
+        instead of scanning ``offset`` rows.
         """
         limit, offset = _normalize_pagination(limit, offset)
         validation = self._validate_search_query(query)
@@ -1527,6 +1883,7 @@ class IndexSearcher:
             metadata_tags_text_clause=metadata_tags_text_clause,
             include_highlight=True,
             roots=None,
+            cursor=cursor,
         )
     async def search_scoped(
         self,
@@ -1582,6 +1939,41 @@ class IndexSearcher:
         roots: list[str] | None,
         sort: str | None = None,
         cursor: str | None = None,
+    ) -> Result[dict[str, Any]]:
+        seek_sort, rank_alias = _cursor_sort_for(query, sort, roots)
+        page_offset = offset
+        if _decode_page_cursor(cursor, seek_sort, rank_alias=rank_alias) is not None:
+            # The cursor already positions the page; ``offset`` is only echoed back.
+            offset = 0
+        result = await self._dispatch_search(
+            query=query,
+            limit=limit,
+            offset=offset,
+            filters=filters,
+            include_total=include_total,
+            metadata_tags_text_clause=metadata_tags_text_clause,
+            include_highlight=include_highlight,
+            roots=roots,
+            sort=sort,
+            cursor=cursor,
+        )
+        if result.ok and isinstance(result.data, dict):
+            result.data["offset"] = page_offset
+        return result
+
+    async def _dispatch_search(
+        self,
+        *,
+        query: str,
+        limit: int,
+        offset: int,
+        filters: dict[str, Any] | None,
+        include_total: bool,
+        metadata_tags_text_clause: str,
+        include_highlight: bool,
+        roots: list[str] | None,
+        sort: str | None = None,
+        cursor: str | None = None,
     ) -> Result[dict[str, Any]]:
         if filters and filters.get("group_stacks"):
             return await self._search_grouped_assets(
@@ -1634,6 +2026,22 @@ class IndexSearcher:
         sort: str | None = None,
         cursor: str | None = None,
     ) -> Result[dict[str, Any]]:
+        if _can_group_stacks_in_sql(query, filters):
+            return await self._search_grouped_browse(
+                limit=limit,
+                offset=offset,
+                filters=filters,
+                include_total=include_total,
+                metadata_tags_text_clause=metadata_tags_text_clause,
+                include_highlight=include_highlight,
+                roots=roots,
+                sort=sort,
+                cursor=cursor,
+            )
+        seek_sort, rank_alias = _cursor_sort_for(query, sort, roots)
+        carried = _cursor_stack_ids(_decode_page_cursor(cursor, seek_sort, rank_alias=rank_alias))
+        if carried:
+            filters = {**(filters or {}), _EMITTED_STACK_IDS: carried}
         fetch_rows = self._build_grouped_fetch_rows(
             query=query,
             roots=roots,
@@ -1642,12 +2050,19 @@ class IndexSearcher:
             sort=sort,
             cursor=cursor,
         )
+
+        async def _encode_grouped_cursor(asset: dict[str, Any], stack_ids: set[int]) -> str | None:
+            position = _encode_page_cursor(asset, seek_sort, rank_alias=rank_alias)
+            pending = await self._stacks_with_rows_after(carried | stack_ids, position, seek_sort, rank_alias)
+            return _encode_page_cursor(asset, seek_sort, rank_alias=rank_alias, stack_ids=pending)
+
         grouped_res = await _paginate_grouped_assets(
             fetch_rows,
             lambda rows: _hydrate_search_rows(rows, include_highlight=include_highlight),
             limit=limit,
             offset=offset,
             include_total=include_total,
+            encode_cursor=_encode_grouped_cursor,
         )
         if not grouped_res.ok:
             return Result.Err(grouped_res.code, grouped_res.error or "Grouped search query failed")
@@ -1661,9 +2076,98 @@ class IndexSearcher:
                 include_total=include_total,
                 total=grouped_data.get("total"),
                 sort=sort,
+                next_cursor=grouped_data.get("next_cursor"),
             )
         )
 
+    async def _search_grouped_browse(
+        self,
+        *,
+        limit: int,
+        offset: int,
+        filters: dict[str, Any] | None,
+        include_total: bool,
+        metadata_tags_text_clause: str,
+        include_highlight: bool,
+        roots: list[str] | None,
+        sort: str | None,
+        cursor: str | None,
+    ) -> Result[dict[str, Any]]:
+        """Grouped browse as one keyset query over unstacked assets and stack representatives."""
+        rep_filters = {**(filters or {}), _STACK_REPRESENTATIVES_ONLY: True}
+        if roots is None:
+            rows_total_res = await self._search_global_browse_rows(
+                limit=limit,
+                offset=offset,
+                filters=rep_filters,
+                include_total=include_total,
+                metadata_tags_text_clause=metadata_tags_text_clause,
+                sort=sort,
+                cursor=cursor,
+            )
+        else:
+            roots_clause, roots_params = _build_roots_where_clause(roots)
+            rows_total_res = await self._search_scoped_browse_rows(
+                roots_clause=roots_clause,
+                roots_params=roots_params,
+                limit=limit,
+                offset=offset,
+                filters=rep_filters,
+                include_total=include_total,
+                metadata_tags_text_clause=metadata_tags_text_clause,
+                sort=sort,
+                cursor=cursor,
+            )
+        result = self._rows_to_search_result(
+            rows_total_res,
+            query="*",
+            limit=limit,
+            offset=offset,
+            include_total=include_total,
+            include_highlight=include_highlight,
+            sort=sort,
+            failure_message="Grouped search query failed",
+        )
+        if result.ok and isinstance(result.data, dict):
+            await self._attach_stack_member_counts(result.data.get("assets") or [])
+        return result
+
+    async def _attach_stack_member_counts(self, assets: list[dict[str, Any]]) -> None:
+        stack_ids = sorted({sid for sid in (_safe_positive_int(a.get("stack_id")) for a in assets) if sid})
+        counts: dict[int, int] = {}
+        if stack_ids:
+            res = await self.db.aquery_in(
+                "SELECT id, asset_count FROM asset_stacks WHERE {IN_CLAUSE}",
+                "id",
+                stack_ids,
+            )
+            if res.ok:
+                counts = {int(r["id"]): int(r.get("asset_count") or 0) for r in (res.data or [])}
+        for asset in assets:
+            stack_id = _safe_positive_int(asset.get("stack_id"))
+            asset["stack_asset_count"] = max(1, counts.get(stack_id or 0, 1))
+
+    async def _stacks_with_rows_after(
+        self, stack_ids: set[int], cursor: str | None, sort: str | None, rank_alias: str | None
+    ) -> set[int]:
+        """
+        Return the stacks in *stack_ids* with a member sorting after *cursor*.
+
+        Only those can still surface on later pages. FTS rank is not
+        available outside the match, so rank orderings keep every id.
+        """
+        if not stack_ids or not cursor or _plan_uses_rank(sort, rank_alias):
+            return set(stack_ids)
+        clause, params = _build_cursor_where_clause(cursor, sort, table_alias="a", rank_alias=rank_alias)
+        res = await self.db.aquery(
+            "SELECT DISTINCT a.stack_id FROM assets a LEFT JOIN asset_metadata m ON m.asset_id = a.id "
+            f"WHERE a.stack_id IN (SELECT value FROM json_each(?)) {clause}",
+            (json.dumps(sorted(stack_ids)), *params),
+        )
+        if not res.ok:
+            return set(stack_ids)
+        return {int(row["stack_id"]) for row in res.data or []}
+
     def _build_grouped_fetch_rows(
         self,
         *,
@@ -1693,11 +2197,13 @@ class IndexSearcher:
                     return Result.Err("INVALID_INPUT", "Invalid search query syntax")
                 return await self._search_global_fts_rows(
                     fts_query=fts_query,
+                    name_query=await self._name_substring_query(query),
                     limit=raw_limit,
                     offset=raw_offset,
                     filters=filters,
                     include_total=False,
                     metadata_tags_text_clause=metadata_tags_text_clause,
+                    cursor=cursor,
                 )
 
             return _fetch_global_group_rows
@@ -1722,6 +2228,7 @@ class IndexSearcher:
                 return Result.Err("INVALID_INPUT", "Invalid search query syntax")
             return await self._search_scoped_fts_rows(
                 fts_query=fts_query,
+                name_query=await self._name_substring_query(query),
                 roots_clause=roots_clause,
                 roots_params=roots_params,
                 limit=raw_limit,
@@ -1730,6 +2237,7 @@ class IndexSearcher:
                 include_total=False,
                 metadata_tags_text_clause=metadata_tags_text_clause,
                 sort=sort,
+                cursor=cursor,
             )
 
         return _fetch_scoped_group_rows
@@ -1761,11 +2269,13 @@ class IndexSearcher:
                 return Result.Err("INVALID_INPUT", "Invalid search query syntax")
             rows_total_res = await self._search_global_fts_rows(
                 fts_query=fts_query,
+                name_query=await self._name_substring_query(query),
                 limit=limit,
                 offset=offset,
                 filters=filters,
                 include_total=include_total,
                 metadata_tags_text_clause=metadata_tags_text_clause,
+                cursor=cursor,
             )
         return self._rows_to_search_result(
             rows_total_res,
@@ -1811,6 +2321,7 @@ class IndexSearcher:
                 return Result.Err("INVALID_INPUT", "Invalid search query syntax")
             rows_total_res = await self._search_scoped_fts_rows(
                 fts_query=fts_query,
+                name_query=await self._name_substring_query(query),
                 roots_clause=roots_clause,
                 roots_params=roots_params,
                 limit=limit,
@@ -1819,6 +2330,7 @@ class IndexSearcher:
                 include_total=include_total,
                 metadata_tags_text_clause=metadata_tags_text_clause,
                 sort=sort,
+                cursor=cursor,
             )
         return self._rows_to_search_result(
             rows_total_res,
@@ -1894,6 +2406,8 @@ class IndexSearcher:
         month_start: int,
         month_end: int,
         filters: dict[str, Any] | None = None,
+        *,
+        scopes: list[CounterScope] | None = None,
     ) -> Result[dict[str, int]]:
         """
         Return a day->count mapping for assets whose mtime falls inside [month_start, month_end).
@@ -1901,6 +2415,8 @@ class IndexSearcher:
         Notes:
         - Uses UTC day buckets to stay aligned with list/search date filters.
         - Intended for calendar "days with assets" indicators (no query/FTS).
+        - With *scopes* and no ad-hoc filter besides ``kind``, days are read
+          from ``asset_counters`` instead of grouping the month's rows.
         """
         cleaned_roots = _resolve_search_roots(roots)
         if not cleaned_roots:
@@ -1910,6 +2426,17 @@ class IndexSearcher:
         if month_range is None:
             return Result.Err("INVALID_INPUT", "Invalid month range")
         start_i, end_i = month_range
+        counter_days = _histogram_counter_days(start_i, end_i, filters) if scopes else None
+        if counter_days is not None:
+            kind = (filters or {}).get("kind")
+            counted = await AssetCountersRepository(self.db).day_histogram(
+                scopes or [],
+                *counter_days,
+                kind=kind if isinstance(kind, str) and kind else None,
+            )
+            if counted.ok:
+                return counted
+            logger.debug("Asset counters unavailable, grouping histogram live: %s", counted.error)
         roots_clause, roots_params = _build_roots_where_clause(cleaned_roots, alias="a")
         sql, params = _build_histogram_query(roots_clause, roots_params, start_i, end_i, filters)
         result = await self.db.aquery(sql, params)
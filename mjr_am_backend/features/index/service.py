@@ -18,9 +18,11 @@ from mjr_am_shared.scan_throttle import mark_directory_indexed
 
 from ...adapters.db.sqlite import Sqlite
 from ...config import BATCH_ASSET_PUSH_LIMIT, is_vector_search_enabled
+from ...data.repositories import CounterScope
 from ...shared import Result, get_logger
 from ...utils import sanitize_for_json
 from ..metadata import MetadataService
+from .direct_ingest import ingest_generated_files, release_paths
 from .enricher import MetadataEnricher
 from .metadata_helpers import MetadataHelpers
 from .scan_batch_utils import compute_state_hash, normalize_filepath_str
@@ -34,6 +36,8 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+_THUMB_PREFETCH_CHUNK = 500
+
 
 def _normalize_rename_paths(old_filepath: str, new_filepath: str) -> tuple[str, str]:
     return str(old_filepath or ""), normalize_filepath_str(str(new_filepath or ""))
@@ -265,6 +269,7 @@ class IndexService:
 
         if result.ok:
             self._emit_scan_complete_event(result.data)
+            await self._prefetch_added_thumbnails(result.data)
             if not fast:
                 mark_directory_indexed(directory, source, root_id, metadata_complete=True)
 
@@ -304,9 +309,47 @@ class IndexService:
         )
         if res.ok:
             await self._emit_index_paths_notifications(res.data, source=source, root_id=root_id)
+            await self._prefetch_added_thumbnails(res.data)
             mark_directory_indexed(base_dir, source, root_id)
         return res
 
+    async def ingest_generated(
+        self,
+        records: list[dict[str, Any]],
+        base_dir: str,
+        source: str = "output",
+        root_id: str | None = None,
+    ) -> Result[dict[str, Any]]:
+        """
+        Index files just written by a Majoor save node from the node's own record.
+
+        Each record carries the prompt/workflow/geninfo the node embedded, so no
+        metadata extraction runs.  Files that cannot be ingested directly (e.g.
+        changed on disk since the save) fall back to ``index_paths``.
+
+        Args:
+            records: Save-node records (``filepath``, ``prompt``, ``extra_pnginfo``, ...)
+            base_dir: Output directory the files were saved under
+            source: Source identifier for the index
+            root_id: Root identifier for the index
+
+        Returns:
+            Result with ingest statistics
+        """
+        await self._ensure_vector_services_async()
+        res = await ingest_generated_files(self._scanner, records, base_dir=base_dir, source=source, root_id=root_id)
+        if not res.ok:
+            return res
+        data = res.data or {}
+        await self._emit_added_assets_notifications(data)
+        await self._prefetch_added_thumbnails(data)
+        failed = [str(p) for p in data.pop("failed_paths", []) if p]
+        if failed:
+            release_paths(failed)
+            fallback = await self.index_paths([Path(p) for p in failed], base_dir, True, source, root_id)
+            data["fallback"] = fallback.data if fallback.ok else {"error": fallback.error}
+        return Result.Ok(data)
+
     async def remove_file(self, filepath: str) -> Result[bool]:
         """
         Remove a file from the index.
@@ -408,7 +451,7 @@ class IndexService:
         if not added_ids:
             return
         try:
-            from ...adapters.comfy_events import emit_event
+            from ...adapters.comfy_events import queue_event
 
             batch_res = await self.get_assets_batch(list(added_ids[:BATCH_ASSET_PUSH_LIMIT]))
             if not batch_res.ok or not batch_res.data:
@@ -416,13 +459,37 @@ class IndexService:
             for asset in batch_res.data:
                 try:
                     payload = sanitize_for_json(dict(asset))
-                    emit_event("mjr-asset-added", payload)
-                    emit_event("mjr.asset.indexed", payload)
+                    queue_event("mjr-asset-added", payload)
+                    queue_event("mjr.asset.indexed", payload)
                 except Exception as exc:
                     logger.debug("Failed to push mjr-asset-added for one asset: %s", exc)
         except Exception as exc:
             logger.warning("Failed to emit mjr-asset-added events: %s", exc)
 
+    async def _prefetch_added_thumbnails(self, data: Any) -> None:
+        """Queue grid thumbnails for newly added assets so scrolling never waits on rendering."""
+        added_ids = list((data or {}).get("added_ids") or [])
+        if not added_ids:
+            return
+        try:
+            from ..metadata.thumbnail_cache import prefetch_thumbnails
+
+            queued = 0
+            for start in range(0, len(added_ids), _THUMB_PREFETCH_CHUNK):
+                rows = await self.db.aquery_in(
+                    "SELECT filepath FROM assets WHERE {IN_CLAUSE}",
+                    "id",
+                    added_ids[start : start + _THUMB_PREFETCH_CHUNK],
+                )
+                if not rows.ok:
+                    return
+                paths = [str(row.get("filepath")) for row in rows.data or [] if row.get("filepath")]
+                queued += await asyncio.to_thread(prefetch_thumbnails, paths)
+            if queued:
+                logger.debug("Queued %d thumbnails for pre-generation", queued)
+        except Exception as exc:
+            logger.debug("Thumbnail pre-generation skipped: %s", exc)
+
     async def _rename_file_transaction(self, old_fp: str, new_fp: str) -> Result[bool]:
         old_where_sql, old_where_params = _filepath_match_clause(old_fp, column="filepath")
         new_path = Path(new_fp)
@@ -473,6 +540,7 @@ class IndexService:
         offset: int = 0,
         filters: dict[str, Any] | None = None,
         include_total: bool = True,
+        cursor: str | None = None,
     ) -> Result[dict[str, Any]]:
         """
         Search assets using FTS5 full-text search, or browse all if query is '*'.
@@ -482,11 +550,12 @@ class IndexService:
             limit: Max results to return
             offset: Pagination offset
             filters: Optional filters (kind, rating, tags, etc.)
+            cursor: Previous page's ``next_cursor``; seeks past it instead of scanning ``offset`` rows
 
         Returns:
             Result with search results and metadata
         """
-        return await self.searcher.search(query, limit, offset, filters, include_total=include_total)
+        return await self.searcher.search(query, limit, offset, filters, include_total=include_total, cursor=cursor)
 
     async def search_scoped(
         self,
@@ -497,6 +566,7 @@ class IndexService:
         filters: dict[str, Any] | None = None,
         include_total: bool = True,
         sort: str | None = None,
+        cursor: str | None = None,
     ) -> Result[dict[str, Any]]:
         """
         Search assets but restrict results to files whose absolute filepath is under one of the provided roots.
@@ -511,6 +581,7 @@ class IndexService:
             filters,
             include_total=include_total,
             sort=sort,
+            cursor=cursor,
         )
 
     async def has_assets_under_root(self, root: str) -> Result[bool]:
@@ -525,13 +596,15 @@ class IndexService:
         month_start: int,
         month_end: int,
         filters: dict[str, Any] | None = None,
+        *,
+        scopes: list[CounterScope] | None = None,
     ) -> Result[dict[str, int]]:
         """
         Return a day->count mapping for assets within a month for the given roots.
 
         Used by the UI calendar to mark days that have assets.
         """
-        return await self.searcher.date_histogram_scoped(roots, month_start, month_end, filters)
+        return await self.searcher.date_histogram_scoped(roots, month_start, month_end, filters, scopes=scopes)
 
     async def get_asset(self, asset_id: int) -> Result[dict[str, Any] | None]:
         """Fetch a single asset row by id."""
@@ -0,0 +1,125 @@
+"""
+On-disk persistence for the Faiss vector index.
+
+The serialized index lives in a ``vectors/`` directory next to
+``vectors.sqlite`` together with a small JSON sidecar describing how it was
+built (embedding dimension, model name, index type) and the
+``asset_embedding_changes`` sequence number it reflects.  On startup the
+searcher reloads the file and only replays the change-log entries past that
+sequence, so the full rebuild from SQLite is reserved for model/dimension
+changes.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from ...shared import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the on-disk layout changes in a way older files can't satisfy.
+INDEX_FORMAT_VERSION = 2
+
+INDEX_FILENAME = "asset_embeddings.faiss"
+META_FILENAME = "asset_embeddings.meta.json"
+
+
+def resolve_index_dir(db: Any) -> Path | None:
+    """Return the ``vectors/`` directory for *db*, or ``None`` when unknown.
+
+    Mirrors the ``vectors.sqlite`` attach rule of the Sqlite facade: the
+    vector files sit next to the main DB file.
+    """
+    raw = getattr(db, "db_path", None)
+    if not raw:
+        return None
+    try:
+        return Path(raw).with_name("vectors")
+    except Exception:
+        return None
+
+
+def read_meta(index_dir: Path) -> dict[str, Any] | None:
+    """Read the JSON sidecar, returning ``None`` when absent or unreadable."""
+    try:
+        raw = (index_dir / META_FILENAME).read_text(encoding="utf-8")
+        data = json.loads(raw)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.debug("Ignoring unreadable vector index meta: %s", exc)
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def meta_matches(meta: dict[str, Any] | None, *, dim: int, model_name: str) -> bool:
+    """Return True when a persisted index was built for the current model."""
+    if not meta:
+        return False
+    try:
+        if int(meta.get("format") or 0) != INDEX_FORMAT_VERSION:
+            return False
+        if int(meta.get("dim") or 0) != int(dim):
+            return False
+    except (TypeError, ValueError):
+        return False
+    stored_model = str(meta.get("model_name") or "")
+    return not model_name or not stored_model or stored_model == model_name
+
+
+def load_index(faiss: Any, index_dir: Path, meta: dict[str, Any]) -> Any | None:
+    """Deserialize the persisted index; ``None`` if missing or inconsistent."""
+    path = index_dir / INDEX_FILENAME
+    if not path.is_file():
+        return None
+    try:
+        index = faiss.read_index(str(path))
+    except Exception as exc:
+        logger.warning("Failed to load persisted vector index (%s); rebuilding", exc)
+        return None
+    try:
+        expected = int(meta.get("ntotal") or 0)
+    except (TypeError, ValueError):
+        expected = -1
+    if int(getattr(index, "ntotal", -1)) != expected:
+        logger.info("Persisted vector index is out of sync with its meta file; rebuilding")
+        return None
+    return index
+
+
+def save_index(faiss: Any, index_dir: Path, index: Any, meta: dict[str, Any]) -> bool:
+    """Atomically write the index file then its sidecar (write-then-rename)."""
+    index_path = index_dir / INDEX_FILENAME
+    meta_path = index_dir / META_FILENAME
+    tmp_index = index_path.with_suffix(".faiss.tmp")
+    tmp_meta = meta_path.with_suffix(".json.tmp")
+    payload = dict(meta)
+    payload["format"] = INDEX_FORMAT_VERSION
+    payload["ntotal"] = int(getattr(index, "ntotal", 0) or 0)
+    try:
+        index_dir.mkdir(parents=True, exist_ok=True)
+        faiss.write_index(index, str(tmp_index))
+        os.replace(tmp_index, index_path)
+        tmp_meta.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_meta, meta_path)
+        return True
+    except Exception as exc:
+        logger.warning("Failed to persist vector index: %s", exc)
+        for tmp in (tmp_index, tmp_meta):
+            with contextlib.suppress(Exception):
+                tmp.unlink(missing_ok=True)
+        return False
+
+
+def discard_index(index_dir: Path | None) -> None:
+    """Remove persisted index files (best-effort)."""
+    if index_dir is None:
+        return
+    for name in (INDEX_FILENAME, META_FILENAME):
+        with contextlib.suppress(Exception):
+            (index_dir / name).unlink(missing_ok=True)
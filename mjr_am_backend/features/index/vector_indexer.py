@@ -36,7 +36,7 @@ from ...config import (
     is_vector_search_enabled,
 )
 from ...shared import FileKind, Result, get_logger
-from .vector_service import VectorService, vector_to_blob
+from .vector_service import VectorService, vector_to_blob, vectors_to_blobs
 
 logger = get_logger(__name__)
 
@@ -202,8 +202,34 @@ async def index_asset_vector(
     if not is_vector_search_enabled():
         return Result.Ok(False)
 
-    if kind not in ("image", "video"):
+    computed = await _compute_asset_vector(db, vs, asset_id, filepath, kind, metadata_raw)
+    if computed is None:
         return Result.Ok(False)
+    vector, aesthetic = computed
+
+    # 4. Persist embedding
+    blob = vector_to_blob(vector)
+    store_result = await _store_embedding(db, asset_id, blob, aesthetic, vs._model_name)
+    if not store_result.ok:
+        return store_result
+
+    # 5. Auto-tagging
+    await _apply_autotags(db, vs, asset_id, vector)
+
+    return Result.Ok(True)
+
+
+async def _compute_asset_vector(
+    db: Sqlite,
+    vs: VectorService,
+    asset_id: int,
+    filepath: str,
+    kind: FileKind,
+    metadata_raw: dict[str, Any] | None,
+) -> tuple[list[float], float | None] | None:
+    """Embedding and alignment score for one asset, or ``None`` when it is skipped."""
+    if kind not in ("image", "video"):
+        return None
 
     # 1. Generate embedding
     if kind == "image":
@@ -213,7 +239,7 @@ async def index_asset_vector(
 
     if not emb_result.ok or not emb_result.data:
         logger.debug("Skipping vector index for asset %d: %s", asset_id, emb_result.error)
-        return Result.Ok(False)
+        return None
 
     vector = emb_result.data
 
@@ -229,17 +255,7 @@ async def index_asset_vector(
     aesthetic = await _compute_prompt_alignment(
         vs, vector, metadata_raw, enhanced_caption=caption,
     )
-
-    # 4. Persist embedding
-    blob = vector_to_blob(vector)
-    store_result = await _store_embedding(db, asset_id, blob, aesthetic, vs._model_name)
-    if not store_result.ok:
-        return store_result
-
-    # 5. Auto-tagging
-    await _apply_autotags(db, vs, asset_id, vector)
-
-    return Result.Ok(True)
+    return vector, aesthetic
 
 
 async def index_assets_vector_batch(
@@ -250,28 +266,39 @@ async def index_assets_vector_batch(
     """Batch-index embeddings for multiple assets.
 
     *entries* is a list of dicts with keys ``asset_id``, ``filepath``,
-    ``kind``, and optionally ``metadata_raw``.
+    ``kind``, and optionally ``metadata_raw``.  Embeddings are computed per
+    asset, then packed in one ``vectors_to_blobs`` pass and written with a
+    single ``executemany``.  A failure while computing one entry counts as
+    one error; if the batched write fails, rows are retried one by one so
+    only the rows that cannot be stored are counted as errors.
     """
     if not is_vector_search_enabled():
         return Result.Ok({"indexed": 0, "skipped": len(entries), "errors": 0})
 
     stats = {"indexed": 0, "skipped": 0, "errors": 0}
+    computed: list[tuple[int, list[float], float | None]] = []
     for entry in entries:
-        result = await index_asset_vector(
-            db,
-            vs,
-            asset_id=entry["asset_id"],
-            filepath=entry["filepath"],
-            kind=entry.get("kind", "image"),
-            metadata_raw=entry.get("metadata_raw"),
-        )
-        if result.ok and result.data:
-            stats["indexed"] += 1
-        elif result.ok:
-            stats["skipped"] += 1
-        else:
+        asset_id = int(entry["asset_id"])
+        try:
+            result = await _compute_asset_vector(
+                db, vs, asset_id, entry["filepath"], entry.get("kind", "image"), entry.get("metadata_raw")
+            )
+        except Exception as exc:
+            logger.debug("Vector indexing failed for asset %d: %s", asset_id, exc)
             stats["errors"] += 1
-
+            continue
+        if result is None:
+            stats["skipped"] += 1
+            continue
+        computed.append((asset_id, *result))
+    if not computed:
+        return Result.Ok(stats)
+
+    stored = await _store_embeddings(db, vs._model_name, computed)
+    stats["errors"] += len(computed) - len(stored)
+    for asset_id, vector, _aesthetic in stored:
+        await _apply_autotags(db, vs, asset_id, vector)
+    stats["indexed"] += len(stored)
     return Result.Ok(stats)
 
 
@@ -786,6 +813,19 @@ def _extract_negative_prompt(meta: dict[str, Any]) -> str | None:
     return None
 
 
+_STORE_EMBEDDING_SQL = """
+INSERT INTO vec.asset_embeddings (asset_id, vector, aesthetic_score, model_name, updated_at)
+SELECT ?, ?, ?, ?, CURRENT_TIMESTAMP
+WHERE EXISTS (SELECT 1 FROM assets WHERE id = ?)
+ON CONFLICT(asset_id) DO UPDATE SET
+    vector = excluded.vector,
+    aesthetic_score = excluded.aesthetic_score,
+    model_name = excluded.model_name,
+    updated_at = CURRENT_TIMESTAMP
+WHERE EXISTS (SELECT 1 FROM assets WHERE id = excluded.asset_id)
+"""
+
+
 async def _store_embedding(
     db: Sqlite,
     asset_id: int,
@@ -794,20 +834,36 @@ async def _store_embedding(
     model_name: str,
 ) -> Result[bool]:
     """INSERT OR REPLACE the embedding row."""
-    return await db.aexecute(
-        """
-        INSERT INTO vec.asset_embeddings (asset_id, vector, aesthetic_score, model_name, updated_at)
-        SELECT ?, ?, ?, ?, CURRENT_TIMESTAMP
-        WHERE EXISTS (SELECT 1 FROM assets WHERE id = ?)
-        ON CONFLICT(asset_id) DO UPDATE SET
-            vector = excluded.vector,
-            aesthetic_score = excluded.aesthetic_score,
-            model_name = excluded.model_name,
-            updated_at = CURRENT_TIMESTAMP
-        WHERE EXISTS (SELECT 1 FROM assets WHERE id = excluded.asset_id)
-        """,
-        (asset_id, blob, aesthetic_score, model_name, asset_id),
-    )
+    return await db.aexecute(_STORE_EMBEDDING_SQL, (asset_id, blob, aesthetic_score, model_name, asset_id))
+
+
+async def _store_embeddings(
+    db: Sqlite,
+    model_name: str,
+    computed: list[tuple[int, list[float], float | None]],
+) -> list[tuple[int, list[float], float | None]]:
+    """Write ``(asset_id, vector, aesthetic)`` rows in one batch; return the rows stored.
+
+    When the batch fails, each row is written on its own so one bad row does
+    not discard the others.
+    """
+    blobs = vectors_to_blobs([vector for _asset_id, vector, _aesthetic in computed])
+    rows = [
+        (asset_id, blob, aesthetic, model_name, asset_id)
+        for (asset_id, _vector, aesthetic), blob in zip(computed, blobs, strict=True)
+    ]
+    batch_result = await db.aexecutemany(_STORE_EMBEDDING_SQL, rows)
+    if batch_result.ok:
+        return computed
+    logger.debug("Batched embedding write failed, retrying per asset: %s", batch_result.error)
+    stored: list[tuple[int, list[float], float | None]] = []
+    for item, row in zip(computed, rows, strict=True):
+        res = await db.aexecute(_STORE_EMBEDDING_SQL, row)
+        if res.ok:
+            stored.append(item)
+        else:
+            logger.debug("Embedding write failed for asset %d: %s", item[0], res.error)
+    return stored
 
 
 async def _store_enhanced_caption(
@@ -10,33 +10,47 @@ This module provides:
 3. **Prompt-alignment score** retrieval — read the pre-computed
    ``aesthetic_score`` stored during indexing.
 
-The Faiss index is loaded from the SQLite ``asset_embeddings`` table into
-an in-memory index.  For small datasets (< ``_IVF_THRESHOLD`` vectors)
+The Faiss index is streamed from the SQLite ``asset_embeddings`` table
+into an in-memory index.  For small datasets (< ``_IVF_THRESHOLD`` vectors)
 a flat inner-product index (``IndexFlatIP``) is used — exact results,
 zero training overhead.  For larger datasets an **IVF** (Inverted File)
 index is built (``IndexIVFFlat`` with ``nlist ≈ √n``), reducing query
 time from O(n) to O(√n) at the cost of a brief one-time training step.
-Both index types operate on L2-normalised vectors so inner-product
-equals cosine similarity.
-
-The index is **rebuilt lazily** on first use and can be manually
-invalidated via ``invalidate()``.
+When the full float32 vectors would exceed ``VECTOR_INDEX_RAM_BUDGET_MB``
+the compressed **IVF-PQ** tier is used instead (``IndexIVFPQ``, a few
+dozen bytes per vector); its approximate candidates are re-ranked with
+exact cosine scores from the stored BLOBs.  All tiers operate on
+L2-normalised vectors so inner-product equals cosine similarity, and all
+are keyed directly by ``asset_id``.
+
+The index is serialized next to ``vectors.sqlite`` (see
+``vector_index_store``) with the ``asset_embedding_changes`` sequence number
+it reflects.  Triggers append every embedding write and delete to that log,
+so on startup the file is reloaded and ``invalidate()`` only marks it
+stale: the next query replays the logged asset ids with ``add_with_ids`` /
+``remove_ids`` instead of re-reading every BLOB.  A full rebuild only
+happens on model/dimension change, when the index outgrows its trained
+layout, or when most of it changed at once.
 """
 
 from __future__ import annotations
 
 import asyncio
 import math
+import time
 from typing import Any
 
 from ...adapters.db.sqlite import Sqlite
 from ...config import (
     VECTOR_EMBEDDING_DIM,
+    VECTOR_FAISS_NPROBE,
+    VECTOR_INDEX_RAM_BUDGET_MB,
     VECTOR_SIMILAR_TOPK,
     is_vector_search_enabled,
 )
 from ...shared import Result, get_logger
-from .vector_service import VectorService, blob_to_vector
+from . import vector_index_store
+from .vector_service import VectorService, blobs_to_matrix
 
 logger = get_logger(__name__)
 
@@ -48,6 +62,42 @@ _IVF_THRESHOLD = 4_096
 # slower). 16 is a good default for nlist ≈ √n up to ~100 K vectors.
 _IVF_NPROBE = 16
 
+# Index tiers, picked by ``_choose_tier`` from the row count and RAM budget.
+_TIER_FLAT = "flat"
+_TIER_IVF = "ivf"
+_TIER_IVFPQ = "ivfpq"
+
+# Candidate PQ sub-quantizer counts, best quality first. Each must divide
+# the embedding dimension; codes cost ``m`` bytes per vector (8-bit PQ).
+_PQ_M_CANDIDATES = (128, 96, 64, 48, 32, 24, 16, 12, 8, 4)
+
+# Per-vector overhead of the id list inside IVF inverted lists.
+_IVF_ID_BYTES = 8
+
+# Upper bound on the training sample drawn for IVF / IVF-PQ.
+_TRAIN_SAMPLE_MAX = 65_536
+
+# Rows decoded per round-trip while streaming vectors into the index.
+_BUILD_CHUNK = 8_192
+
+# The compressed tier returns ``top_k * _RERANK_FACTOR`` approximate
+# candidates, re-scored exactly from the stored BLOBs.
+_RERANK_FACTOR = 4
+_RERANK_MIN_CANDIDATES = 64
+
+# An IVF index trained on n vectors is retrained once it grows past
+# ``n * _IVF_RETRAIN_GROWTH`` (its nlist no longer fits the data).
+_IVF_RETRAIN_GROWTH = 4
+
+# Fall back to a full rebuild when a single sync touches more than this
+# fraction of the index — cheaper than thousands of remove/add calls.
+_SYNC_REBUILD_RATIO = 0.5
+
+# Minimum delay between two on-disk saves triggered by incremental syncs.
+_PERSIST_MIN_INTERVAL_S = 30.0
+
+_ID_CHUNK = 500
+
 
 class VectorSearcher:
     """Faiss-backed nearest-neighbour searcher over asset embeddings."""
@@ -56,19 +106,26 @@ class VectorSearcher:
         self.db = db
         self.vs = vector_service
         self._dim = VECTOR_EMBEDDING_DIM
-        self._index: Any | None = None  # faiss.IndexFlatIP or faiss.IndexIVFFlat
-        self._id_map: list[int] = []   # position → asset_id
+        self._index: Any | None = None  # faiss.IndexIDMap2(IndexFlatIP) or faiss.IndexIVFFlat
+        self._ids: set[int] = set()     # asset_ids currently held by the index
+        self._change_seq = 0            # last ``asset_embedding_changes.seq`` applied
+        self._trained_total = 0         # vectors the current layout was built for
+        self._tier = _TIER_FLAT
+        self._generation = 0
+        self._index_dir = vector_index_store.resolve_index_dir(db)
+        self._persist_pending = False
+        self._last_persist_at = 0.0
         self._lock = asyncio.Lock()
         self._dirty = True
 
     # ── Index lifecycle ────────────────────────────────────────────────
 
     def invalidate(self) -> None:
-        """Mark the in-memory index as stale (will be rebuilt on next query)."""
+        """Mark the in-memory index as stale (synced incrementally on next query)."""
         self._dirty = True
 
     async def prewarm_index(self) -> Result[dict[str, Any]]:
-        """Build the in-memory Faiss index ahead of the first semantic query."""
+        """Load or build the Faiss index ahead of the first semantic query."""
         try:
             await self._ensure_index()
         except Exception as exc:
@@ -84,111 +141,374 @@ class VectorSearcher:
             "loaded": bool(self._index is not None),
             "total": total,
             "dirty": bool(self._dirty),
+            "generation": int(self._generation),
         })
 
     async def _ensure_index(self) -> None:
-        """Build (or rebuild) the Faiss index from the database."""
+        """Load, sync or rebuild the Faiss index from the database."""
         if not self._dirty and self._index is not None:
             return
         async with self._lock:
             if not self._dirty and self._index is not None:
                 return
-            await self._build_index()
+            if self._index is None:
+                await self._load_persisted_index()
+            if self._index is None:
+                await self._build_index()
+            else:
+                await self._sync_index()
             self._dirty = False
 
-    async def _build_index(self) -> None:
-        """Load embeddings from ``asset_embeddings`` and build the best-fit Faiss index."""
+    def _model_name(self) -> str:
+        return str(getattr(self.vs, "_model_name", "") or "").strip()
+
+    async def _load_persisted_index(self) -> None:
+        """Restore the index saved by a previous run, if it matches the current model."""
+        if self._index_dir is None:
+            return
+        faiss = _import_faiss()
+        if faiss is None:
+            return
+        meta = await asyncio.to_thread(vector_index_store.read_meta, self._index_dir)
+        if meta is None or not vector_index_store.meta_matches(
+            meta, dim=self._dim, model_name=self._model_name()
+        ):
+            return
+        # A sequence past the log's head means vectors.sqlite was replaced.
+        head = await self._read_change_head()
         try:
-            import faiss
-            import numpy as np
-        except ImportError:
-            logger.warning("faiss-cpu or numpy not installed — vector search unavailable")
-            self._index = None
-            self._id_map = []
+            change_seq = int(meta["change_seq"])
+        except (KeyError, TypeError, ValueError):
+            return
+        if head is None or change_seq > head:
+            return
+        index = await asyncio.to_thread(vector_index_store.load_index, faiss, self._index_dir, meta)
+        if index is None:
             return
+        id_rows = await asyncio.to_thread(_index_asset_ids, faiss, index)
+        if id_rows is None:
+            return
+        self._index = index
+        self._ids = id_rows
+        self._change_seq = change_seq
+        self._trained_total = int(meta.get("trained_total") or index.ntotal)
+        self._tier = str(meta.get("tier") or _TIER_FLAT)
+        self._generation = int(meta.get("generation") or 0)
+        self._last_persist_at = time.monotonic()
+        logger.info(
+            "Vector index loaded from disk (%d vectors, generation=%d)",
+            int(index.ntotal), self._generation,
+        )
+
+    async def _build_index(self) -> None:
+        """Stream embeddings from ``asset_embeddings`` into the best-fit Faiss index.
+
+        Vectors are decoded in ``_BUILD_CHUNK`` batches so peak memory is the
+        index itself plus one chunk — never a full Python copy of the table.
+        """
+        import numpy as np
+
+        faiss = _import_faiss()
+        if faiss is None:
+            logger.warning("faiss-cpu not installed — vector search unavailable")
+            self._reset_state(None)
+            return
+
+        count_res = await self.db.aquery(
+            "SELECT COUNT(*) AS c FROM vec.asset_embeddings WHERE vector IS NOT NULL"
+        )
+        n_rows = int((count_res.data or [{}])[0].get("c") or 0) if count_res.ok else 0
+        tier = self._choose_tier(n_rows, self._dim)
+
+        train_mat = None
+        if tier != _TIER_FLAT:
+            train_mat = await self._load_training_sample(np, n_rows)
+            if train_mat is None or train_mat.shape[0] < _IVF_THRESHOLD:
+                tier = _TIER_FLAT
+                train_mat = None
+        if train_mat is not None:
+            faiss.normalize_L2(train_mat)
+
+        # Read before streaming: writes landing mid-build are replayed again,
+        # which is harmless since syncs replace vectors by asset_id.
+        head = await self._read_change_head()
+        index = await asyncio.to_thread(
+            self._create_index, faiss, self._dim, n_rows, tier, train_mat
+        )
+        self._reset_state(index)
+        self._tier = tier
+        self._change_seq = head or 0
+
+        last_rowid = 0
+        while True:
+            rows = await self.db.aquery(
+                "SELECT rowid AS rid, asset_id, vector FROM vec.asset_embeddings "
+                "WHERE vector IS NOT NULL AND rowid > ? ORDER BY rowid LIMIT ?",
+                (last_rowid, _BUILD_CHUNK),
+            )
+            if not rows.ok or not rows.data:
+                break
+            last_rowid = int(rows.data[-1]["rid"])
+            ids, mat = self._decode_rows(rows.data)
+            if ids:
+                faiss.normalize_L2(mat)
+                await asyncio.to_thread(index.add_with_ids, mat, np.array(ids, dtype=np.int64))
+                self._ids.update(ids)
+            if len(rows.data) < _BUILD_CHUNK:
+                break
 
-        # H-12: cap loaded vectors to avoid OOM. Most-recent rows first so
-        # freshest assets are always searchable.
-        _MAX_ROWS = 100_000
+        self._trained_total = len(self._ids)
+        logger.info(
+            "Vector index built (%d vectors, type=%s, tier=%s)",
+            int(index.ntotal), type(index).__name__, tier,
+        )
+        await self._persist(faiss, force=True)
+
+    async def _load_training_sample(self, np: Any, n_rows: int) -> Any | None:
+        """Return a stride-sampled float32 matrix used to train IVF quantizers."""
+        sample = min(n_rows, _TRAIN_SAMPLE_MAX)
+        if sample <= 0:
+            return None
+        step = max(1, n_rows // sample)
         rows = await self.db.aquery(
             "SELECT asset_id, vector FROM vec.asset_embeddings "
-            "WHERE vector IS NOT NULL "
-            "ORDER BY rowid DESC "
-            f"LIMIT {_MAX_ROWS}"
+            "WHERE vector IS NOT NULL AND rowid % ? = 0 LIMIT ?",
+            (step, sample),
         )
         if not rows.ok or not rows.data:
-            self._index = faiss.IndexFlatIP(self._dim)
-            self._id_map = []
-            logger.info("Vector index built (0 vectors)")
-            return
+            return None
+        ids, mat = self._decode_rows(rows.data)
+        return mat if ids else None
 
-        # Surface truncation so users know older assets fall outside semantic search.
-        if len(rows.data) >= _MAX_ROWS:
-            try:
-                total_res = await self.db.aquery(
-                    "SELECT COUNT(*) AS c FROM vec.asset_embeddings WHERE vector IS NOT NULL"
-                )
-                total = int((total_res.data or [{}])[0].get("c") or 0) if total_res.ok else _MAX_ROWS
-            except Exception:
-                total = _MAX_ROWS
-            if total > _MAX_ROWS:
-                logger.warning(
-                    "Vector index truncated: %d / %d embeddings loaded (oldest %d "
-                    "excluded from semantic search). Set MJR_AM_VECTOR_INDEX_MAX_ROWS "
-                    "to raise the cap if you have enough RAM.",
-                    _MAX_ROWS, total, total - _MAX_ROWS,
-                )
-
-        id_map: list[int] = []
-        vectors: list[list[float]] = []
-        for row in rows.data:
+    def _reset_state(self, index: Any | None) -> None:
+        self._index = index
+        self._ids = set()
+        self._change_seq = 0
+        self._trained_total = 0
+        self._tier = _TIER_FLAT
+        self._generation += 1
+
+    def _decode_rows(self, rows: list[dict[str, Any]]) -> tuple[list[int], Any]:
+        """Batch-decode ``(asset_id, vector)`` rows into one float32 matrix.
+
+        Corrupt BLOBs are skipped; the returned ids line up with matrix rows.
+        """
+        mat, positions = blobs_to_matrix([row.get("vector") for row in rows], self._dim)
+        ids: list[int] = []
+        keep: list[int] = []
+        for i, pos in enumerate(positions):
             try:
-                aid = int(row["asset_id"])
-                vec = blob_to_vector(row["vector"], self._dim)
-                vectors.append(vec)
-                id_map.append(aid)
-            except Exception:
+                ids.append(int(rows[pos]["asset_id"]))
+            except (KeyError, TypeError, ValueError):
                 continue
+            keep.append(i)
+        if len(keep) != len(positions):
+            mat = mat[keep]
+        return ids, mat
+
+    async def _read_change_head(self) -> int | None:
+        """Highest ``asset_embedding_changes.seq`` ever issued; ``None`` without a log."""
+        res = await self.db.aquery(
+            "SELECT MAX("
+            "COALESCE((SELECT seq FROM vec.sqlite_sequence WHERE name = 'asset_embedding_changes'), 0), "
+            "COALESCE((SELECT MAX(seq) FROM vec.asset_embedding_changes), 0)) AS head"
+        )
+        if not res.ok:
+            return None
+        return int((res.data or [{}])[0].get("head") or 0)
+
+    async def _read_vectors(self, asset_ids: list[int]) -> tuple[list[int], Any] | None:
+        """Read the stored vectors of *asset_ids*; ids without one are left out."""
+        import numpy as np
+
+        ids: list[int] = []
+        mats: list[Any] = []
+        for start in range(0, len(asset_ids), _ID_CHUNK):
+            chunk = asset_ids[start : start + _ID_CHUNK]
+            placeholders = ",".join("?" for _ in chunk)
+            rows = await self.db.aquery(
+                "SELECT asset_id, vector FROM vec.asset_embeddings "
+                f"WHERE asset_id IN ({placeholders}) AND vector IS NOT NULL",
+                tuple(chunk),
+            )
+            if not rows.ok:
+                return None
+            if rows.data:
+                chunk_ids, chunk_mat = self._decode_rows(rows.data)
+                ids.extend(chunk_ids)
+                mats.append(chunk_mat)
+        if not mats:
+            return ids, np.empty((0, self._dim), dtype=np.float32)
+        return ids, mats[0] if len(mats) == 1 else np.concatenate(mats)
+
+    async def _sync_index(self) -> None:
+        """Replay the embedding change log past ``_change_seq`` into the index, in place."""
+        import numpy as np
+
+        faiss = _import_faiss()
+        if faiss is None:
+            self._reset_state(None)
+            return
 
-        if not vectors:
-            self._index = faiss.IndexFlatIP(self._dim)
-            self._id_map = []
+        head = await self._read_change_head()
+        if head is None:
+            await self._build_index()
+            return
+        if head <= self._change_seq:
+            await self._persist(faiss)
+            return
+        changed = await self.db.aquery(
+            "SELECT DISTINCT asset_id FROM vec.asset_embedding_changes WHERE seq > ? AND seq <= ?",
+            (self._change_seq, head),
+        )
+        if not changed.ok:
+            return
+        changed_ids = {int(r["asset_id"]) for r in changed.data or [] if r.get("asset_id") is not None}
+        if len(changed_ids) > max(_IVF_THRESHOLD, int(len(self._ids) * _SYNC_REBUILD_RATIO)):
+            await self._build_index()
+            return
+        read = await self._read_vectors(sorted(changed_ids))
+        if read is None:
+            return
+        ids, mat = read
+        stale_ids, removed, total_after = _plan_sync(self._ids, changed_ids, set(ids))
+        if self._needs_retrain(total_after):
+            await self._build_index()
             return
 
-        mat = np.array(vectors, dtype=np.float32)
-        faiss.normalize_L2(mat)
+        index: Any = self._index
+        stale = np.array(sorted(stale_ids), dtype=np.int64)
+        if ids:
+            faiss.normalize_L2(mat)
+        id_arr = np.array(ids, dtype=np.int64)
+
+        def _apply() -> None:
+            if stale.size:
+                index.remove_ids(stale)
+            if id_arr.size:
+                index.add_with_ids(mat, id_arr)
+
+        await asyncio.to_thread(_apply)
+        self._ids = (self._ids - changed_ids) | set(ids)
+        self._change_seq = head
+        self._generation += 1
+        self._persist_pending = True
+        logger.debug(
+            "Vector index synced (+%d / -%d, total=%d)", len(ids), len(removed), int(index.ntotal)
+        )
+        await self._persist(faiss)
+
+    def _needs_retrain(self, total: int) -> bool:
+        """Return True when the current layout no longer suits *total* vectors."""
+        if self._index is None:
+            return True
+        if self._choose_tier(total, self._dim) != self._tier:
+            return True
+        if self._tier == _TIER_FLAT:
+            return False
+        return total > max(1, self._trained_total) * _IVF_RETRAIN_GROWTH
 
-        n_vectors = mat.shape[0]
-        index = self._create_index(faiss, mat, n_vectors)
+    @staticmethod
+    def _choose_tier(n_vectors: int, dim: int) -> str:
+        """Pick the index tier for *n_vectors* under the configured RAM budget.
 
-        self._index = index
-        self._id_map = id_map
-        logger.info("Vector index built (%d vectors, type=%s)", n_vectors, type(index).__name__)
+        - < _IVF_THRESHOLD            → flat   (exact)
+        - full float32 fits the budget → ivf    (exact vectors, O(√n) probes)
+        - otherwise                    → ivfpq  (compressed codes + exact re-rank)
+        """
+        if n_vectors < _IVF_THRESHOLD:
+            return _TIER_FLAT
+        budget = _ram_budget_bytes()
+        if n_vectors * (dim * 4 + _IVF_ID_BYTES) <= budget:
+            return _TIER_IVF
+        return _TIER_IVFPQ
 
     @staticmethod
-    def _create_index(faiss: Any, mat: Any, n_vectors: int) -> Any:
-        """Choose the right Faiss index type based on dataset size.
-
-        - < _IVF_THRESHOLD  → IndexFlatIP  (exact, O(n) but n is small)
-        - >= _IVF_THRESHOLD → IndexIVFFlat (approximate, O(√n) per query)
+    def _pq_subquantizers(n_vectors: int, dim: int) -> int:
+        """Largest PQ ``m`` dividing *dim* whose codes fit the RAM budget."""
+        budget = _ram_budget_bytes()
+        divisors = [m for m in _PQ_M_CANDIDATES if dim % m == 0]
+        if not divisors:
+            return 1
+        for m in divisors:
+            if n_vectors * (m + _IVF_ID_BYTES) <= budget:
+                return m
+        return divisors[-1]
+
+    async def _persist(self, faiss: Any, *, force: bool = False) -> None:
+        """Save the index to disk, throttled unless *force* is set.
+
+        Change-log entries the saved index reflects are pruned afterwards;
+        without an index directory they are pruned once applied.
         """
-        dim = mat.shape[1]
+        if self._index is None:
+            return
+        if self._index_dir is None:
+            await self._prune_change_log(self._change_seq)
+            return
+        if force:
+            self._persist_pending = True
+        if not self._persist_pending:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_persist_at < _PERSIST_MIN_INTERVAL_S:
+            return
+        change_seq = self._change_seq
+        meta = {
+            "dim": self._dim,
+            "model_name": self._model_name(),
+            "change_seq": change_seq,
+            "trained_total": self._trained_total,
+            "generation": self._generation,
+            "index_type": type(self._index).__name__,
+            "tier": self._tier,
+        }
+        saved = await asyncio.to_thread(
+            vector_index_store.save_index, faiss, self._index_dir, self._index, meta
+        )
+        if saved:
+            self._persist_pending = False
+            self._last_persist_at = now
+            await self._prune_change_log(change_seq)
 
-        if n_vectors < _IVF_THRESHOLD:
-            index = faiss.IndexFlatIP(dim)
-            index.add(mat)
-            return index
+    async def _prune_change_log(self, seq: int) -> None:
+        if seq <= 0:
+            return
+        res = await self.db.aexecute("DELETE FROM vec.asset_embedding_changes WHERE seq <= ?", (seq,))
+        if not res.ok:
+            logger.debug("Failed to prune the embedding change log: %s", res.error)
+
+    @staticmethod
+    def _create_index(
+        faiss: Any,
+        dim: int,
+        n_vectors: int,
+        tier: str,
+        train_mat: Any | None,
+    ) -> Any:
+        """Create an empty (trained) Faiss index for *tier*.
+
+        - flat  → IndexIDMap2(IndexFlatIP)  (exact, O(n) but n is small)
+        - ivf   → IndexIVFFlat  (approximate, O(√n) per query)
+        - ivfpq → IndexIVFPQ    (approximate, ``m`` bytes per vector)
+
+        Vectors are added under their ``asset_id`` so later syncs can
+        ``remove_ids`` / ``add_with_ids`` without a position map.
+        """
+        if tier == _TIER_FLAT or train_mat is None:
+            return faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
 
-        # IVF: nlist ≈ √n, clamped to [16, 1024] for sanity.
-        nlist = max(16, min(1024, int(math.sqrt(n_vectors))))
+        # IVF: nlist ≈ √n, clamped to [16, 1024] and to what the sample can train.
+        n_train = int(train_mat.shape[0])
+        nlist = max(16, min(1024, int(math.sqrt(max(n_vectors, 1))), n_train // 39 or 16))
         quantizer = faiss.IndexFlatIP(dim)
-        index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
-        index.nprobe = _IVF_NPROBE
-        # Training requires a representative sample. Full matrix is fine up to
-        # 100 K rows; for much larger datasets we'd sub-sample, but _MAX_ROWS
-        # already caps us at 100 K.
-        index.train(mat)
-        index.add(mat)
+        if tier == _TIER_IVFPQ:
+            m = VectorSearcher._pq_subquantizers(n_vectors, dim)
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, m, 8, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        index.nprobe = VECTOR_FAISS_NPROBE or _IVF_NPROBE
+        index.train(train_mat)
         return index
 
     # ── Semantic text search ───────────────────────────────────────────
@@ -347,9 +667,12 @@ class VectorSearcher:
             return Result.Err("NOT_FOUND", f"No embedding found for asset {asset_id}")
 
         try:
-            vec = blob_to_vector(row.data[0]["vector"], self._dim)
+            mat, _positions = blobs_to_matrix([row.data[0]["vector"]], self._dim)
         except Exception as exc:
             return Result.Err("PARSE_ERROR", f"Failed to decode embedding: {exc}")
+        if mat.shape[0] == 0:
+            return Result.Err("PARSE_ERROR", "Failed to decode embedding: unexpected vector size")
+        vec = mat[0]
 
         return await self._query_index(vec, top_k=top_k + 1, exclude_ids={asset_id})
 
@@ -419,42 +742,67 @@ class VectorSearcher:
 
     async def _query_index(
         self,
-        query_vec: list[float],
+        query_vec: list[float] | Any,
         *,
         top_k: int,
         exclude_ids: set[int],
     ) -> Result[list[dict[str, Any]]]:
         """Run a Faiss nearest-neighbour query and return scored results."""
-        try:
-            import faiss
-            import numpy as np
-        except ImportError:
+        import numpy as np
+
+        faiss = _import_faiss()
+        if faiss is None:
             return Result.Err("TOOL_MISSING", "faiss-cpu is required for vector search")
 
         await self._ensure_index()
-        if self._index is None or self._index.ntotal == 0:
-            return Result.Ok([])
-
-        q = np.array([query_vec], dtype=np.float32)
+        q = np.asarray(query_vec, dtype=np.float32).reshape(1, -1).copy()
         faiss.normalize_L2(q)
 
-        # Request more results than needed to account for exclusions.
-        k = min(top_k + len(exclude_ids), self._index.ntotal)
-        distances, indices = await asyncio.to_thread(self._index.search, q, k)
+        # Searches share the lock with incremental syncs: Faiss indexes are
+        # not safe to query while ``add_with_ids``/``remove_ids`` mutate them.
+        async with self._lock:
+            index = self._index
+            if index is None or index.ntotal == 0:
+                return Result.Ok([])
+            compressed = self._tier == _TIER_IVFPQ
+            # Request more results than needed to account for exclusions;
+            # the compressed tier over-fetches candidates for exact re-ranking.
+            wanted = top_k + len(exclude_ids)
+            if compressed:
+                wanted = max(wanted * _RERANK_FACTOR, _RERANK_MIN_CANDIDATES)
+            k = min(wanted, index.ntotal)
+            distances, labels = await asyncio.to_thread(index.search, q, k)
+
+        scored = [
+            (int(label), float(dist))
+            for dist, label in zip(distances[0], labels[0], strict=True)
+            if int(label) >= 0 and int(label) not in exclude_ids
+        ]
+        if compressed and scored:
+            scored = await self._rerank_exact(np, q[0], [aid for aid, _ in scored])
 
         results: list[dict[str, Any]] = []
-        for dist, idx in zip(distances[0], indices[0], strict=True):
-            if idx < 0 or idx >= len(self._id_map):
-                continue
-            aid = self._id_map[idx]
-            if aid in exclude_ids:
-                continue
-            results.append({"asset_id": aid, "score": round(float(dist), 4)})
+        for aid, dist in scored:
+            results.append({"asset_id": aid, "score": round(dist, 4)})
             if len(results) >= top_k:
                 break
 
         return Result.Ok(results)
 
+    async def _rerank_exact(
+        self, np: Any, query: Any, asset_ids: list[int]
+    ) -> list[tuple[int, float]]:
+        """Re-score PQ candidates with exact cosine similarity from stored BLOBs."""
+        read = await self._read_vectors(asset_ids)
+        if not read or not read[0]:
+            return []
+        ids, mat = read
+        norms = np.linalg.norm(mat, axis=1)
+        norms[norms == 0] = 1.0
+        scores = (mat @ query) / norms
+        order = np.argsort(-scores)
+        return [(ids[i], float(scores[i])) for i in order]
+
     @staticmethod
     def _append_variant(variants: list[str], seen: set[str], candidate: str) -> None:
         value = str(candidate or "").strip()
@@ -505,3 +853,48 @@ class VectorSearcher:
                 return None, None
             return None, Result.Err("METADATA_FAILED", emb.error or "Text embedding failed")
         return emb.data, None
+
+
+def _import_faiss() -> Any | None:
+    """Return the ``faiss`` module, or ``None`` when faiss-cpu is not installed."""
+    try:
+        import faiss
+    except ImportError:
+        return None
+    return faiss
+
+
+def _plan_sync(held: set[int], changed: set[int], present: set[int]) -> tuple[set[int], set[int], int]:
+    """Diff one change-log replay against the ids the index holds.
+
+    *changed* are the logged asset ids and *present* those of them that still
+    have a stored vector.  Returns the held ids to ``remove_ids`` before
+    re-adding *present*, the ids deleted outright, and the index size after
+    the sync.
+    """
+    stale = held & changed
+    removed = stale - present
+    return stale, removed, len(held) - len(stale) + len(present)
+
+
+def _index_asset_ids(faiss: Any, index: Any) -> set[int] | None:
+    """Return the ``asset_id`` labels stored in a persisted index."""
+    try:
+        if hasattr(index, "invlists"):
+            invlists = index.invlists
+            ids: set[int] = set()
+            for list_no in range(index.nlist):
+                size = invlists.list_size(list_no)
+                if not size:
+                    continue
+                ptr = invlists.get_ids(list_no)
+                ids.update(int(x) for x in faiss.rev_swig_ptr(ptr, size))
+            return ids
+        return {int(x) for x in faiss.vector_to_array(index.id_map)}
+    except Exception as exc:
+        logger.debug("Could not read ids from persisted vector index: %s", exc)
+        return None
+
+
+def _ram_budget_bytes() -> int:
+    return int(VECTOR_INDEX_RAM_BUDGET_MB) * 1024 * 1024
@@ -271,12 +271,24 @@ def _log_model_loading_once(model_name: str) -> None:
 # ---------------------------------------------------------------------------
 
 _FLOAT_FMT = "f"  # 32-bit IEEE 754 float
+_BLOB_DTYPE = "<f4"  # same layout as ``_FLOAT_FMT`` for NumPy (little-endian float32)
 
 
 def vector_to_blob(vec: list[float] | Any) -> bytes:
-    """Pack a flat float list into a compact binary BLOB."""
-    flat = list(vec)
-    return struct.pack(f"<{len(flat)}{_FLOAT_FMT}", *flat)
+    """Pack a flat float list (or 1-D array) into a compact binary BLOB."""
+    import numpy as np
+
+    return np.asarray(vec, dtype=_BLOB_DTYPE).reshape(-1).tobytes()
+
+
+def vectors_to_blobs(mat: Any) -> list[bytes]:
+    """Pack each row of a ``(n, dim)`` matrix into a BLOB (one conversion pass)."""
+    import numpy as np
+
+    arr = np.ascontiguousarray(mat, dtype=_BLOB_DTYPE)
+    if arr.ndim == 1:
+        arr = arr.reshape(1, -1)
+    return [row.tobytes() for row in arr]
 
 
 def blob_to_vector(blob: bytes, dim: int | None = None) -> list[float]:
@@ -285,6 +297,31 @@ def blob_to_vector(blob: bytes, dim: int | None = None) -> list[float]:
     return list(struct.unpack(f"<{dim}{_FLOAT_FMT}", blob))
 
 
+def blobs_to_matrix(blobs: Sequence[Any], dim: int | None = None) -> tuple[Any, list[int]]:
+    """Decode many BLOBs into one contiguous, writable ``(n, dim)`` float32 matrix.
+
+    Returns the matrix and the positions in *blobs* that were decoded; BLOBs
+    that are missing or have the wrong byte length are skipped.  The valid
+    BLOBs are joined into a single buffer viewed through ``np.frombuffer``,
+    so no per-row ``struct.unpack`` or Python float list is ever built.
+    """
+    import numpy as np
+
+    dim = dim or VECTOR_EMBEDDING_DIM
+    row_bytes = dim * 4
+    positions: list[int] = []
+    parts: list[Any] = []
+    for pos, blob in enumerate(blobs):
+        if isinstance(blob, (bytes, bytearray, memoryview)) and len(blob) == row_bytes:
+            positions.append(pos)
+            parts.append(blob)
+    if not parts:
+        return np.empty((0, dim), dtype=np.float32), positions
+    buf = bytearray().join(parts)
+    mat = np.frombuffer(buf, dtype=_BLOB_DTYPE).reshape(len(parts), dim)
+    return mat.astype(np.float32, copy=False), positions
+
+
 def _encode_quiet(model: Any, payload: Any, **kwargs: Any) -> Any:
     if _ai_verbose_logs_enabled():
         return model.encode(payload, **kwargs)
@@ -1,4 +1,9 @@
-"""Aggregate metadata keys from indexed metadata JSON."""
+"""Metadata key catalog: extraction at index time and the keys payload.
+
+Keys are recorded per asset when metadata is written (see
+:func:`record_asset_metadata_keys`) and served from the v32 catalog tables.
+Sampling ``metadata_raw`` remains as a fallback for databases without them.
+"""
 
 from __future__ import annotations
 
@@ -6,8 +11,16 @@ import json
 from collections import defaultdict
 from typing import Any
 
+from ...data.repositories.metadata_keys_repository import (
+    KeyPair,
+    MetadataKeysRepository,
+    key_set_signature,
+)
+from ...shared import Result, get_logger
 from .section_catalog import get_metadata_section_catalog
 
+logger = get_logger(__name__)
+
 MAX_ROWS = 5000
 MAX_KEYS = 1200
 MAX_NODE_TYPES = 300
@@ -65,7 +78,82 @@ def _collect_workflow_nodes(meta: dict[str, Any], bucket: dict[str, set[str]]) -
             params.add("widgets_values")
 
 
+def metadata_key_pairs(meta: dict[str, Any]) -> set[KeyPair]:
+    """Catalog keys of one metadata payload as ``(node_type, path)`` pairs."""
+    pairs: set[KeyPair] = {("", path) for path in _walk_keys(meta)}
+    node_params: dict[str, set[str]] = defaultdict(set)
+    _collect_workflow_nodes(meta, node_params)
+    for node_type, params in node_params.items():
+        pairs.add((node_type, ""))
+        pairs.update((node_type, param) for param in params)
+    return pairs
+
+
+async def record_asset_metadata_keys(
+    db: Any,
+    asset_id: int,
+    metadata_raw_json: str | None,
+    meta: dict[str, Any] | None = None,
+) -> Result[bool]:
+    """Point *asset_id* at the key set of the metadata JSON just written.
+
+    Skipped when the upsert kept the previously stored (richer) payload or
+    when the key set is unchanged. *meta* is the decoded payload when the
+    caller already has it. Returns ``True`` when the catalog changed.
+    """
+    if not metadata_raw_json:
+        return Result.Ok(False)
+    stored = await db.aquery(
+        "SELECT metadata_raw = ? AS current FROM asset_metadata WHERE asset_id = ?",
+        (metadata_raw_json, int(asset_id)),
+    )
+    if not stored.ok:
+        return Result.Err(stored.code, stored.error or "metadata_raw lookup failed")
+    if not stored.data or not stored.data[0].get("current"):
+        return Result.Ok(False)
+    if meta is None:
+        try:
+            meta = json.loads(metadata_raw_json)
+        except ValueError:
+            meta = None
+    repo = MetadataKeysRepository(db)
+    pairs = metadata_key_pairs(meta) if isinstance(meta, dict) else set()
+    if not pairs:
+        return await repo.clear(asset_id)
+    signature = key_set_signature(pairs)
+    current = await repo.current_signature(asset_id)
+    if current.ok and current.data == signature:
+        return Result.Ok(False)
+    set_res = await repo.ensure_key_set(pairs, signature)
+    if not set_res.ok:
+        return Result.Err(set_res.code, set_res.error or "Key set insert failed")
+    return await repo.assign(asset_id, int(set_res.data or 0))
+
+
 async def aggregate_metadata_keys(db: Any, *, limit: int = MAX_ROWS) -> dict[str, Any]:
+    """Keys payload for ``/mjr/am/metadata/keys`` covering the whole library.
+
+    ``limit`` only bounds the sampled fallback used when the catalog tables
+    are unavailable.
+    """
+    catalog = await MetadataKeysRepository(db).catalog(max_keys=MAX_KEYS, max_node_types=MAX_NODE_TYPES)
+    if not catalog.ok:
+        logger.debug("Metadata key catalog unavailable, sampling metadata_raw: %s", catalog.error)
+        return await _sample_metadata_keys(db, limit=limit)
+    data = catalog.data or {}
+    return {
+        "catalog": get_metadata_section_catalog(),
+        "source": "catalog",
+        "scanned": data["assets"],
+        "keys": sorted(data["keys"]),
+        "key_counts": data["keys"],
+        "key_last_seen": data["key_last_seen"],
+        "workflow_nodes": {key: sorted(params) for key, params in sorted(data["workflow_nodes"].items())},
+        "truncated": data["truncated"],
+    }
+
+
+async def _sample_metadata_keys(db: Any, *, limit: int = MAX_ROWS) -> dict[str, Any]:
     row_limit = max(1, min(MAX_ROWS, int(limit or MAX_ROWS)))
     result = await db.aquery(
         """
@@ -96,7 +184,9 @@ async def aggregate_metadata_keys(db: Any, *, limit: int = MAX_ROWS) -> dict[str
 
     return {
         "catalog": get_metadata_section_catalog(),
+        "source": "sample",
         "scanned": scanned,
         "keys": sorted(keys),
         "workflow_nodes": {key: sorted(values) for key, values in sorted(node_params.items())},
+        "truncated": len(keys) >= MAX_KEYS or len(node_params) >= MAX_NODE_TYPES,
     }
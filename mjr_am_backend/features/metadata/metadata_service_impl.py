@@ -2,7 +2,6 @@
 Metadata service - coordinates metadata extraction from multiple sources.
 """
 import asyncio
-import functools
 import logging
 import os
 import time
@@ -10,13 +9,13 @@ from collections.abc import Awaitable, Callable
 from typing import Any
 
 from ...adapters.tools import ExifTool, FFProbe
-from ...config import METADATA_EXTRACT_CONCURRENCY
+from ...config import METADATA_EXTRACT_CONCURRENCY, METADATA_NATIVE_READER
 from ...probe_router import pick_probe_backend
 from ...settings import AppSettings
 from ...shared import ErrorCode, Result, classify_file, get_logger
 from ..audio import extract_audio_metadata
 from ..geninfo.override import build_geninfo_override, merge_geninfo_override
-from ..geninfo.parser import parse_geninfo_from_prompt
+from ..geninfo.parse_cache import aparse_geninfo_cached
 from ..workflows import classify_workflow, parse_workflow, workflow_node_text
 from .dimension_resolver import get_file_info as dims_get_file_info
 from .dimension_resolver import normalize_dimensions
@@ -61,6 +60,7 @@ from .extractors import (
 )
 from .extractors_3d import extract_model3d_metadata
 from .fallback_readers import read_image_exif_like, read_media_probe_like
+from .native_reader import has_generation_data, native_metadata_is_complete, read_native_metadata
 from .parsing_utils import parse_auto1111_params
 from .retry_coordinator import (
     extract_rating_tags_only as retry_extract_rating_tags_only,
@@ -361,6 +361,45 @@ def _coerce_dimension_value(value: Any) -> Any:
     except Exception:
         return value
 
+def apply_workflow_detection(combined: dict[str, Any], workflow: Any) -> None:
+    """Classify an embedded workflow into ``workflow_detection`` (and ``workflow_type`` when unset)."""
+    if not isinstance(workflow, dict) or "workflow_detection" in combined:
+        return
+    try:
+        parsed = parse_workflow(workflow)
+        text = workflow_node_text(parsed.nodes)
+        classified = classify_workflow(text, parsed.nodes)
+        combined["workflow_detection"] = {
+            "task": classified.task,
+            "workflow_type": classified.task,
+            "model_family": classified.model_family,
+            "provider": classified.provider,
+            "runs_on": classified.runs_on,
+            "confidence": classified.confidence,
+            "source": classified.source,
+            "signals": classified.signals or {},
+        }
+        if not str(combined.get("workflow_type") or "").strip():
+            combined["workflow_type"] = classified.task
+    except Exception:
+        logger.debug("Workflow detection metadata skipped", exc_info=True)
+
+
+def apply_geninfo_result(combined: dict[str, Any], geninfo_res: Result[dict[str, Any] | None] | None) -> None:
+    """Store a geninfo parse in ``combined``, falling back to A1111 parameters and applying overrides."""
+    override = build_geninfo_override(combined)
+    if geninfo_res and geninfo_res.ok and geninfo_res.data:
+        combined["geninfo"] = geninfo_res.data
+    elif "geninfo" not in combined:
+        gi = registry_build_geninfo_from_parameters(combined)
+        # Always set geninfo to a dict (empty if nothing parsed)
+        combined["geninfo"] = gi if gi is not None else {}
+        if not gi and registry_looks_like_media_pipeline(combined.get("prompt")):
+            combined["geninfo_status"] = {"kind": "media_pipeline", "reason": "no_sampler"}
+    if override:
+        combined["geninfo"] = merge_geninfo_override(combined.get("geninfo"), override) or override
+
+
 class MetadataService:
     """
     Metadata extraction service.
@@ -369,7 +408,7 @@ class MetadataService:
     and file-specific extractors.
     """
 
-    def __init__(self, exiftool: ExifTool, ffprobe: FFProbe, settings: AppSettings):
+    def __init__(self, exiftool: ExifTool, ffprobe: FFProbe, settings: AppSettings, db: Any | None = None):
         """
         Initialize metadata service.
 
@@ -377,10 +416,12 @@ class MetadataService:
             exiftool: ExifTool adapter instance
             ffprobe: FFProbe adapter instance
             settings: Application settings service
+            db: Optional index database backing the persistent geninfo parse cache
         """
         self.exiftool = exiftool
         self.ffprobe = ffprobe
         self._settings = settings
+        self._db = db
         try:
             max_concurrency = int(METADATA_EXTRACT_CONCURRENCY or 1)
         except Exception:
@@ -437,58 +478,25 @@ class MetadataService:
     def _is_transient_metadata_read_error(self, result: Result[dict[str, Any]], file_path: str) -> bool:
         return retry_is_transient_metadata_read_error(result, file_path, _TRANSIENT_ERROR_HINTS)
 
+    async def enrich_generation_metadata(self, combined: dict[str, Any]) -> None:
+        """Add geninfo/workflow detection to a payload built without extraction (save-node ingest)."""
+        await self._enrich_with_geninfo_async(combined)
+
     async def _enrich_with_geninfo_async(self, combined: dict[str, Any]) -> None:
         """Helper to parse geninfo from prompt/workflow in combined metadata (Worker Thread)."""
         combined.setdefault("metadata_parser_version", PARSER_FAMILY_VERSION)
-        override = build_geninfo_override(combined)
+        self._apply_workflow_detection_metadata(combined, combined.get("workflow"))
 
-        prompt_graph = combined.get("prompt")
-        workflow = combined.get("workflow")
-        loop = asyncio.get_running_loop()
         geninfo_res = None
-        self._apply_workflow_detection_metadata(combined, workflow)
-
         try:
-            # Offload heavy parsing to thread pool to prevent blocking the event loop
-            geninfo_res = await loop.run_in_executor(
-                None,
-                functools.partial(parse_geninfo_from_prompt, prompt_graph, workflow=workflow)
-            )
+            # Batch outputs share one prompt graph: parse it once, on the thread pool.
+            geninfo_res = await aparse_geninfo_cached(combined.get("prompt"), combined.get("workflow"), db=self._db)
         except Exception as exc:
             logger.debug(f"GenInfo parse skipped: {exc}")
-
-        if geninfo_res and geninfo_res.ok and geninfo_res.data:
-            combined["geninfo"] = geninfo_res.data
-        elif "geninfo" not in combined:
-            gi = registry_build_geninfo_from_parameters(combined)
-            # Always set geninfo to a dict (empty if nothing parsed)
-            combined["geninfo"] = gi if gi is not None else {}
-            if not gi and registry_looks_like_media_pipeline(prompt_graph):
-                combined["geninfo_status"] = {"kind": "media_pipeline", "reason": "no_sampler"}
-        if override:
-            combined["geninfo"] = merge_geninfo_override(combined.get("geninfo"), override) or override
+        apply_geninfo_result(combined, geninfo_res)
 
     def _apply_workflow_detection_metadata(self, combined: dict[str, Any], workflow: Any) -> None:
-        if not isinstance(workflow, dict) or "workflow_detection" in combined:
-            return
-        try:
-            parsed = parse_workflow(workflow)
-            text = workflow_node_text(parsed.nodes)
-            classified = classify_workflow(text, parsed.nodes)
-            combined["workflow_detection"] = {
-                "task": classified.task,
-                "workflow_type": classified.task,
-                "model_family": classified.model_family,
-                "provider": classified.provider,
-                "runs_on": classified.runs_on,
-                "confidence": classified.confidence,
-                "source": classified.source,
-                "signals": classified.signals or {},
-            }
-            if not str(combined.get("workflow_type") or "").strip():
-                combined["workflow_type"] = classified.task
-        except Exception:
-            logger.debug("Workflow detection metadata skipped", exc_info=True)
+        apply_workflow_detection(combined, workflow)
 
     async def _resolve_probe_mode(self, override: str | None) -> str:
         if isinstance(override, str):
@@ -497,6 +505,32 @@ class MetadataService:
                 return normalized
         return await self._settings.get_probe_backend()
 
+    async def _read_native(self, file_path: str) -> dict[str, Any]:
+        """In-process PNG/WebP/MP4 metadata read (empty when disabled or unsupported)."""
+        if not METADATA_NATIVE_READER:
+            return {}
+        return await asyncio.to_thread(read_native_metadata, file_path)
+
+    async def _read_native_batch(
+        self,
+        images: list[str],
+        videos: list[str],
+    ) -> dict[str, Result[dict[str, Any]]]:
+        """Native reads that are complete enough to take ExifTool out of the batch."""
+        if not METADATA_NATIVE_READER or not (images or videos):
+            return {}
+
+        def _scan() -> dict[str, Result[dict[str, Any]]]:
+            out: dict[str, Result[dict[str, Any]]] = {}
+            for kind, paths in (("image", images), ("video", videos)):
+                for path in paths:
+                    data = read_native_metadata(path)
+                    if native_metadata_is_complete(data, kind):
+                        out[path] = Result.Ok(data)
+            return out
+
+        return await asyncio.to_thread(_scan)
+
     async def _probe_backends(self, file_path: str, override: str | None) -> tuple[str, list[str]]:
         mode = await self._resolve_probe_mode(override)
         return mode, pick_probe_backend(file_path, settings_override=mode)
@@ -647,6 +681,9 @@ class MetadataService:
         image_fallback_enabled: bool,
         scan_id: str | None,
     ) -> dict[str, Any]:
+        native = await self._read_native(file_path)
+        if has_generation_data(native):
+            return native
         exif_start = time.perf_counter()
         exif_result = await self._exif_read(file_path)
         exif_duration = time.perf_counter() - exif_start
@@ -715,12 +752,17 @@ class MetadataService:
         scan_id: str | None,
         allow_exif: bool,
     ) -> dict[str, Any] | None:
+        native = await self._read_native(file_path)
+        if native_metadata_is_complete(native, "image"):
+            return native
         exif_data: dict[str, Any] | None = None
         image_fallback_enabled, _ = await self._resolve_fallback_prefs()
         if allow_exif:
             exif_data = await self._read_image_exif_if_allowed(file_path, scan_id=scan_id)
         if not exif_data and image_fallback_enabled:
             exif_data = await asyncio.to_thread(read_image_exif_like, file_path)
+        if not exif_data and native:
+            exif_data = native
         return exif_data
 
     async def _read_image_exif_if_allowed(
@@ -766,7 +808,7 @@ class MetadataService:
     ) -> Result[dict[str, Any]]:
         """Extract metadata from video file."""
         _, media_fallback_enabled = await self._resolve_fallback_prefs()
-        exif_data, exif_duration = await self._read_video_exif_if_allowed(file_path, scan_id, allow_exif)
+        exif_data, exif_duration = await self._read_video_exif_or_native(file_path, scan_id, allow_exif)
         ffprobe_data, ffprobe_duration = await self._read_video_ffprobe_if_allowed(file_path, scan_id, allow_ffprobe)
         if not ffprobe_data and media_fallback_enabled:
             ffprobe_data = await asyncio.to_thread(read_media_probe_like, file_path)
@@ -880,6 +922,17 @@ class MetadataService:
         quality = metadata_result.meta.get("quality", "none")
         return Result.Ok(combined, quality=quality)
 
+    async def _read_video_exif_or_native(
+        self, file_path: str, scan_id: str | None, allow_exif: bool
+    ) -> tuple[dict[str, Any] | None, float]:
+        native = await self._read_native(file_path)
+        if native_metadata_is_complete(native, "video"):
+            return native, 0.0
+        exif_data, exif_duration = await self._read_video_exif_if_allowed(file_path, scan_id, allow_exif)
+        if not exif_data and native:
+            exif_data = native
+        return exif_data, exif_duration
+
     async def _read_video_exif_if_allowed(
         self, file_path: str, scan_id: str | None, allow_exif: bool
     ) -> tuple[dict[str, Any] | None, float]:
@@ -1150,6 +1203,9 @@ class MetadataService:
         image_fallback_enabled, media_fallback_enabled = await self._resolve_fallback_prefs()
 
         exif_targets, ffprobe_targets = registry_build_batch_probe_targets([*images, *videos, *audios], probe_mode)
+        native_results = await self._read_native_batch(images, videos)
+        if native_results:
+            exif_targets = [path for path in exif_targets if path not in native_results]
 
         async def _read_exif_batch() -> dict[str, Result[dict[str, Any]]]:
             return await self.exiftool.aread_batch(exif_targets) if exif_targets else {}
@@ -1161,6 +1217,8 @@ class MetadataService:
             _read_exif_batch(),
             _read_ffprobe_batch(),
         )
+        if native_results:
+            exif_results = {**exif_results, **native_results}
 
         await self._fill_image_batch_results(results, images, exif_results, image_fallback_enabled)
         await self._fill_video_batch_results(results, videos, exif_results, ffprobe_results, media_fallback_enabled)
@@ -0,0 +1,536 @@
+"""
+In-process container readers for PNG, WebP and MP4/MOV metadata.
+
+ComfyUI outputs carry everything the indexer needs in a few small chunks or
+boxes near the start of the file: PNG ``tEXt``/``zTXt``/``iTXt``, the WebP
+``EXIF``/``XMP `` chunks and the MP4 ``moov`` header (``udta``/``meta``/
+``ilst`` items).  These readers walk the container structure, seek over pixel
+and sample data without reading it, and return an ExifTool-shaped dict
+(``-G1`` style keys such as ``PNG:Prompt``, ``IFD0:Make``, ``Keys:Workflow``)
+so the regular extractors can consume the result unchanged.
+
+The metadata service calls :func:`read_native_metadata` first and only
+spawns ExifTool when :func:`native_metadata_is_complete` says a required
+field is missing.  Every reader is best-effort: malformed input yields
+whatever was parsed before the damage, never an exception.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import IO, Any
+
+# Upper bound for a single text chunk / metadata box we are willing to load.
+_MAX_TEXT_BYTES = 32 * 1024 * 1024
+# Upper bound for an MP4 ``moov`` box (sample tables of very long videos).
+_MAX_MOOV_BYTES = 64 * 1024 * 1024
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_PNG_XMP_KEYWORD = "XML:com.adobe.xmp"
+
+_MP4_CONTAINERS = {b"moov", b"trak", b"mdia", b"udta"}
+_MP4_EPOCH = datetime(1904, 1, 1, tzinfo=timezone.utc)
+_ILST_NAMES = {
+    b"\xa9cmt": "Comment",
+    b"\xa9nam": "Title",
+    b"\xa9too": "Encoder",
+    b"\xa9day": "ContentCreateDate",
+    b"desc": "Description",
+    b"ldes": "LongDescription",
+    b"keyw": "Keyword",
+}
+
+# IFD0 / ExifIFD tags worth surfacing (id -> (group, name)).
+_TIFF_TAGS = {
+    0x010E: ("IFD0", "ImageDescription"),
+    0x010F: ("IFD0", "Make"),
+    0x0110: ("IFD0", "Model"),
+    0x0131: ("IFD0", "Software"),
+    0x013B: ("IFD0", "Artist"),
+    0x4746: ("IFD0", "Rating"),
+    0x4749: ("IFD0", "RatingPercent"),
+    0x9C9B: ("IFD0", "XPTitle"),
+    0x9C9C: ("IFD0", "XPComment"),
+    0x9C9E: ("IFD0", "XPKeywords"),
+    0x9C9F: ("IFD0", "XPSubject"),
+    0x9003: ("ExifIFD", "DateTimeOriginal"),
+    0x9004: ("ExifIFD", "CreateDate"),
+    0x9286: ("ExifIFD", "UserComment"),
+}
+_TIFF_EXIF_IFD_POINTER = 0x8769
+_TIFF_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 7: 1}
+_TIFF_MAX_ENTRIES = 512
+
+_GENERATION_TAGS = {"prompt", "workflow", "parameters"}
+_GENERATION_PREFIXES = ("workflow:", "prompt:")
+
+_XMP_RATING_RE = re.compile(r"xmp:Rating(?:=\"([^\"]*)\"|>([^<]*)<)")
+_XMP_MS_RATING_RE = re.compile(r"MicrosoftPhoto:Rating(?:=\"([^\"]*)\"|>([^<]*)<)")
+_XMP_SUBJECT_RE = re.compile(r"<dc:subject>(.*?)</dc:subject>", re.S)
+_XMP_DESCRIPTION_RE = re.compile(r"<dc:description>(.*?)</dc:description>", re.S)
+_XMP_LI_RE = re.compile(r"<rdf:li[^>]*>(.*?)</rdf:li>", re.S)
+
+
+def read_native_metadata(path: str) -> dict[str, Any]:
+    """
+    Read embedded metadata of a PNG, WebP or MP4/MOV file without ExifTool.
+
+    Returns an empty dict for other formats or when the file can't be read.
+    """
+    try:
+        with open(path, "rb") as fh:
+            head = fh.read(12)
+            fh.seek(0)
+            if head.startswith(_PNG_SIGNATURE):
+                return _read_png(fh)
+            if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+                return _read_webp(fh)
+            if head[4:8] == b"ftyp":
+                return _read_mp4(fh, os.fstat(fh.fileno()).st_size)
+    except Exception:
+        return {}
+    return {}
+
+
+def native_metadata_is_complete(data: dict[str, Any] | None, kind: str) -> bool:
+    """
+    Whether a native read already holds everything ExifTool would add.
+
+    Images need dimensions plus a generation payload; videos only need the
+    payload (ffprobe supplies stream geometry and timing).
+    """
+    if not data or not has_generation_data(data):
+        return False
+    if kind == "image":
+        return bool(data.get("Image:ImageWidth") and data.get("Image:ImageHeight"))
+    return kind == "video"
+
+
+def has_generation_data(data: dict[str, Any] | None) -> bool:
+    """True when *data* carries a ComfyUI prompt/workflow or A1111 parameters."""
+    if not data:
+        return False
+    for key, value in data.items():
+        if not isinstance(value, str) or not value.strip():
+            continue
+        if str(key).split(":")[-1].lower() in _GENERATION_TAGS:
+            return True
+        text = value.lstrip()
+        if text.startswith(_GENERATION_PREFIXES):
+            return True
+        if text.startswith("{") and ('"prompt"' in text or '"workflow"' in text):
+            return True
+        if "Steps: " in text and "Sampler: " in text:
+            return True
+    return False
+
+
+def _set_dimensions(out: dict[str, Any], width: int, height: int) -> None:
+    if width <= 0 or height <= 0:
+        return
+    out["Image:ImageWidth"] = int(width)
+    out["Image:ImageHeight"] = int(height)
+    out["Composite:ImageSize"] = f"{int(width)} {int(height)}"
+
+
+def _tag_name(keyword: str) -> str:
+    """ExifTool-style tag name for a free-form keyword (``job_id`` -> ``Job_id``)."""
+    name = re.sub(r"[^\w-]", "", keyword)
+    return name[:1].upper() + name[1:]
+
+
+# --- PNG -------------------------------------------------------------------
+
+
+def _read_png(fh: IO[bytes]) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    fh.seek(len(_PNG_SIGNATURE))
+    while True:
+        header = fh.read(8)
+        if len(header) < 8:
+            break
+        length, ctype = struct.unpack(">I4s", header)
+        if ctype == b"IEND":
+            break
+        if ctype in (b"IHDR", b"tEXt", b"zTXt", b"iTXt", b"eXIf") and length <= _MAX_TEXT_BYTES:
+            body = fh.read(length)
+            if len(body) < length:
+                break
+            _apply_png_chunk(out, ctype, body)
+            fh.seek(4, os.SEEK_CUR)
+        else:
+            # Pixel data (IDAT) and anything else is skipped without reading.
+            fh.seek(length + 4, os.SEEK_CUR)
+    return out
+
+
+def _apply_png_chunk(out: dict[str, Any], ctype: bytes, body: bytes) -> None:
+    if ctype == b"IHDR":
+        if len(body) >= 8:
+            width, height = struct.unpack(">II", body[:8])
+            out["PNG:ImageWidth"] = width
+            out["PNG:ImageHeight"] = height
+            _set_dimensions(out, width, height)
+        return
+    if ctype == b"eXIf":
+        out.update(_parse_tiff(body))
+        return
+    parsed = _decode_png_text(ctype, body)
+    if parsed is None:
+        return
+    keyword, text = parsed
+    if keyword == _PNG_XMP_KEYWORD:
+        out.update(_parse_xmp(text))
+        return
+    name = _tag_name(keyword)
+    if name:
+        out.setdefault(f"PNG:{name}", text)
+
+
+def _decode_png_text(ctype: bytes, body: bytes) -> tuple[str, str] | None:
+    keyword_raw, sep, rest = body.partition(b"\0")
+    if not sep or not keyword_raw:
+        return None
+    keyword = keyword_raw.decode("latin-1")
+    try:
+        if ctype == b"tEXt":
+            return keyword, rest.decode("latin-1")
+        if ctype == b"zTXt":
+            return keyword, _inflate(rest[1:]).decode("latin-1")
+        # iTXt: compression flag, method, language tag\0, translated keyword\0, text
+        if len(rest) < 2:
+            return None
+        compressed = rest[0] == 1
+        _lang, _, rest = rest[2:].partition(b"\0")
+        _translated, _, text = rest.partition(b"\0")
+        if compressed:
+            text = _inflate(text)
+        return keyword, text.decode("utf-8", errors="replace")
+    except (zlib.error, ValueError):
+        return None
+
+
+def _inflate(data: bytes) -> bytes:
+    inflater = zlib.decompressobj()
+    out = inflater.decompress(data, _MAX_TEXT_BYTES)
+    if inflater.unconsumed_tail:
+        raise ValueError("compressed text chunk exceeds size limit")
+    return out
+
+
+# --- WebP ------------------------------------------------------------------
+
+
+def _read_webp(fh: IO[bytes]) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    riff_size = struct.unpack("<I", fh.read(8)[4:8])[0]
+    end = 8 + riff_size
+    fh.seek(12)
+    while fh.tell() + 8 <= end:
+        header = fh.read(8)
+        if len(header) < 8:
+            break
+        ctype, length = struct.unpack("<4sI", header)
+        padded = length + (length & 1)
+        if ctype in (b"VP8X", b"VP8 ", b"VP8L"):
+            body = fh.read(min(length, 30))
+            fh.seek(padded - len(body), os.SEEK_CUR)
+            if "Image:ImageWidth" not in out:
+                _apply_webp_dimensions(out, ctype, body)
+        elif ctype in (b"EXIF", b"XMP ") and length <= _MAX_TEXT_BYTES:
+            body = fh.read(length)
+            fh.seek(padded - length, os.SEEK_CUR)
+            if ctype == b"EXIF":
+                out.update(_parse_tiff(body[6:] if body.startswith(b"Exif\0\0") else body))
+            else:
+                out.update(_parse_xmp(body.decode("utf-8", errors="replace")))
+        else:
+            fh.seek(padded, os.SEEK_CUR)
+    return out
+
+
+def _apply_webp_dimensions(out: dict[str, Any], ctype: bytes, body: bytes) -> None:
+    width = height = 0
+    if ctype == b"VP8X" and len(body) >= 10:
+        width = 1 + int.from_bytes(body[4:7], "little")
+        height = 1 + int.from_bytes(body[7:10], "little")
+    elif ctype == b"VP8 " and len(body) >= 10 and body[3:6] == b"\x9d\x01\x2a":
+        width = struct.unpack("<H", body[6:8])[0] & 0x3FFF
+        height = struct.unpack("<H", body[8:10])[0] & 0x3FFF
+    elif ctype == b"VP8L" and len(body) >= 5 and body[0] == 0x2F:
+        bits = int.from_bytes(body[1:5], "little")
+        width = (bits & 0x3FFF) + 1
+        height = ((bits >> 14) & 0x3FFF) + 1
+    if width and height:
+        out["RIFF:ImageWidth"] = width
+        out["RIFF:ImageHeight"] = height
+        _set_dimensions(out, width, height)
+
+
+# --- TIFF / EXIF -------------------------------------------------------------
+
+
+def _parse_tiff(data: bytes) -> dict[str, Any]:
+    """Decode the handful of IFD0/ExifIFD text and rating tags we care about."""
+    out: dict[str, Any] = {}
+    if len(data) < 8 or data[:2] not in (b"II", b"MM"):
+        return out
+    bo = "<" if data[:2] == b"II" else ">"
+    try:
+        ifd0 = struct.unpack(bo + "I", data[4:8])[0]
+        exif_ifd = _parse_ifd(data, ifd0, bo, out)
+        if exif_ifd:
+            _parse_ifd(data, exif_ifd, bo, out)
+    except struct.error:
+        pass
+    return out
+
+
+def _parse_ifd(data: bytes, offset: int, bo: str, out: dict[str, Any]) -> int | None:
+    if offset <= 0 or offset + 2 > len(data):
+        return None
+    count = min(struct.unpack(bo + "H", data[offset : offset + 2])[0], _TIFF_MAX_ENTRIES)
+    exif_pointer = None
+    for i in range(count):
+        entry = offset + 2 + i * 12
+        if entry + 12 > len(data):
+            break
+        tag, typ, n = struct.unpack(bo + "HHI", data[entry : entry + 8])
+        if tag == _TIFF_EXIF_IFD_POINTER and typ == 4:
+            exif_pointer = struct.unpack(bo + "I", data[entry + 8 : entry + 12])[0]
+            continue
+        known = _TIFF_TAGS.get(tag)
+        size = _TIFF_TYPE_SIZES.get(typ)
+        if known is None or size is None:
+            continue
+        nbytes = size * n
+        if nbytes <= 4:
+            raw = data[entry + 8 : entry + 8 + nbytes]
+        else:
+            start = struct.unpack(bo + "I", data[entry + 8 : entry + 12])[0]
+            raw = data[start : start + nbytes]
+        value = _tiff_value(known[1], typ, raw, bo)
+        if value not in (None, ""):
+            out[f"{known[0]}:{known[1]}"] = value
+    return exif_pointer
+
+
+def _tiff_value(name: str, typ: int, raw: bytes, bo: str) -> Any:
+    if typ == 3 and len(raw) >= 2:
+        return struct.unpack(bo + "H", raw[:2])[0]
+    if typ == 4 and len(raw) >= 4:
+        return struct.unpack(bo + "I", raw[:4])[0]
+    if name.startswith("XP"):
+        return raw.decode("utf-16-le", errors="replace").rstrip("\0")
+    if name == "UserComment":
+        return _decode_user_comment(raw, bo)
+    return raw.split(b"\0", 1)[0].decode("utf-8", errors="replace")
+
+
+def _decode_user_comment(raw: bytes, bo: str) -> str:
+    charset, body = raw[:8], raw[8:]
+    if charset.startswith(b"UNICODE"):
+        encoding = "utf-16-le" if bo == "<" else "utf-16-be"
+        if body[:2] in (b"\xff\xfe", b"\xfe\xff"):
+            encoding = "utf-16"
+        return body.decode(encoding, errors="replace").rstrip("\0")
+    return body.decode("utf-8", errors="replace").rstrip("\0 ")
+
+
+# --- XMP -------------------------------------------------------------------
+
+
+def _parse_xmp(text: str) -> dict[str, Any]:
+    """Pull rating/keywords/description out of an XMP packet (no XML parser needed)."""
+    out: dict[str, Any] = {}
+    for regex, key in ((_XMP_RATING_RE, "XMP-xmp:Rating"), (_XMP_MS_RATING_RE, "XMP-microsoft:RatingPercent")):
+        match = regex.search(text)
+        if match:
+            value = (match.group(1) or match.group(2) or "").strip()
+            if value:
+                out[key] = value
+    subject = _XMP_SUBJECT_RE.search(text)
+    if subject:
+        items = [_xml_unescape(li).strip() for li in _XMP_LI_RE.findall(subject.group(1))]
+        out["XMP-dc:Subject"] = [item for item in items if item]
+    description = _XMP_DESCRIPTION_RE.search(text)
+    if description:
+        items = [_xml_unescape(li).strip() for li in _XMP_LI_RE.findall(description.group(1))]
+        if items and items[0]:
+            out["XMP-dc:Description"] = items[0]
+    return out
+
+
+def _xml_unescape(text: str) -> str:
+    return (
+        text.replace("&lt;", "<")
+        .replace("&gt;", ">")
+        .replace("&quot;", '"')
+        .replace("&apos;", "'")
+        .replace("&amp;", "&")
+    )
+
+
+# --- MP4 / MOV -------------------------------------------------------------
+
+
+def _read_mp4(fh: IO[bytes], file_size: int) -> dict[str, Any]:
+    out: dict[str, Any] = {}
+    pos = 0
+    while pos + 8 <= file_size:
+        fh.seek(pos)
+        size, btype, header_len = _read_box_header(fh, file_size - pos)
+        if size is None:
+            break
+        if btype == b"moov":
+            if size - header_len > _MAX_MOOV_BYTES:
+                break
+            body = fh.read(size - header_len)
+            _walk_mp4(body, out, track={})
+            break
+        # ``mdat`` and friends are skipped by seeking; ``moov`` may sit at the end.
+        pos += size
+    return out
+
+
+def _read_box_header(fh: IO[bytes], remaining: int) -> tuple[int | None, bytes, int]:
+    header = fh.read(8)
+    if len(header) < 8:
+        return None, b"", 0
+    size, btype = struct.unpack(">I4s", header)
+    header_len = 8
+    if size == 1:
+        ext = fh.read(8)
+        if len(ext) < 8:
+            return None, b"", 0
+        size = struct.unpack(">Q", ext)[0]
+        header_len = 16
+    elif size == 0:
+        size = remaining
+    if size < header_len or size > remaining:
+        return None, b"", 0
+    return size, btype, header_len
+
+
+def _iter_boxes(data: bytes, start: int = 0):
+    pos = start
+    while pos + 8 <= len(data):
+        size, btype = struct.unpack(">I4s", data[pos : pos + 8])
+        header_len = 8
+        if size == 1 and pos + 16 <= len(data):
+            size = struct.unpack(">Q", data[pos + 8 : pos + 16])[0]
+            header_len = 16
+        elif size == 0:
+            size = len(data) - pos
+        if size < header_len or pos + size > len(data):
+            return
+        yield btype, data[pos + header_len : pos + size]
+        pos += size
+
+
+def _walk_mp4(data: bytes, out: dict[str, Any], *, track: dict[str, Any], parent: bytes = b"") -> None:
+    for btype, body in _iter_boxes(data):
+        if btype == b"trak":
+            current: dict[str, Any] = {}
+            _walk_mp4(body, out, track=current, parent=btype)
+            if current.get("handler") == b"vide" and "Image:ImageWidth" not in out:
+                width, height = current.get("width", 0), current.get("height", 0)
+                if width and height:
+                    out["QuickTime:ImageWidth"] = width
+                    out["QuickTime:ImageHeight"] = height
+                    _set_dimensions(out, width, height)
+        elif btype in _MP4_CONTAINERS:
+            _walk_mp4(body, out, track=track, parent=btype)
+        elif btype == b"mvhd":
+            _apply_mvhd(out, body)
+        elif btype == b"tkhd" and body:
+            # width/height are 16.16 fixed point after the 36-byte matrix
+            offset = 88 if body[0] == 1 else 76
+            if len(body) >= offset + 8:
+                width, height = struct.unpack(">II", body[offset : offset + 8])
+                track["width"], track["height"] = width >> 16, height >> 16
+        elif btype == b"hdlr" and len(body) >= 12:
+            track["handler"] = body[8:12]
+        elif btype == b"meta":
+            _apply_mp4_meta(out, body)
+        elif parent == b"udta" and btype[:1] == b"\xa9" and btype in _ILST_NAMES:
+            _apply_udta_text(out, btype, body)
+
+
+def _apply_mvhd(out: dict[str, Any], body: bytes) -> None:
+    try:
+        if body[0] == 1:
+            created, _modified, timescale, duration = struct.unpack(">QQIQ", body[4:32])
+        else:
+            created, _modified, timescale, duration = struct.unpack(">IIII", body[4:20])
+    except (IndexError, struct.error):
+        return
+    if timescale:
+        out["QuickTime:Duration"] = round(duration / timescale, 3)
+    if created:
+        stamp = _MP4_EPOCH + timedelta(seconds=created)
+        out["QuickTime:CreateDate"] = stamp.strftime("%Y:%m:%d %H:%M:%S")
+
+
+def _apply_mp4_meta(out: dict[str, Any], body: bytes) -> None:
+    # QuickTime ``meta`` has no version/flags; ISO ``meta`` (inside udta) does.
+    start = 0 if body[4:8] in (b"hdlr", b"keys", b"ilst") else 4
+    keys: list[str] = []
+    ilst: bytes | None = None
+    for btype, child in _iter_boxes(body, start):
+        if btype == b"keys":
+            keys = _parse_keys(child)
+        elif btype == b"ilst":
+            ilst = child
+    if ilst is None:
+        return
+    for btype, item in _iter_boxes(ilst):
+        value = _ilst_data(item)
+        if value is None:
+            continue
+        index = struct.unpack(">I", btype)[0]
+        if keys and 1 <= index <= len(keys):
+            name = _tag_name(keys[index - 1].rsplit(".", 1)[-1])
+            if name:
+                out.setdefault(f"Keys:{name}", value)
+        elif btype in _ILST_NAMES:
+            out.setdefault(f"ItemList:{_ILST_NAMES[btype]}", value)
+
+
+def _parse_keys(body: bytes) -> list[str]:
+    keys: list[str] = []
+    if len(body) < 8:
+        return keys
+    count = struct.unpack(">I", body[4:8])[0]
+    pos = 8
+    for _ in range(count):
+        if pos + 8 > len(body):
+            break
+        size = struct.unpack(">I", body[pos : pos + 4])[0]
+        if size < 8 or pos + size > len(body):
+            break
+        keys.append(body[pos + 8 : pos + size].decode("utf-8", errors="replace"))
+        pos += size
+    return keys
+
+
+def _ilst_data(item: bytes) -> str | None:
+    for btype, body in _iter_boxes(item):
+        # data box: type indicator (4 bytes) + locale (4 bytes) + payload
+        if btype == b"data" and len(body) >= 8 and body[1:4] in (b"\0\0\1", b"\0\0\0"):
+            return body[8:].decode("utf-8", errors="replace")
+    return None
+
+
+def _apply_udta_text(out: dict[str, Any], btype: bytes, body: bytes) -> None:
+    # Classic QuickTime user-data text: 16-bit length, 16-bit language, text.
+    if len(body) < 4:
+        return
+    length = struct.unpack(">H", body[:2])[0]
+    text = body[4 : 4 + length].decode("utf-8", errors="replace")
+    if text:
+        out.setdefault(f"UserData:{_ILST_NAMES[btype]}", text)
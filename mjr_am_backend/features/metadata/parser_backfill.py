@@ -1,17 +1,60 @@
-"""Targeted metadata parser-version backfill."""
+"""
+Metadata parser-version backfill.
+
+Rows whose ``metadata_raw`` carries an older ``metadata_parser_version`` are
+re-derived from the stored JSON: the geninfo parser runs again on the saved
+prompt graph and workflow (no file is re-read), and the denormalized
+columns, FTS text, ``asset_generation`` row and metadata key catalog are
+rewritten from the result. Parsing runs in a small thread pool off the event
+loop; writes go back one page per transaction.
+
+Finished rows carry the new version, so an interrupted run resumes where it
+stopped the next time it is started.
+"""
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
-from mjr_am_backend.features.metadata.section_catalog import PARSER_FAMILY_VERSION
-from mjr_am_backend.shared import Result
+from ...config import METADATA_BACKFILL_WORKERS
+from ...data.repositories.metadata_keys_repository import MetadataKeysRepository, key_set_signature
+from ...shared import Result, get_logger
+from ..index.asset_generation import write_asset_generation_rows
+from .rederive_worker import rederive_job
+from .section_catalog import PARSER_FAMILY_VERSION
+
+logger = get_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 200
+_MAX_BATCH_SIZE = 1000
+# Pages smaller than this are parsed as a single job.
+_POOL_MIN_ROWS = 32
 
 _OUTDATED_WHERE = (
     "json_valid(COALESCE(metadata_raw, '')) "
     "AND COALESCE(json_extract(metadata_raw, '$.metadata_parser_version'), '') <> ?"
 )
 
+_UPDATE_DERIVED_SQL = """
+    UPDATE asset_metadata
+    SET metadata_raw = ?,
+        has_workflow = COALESCE(?, has_workflow),
+        has_generation_data = COALESCE(?, has_generation_data),
+        workflow_type = ?,
+        generation_time_ms = COALESCE(?, generation_time_ms),
+        positive_prompt = ?,
+        metadata_text = ?
+    WHERE asset_id = ? AND metadata_raw = ?
+    RETURNING asset_id
+"""
+
+_UPDATE_STAMP_SQL = (
+    "UPDATE asset_metadata SET metadata_raw = ? WHERE asset_id = ? AND metadata_raw = ? RETURNING asset_id"
+)
+
 
 async def metadata_parser_backfill_status(db: Any) -> Result[dict[str, Any]]:
     res = await db.aquery(
@@ -25,30 +68,235 @@ async def metadata_parser_backfill_status(db: Any) -> Result[dict[str, Any]]:
     return Result.Ok({"parser_family_version": PARSER_FAMILY_VERSION, "outdated": count})
 
 
-async def run_metadata_parser_backfill(db: Any, *, limit: int = 1000) -> Result[dict[str, Any]]:
-    batch_limit = max(1, min(10_000, int(limit or 1000)))
-    res = await db.aexecute(
+class _Rederiver:
+    """
+    Runs :func:`rederive_job` on a dedicated thread pool.
+
+    Not a process pool: spawned children re-import the host's ``__main__``,
+    which inside ComfyUI is ``main.py`` (torch, custom nodes, CUDA init).
+    Threads keep the event loop responsive without that cost.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self._workers = max(0, int(workers))
+        self._pool: ThreadPoolExecutor | None = None
+
+    async def run(self, rows: list[tuple[int, str]]) -> list[dict[str, Any]]:
+        if not rows:
+            return []
+        pool = self._get_pool()
+        if pool is None or len(rows) < _POOL_MIN_ROWS:
+            return await asyncio.to_thread(rederive_job, rows)
+        loop = asyncio.get_running_loop()
+        chunks = [rows[i :: self._workers] for i in range(self._workers)]
+        parts = await asyncio.gather(*(loop.run_in_executor(pool, rederive_job, chunk) for chunk in chunks if chunk))
+        return [item for part in parts for item in part]
+
+    def _get_pool(self) -> ThreadPoolExecutor | None:
+        if self._workers <= 0:
+            return None
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="mjr-metadata-backfill")
+        return self._pool
+
+    def close(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _query_outdated_page(db: Any, last_id: int, page_size: int) -> Result[list[dict[str, Any]]]:
+    return await db.aquery(
         f"""
-        UPDATE asset_metadata
-        SET metadata_raw = json_set(metadata_raw, '$.metadata_parser_version', ?)
-        WHERE asset_id IN (
-            SELECT asset_id
-            FROM asset_metadata
-            WHERE {_OUTDATED_WHERE}
-            LIMIT ?
-        )
+        SELECT asset_id, metadata_raw
+        FROM asset_metadata
+        WHERE asset_id > ? AND {_OUTDATED_WHERE}
+        ORDER BY asset_id
+        LIMIT ?
         """,
-        (PARSER_FAMILY_VERSION, PARSER_FAMILY_VERSION, batch_limit),
+        (int(last_id), PARSER_FAMILY_VERSION, int(page_size)),
     )
+
+
+class _PageWriteError(RuntimeError):
+    """Raised inside the page transaction so it rolls back as a whole."""
+
+
+def _check(res: Result[Any], fallback: str) -> Result[Any]:
     if not res.ok:
-        return Result.Err("METADATA_BACKFILL_FAILED", res.error or "Failed to backfill metadata parser version")
+        raise _PageWriteError(res.error or fallback)
+    return res
+
+
+async def _write_page(
+    db: Any,
+    results: list[dict[str, Any]],
+    originals: dict[int, str],
+) -> Result[dict[str, int]]:
+    """Write one page of re-derived rows in a single transaction."""
+    try:
+        async with db.atransaction(mode="immediate") as tx:
+            if not tx.ok:
+                return Result.Err("DB_ERROR", tx.error or "Failed to begin metadata backfill transaction")
+            counts = await _apply_page(db, results, originals)
+    except _PageWriteError as exc:
+        return Result.Err("DB_ERROR", str(exc))
+    if not tx.ok:
+        return Result.Err("DB_ERROR", tx.error or "Failed to commit metadata backfill page")
+    return Result.Ok(counts)
+
+
+async def _apply_page(db: Any, results: list[dict[str, Any]], originals: dict[int, str]) -> dict[str, int]:
+    counts = {"updated": 0, "skipped": 0, "errors": 0}
+    generation_rows: list[tuple[int, dict[str, Any]]] = []
+    key_sets: dict[str, list[tuple[str, str]]] = {}
+    assignments: list[tuple[int, str]] = []
+    cleared: list[int] = []
+    stale_generation: list[tuple[int]] = []
+    for item in results:
+        asset_id = int(item["asset_id"])
+        if item.get("error"):
+            counts["errors"] += 1
+            continue
+        columns = item.get("columns")
+        if columns is None:
+            params: tuple[Any, ...] = (item["metadata_raw"], asset_id, originals[asset_id])
+            res = _check(await db.aquery(_UPDATE_STAMP_SQL, params), "Failed to stamp metadata parser version")
+        else:
+            params = (
+                item["metadata_raw"],
+                columns["has_workflow"],
+                columns["has_generation_data"],
+                columns["workflow_type"],
+                columns["generation_time_ms"],
+                columns["positive_prompt"],
+                columns["metadata_text"],
+                asset_id,
+                originals[asset_id],
+            )
+            res = _check(await db.aquery(_UPDATE_DERIVED_SQL, params), "Failed to write re-derived metadata")
+        if not res.data:
+            # Rewritten by the indexer since the page was read.
+            counts["skipped"] += 1
+            continue
+        counts["updated"] += 1
+        if columns is None:
+            continue
+        if item.get("generation"):
+            generation_rows.append((asset_id, item["generation"]))
+        else:
+            stale_generation.append((asset_id,))
+        pairs = [(str(node_type), str(path)) for node_type, path in item.get("key_pairs") or []]
+        if not pairs:
+            cleared.append(asset_id)
+            continue
+        signature = key_set_signature(pairs)
+        key_sets.setdefault(signature, pairs)
+        assignments.append((asset_id, signature))
+
+    _check(await write_asset_generation_rows(db, generation_rows), "Failed to write asset_generation rows")
+    if stale_generation:
+        # The new parse found no generation parameters: drop the old projection.
+        res = await db.aexecutemany("DELETE FROM asset_generation WHERE asset_id = ?", stale_generation)
+        _check(res, "Failed to delete stale asset_generation rows")
+    repo = MetadataKeysRepository(db)
+    set_ids: dict[str, int] = {}
+    for signature, pairs in key_sets.items():
+        set_id = _check(await repo.ensure_key_set(pairs, signature), "Failed to write metadata key set").data
+        if set_id is None:
+            raise _PageWriteError("Metadata key set was not created")
+        set_ids[signature] = int(set_id)
+    assigned = [(asset_id, set_ids[signature]) for asset_id, signature in assignments]
+    _check(await repo.assign_many(assigned), "Failed to assign metadata key sets")
+    for asset_id in cleared:
+        _check(await repo.clear(asset_id), "Failed to clear metadata key set")
+    return counts
+
+
+async def _backfill_page(
+    db: Any,
+    rederiver: _Rederiver,
+    progress: dict[str, int],
+    want: int,
+) -> Result[bool]:
+    """Re-derive and write the next page; ``Ok(False)`` once nothing is left."""
+    page = await _query_outdated_page(db, progress["last_asset_id"], want)
+    if not page.ok:
+        return Result.Err("METADATA_BACKFILL_FAILED", page.error or "Failed to read outdated metadata")
+    rows = [(int(row["asset_id"]), str(row["metadata_raw"])) for row in page.data or []]
+    if not rows:
+        return Result.Ok(False)
+    results = await rederiver.run(rows)
+    written = await _write_page(db, results, dict(rows))
+    if not written.ok:
+        return Result.Err("METADATA_BACKFILL_FAILED", written.error or "Failed to write re-derived metadata")
+    for key, value in (written.data or {}).items():
+        progress[key] += value
+    progress["processed"] += len(rows)
+    progress["last_asset_id"] = rows[-1][0]
+    return Result.Ok(True)
+
+
+async def run_metadata_parser_backfill(
+    db: Any,
+    *,
+    limit: int | None = 1000,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int | None = None,
+    on_progress: Callable[[dict[str, int]], None] | None = None,
+    wait_for_priority_window_fn: Callable[[], Awaitable[None]] | None = None,
+) -> Result[dict[str, Any]]:
+    """
+    Re-derive up to ``limit`` outdated rows (``None`` = all of them).
+
+    ``wait_for_priority_window_fn`` is awaited before each page so a running
+    generation can pause the backfill; ``on_progress`` receives the running
+    counters after each page.
+    """
+    row_limit = None if limit is None else max(1, min(100_000, int(limit or 1000)))
+    page_size = max(1, min(_MAX_BATCH_SIZE, int(batch_size or DEFAULT_BATCH_SIZE)))
+    status = await metadata_parser_backfill_status(db)
+    if not status.ok:
+        return status
+    outdated = int((status.data or {}).get("outdated") or 0)
+    candidates = outdated if row_limit is None else min(outdated, row_limit)
+    progress = {
+        "candidates": candidates,
+        "processed": 0,
+        "updated": 0,
+        "skipped": 0,
+        "errors": 0,
+        "batch_size": page_size,
+        "last_asset_id": 0,
+    }
+    if on_progress:
+        on_progress(dict(progress))
+
+    rederiver = _Rederiver(METADATA_BACKFILL_WORKERS if workers is None else workers)
+    try:
+        while row_limit is None or progress["processed"] < row_limit:
+            if wait_for_priority_window_fn is not None:
+                await wait_for_priority_window_fn()
+            want = page_size if row_limit is None else min(page_size, row_limit - progress["processed"])
+            page = await _backfill_page(db, rederiver, progress, want)
+            if not page.ok:
+                return Result.Err(page.code, page.error or "Metadata backfill failed")
+            if not page.data:
+                break
+            if on_progress:
+                on_progress(dict(progress))
+    finally:
+        rederiver.close()
+
     status = await metadata_parser_backfill_status(db)
     if not status.ok:
         return status
     return Result.Ok(
         {
             "parser_family_version": PARSER_FAMILY_VERSION,
-            "updated": int(res.data or 0),
+            "updated": progress["updated"],
+            "skipped": progress["skipped"],
+            "errors": progress["errors"],
             "remaining": int((status.data or {}).get("outdated") or 0),
         }
     )
@@ -0,0 +1,101 @@
+"""
+Geninfo re-derivation jobs for the parser-version backfill.
+
+Everything here is a plain top-level function taking and returning plain
+values, run on the backfill's worker threads.  Jobs only decode stored
+``metadata_raw`` JSON, re-run the geninfo parser and project the derived
+columns; no file is read and all writes stay on the event loop.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from ...shared import Result
+from ...utils import sanitize_for_json
+from ..geninfo.parse_cache import parse_geninfo_cached
+from ..index.asset_generation import extract_generation_fields
+from ..index.metadata_helpers import _apply_metadata_json_size_guard, derived_metadata_columns
+from .extractor_registry import should_parse_geninfo
+from .key_aggregator import metadata_key_pairs
+from .metadata_service_impl import apply_geninfo_result, apply_workflow_detection
+from .section_catalog import PARSER_FAMILY_VERSION
+
+# Keys produced by the geninfo step; they are rebuilt from prompt/workflow.
+_DERIVED_KEYS = ("geninfo", "geninfo_status", "workflow_detection")
+
+
+def rederive_metadata(meta: dict[str, Any]) -> bool:
+    """
+    Re-run geninfo parsing on a stored payload in place.
+
+    Payloads without a prompt graph, workflow, A1111 parameters or override
+    keep their geninfo and are only stamped. Returns True when re-parsed.
+    """
+    meta["metadata_parser_version"] = PARSER_FAMILY_VERSION
+    if meta.get("_truncated") or not should_parse_geninfo(meta):
+        return False
+    detection = meta.get("workflow_detection")
+    detected_type = detection.get("workflow_type") if isinstance(detection, dict) else None
+    for key in _DERIVED_KEYS:
+        meta.pop(key, None)
+    if detected_type and meta.get("workflow_type") == detected_type:
+        meta.pop("workflow_type", None)
+
+    apply_workflow_detection(meta, meta.get("workflow"))
+    try:
+        geninfo_res = parse_geninfo_cached(meta.get("prompt"), meta.get("workflow"))
+    except Exception as exc:
+        geninfo_res = Result.Err("PARSE_ERROR", str(exc))
+    apply_geninfo_result(meta, geninfo_res)
+    return True
+
+
+def rederive_row(asset_id: int, metadata_raw: str) -> dict[str, Any]:
+    """Re-derive one stored payload; see :func:`rederive_job` for the result shape."""
+    try:
+        meta = json.loads(metadata_raw)
+    except (TypeError, ValueError) as exc:
+        return {"asset_id": asset_id, "error": f"invalid metadata_raw: {exc}"}
+    if not isinstance(meta, dict):
+        return {"asset_id": asset_id, "error": "metadata_raw is not an object"}
+
+    if not rederive_metadata(meta):
+        return {
+            "asset_id": asset_id,
+            "metadata_raw": json.dumps(meta),
+            "columns": None,
+            "generation": None,
+            "key_pairs": None,
+        }
+
+    metadata_result = Result.Ok(meta)
+    new_raw = _apply_metadata_json_size_guard(asset_id, metadata_result, json.dumps(sanitize_for_json(meta)))
+    stored = json.loads(new_raw) if metadata_result.meta.get("truncated") else meta
+    return {
+        "asset_id": asset_id,
+        "metadata_raw": new_raw,
+        "columns": derived_metadata_columns(meta),
+        "generation": extract_generation_fields(meta),
+        "key_pairs": sorted(metadata_key_pairs(stored)) if isinstance(stored, dict) else [],
+    }
+
+
+def rederive_job(rows: list[tuple[int, str]]) -> list[dict[str, Any]]:
+    """
+    Re-derive a chunk of ``(asset_id, metadata_raw)`` rows.
+
+    Each result carries ``asset_id`` and either ``error`` or the new
+    ``metadata_raw`` with ``columns`` (denormalized ``asset_metadata``
+    values), ``generation`` (``asset_generation`` fields) and ``key_pairs``
+    (metadata key catalog). The last three are ``None`` for payloads that
+    were only stamped with the current parser version.
+    """
+    out: list[dict[str, Any]] = []
+    for asset_id, metadata_raw in rows:
+        try:
+            out.append(rederive_row(int(asset_id), metadata_raw))
+        except Exception as exc:
+            out.append({"asset_id": int(asset_id), "error": str(exc)})
+    return out
@@ -6,6 +6,9 @@ from copy import deepcopy
 from typing import Any
 
 CATALOG_VERSION = 1
+# Bump whenever a parser/tracer change alters the geninfo produced for the same
+# prompt graph: cached parses are ignored and stored rows become outdated for
+# the parser-version backfill.
 PARSER_FAMILY_VERSION = "geninfo-catalog-v1"
 
 METADATA_SECTION_CATALOG: dict[str, Any] = {
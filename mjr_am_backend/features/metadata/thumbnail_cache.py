@@ -1,22 +1,47 @@
-"""Content-addressed thumbnail generation for indexed media previews."""
+"""Content-addressed thumbnail generation for indexed media previews.
+
+Thumbnails live in 256 sharded subdirectories (``<key[:2]>/<key>.jpg``) of
+the cache root.  An in-memory LRU index of ``key -> (bytes, atime)`` answers
+hits without touching the filesystem and keeps the running total, so the
+single background GC worker evicts oldest entries in O(evicted) instead of
+globbing and stat-ing the whole cache.  The index is persisted to
+``index.json`` by the same worker and rebuilt from disk once if missing.
+"""
 
 from __future__ import annotations
 
+import atexit
+import contextlib
 import hashlib
+import json
 import os
 import shutil
 import subprocess
 import threading
 import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
-from mjr_am_backend.shared import Result, classify_file
+from mjr_am_backend.config import THUMB_PREGEN_WORKERS
+from mjr_am_backend.shared import Result, classify_file, get_logger
+
+logger = get_logger(__name__)
 
 THUMB_CACHE_VERSION = "thumb-v1"
 THUMB_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024
+# Matches the grid card request size (ui/api/endpoints.ts buildThumbnailURL).
+PREFETCH_THUMB_SIZE = 384
 _FFMPEG_SEM = threading.Semaphore(2)
 
+_INDEX_FILE = "index.json"
+_INDEX_VERSION = 1
+_INDEX_FLUSH_INTERVAL_S = 30.0
+# GC trims down to this fraction of the budget so it doesn't run on every miss.
+_GC_LOW_WATERMARK = 0.9
+
 
 def thumbnail_cache_dir() -> Path:
     root = Path(__file__).resolve().parents[3] / ".majoor_thumbs"
@@ -33,10 +58,6 @@ def _thumb_key(path: Path, size: int) -> str:
     return hashlib.sha256(stamp.encode("utf-8", errors="replace")).hexdigest()[:32]
 
 
-def _thumb_path(path: Path, size: int) -> Path:
-    return thumbnail_cache_dir() / f"{_thumb_key(path, size)}.jpg"
-
-
 def _clamp_size(value: Any) -> int:
     try:
         n = int(value)
@@ -45,8 +66,12 @@ def _clamp_size(value: Any) -> int:
     return max(64, min(1024, n))
 
 
+def _tmp_path(target: Path) -> Path:
+    return target.with_name(f"tmp_{threading.get_ident()}_{target.name}")
+
+
 def _generate_image_thumb(source: Path, target: Path, size: int) -> bool:
-    tmp = target.with_name(f"tmp_{target.name}")
+    tmp = _tmp_path(target)
     try:
         from PIL import Image, ImageOps
 
@@ -80,7 +105,7 @@ def _generate_video_thumb(source: Path, target: Path, size: int) -> bool:
     ffmpeg = _ffmpeg_bin()
     if not ffmpeg:
         return False
-    tmp = target.with_name(f"tmp_{target.name}")
+    tmp = _tmp_path(target)
     try:
         with _FFMPEG_SEM:
             proc = subprocess.run(
@@ -116,53 +141,322 @@ def _generate_video_thumb(source: Path, target: Path, size: int) -> bool:
     return False
 
 
-def gc_thumbnail_cache(max_bytes: int = THUMB_CACHE_MAX_BYTES) -> None:
-    try:
-        entries = []
-        total = 0
-        for path in thumbnail_cache_dir().glob("*.jpg"):
-            try:
-                st = path.stat()
-            except OSError:
+def _generate_thumb(source: Path, target: Path, size: int) -> bool:
+    kind = classify_file(str(source))
+    if kind == "image":
+        if _generate_image_thumb(source, target, size):
+            return True
+        # Pillow builds do not consistently ship a JPEG XL decoder yet.
+        return source.suffix.lower() == ".jxl" and _generate_video_thumb(source, target, size)
+    if kind == "video":
+        return _generate_video_thumb(source, target, size)
+    return False
+
+
+class ThumbnailStore:
+    """Sharded on-disk thumbnail cache with in-memory LRU accounting."""
+
+    def __init__(self, root: Path, *, max_bytes: int = THUMB_CACHE_MAX_BYTES, workers: int = THUMB_PREGEN_WORKERS):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.workers = max(0, int(workers))
+        self._lock = threading.Lock()
+        # key -> [size_bytes, atime]; iteration order is least-recently-used first.
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+        self._total = 0
+        self._loaded = False
+        self._dirty = False
+        self._inflight: dict[str, threading.Event] = {}
+        self._wake = threading.Event()
+        self._worker: threading.Thread | None = None
+        self._pool: ThreadPoolExecutor | None = None
+        self._closed = False
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.jpg"
+
+    # --- lookup / generation ------------------------------------------------
+
+    def get_or_create(self, source_path: str, *, size: Any = 320) -> Result[dict[str, Any]]:
+        source = Path(str(source_path)).resolve(strict=False)
+        if not source.is_file():
+            return Result.Err("NOT_FOUND", "File not found")
+        target_size = _clamp_size(size)
+        key = _thumb_key(source, target_size)
+        self._ensure_loaded()
+        while True:
+            if self._touch(key):
+                return self._ok(key, "hit")
+            with self._lock:
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self._inflight[key] = threading.Event()
+                    break
+            # Another request (or the prefetch pool) is rendering this key.
+            waiter.wait(timeout=30)
+            if key not in self._entries:
+                return Result.Err("THUMBNAIL_FAILED", "Failed to generate thumbnail")
+        try:
+            return self._create(key, source, target_size)
+        finally:
+            with self._lock:
+                done = self._inflight.pop(key, None)
+            if done is not None:
+                done.set()
+
+    def _create(self, key: str, source: Path, size: int) -> Result[dict[str, Any]]:
+        target = self.path_for(key)
+        # An entry can exist on disk but not in the index after an unclean exit.
+        with contextlib.suppress(OSError):
+            existing = target.stat().st_size
+            if existing > 0:
+                self._record(key, existing)
+                return self._ok(key, "hit")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if not _generate_thumb(source, target, size):
+            return Result.Err("THUMBNAIL_FAILED", "Failed to generate thumbnail")
+        try:
+            written = target.stat().st_size
+        except OSError:
+            return Result.Err("THUMBNAIL_FAILED", "Failed to generate thumbnail")
+        self._record(key, written)
+        return self._ok(key, "miss")
+
+    def _ok(self, key: str, cache: str) -> Result[dict[str, Any]]:
+        return Result.Ok({"path": str(self.path_for(key)), "cache": cache, "version": THUMB_CACHE_VERSION})
+
+    def _touch(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            entry[1] = time.time()
+            self._entries.move_to_end(key)
+            self._dirty = True
+            return True
+
+    def _record(self, key: str, size: int) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total -= int(previous[0])
+            self._entries[key] = [int(size), time.time()]
+            self._total += int(size)
+            self._dirty = True
+            over = self._total > self.max_bytes
+        self._ensure_worker()
+        if over:
+            self._wake.set()
+
+    def discard(self, key: str) -> None:
+        """Forget *key* (e.g. its file was removed behind our back)."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total -= int(entry[0])
+                self._dirty = True
+        with contextlib.suppress(OSError):
+            self.path_for(key).unlink()
+
+    # --- batch pre-generation ----------------------------------------------
+
+    def prefetch(self, paths: Iterable[str], *, size: Any = PREFETCH_THUMB_SIZE) -> int:
+        """Queue thumbnail generation for *paths* on the worker pool; returns how many were queued."""
+        pool = self._get_pool()
+        if pool is None:
+            return 0
+        target_size = _clamp_size(size)
+        queued = 0
+        for path in paths:
+            if classify_file(str(path)) not in ("image", "video"):
                 continue
-            total += st.st_size
-            entries.append((st.st_mtime, st.st_size, path))
-        if total <= max_bytes:
+            pool.submit(self._prefetch_one, str(path), target_size)
+            queued += 1
+        return queued
+
+    def _prefetch_one(self, path: str, size: int) -> None:
+        if self._closed:
             return
-        for _mtime, size, path in sorted(entries):
-            if total <= max_bytes:
-                break
+        try:
+            self.get_or_create(path, size=size)
+        except Exception as exc:
+            logger.debug("Thumbnail prefetch failed for %s: %s", path, exc)
+
+    def _get_pool(self) -> ThreadPoolExecutor | None:
+        if self.workers <= 0 or self._closed:
+            return None
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="mjr-thumb")
+            return self._pool
+
+    # --- index persistence ---------------------------------------------------
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self.root.mkdir(parents=True, exist_ok=True)
+            entries = self._read_index()
+            if entries is None:
+                entries = self._rebuild_index()
+                self._dirty = True
+            self._entries = entries
+            self._total = sum(int(e[0]) for e in entries.values())
+            self._loaded = True
+            over = self._total > self.max_bytes
+        if over:
+            self._ensure_worker()
+            self._wake.set()
+
+    def _read_index(self) -> OrderedDict[str, list[float]] | None:
+        try:
+            payload = json.loads((self.root / _INDEX_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != _INDEX_VERSION:
+            return None
+        rows = payload.get("entries")
+        if not isinstance(rows, list):
+            return None
+        entries: OrderedDict[str, list[float]] = OrderedDict()
+        try:
+            for key, size, atime in sorted(rows, key=lambda row: float(row[2])):
+                entries[str(key)] = [int(size), float(atime)]
+        except (TypeError, ValueError, IndexError):
+            return None
+        return entries
+
+    def _rebuild_index(self) -> OrderedDict[str, list[float]]:
+        """One full scan when no index exists; also moves pre-shard flat files into shards."""
+        found: list[tuple[float, str, int]] = []
+        for path in self.root.glob("*.jpg"):
+            if path.name.startswith("tmp_"):
+                with contextlib.suppress(OSError):
+                    path.unlink()
+                continue
+            with contextlib.suppress(OSError):
+                target = self.path_for(path.stem)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, target)
+        for path in self.root.glob("??/*.jpg"):
+            if path.name.startswith("tmp_"):
+                with contextlib.suppress(OSError):
+                    path.unlink()
+                continue
+            with contextlib.suppress(OSError):
+                st = path.stat()
+                found.append((st.st_mtime, path.stem, st.st_size))
+        found.sort()
+        return OrderedDict((key, [size, mtime]) for mtime, key, size in found)
+
+    def flush(self) -> None:
+        """Persist the index if it changed since the last flush."""
+        with self._lock:
+            if not self._dirty or not self._loaded:
+                return
+            rows = [[key, int(e[0]), round(float(e[1]), 3)] for key, e in self._entries.items()]
+            self._dirty = False
+        tmp = self.root / f"{_INDEX_FILE}.tmp"
+        try:
+            tmp.write_text(json.dumps({"version": _INDEX_VERSION, "entries": rows}), encoding="utf-8")
+            os.replace(tmp, self.root / _INDEX_FILE)
+        except OSError as exc:
+            logger.debug("Failed to persist thumbnail index: %s", exc)
+            with self._lock:
+                self._dirty = True
+
+    # --- garbage collection --------------------------------------------------
+
+    def gc(self, max_bytes: int | None = None) -> int:
+        """Evict least-recently-used thumbnails until under budget; returns the eviction count."""
+        self._ensure_loaded()
+        budget = self.max_bytes if max_bytes is None else int(max_bytes)
+        with self._lock:
+            if self._total <= budget:
+                return 0
+            goal = int(budget * _GC_LOW_WATERMARK)
+            victims: list[str] = []
+            while self._entries and self._total > goal:
+                key, entry = self._entries.popitem(last=False)
+                self._total -= int(entry[0])
+                victims.append(key)
+            self._dirty = True
+        for key in victims:
+            with contextlib.suppress(OSError):
+                self.path_for(key).unlink()
+        return len(victims)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None or self._closed:
+            return
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(target=self._run_worker, name="mjr-thumb-gc", daemon=True)
+            self._worker.start()
+
+    def _run_worker(self) -> None:
+        while not self._closed:
+            self._wake.wait(timeout=_INDEX_FLUSH_INTERVAL_S)
+            self._wake.clear()
             try:
-                path.unlink()
-                total -= size
-            except OSError:
-                pass
+                self.gc()
+                self.flush()
+            except Exception as exc:
+                logger.debug("Thumbnail cache maintenance failed: %s", exc)
+
+    def close(self) -> None:
+        """Stop the prefetch pool and GC worker and persist the index."""
+        self._closed = True
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._wake.set()
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            worker.join(timeout=5)
+        self.flush()
+
+
+_store: ThumbnailStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_thumbnail_store() -> ThumbnailStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ThumbnailStore(thumbnail_cache_dir())
+                atexit.register(_store.flush)
+    return _store
+
+
+def gc_thumbnail_cache(max_bytes: int = THUMB_CACHE_MAX_BYTES) -> None:
+    try:
+        get_thumbnail_store().gc(max_bytes)
     except Exception:
         return
 
 
 def get_or_create_thumbnail(source_path: str, *, size: Any = 320) -> Result[dict[str, Any]]:
-    source = Path(str(source_path)).resolve(strict=False)
-    if not source.is_file():
-        return Result.Err("NOT_FOUND", "File not found")
-    target_size = _clamp_size(size)
-    target = _thumb_path(source, target_size)
-    if target.exists() and target.stat().st_size > 0:
-        return Result.Ok({"path": str(target), "cache": "hit", "version": THUMB_CACHE_VERSION})
-    kind = classify_file(str(source))
-    ok = False
-    if kind == "image":
-        ok = _generate_image_thumb(source, target, target_size)
-        # Pillow builds do not consistently ship a JPEG XL decoder yet.
-        if not ok and source.suffix.lower() == ".jxl":
-            ok = _generate_video_thumb(source, target, target_size)
-    elif kind == "video":
-        ok = _generate_video_thumb(source, target, target_size)
-    if not ok:
-        return Result.Err("THUMBNAIL_FAILED", "Failed to generate thumbnail")
+    return get_thumbnail_store().get_or_create(source_path, size=size)
+
+
+def prefetch_thumbnails(paths: Iterable[str], *, size: Any = PREFETCH_THUMB_SIZE) -> int:
+    """Queue background generation for *paths* (no-op when ``MJR_AM_THUMB_WORKERS=0``)."""
     try:
-        os.utime(target, (time.time(), time.time()))
-    except OSError:
-        pass
-    threading.Thread(target=gc_thumbnail_cache, daemon=True).start()
-    return Result.Ok({"path": str(target), "cache": "miss", "version": THUMB_CACHE_VERSION})
+        return get_thumbnail_store().prefetch(paths, size=size)
+    except Exception as exc:
+        logger.debug("Thumbnail prefetch skipped: %s", exc)
+        return 0
@@ -16,11 +16,16 @@ from ...adapters.comfy_core import (
 from ...adapters.core_assets import fetch_by_job_id
 from ...config import get_runtime_output_root
 from ...shared import Result, get_logger
-from ..geninfo.parser_impl import parse_geninfo_from_prompt
+from ..geninfo.parse_cache import parse_geninfo_cached
+from ..index.direct_ingest import is_claimed, wait_for_claims
 from ..index.metadata_helpers import MetadataHelpers
 
 logger = get_logger(__name__)
 
+# How long post-execution waits for save-node direct ingests to commit before
+# assigning execution context and stacks to their rows.
+_DIRECT_INGEST_WAIT_S = 30.0
+
 
 def _existing_refs(refs: list[PromptOutputFile]) -> list[tuple[Path, PromptOutputFile]]:
     out: list[tuple[Path, PromptOutputFile]] = []
@@ -67,30 +72,38 @@ async def ingest_prompt_outputs(index_service: Any, prompt_id: str) -> Result[di
         return Result.Ok(payload)
 
     paths = [path for path, _ref in refs]
-    base_dir = _base_dir_for_paths(paths)
     index_paths = getattr(index_service, "index_paths", None)
     if not callable(index_paths):
         return Result.Err("SERVICE_UNAVAILABLE", "index service does not support index_paths")
 
-    result = await index_paths(
-        paths,
-        base_dir=base_dir,
-        incremental=True,
-        source="output",
-        root_id=None,
-    )
-    if not result.ok:
-        return Result.Err(result.code or "INDEX_ERROR", result.error or "Failed to index prompt outputs")
+    # Majoor save-node outputs are ingested directly from the node's own record.
+    pending = [(path, ref) for path, ref in refs if not is_claimed(path)]
+    stats: dict[str, Any] = {"direct": len(refs) - len(pending)}
+    if pending:
+        pending_paths = [path for path, _ref in pending]
+        result = await index_paths(
+            pending_paths,
+            base_dir=_base_dir_for_paths(pending_paths),
+            incremental=True,
+            source="output",
+            root_id=None,
+        )
+        if not result.ok:
+            return Result.Err(result.code or "INDEX_ERROR", result.error or "Failed to index prompt outputs")
+        if isinstance(result.data, dict):
+            stats.update(result.data)
 
+    if stats["direct"] and not await wait_for_claims(paths, _DIRECT_INGEST_WAIT_S):
+        logger.debug("Direct ingest still running for prompt_id=%s; assigning context anyway", safe_prompt_id)
     await _assign_execution_context(index_service, refs, safe_prompt_id)
-    await _write_runtime_metadata(index_service, refs, safe_prompt_id)
+    await _write_runtime_metadata(index_service, pending, safe_prompt_id)
     await _assign_rodin_package_context(index_service, refs, safe_prompt_id)
     await _finalize_execution_stack(index_service, safe_prompt_id)
     payload = {
         "prompt_id": safe_prompt_id,
         "indexed": len(paths),
         "paths": [str(path) for path in paths],
-        "stats": result.data if isinstance(result.data, dict) else {},
+        "stats": stats,
     }
     send_event("mjr-core-execution-assets-ready", payload)
     return Result.Ok(payload)
@@ -157,7 +170,7 @@ def _runtime_metadata_payload(prompt_id: str) -> dict[str, Any]:
     out["job_id"] = prompt_id
     out["prompt_id"] = prompt_id
     try:
-        geninfo_res = parse_geninfo_from_prompt(out.get("prompt"), workflow=out.get("workflow"))
+        geninfo_res = parse_geninfo_cached(out.get("prompt"), workflow=out.get("workflow"))
         if geninfo_res.ok and geninfo_res.data:
             out["geninfo"] = geninfo_res.data
     except Exception:
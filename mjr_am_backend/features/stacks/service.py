@@ -14,6 +14,7 @@ from dataclasses import dataclass
 from typing import Any
 
 from ...adapters.db.sqlite import Sqlite
+from ...adapters.db.stack_representative import representative_sql
 from ...shared import Result, get_logger
 
 logger = get_logger(__name__)
@@ -21,6 +22,9 @@ logger = get_logger(__name__)
 MAX_STACK_NAME_LEN = 200
 MAX_STACK_MEMBERS = 500
 
+# Member shown for a stack in grouped listings (``asset_stacks.rep_asset_id``).
+_REPRESENTATIVE_SQL = representative_sql("?")
+
 
 @dataclass
 class StackInfo:
@@ -465,13 +469,15 @@ class StacksService:
     # ── Internal helpers ─────────────────────────────────────────────────
 
     async def _refresh_stack_count(self, stack_id: int) -> None:
+        """Recompute ``asset_count`` and the grouped-listing representative."""
         now = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
         await self.db.aexecute(
             "UPDATE asset_stacks SET "
             "  asset_count = (SELECT COUNT(*) FROM assets WHERE stack_id = ?), "
+            f"  rep_asset_id = ({_REPRESENTATIVE_SQL}), "
             "  updated_at = ? "
             "WHERE id = ?",
-            (stack_id, now, stack_id),
+            (stack_id, stack_id, now, stack_id),
         )
 
     async def _find_stack_id_by_job_id(self, job_id: str) -> int | None:
@@ -5,10 +5,14 @@ Design goals:
 - Never raise to the UI/request handler.
 - Keep routes/payloads stable (sync controlled by request headers).
 - Avoid blocking request path: run writes in a background worker.
+- Survive restarts: pending writes live in ``rating_tags_sync_queue`` and are
+  written in multi-file ExifTool batches.
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import os
 import threading
 import time
@@ -30,6 +34,10 @@ try:
     RT_SYNC_PENDING_MAX = max(128, int(os.getenv("MAJOOR_RT_SYNC_PENDING_MAX", "5000") or 5000))
 except Exception:
     RT_SYNC_PENDING_MAX = 5000
+try:
+    RT_SYNC_BATCH_SIZE = max(1, min(1000, int(os.getenv("MAJOOR_RT_SYNC_BATCH_SIZE", "100") or 100)))
+except Exception:
+    RT_SYNC_BATCH_SIZE = 100
 
 
 # Windows Property System stores ratings as a pseudo-percent (0..99).
@@ -144,6 +152,47 @@ def write_exif_rating_tags(exiftool: ExifTool, file_path: str, rating: int, tags
     return Result.Ok(True)
 
 
+def write_exif_rating_tags_batch(
+    exiftool: ExifTool,
+    entries: list[tuple[str, int, list[str]]],
+) -> dict[str, Result[bool]]:
+    """
+    Write rating/tags for many files, one ExifTool process per call when possible.
+
+    Falls back to ``write_exif_rating_tags`` per file for single entries or
+    ExifTool wrappers without ``write_batch``.
+    """
+    batch_write = getattr(exiftool, "write_batch", None)
+    if len(entries) <= 1 or not callable(batch_write):
+        return {path: write_exif_rating_tags(exiftool, path, rating, tags) for path, rating, tags in entries}
+    if not _exiftool_available(exiftool):
+        return {path: Result.Err(ErrorCode.TOOL_MISSING, "ExifTool not available") for path, _r, _t in entries}
+
+    results: dict[str, Result[bool]] = {}
+    items: list[tuple[str, dict[str, Any]]] = []
+    mtimes: dict[str, float | None] = {}
+    for path, rating, tags in entries:
+        path_res = _validate_exiftool_file_path(path)
+        if not path_res.ok or not isinstance(path_res.data, Path):
+            results[path] = Result.Err(path_res.code or ErrorCode.INVALID_INPUT, path_res.error or "Invalid file path")
+            continue
+        stars = max(0, min(5, int(rating or 0)))
+        mtimes[path] = _get_file_mtime(path_res.data)
+        items.append((path, _build_exiftool_rating_tags_payload(stars, _normalize_tags(tags))))
+    if not items:
+        return results
+    try:
+        written = batch_write(items, preserve_workflow=True)
+    except Exception as exc:
+        written = {path: Result.Err(ErrorCode.EXIFTOOL_ERROR, f"ExifTool write failed: {exc}") for path, _p in items}
+    for path, _payload in items:
+        res = written.get(path) or Result.Err(ErrorCode.EXIFTOOL_ERROR, "ExifTool write failed")
+        if res.ok:
+            _restore_file_mtime(Path(path), mtimes.get(path))
+        results[path] = res
+    return results
+
+
 @dataclass(frozen=True)
 class RatingTagsSyncTask:
     """Coalesced update request for a single file."""
@@ -371,17 +420,69 @@ def write_windows_rating_tags(file_path: str, rating: int, tags: list[str]) -> R
         return Result.Err(ErrorCode.UPDATE_FAILED, f"Windows metadata sync failed: {exc}")
 
 
+def _normalize_sync_mode(mode: str) -> str:
+    mode_norm = str(mode or "off").strip().lower()
+    # Backward compatible: "sidecar"/"both" now map to "on" (no sidecar writes).
+    if mode_norm in ("sidecar", "both", "true", "1", "yes", "enabled", "enable", "on"):
+        mode_norm = "on"
+    if mode_norm not in ("off", "on", "exiftool"):
+        mode_norm = "off"
+    return mode_norm
+
+
+def _decode_queued_tags(raw: Any) -> list[str]:
+    try:
+        tags = json.loads(raw) if isinstance(raw, str) else []
+    except (TypeError, ValueError):
+        return []
+    return [str(tag) for tag in tags] if isinstance(tags, list) else []
+
+
+_UPSERT_QUEUE_SQL = """
+    INSERT INTO rating_tags_sync_queue (filepath, rating, tags, mode, revision, enqueued_at)
+    VALUES (?, ?, ?, ?, (SELECT COALESCE(MAX(revision), 0) + 1 FROM rating_tags_sync_queue), ?)
+    ON CONFLICT(filepath) DO UPDATE SET
+        rating = excluded.rating,
+        tags = excluded.tags,
+        mode = excluded.mode,
+        revision = excluded.revision,
+        enqueued_at = excluded.enqueued_at
+"""
+
+_TRIM_QUEUE_SQL = """
+    DELETE FROM rating_tags_sync_queue
+    WHERE revision <= (
+        SELECT revision FROM rating_tags_sync_queue ORDER BY revision DESC LIMIT 1 OFFSET ?
+    )
+"""
+
+
 class RatingTagsSyncWorker:
     """
     A background worker that coalesces rating/tag writes per file path.
+
+    With a ``db`` the queue is the ``rating_tags_sync_queue`` table (see
+    ``aenqueue``): one row per file, drained oldest-first in batches of
+    ``MAJOOR_RT_SYNC_BATCH_SIZE`` and written with one ExifTool run per batch.
+    ``enqueue`` keeps the in-memory path for callers without an event loop.
     """
 
-    def __init__(self, exiftool: ExifTool):
+    def __init__(self, exiftool: ExifTool, db: Any = None, *, batch_size: int | None = None):
         self._exiftool = exiftool
+        self._db = db
+        self._batch_size = max(1, int(batch_size or RT_SYNC_BATCH_SIZE))
         self._lock = threading.Lock()
         self._event = threading.Event()
         self._pending: dict[str, RatingTagsSyncTask] = {}
+        # Rows left from a previous run are picked up on the first cycle.
+        self._db_dirty = db is not None
+        self._db_depth = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stats = {"written": 0, "failed": 0, "batches": 0, "last_batch_size": 0, "last_batch_seconds": 0.0}
+        self._busy_seconds = 0.0
         self._stop = False
+        if self._db_dirty:
+            self._event.set()
         self._thread = threading.Thread(target=self._run, name="mjr-rating-tags-sync", daemon=True)
         self._thread.start()
 
@@ -395,13 +496,8 @@ class RatingTagsSyncWorker:
             logger.debug("RatingTagsSyncWorker stop failed: %s", exc)
 
     def enqueue(self, file_path: str, rating: int, tags: list[str], mode: str) -> None:
-        """Queue a rating/tags update (coalesced per filepath)."""
-        mode_norm = str(mode or "off").strip().lower()
-        # Backward compatible: "sidecar"/"both" now map to "on" (no sidecar writes).
-        if mode_norm in ("sidecar", "both", "true", "1", "yes", "enabled", "enable", "on"):
-            mode_norm = "on"
-        if mode_norm not in ("off", "on", "exiftool"):
-            mode_norm = "off"
+        """Queue a rating/tags update in memory (coalesced per filepath)."""
+        mode_norm = _normalize_sync_mode(mode)
         try:
             task = RatingTagsSyncTask(str(file_path), int(rating or 0), list(tags or []), mode_norm)
         except (TypeError, ValueError):
@@ -420,62 +516,178 @@ class RatingTagsSyncWorker:
                     break
             self._event.set()
 
-    def _drain_one(self) -> RatingTagsSyncTask | None:
+    async def aenqueue(self, file_path: str, rating: int, tags: list[str], mode: str) -> None:
+        """Persist a rating/tags update; the newest edit per file wins."""
+        if self._db is None:
+            self.enqueue(file_path, rating, tags, mode)
+            return
+        mode_norm = _normalize_sync_mode(mode)
+        try:
+            params = (str(file_path), int(rating or 0), json.dumps(list(tags or [])), mode_norm, time.time())
+        except (TypeError, ValueError):
+            return
+        res = await self._db.aexecute(_UPSERT_QUEUE_SQL, params)
+        if not res.ok:
+            logger.debug("Persisting rating/tags sync failed, keeping it in memory: %s", res.error)
+            self.enqueue(file_path, rating, tags, mode)
+            return
+        count = await self._db.aquery("SELECT COUNT(*) AS n FROM rating_tags_sync_queue")
+        depth = int(count.data[0]["n"] or 0) if count.ok and count.data else 0
+        if depth > RT_SYNC_PENDING_MAX:
+            await self._db.aexecute(_TRIM_QUEUE_SQL, (RT_SYNC_PENDING_MAX,))
+            depth = RT_SYNC_PENDING_MAX
         with self._lock:
-            if not self._pending:
-                self._event.clear()
-                return None
-            # pop an arbitrary item (dict is insertion-ordered; popitem() pops last)
-            _, task = self._pending.popitem()
-            if not self._pending:
-                self._event.clear()
-            return task
+            self._db_depth = depth
+            self._db_dirty = True
+            self._event.set()
 
-    def _run(self) -> None:
-        while not self._stop:
-            self._event.wait(timeout=0.5)
-            if self._stop:
-                break
+    def get_runtime_status(self) -> dict[str, Any]:
+        """Queue depth and write throughput for the health endpoints."""
+        with self._lock:
+            stats = dict(self._stats)
+            queue_depth = len(self._pending) + self._db_depth
+            busy = self._busy_seconds
+        stats["queue_depth"] = queue_depth
+        stats["persistent"] = self._db is not None
+        stats["files_per_second"] = round(stats["written"] / busy, 2) if busy > 0 else 0.0
+        return stats
+
+    def _drain_memory(self, limit: int) -> list[RatingTagsSyncTask]:
+        with self._lock:
+            tasks: list[RatingTagsSyncTask] = []
+            while self._pending and len(tasks) < limit:
+                tasks.append(self._pending.pop(next(iter(self._pending))))
+            return tasks
 
-            task = self._drain_one()
-            if not task:
-                continue
+    def _run_db(self, coro: Any) -> Any:
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coro)
 
-            try:
-                self._process(task)
-            except Exception as exc:
-                # Never let background errors crash ComfyUI.
-                logger.debug("RatingTagsSyncWorker task failed: %s", exc)
+    def _claim_db_batch(self, limit: int) -> list[tuple[RatingTagsSyncTask, int]]:
+        with self._lock:
+            if self._db is None or not self._db_dirty or limit <= 0:
+                return []
+            # Cleared before reading: an enqueue racing with this read sets it again.
+            self._db_dirty = False
+        res = self._run_db(
+            self._db.aquery(
+                "SELECT filepath, rating, tags, mode, revision FROM rating_tags_sync_queue "
+                "ORDER BY revision LIMIT ?",
+                (int(limit),),
+            )
+        )
+        rows = res.data if res.ok and isinstance(res.data, list) else []
+        if not res.ok:
+            logger.debug("Reading rating/tags sync queue failed: %s", res.error)
+        if len(rows) >= limit:
+            with self._lock:
+                self._db_dirty = True
+        claimed: list[tuple[RatingTagsSyncTask, int]] = []
+        for row in rows:
+            task = RatingTagsSyncTask(
+                str(row.get("filepath") or ""),
+                int(row.get("rating") or 0),
+                _decode_queued_tags(row.get("tags")),
+                _normalize_sync_mode(str(row.get("mode") or "on")),
+            )
+            claimed.append((task, int(row.get("revision") or 0)))
+        return claimed
+
+    def _ack_db_batch(self, claimed: list[tuple[RatingTagsSyncTask, int]]) -> None:
+        if not claimed or self._db is None:
+            return
+        # Rows edited while the batch was written keep their newer revision.
+        self._run_db(
+            self._db.aexecutemany(
+                "DELETE FROM rating_tags_sync_queue WHERE filepath = ? AND revision = ?",
+                [(task.file_path, revision) for task, revision in claimed],
+            )
+        )
+        count = self._run_db(self._db.aquery("SELECT COUNT(*) AS n FROM rating_tags_sync_queue"))
+        with self._lock:
+            if count.ok and count.data:
+                self._db_depth = int(count.data[0]["n"] or 0)
 
-    def _process(self, task: RatingTagsSyncTask) -> None:
-        mode = task.mode
-        if mode == "off":
+    def _run(self) -> None:
+        try:
+            while not self._stop:
+                self._event.wait(timeout=0.5)
+                if self._stop:
+                    break
+                try:
+                    self._run_cycle()
+                except Exception as exc:
+                    # Never let background errors crash ComfyUI.
+                    logger.debug("RatingTagsSyncWorker batch failed: %s", exc)
+        finally:
+            if self._loop is not None:
+                self._loop.close()
+
+    def _run_cycle(self) -> None:
+        tasks = self._drain_memory(self._batch_size)
+        claimed = self._claim_db_batch(self._batch_size - len(tasks))
+        with self._lock:
+            if not self._pending and not self._db_dirty:
+                self._event.clear()
+        if not tasks and not claimed:
             return
+        self._process_batch(tasks + [task for task, _revision in claimed])
+        self._ack_db_batch(claimed)
+
+    def _process(self, task: RatingTagsSyncTask) -> None:
+        self._process_batch([task])
 
-        tags_norm = _normalize_tags(task.tags)
-        rating = max(0, min(5, int(task.rating or 0)))
+    def _process_batch(self, tasks: list[RatingTagsSyncTask]) -> None:
+        writes = [task for task in tasks if task.mode != "off"]
+        if not writes:
+            return
+        started = time.monotonic()
+        entries = [(task.file_path, max(0, min(5, int(task.rating or 0))), _normalize_tags(task.tags)) for task in writes]
 
-        # Mark the file so the watcher ignores events triggered by the
+        # Mark the files so the watcher ignores events triggered by the
         # metadata write (ExifTool may delete+rename, causing ID loss).
-        mark_recent_generated([task.file_path])
+        mark_recent_generated([path for path, _rating, _tags in entries])
 
         # Prefer ExifTool (cross-platform), then Windows Shell fallback (Windows-only).
-        if mode in ("on", "exiftool"):
-            try:
-                ex = write_exif_rating_tags(self._exiftool, task.file_path, rating, tags_norm)
-                if ex.ok:
-                    time.sleep(0.01)
-                    return
-                logger.debug("ExifTool rating/tags write skipped: %s", ex.error)
-            except Exception as exc:
-                logger.debug("ExifTool rating/tags write failed: %s", exc)
-
+        exif_results: dict[str, Result[bool]] = {}
         try:
-            win = write_windows_rating_tags(task.file_path, rating, tags_norm)
-            if not win.ok:
-                logger.debug("Windows rating/tags write skipped: %s", win.error)
+            exif_results = write_exif_rating_tags_batch(self._exiftool, entries)
         except Exception as exc:
-            logger.debug("Windows rating/tags write failed: %s", exc)
+            logger.debug("ExifTool rating/tags write failed: %s", exc)
+
+        written = failed = 0
+        for path, rating, tags_norm in entries:
+            ex = exif_results.get(path)
+            if ex is not None and ex.ok:
+                written += 1
+                continue
+            if ex is not None:
+                logger.debug("ExifTool rating/tags write skipped: %s", ex.error)
+            if self._write_windows_fallback(path, rating, tags_norm):
+                written += 1
+            else:
+                failed += 1
+
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._stats["written"] += written
+            self._stats["failed"] += failed
+            self._stats["batches"] += 1
+            self._stats["last_batch_size"] = len(entries)
+            self._stats["last_batch_seconds"] = round(elapsed, 3)
+            self._busy_seconds += elapsed
 
         # Small delay to prevent hammering exiftool when a batch update happens.
         time.sleep(0.01)
+
+    @staticmethod
+    def _write_windows_fallback(path: str, rating: int, tags_norm: list[str]) -> bool:
+        try:
+            win = write_windows_rating_tags(path, rating, tags_norm)
+            if win.ok:
+                return True
+            logger.debug("Windows rating/tags write skipped: %s", win.error)
+        except Exception as exc:
+            logger.debug("Windows rating/tags write failed: %s", exc)
+        return False
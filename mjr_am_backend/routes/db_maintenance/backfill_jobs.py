@@ -1,12 +1,14 @@
 """
-In-memory state management for async vector backfill jobs.
+In-memory state management for async backfill jobs (vector embeddings and
+metadata parser-version re-derivation).
 
 Extracted from routes/handlers/db_maintenance.py to keep the job lifecycle
 logic (register, update, complete, fail, prune, priority window) separate
 from the HTTP route handlers that orchestrate it.
 
 The job dict lives here so there is exactly one authoritative place for
-all job-state reads and writes.
+all job-state reads and writes. Jobs carry a ``kind``; only one job of any
+kind is active at a time, and the priority window pauses whichever runs.
 """
 
 from __future__ import annotations
@@ -30,6 +32,8 @@ _VECTOR_BACKFILL_PRIORITY_MAX_WINDOW_S = 120.0
 _VECTOR_BACKFILL_PRIORITY_SLEEP_SLICE_S = 0.25
 
 VALID_SCOPES: frozenset[str] = frozenset({"output", "input", "custom", "all"})
+KIND_VECTOR = "vector"
+KIND_METADATA_PARSER = "metadata_parser"
 
 
 # ---------------------------------------------------------------------------
@@ -78,6 +82,7 @@ def normalize_scope(value: Any) -> str:
 def _job_public_base(job: dict[str, Any]) -> dict[str, Any]:
     return {
         "backfill_id": str(job.get("backfill_id") or ""),
+        "kind": str(job.get("kind") or KIND_VECTOR),
         "status": str(job.get("status") or "unknown"),
         "async": True,
         "batch_size": int(job.get("batch_size") or 64),
@@ -123,16 +128,22 @@ def get_job(backfill_id: str) -> dict[str, Any] | None:
         return _VECTOR_BACKFILL_JOBS.get(str(backfill_id or ""))
 
 
-def get_active_or_latest_job() -> dict[str, Any] | None:
+def _job_kind_matches(job: dict[str, Any], kind: str | None) -> bool:
+    return kind is None or str(job.get("kind") or KIND_VECTOR) == kind
+
+
+def get_active_or_latest_job(kind: str | None = None) -> dict[str, Any] | None:
+    """Return the active job, else the most recent one; *kind* restricts both to one job kind."""
     with _VECTOR_BACKFILL_LOCK:
         if _VECTOR_BACKFILL_ACTIVE_JOB_ID:
             active = _VECTOR_BACKFILL_JOBS.get(_VECTOR_BACKFILL_ACTIVE_JOB_ID)
-            if isinstance(active, dict):
+            if isinstance(active, dict) and _job_kind_matches(active, kind):
                 return active
-        if not _VECTOR_BACKFILL_JOBS:
+        candidates = [job for job in _VECTOR_BACKFILL_JOBS.values() if _job_kind_matches(job, kind)]
+        if not candidates:
             return None
         ordered = sorted(
-            _VECTOR_BACKFILL_JOBS.values(),
+            candidates,
             key=lambda j: str(j.get("created_at") or ""),
             reverse=True,
         )
@@ -140,7 +151,7 @@ def get_active_or_latest_job() -> dict[str, Any] | None:
 
 
 def is_active() -> bool:
-    """Return True when an async vector backfill job is queued or running."""
+    """Return True when an async backfill job of any kind is queued or running."""
     with _VECTOR_BACKFILL_LOCK:
         if not _VECTOR_BACKFILL_ACTIVE_JOB_ID:
             return False
@@ -204,13 +215,20 @@ async def wait_for_priority_window() -> None:
 # Job lifecycle writes
 # ---------------------------------------------------------------------------
 
-def register_job(*, batch_size: int, scope: str = "output", custom_root_id: str = "") -> dict[str, Any]:
+def register_job(
+    *,
+    batch_size: int,
+    scope: str = "output",
+    custom_root_id: str = "",
+    kind: str = KIND_VECTOR,
+) -> dict[str, Any]:
     normalized_scope = normalize_scope(scope) or "output"
     normalized_custom_root = str(custom_root_id or "").strip() if normalized_scope == "custom" else ""
     backfill_id = uuid.uuid4().hex
     now = utc_now_iso()
     job: dict[str, Any] = {
         "backfill_id": backfill_id,
+        "kind": str(kind or KIND_VECTOR),
         "status": "queued",
         "batch_size": int(max(1, min(200, batch_size))),
         "scope": normalized_scope,
@@ -384,6 +384,30 @@ def _resolve_asset_id(asset_id: str) -> tuple[str, tuple]:
         return "a.filename = ?", (asset_id,)
 
 
+def _blake3_digest(asset_id: str) -> str | None:
+    """Hex digest of a ``blake3:<hex>`` id, or ``None`` for other ids."""
+    text = (asset_id or "").strip().lower()
+    if not text.startswith("blake3:"):
+        return None
+    return text.split(":", 1)[1].strip() or None
+
+
+def _queue_content_hashing(services: dict[str, Any]) -> None:
+    """Hash unhashed assets in the background so later hash lookups can hit."""
+    dup = services.get("duplicates")
+    if dup is not None:
+        dup.queue_content_hashing()
+
+
+async def _lookup_asset(services: dict[str, Any], asset_id: str) -> dict[str, Any] | None:
+    """Resolve *asset_id* to a row; a ``blake3:`` miss queues background hashing."""
+    where, params = _resolve_asset_id(asset_id)
+    row = await _query_one(services["db"], where, params)
+    if row is None and _blake3_digest(asset_id) is not None:
+        _queue_content_hashing(services)
+    return row
+
+
 def _safe_resolve_filepath(filepath: str) -> Path | None:
     """Resolve and validate that the DB-recorded filepath is inside allowed roots."""
     if not filepath:
@@ -501,11 +525,13 @@ async def _check_asset_by_hash(request: web.Request) -> web.Response:
             "AND hash_algo = 'blake3' LIMIT 1",
             (hex_part, f"blake3:{hex_part}"),
         )
+        found = bool(res.ok and res.data)
+        if res.ok and not found:
+            _queue_content_hashing(services)
     except Exception as exc:
         logger.warning("api/v2/assets hash check failed: %s", exc, exc_info=True)
         return web.Response(status=500)
 
-    found = bool(res.ok and res.data)
     return web.Response(status=200 if found else 404)
 
 
@@ -517,9 +543,8 @@ async def _get_asset(request: web.Request) -> web.Response:
     if not isinstance(services, dict) or "db" not in services:
         return _api_error_response(Result.Err("SERVICE_UNAVAILABLE", "Database unavailable"))
 
-    where, params = _resolve_asset_id(asset_id)
     try:
-        row = await _query_one(services["db"], where, params)
+        row = await _lookup_asset(services, asset_id)
     except Exception as exc:
         logger.warning("api/v2/assets get failed: %s", exc, exc_info=True)
         return _api_error_response(Result.Err("DB_ERROR", "Asset lookup failed"))
@@ -535,9 +560,8 @@ async def _get_asset_content(request: web.Request) -> web.StreamResponse:
     if not isinstance(services, dict) or "db" not in services:
         return web.json_response({"error": "Database unavailable"}, status=503)
 
-    where, params = _resolve_asset_id(asset_id)
     try:
-        row = await _query_one(services["db"], where, params)
+        row = await _lookup_asset(services, asset_id)
     except Exception as exc:
         logger.warning("api/v2/assets content lookup failed: %s", exc, exc_info=True)
         return web.json_response({"error": "Asset lookup failed"}, status=500)
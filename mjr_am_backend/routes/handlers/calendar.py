@@ -10,6 +10,7 @@ from aiohttp import web
 from mjr_am_backend.adapters.comfy_core import get_input_directory
 from mjr_am_backend.config import get_runtime_output_root
 from mjr_am_backend.custom_roots import resolve_custom_root
+from mjr_am_backend.data.repositories import counter_scopes_for
 from mjr_am_backend.shared import Result, sanitize_error_message
 
 from ..core import _json_response, _require_services
@@ -86,6 +87,7 @@ def register_calendar_routes(routes: web.RouteTableDef) -> None:
         input_root = str(Path(input_dir).resolve(strict=False))
 
         roots: list[str] = []
+        counter_root_id: str | None = None
 
         if scope == "input":
             roots = [input_root]
@@ -99,6 +101,7 @@ def register_calendar_routes(routes: web.RouteTableDef) -> None:
             if not root_result.data:
                 return _json_response(Result.Err("NOT_FOUND", "Custom root not found"))
             roots = [str(Path(root_result.data).resolve(strict=False))]
+            counter_root_id = str(root_id)
         else:
             # Default: output
             roots = [output_root]
@@ -109,6 +112,7 @@ def register_calendar_routes(routes: web.RouteTableDef) -> None:
                 month_start,
                 month_end,
                 filters=filters or None,
+                scopes=counter_scopes_for(scope if scope in {"input", "all", "custom"} else "output", counter_root_id),
             )
         except Exception as exc:
             return _json_response(
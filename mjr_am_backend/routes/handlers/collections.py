@@ -1,10 +1,9 @@
 """
 Collections endpoints.
 
-Collections are small JSON files that store a user-curated list of assets (by filepath + basic fields).
+Collections are user-curated lists of assets (by filepath + basic fields) stored in the index DB.
 """
 
-import asyncio
 from pathlib import Path
 from typing import Any
 
@@ -23,7 +22,39 @@ from ..core import (
 
 logger = get_logger(__name__)
 
-_collections = CollectionsService()
+
+def _collections_service(services):
+    """Lazily obtain or create a CollectionsService from the service container."""
+    if isinstance(services, dict):
+        svc = services.get("_collections_service")
+        if svc is not None:
+            return svc
+        db = services.get("db")
+        if db is None:
+            raise RuntimeError("CollectionsService requires a 'db' service")
+        svc = CollectionsService(db)
+        services["_collections_service"] = svc
+        return svc
+
+    svc = getattr(services, "_collections_service", None)
+    if svc is not None:
+        return svc
+    db = getattr(services, "db", None)
+    if db is None:
+        raise RuntimeError("CollectionsService requires a 'db' service")
+    svc = CollectionsService(db)
+    try:
+        services._collections_service = svc
+    except Exception:
+        pass
+    return svc
+
+
+async def _get_collections() -> tuple[Any, Result | None]:
+    services, error_result = await _require_services()
+    if error_result is not None or not services:
+        return None, error_result or Result.Err("SERVICE_UNAVAILABLE", "Backend not ready")
+    return _collections_service(services), None
 
 
 def _as_list(value: Any) -> list[Any]:
@@ -45,6 +76,7 @@ def _safe_assets_payload(value: Any) -> list[dict[str, Any]]:
 
 
 def _minimal_asset_from_item(item: dict[str, Any]) -> dict[str, Any]:
+    """Asset-like grid object for a collection member; indexed members skip the stat()."""
     fp = str(item.get("filepath") or "")
     p = Path(fp)
     kind = str(item.get("kind") or classify_file(fp) or "unknown").lower()
@@ -53,9 +85,13 @@ def _minimal_asset_from_item(item: dict[str, Any]) -> dict[str, Any]:
     asset_type = str(item.get("type") or "output").lower()
     root_id = item.get("root_id") or item.get("rootId") or item.get("custom_root_id") or None
 
-    stat_size, stat_mtime = _safe_file_stat_fields(p)
+    db_row = item.get("asset") if isinstance(item.get("asset"), dict) else None
+    if db_row is not None:
+        stat_size, stat_mtime = int(db_row.get("size") or 0), int(db_row.get("mtime") or 0)
+    else:
+        stat_size, stat_mtime = _safe_file_stat_fields(p)
 
-    return {
+    asset: dict[str, Any] = {
         "id": None,
         "filename": filename,
         "subfolder": subfolder,
@@ -74,6 +110,28 @@ def _minimal_asset_from_item(item: dict[str, Any]) -> dict[str, Any]:
         "type": asset_type,
         "root_id": root_id,
     }
+    if db_row is not None:
+        asset["id"] = db_row.get("id")
+        asset["width"] = db_row.get("width")
+        asset["height"] = db_row.get("height")
+        asset["duration"] = db_row.get("duration")
+        asset["rating"] = int(db_row.get("rating") or 0)
+        asset["tags"] = db_row.get("tags") or []
+        asset["has_workflow"] = db_row.get("has_workflow")
+        asset["has_generation_data"] = db_row.get("has_generation_data")
+        if db_row.get("root_id"):
+            asset["root_id"] = db_row.get("root_id")
+    return asset
+
+
+def _page_param(request: web.Request, name: str) -> int | None:
+    raw = str(request.query.get(name) or "").strip()
+    if not raw:
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        return None
 
 
 def _safe_file_stat_fields(path: Path) -> tuple[int, int]:
@@ -114,7 +172,10 @@ def register_collections_routes(routes: web.RouteTableDef) -> None:
     @routes.get("/mjr/am/collections")
     async def list_collections(request):
         try:
-            result = _collections.list()
+            svc, error = await _get_collections()
+            if error is not None:
+                return _json_response(error)
+            result = await svc.list()
         except Exception as exc:
             result = Result.Err(
                 "COLLECTIONS_FAILED",
@@ -133,14 +194,33 @@ def register_collections_routes(routes: web.RouteTableDef) -> None:
         body_res = await _read_json(request)
         body = body_res.data if body_res.ok else {}
         name = str((body or {}).get("name") or "").strip()
-        result = _collections.create(name)
+        svc, error = await _get_collections()
+        if error is not None:
+            return _json_response(error)
+        result = await svc.create(name)
         await _audit_collection_write(request, "collection_create", f"collection:{name or 'unknown'}", result, name=name)
         return _json_response(result)
 
+    @routes.get("/mjr/am/collections/by-asset")
+    async def collections_for_asset(request):
+        """List the collections containing an asset, by `filepath` or `asset_id` query param."""
+        filepath = str(request.query.get("filepath") or "").strip()
+        asset_id = _page_param(request, "asset_id")
+        if not filepath and asset_id is None:
+            return _json_response(Result.Err("INVALID_INPUT", "Missing filepath or asset_id"))
+        svc, error = await _get_collections()
+        if error is not None:
+            return _json_response(error)
+        result = await svc.collections_for_asset(filepath=filepath or None, asset_id=asset_id)
+        return _json_response(result)
+
     @routes.get(r"/mjr/am/collections/{collection_id}")
     async def get_collection(request):
         cid = str(request.match_info.get("collection_id") or "").strip()
-        result = _collections.get(cid)
+        svc, error = await _get_collections()
+        if error is not None:
+            return _json_response(error)
+        result = await svc.get(cid)
         return _json_response(result)
 
     @routes.post(r"/mjr/am/collections/{collection_id}/delete")
@@ -152,7 +232,10 @@ def register_collections_routes(routes: web.RouteTableDef) -> None:
         if not auth.ok:
             return _json_response(auth)
         cid = str(request.match_info.get("collection_id") or "").strip()
-        result = _collections.delete(cid)
+        svc, error = await _get_collections()
+        if error is not None:
+            return _json_response(error)
+        result = await svc.delete(cid)
         await _audit_collection_write(request, "collection_delete", f"collection:{cid or 'unknown'}", result, collection_id=cid)
         return _json_response(result)
 
@@ -168,7 +251,10 @@ def register_collections_routes(routes: web.RouteTableDef) -> None:
         body_res = await _read_json(request)
         body = body_res.data if body_res.ok else {}
         assets = _safe_assets_payload((body or {}).get("assets"))
-        result = await asyncio.to_thread(_collections.add_assets, cid, assets)
+        svc, error = await _get_collections()
+        if error is not None:
+            return _json_response(error)
+        result = await svc.add_assets(cid, assets)
         await _audit_collection_write(
             request,
             "collection_add_assets",
@@ -191,7 +277,10 @@ def register_collections_routes(routes: web.RouteTableDef) -> None:
         body_res = await _read_json(request)
         body = body_res.data if body_res.ok else {}
         filepaths = [str(x) for x in _as_list((body or {}).get("filepaths")) if x]
-        result = await asyncio.to_thread(_collections.remove_filepaths, cid, filepaths)
+        svc, error = await _get_collections()
+        if error is not None:
+            return _json_response(error)
+        result = await svc.remove_filepaths(cid, filepaths)
         await _audit_collection_write(
             request,
             "collection_remove_assets",
@@ -206,50 +295,36 @@ def register_collections_routes(routes: web.RouteTableDef) -> None:
     async def get_collection_assets(request):
         """
         Return the collection entries as asset-like objects for the grid,
-        enriched from the index DB when possible.
+        joined against the index DB. Optional `limit`/`offset` page the
+        members; without `limit` every member is returned.
         """
         cid = str(request.match_info.get("collection_id") or "").strip()
-        col_res = _collections.get(cid)
-        if not col_res.ok:
-            return _json_response(col_res)
-
-        collection = col_res.data or {}
-        items = collection.get("items") if isinstance(collection, dict) else None
-        items_list = items if isinstance(items, list) else []
-
-        assets = []
-        filepaths: list[str] = []
-        for it in items_list:
-            if not isinstance(it, dict):
-                continue
-            fp = str(it.get("filepath") or "").strip()
-            if not fp:
-                continue
-            filepaths.append(fp)
-            assets.append(_minimal_asset_from_item(it))
-
-        # Enrich with DB fields when available
-        try:
-            svc, error_result = await _require_services()
-            if not error_result and svc and "index" in svc:
-                lookup = getattr(svc["index"], "lookup_assets_by_filepaths", None)
-                if callable(lookup) and filepaths:
-                    enrich = await lookup(filepaths)
-                    if enrich and getattr(enrich, "ok", False) and isinstance(enrich.data, dict):
-                        mapping = enrich.data
-                        for a in assets:
-                            fp = str(a.get("filepath") or "")
-                            db_row = mapping.get(fp)
-                            if not isinstance(db_row, dict):
-                                continue
-                            a["id"] = db_row.get("id")
-                            a["rating"] = int(db_row.get("rating") or 0)
-                            a["tags"] = db_row.get("tags") or []
-                            a["has_workflow"] = db_row.get("has_workflow")
-                            a["has_generation_data"] = db_row.get("has_generation_data")
-                            if db_row.get("root_id"):
-                                a["root_id"] = db_row.get("root_id")
-        except Exception as exc:
-            logger.debug("Collections assets enrichment skipped: %s", exc)
+        svc, error = await _get_collections()
+        if error is not None:
+            return _json_response(error)
+        page_res = await svc.list_items(
+            cid,
+            limit=_page_param(request, "limit"),
+            offset=_page_param(request, "offset") or 0,
+        )
+        if not page_res.ok:
+            return _json_response(page_res)
 
-        return _json_response(Result.Ok({"id": cid, "name": collection.get("name"), "assets": assets}))
+        page = page_res.data or {}
+        assets = [
+            _minimal_asset_from_item(item)
+            for item in _as_list(page.get("items"))
+            if isinstance(item, dict) and str(item.get("filepath") or "").strip()
+        ]
+        return _json_response(
+            Result.Ok(
+                {
+                    "id": page.get("id") or cid,
+                    "name": page.get("name"),
+                    "total": page.get("total"),
+                    "limit": page.get("limit"),
+                    "offset": page.get("offset"),
+                    "assets": assets,
+                }
+            )
+        )
@@ -231,6 +231,38 @@ async def _stop_watcher_if_running(svc: dict | None) -> bool:
     return await archive_runtime.stop_watcher_if_running(svc)
 
 
+async def _preserve_collections_before_delete(svc: dict | None, db: Any, *, operation: str = "delete") -> None:
+    """Export collections to JSON so they are re-imported after the DB file is gone."""
+    try:
+        from mjr_am_backend.features.collections import export_collections_to_legacy_dir
+
+        res = await export_collections_to_legacy_dir(db)
+        if res.ok:
+            logger.info("Exported %s collection(s) before DB %s", res.data, operation)
+        else:
+            logger.warning("Collections export before DB %s failed: %s", operation, res.error)
+    except Exception as exc:
+        logger.warning("Collections export before DB %s failed: %s", operation, exc)
+    if isinstance(svc, dict):
+        svc.pop("_collections_service", None)
+
+
+async def _reimport_collections_after_restore(svc: dict | None, db: Any) -> None:
+    """Put the collections exported before a restore back over the restored DB."""
+    try:
+        from mjr_am_backend.features.collections import import_collections_from_legacy_dir
+
+        res = await import_collections_from_legacy_dir(db)
+        if res.ok:
+            logger.info("Re-imported %s collection(s) after DB restore", res.data)
+        else:
+            logger.warning("Collections re-import after DB restore failed: %s", res.error)
+    except Exception as exc:
+        logger.warning("Collections re-import after DB restore failed: %s", exc)
+    if isinstance(svc, dict):
+        svc.pop("_collections_service", None)
+
+
 async def _restart_watcher_if_needed(svc: dict | None, should_restart: bool) -> None:
     return await archive_runtime.restart_watcher_if_needed(
         svc,
@@ -615,6 +647,7 @@ def register_db_maintenance_routes(routes: web.RouteTableDef) -> None:
         try:
             # 1. Try to drain the adapter's connections (best-effort)
             if db is not None:
+                await _preserve_collections_before_delete(svc if isinstance(svc, dict) else None, db)
                 try:
                     _emit_restore_status("delete_db", "info", operation="delete_db")
                     reset_res = await db.areset()
@@ -1189,7 +1222,11 @@ def register_db_maintenance_routes(routes: web.RouteTableDef) -> None:
             return _json_response(auth)
 
         backfill_id = str(request.query.get("backfill_id") or request.query.get("job_id") or "").strip()
-        job = _vector_backfill_get_job(backfill_id) if backfill_id else _vector_backfill_get_active_or_latest_job()
+        job = (
+            _vector_backfill_get_job(backfill_id)
+            if backfill_id
+            else _vector_backfill_get_active_or_latest_job(kind=backfill_jobs.KIND_VECTOR)
+        )
         if not isinstance(job, dict):
             return _json_response(Result.Ok({"status": "idle", "async": True}))
         return _json_response(Result.Ok(_vector_backfill_job_public(job)))
@@ -1338,6 +1375,7 @@ def register_db_maintenance_routes(routes: web.RouteTableDef) -> None:
                 except Exception:
                     pass
 
+            await _preserve_collections_before_delete(svc if isinstance(svc, dict) else None, db, operation="restore")
             _emit_restore_status("resetting_db", "info", operation="restore_db", name=src.name)
             reset_res = await db.areset()
             if not reset_res.ok:
@@ -1359,11 +1397,16 @@ def register_db_maintenance_routes(routes: web.RouteTableDef) -> None:
             except Exception:
                 pass
             try:
+                from mjr_am_backend.adapters.db.migrations import MigrationRunner
+                from mjr_am_backend.adapters.db.migrations.registry import MIGRATIONS
                 from mjr_am_backend.adapters.db.schema import migrate_schema
 
                 await migrate_schema(db)
+                # Older backups predate the collections tables (v28).
+                await MigrationRunner(MIGRATIONS).run(db)
             except Exception:
                 pass
+            await _reimport_collections_after_restore(svc if isinstance(svc, dict) else None, db)
 
             scans_triggered: list[str] = []
             if index_service:
@@ -195,6 +195,30 @@ def register_duplicates_routes(routes: web.RouteTableDef) -> None:
         )
         return _json_response(result)
 
+    @routes.get("/mjr/am/duplicates/similar/{asset_id}")
+    async def duplicates_similar_to_asset(request):
+        if is_db_maintenance_active():
+            return _json_response(Result.Err("DB_MAINTENANCE", "Database maintenance in progress. Please wait."))
+        try:
+            asset_id = int(request.match_info.get("asset_id", ""))
+        except Exception:
+            return _json_response(Result.Err("INVALID_INPUT", "Invalid asset_id"))
+        svc, error_result = await _require_services()
+        if error_result:
+            return _json_response(error_result)
+        dup_res = _duplicates_service_or_error(svc)
+        if not dup_res.ok:
+            return _json_response(dup_res)
+        dup = dup_res.data
+        if not hasattr(dup, "find_similar_to_asset"):
+            return _json_response(Result.Err("SERVICE_UNAVAILABLE", "Duplicate service unavailable"))
+        result = await dup.find_similar_to_asset(
+            asset_id,
+            phash_distance=_parse_int_query(request, "phash_distance", 6),
+            limit=_parse_int_query(request, "limit", 50),
+        )
+        return _json_response(result)
+
     @routes.post("/mjr/am/duplicates/merge-tags")
     async def duplicates_merge_tags(request):
         if is_db_maintenance_active():
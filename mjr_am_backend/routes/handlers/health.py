@@ -22,6 +22,7 @@ from mjr_am_backend.config import (
     set_index_directory_override,
 )
 from mjr_am_backend.custom_roots import resolve_custom_root
+from mjr_am_backend.data.repositories import counter_scopes_for
 from mjr_am_backend.runtime_activity import (
     get_runtime_activity_status,
     mark_generation_finished,
@@ -412,10 +413,11 @@ def _safe_watcher_directories(watcher: object) -> list[str]:
     return []
 
 
-def _runtime_status_payload(db: object, index: object, watcher: object) -> dict:
+def _runtime_status_payload(db: object, index: object, watcher: object, rating_tags_sync: object = None) -> dict:
     return {
         "db": _safe_runtime_status(db),
         "index": _safe_runtime_status(index),
+        "rating_tags_sync": _safe_runtime_status(rating_tags_sync),
         "watcher": {
             "enabled": _safe_watcher_is_running(watcher),
             "pending_files": _safe_watcher_pending_count(watcher),
@@ -495,6 +497,9 @@ def register_health_routes(routes: web.RouteTableDef) -> None:
         if result.ok and isinstance(result.data, dict):
             vector_diag = _vector_runtime_diagnostics(svc if isinstance(svc, dict) else None)
             result.data["vector"] = vector_diag
+            result.data["rating_tags_sync"] = _safe_runtime_status(
+                svc.get("rating_tags_sync") if isinstance(svc, dict) else None
+            )
             try:
                 overall = str(result.data.get("overall") or "healthy")
                 if bool(vector_diag.get("degraded")) and overall == "healthy":
@@ -541,7 +546,10 @@ def register_health_routes(routes: web.RouteTableDef) -> None:
             return _json_response(Result.Err(ErrorCode.INVALID_INPUT, f"Unknown scope: {scope}"))
 
         try:
-            result = await asyncio.wait_for(svc['health'].get_counters(roots=roots), timeout=TO_THREAD_TIMEOUT_S)
+            result = await asyncio.wait_for(
+                svc['health'].get_counters(roots=roots, scopes=counter_scopes_for(scope, custom_root_id)),
+                timeout=TO_THREAD_TIMEOUT_S,
+            )
         except asyncio.TimeoutError:
             result = Result.Err(ErrorCode.TIMEOUT, "Health counters timed out")
         except Exception as exc:
@@ -656,6 +664,7 @@ def register_health_routes(routes: web.RouteTableDef) -> None:
         - SQLite active connections
         - enrichment queue length
         - watcher pending files
+        - rating/tags write-back queue depth and throughput
         """
         svc, error_result = await _require_services()
         if error_result:
@@ -664,8 +673,9 @@ def register_health_routes(routes: web.RouteTableDef) -> None:
         db = svc.get("db") if isinstance(svc, dict) else None
         index = svc.get("index") if isinstance(svc, dict) else None
         watcher = svc.get("watcher") if isinstance(svc, dict) else None
+        rating_tags_sync = svc.get("rating_tags_sync") if isinstance(svc, dict) else None
 
-        payload = _runtime_status_payload(db, index, watcher)
+        payload = _runtime_status_payload(db, index, watcher, rating_tags_sync)
         return _json_response(Result.Ok(payload))
 
     @routes.get("/mjr/am/runtime/execution")
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from aiohttp import web
 from mjr_am_backend.features.metadata.key_aggregator import aggregate_metadata_keys
 from mjr_am_backend.features.metadata.parser_backfill import (
+    DEFAULT_BATCH_SIZE,
     metadata_parser_backfill_status,
     run_metadata_parser_backfill,
 )
@@ -15,6 +18,40 @@ from mjr_am_backend.features.metadata.section_catalog import (
 from mjr_am_backend.shared import Result, sanitize_error_message
 
 from ..core import _csrf_error, _json_response, _require_services, _require_write_access
+from ..db_maintenance import archive_runtime, backfill_jobs
+
+
+async def _run_parser_backfill_job(*, backfill_id: str, db: Any, batch_size: int) -> None:
+    backfill_jobs.update_job(backfill_id, status="running", started_at=backfill_jobs.utc_now_iso(), code=None, error=None)
+    try:
+
+        def _on_progress(progress: dict[str, int]) -> None:
+            backfill_jobs.update_job(backfill_id, progress=dict(progress or {}))
+
+        res = await run_metadata_parser_backfill(
+            db,
+            limit=None,
+            batch_size=batch_size,
+            on_progress=_on_progress,
+            wait_for_priority_window_fn=backfill_jobs.wait_for_priority_window,
+        )
+        if not res.ok:
+            backfill_jobs.fail_job(
+                backfill_id,
+                str(res.error or "Metadata backfill failed"),
+                code=str(res.code or "METADATA_BACKFILL_FAILED"),
+            )
+            return
+        backfill_jobs.complete_job(backfill_id, scope="all", custom_root_id="", payload=res.data or {})
+    except Exception as exc:
+        backfill_jobs.fail_job(
+            backfill_id,
+            sanitize_error_message(exc, "Metadata backfill failed"),
+            code="METADATA_BACKFILL_FAILED",
+        )
+    finally:
+        backfill_jobs.clear_active_job_id(backfill_id)
+        backfill_jobs.prune_history()
 
 
 def register_metadata_catalog_routes(routes: web.RouteTableDef) -> None:
@@ -55,7 +92,13 @@ def register_metadata_catalog_routes(routes: web.RouteTableDef) -> None:
             db = svc.get("db") if isinstance(svc, dict) else None
             if db is None:
                 return _json_response(Result.Err("SERVICE_UNAVAILABLE", "Database service unavailable"))
-            return _json_response(await metadata_parser_backfill_status(db))
+            status = await metadata_parser_backfill_status(db)
+            if not status.ok:
+                return _json_response(status)
+            job = backfill_jobs.get_active_or_latest_job(kind=backfill_jobs.KIND_METADATA_PARSER)
+            payload = dict(status.data or {})
+            payload["job"] = backfill_jobs.job_public(job) if isinstance(job, dict) else None
+            return _json_response(Result.Ok(payload))
         except Exception as exc:
             return _json_response(
                 Result.Err("METADATA_BACKFILL_STATUS_FAILED", sanitize_error_message(exc, "Failed to inspect metadata backfill status"))
@@ -81,8 +124,35 @@ def register_metadata_catalog_routes(routes: web.RouteTableDef) -> None:
                 payload = await request.json()
             except Exception:
                 payload = {}
+            if not isinstance(payload, dict):
+                payload = {}
+            batch_size = int(payload.get("batch_size") or request.query.get("batch_size") or DEFAULT_BATCH_SIZE)
+            async_mode = backfill_jobs.parse_bool_flag(payload.get("async", request.query.get("async")), default=False)
+            if async_mode:
+                # One backfill (vector or metadata) runs at a time; report the running one.
+                active = backfill_jobs.get_active_or_latest_job()
+                if backfill_jobs.is_active() and isinstance(active, dict):
+                    return _json_response(Result.Ok(backfill_jobs.job_public(active)))
+                job = backfill_jobs.register_job(
+                    batch_size=batch_size,
+                    scope="all",
+                    kind=backfill_jobs.KIND_METADATA_PARSER,
+                )
+                backfill_id = str(job.get("backfill_id") or "")
+                archive_runtime.spawn_background_task(
+                    _run_parser_backfill_job(backfill_id=backfill_id, db=db, batch_size=int(job["batch_size"])),
+                    label=f"metadata-parser-backfill-{backfill_id}",
+                )
+                return _json_response(Result.Ok(backfill_jobs.job_public(job)))
             limit = int(payload.get("limit") or request.query.get("limit") or 1000)
-            return _json_response(await run_metadata_parser_backfill(db, limit=limit))
+            return _json_response(
+                await run_metadata_parser_backfill(
+                    db,
+                    limit=limit,
+                    batch_size=batch_size,
+                    wait_for_priority_window_fn=backfill_jobs.wait_for_priority_window,
+                )
+            )
         except Exception as exc:
             return _json_response(
                 Result.Err("METADATA_BACKFILL_FAILED", sanitize_error_message(exc, "Failed to backfill metadata parser version"))
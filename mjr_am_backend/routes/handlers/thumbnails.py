@@ -6,10 +6,17 @@ import asyncio
 from pathlib import Path
 
 from aiohttp import web
-from mjr_am_backend.features.metadata.thumbnail_cache import get_or_create_thumbnail
+from mjr_am_backend.features.metadata.thumbnail_cache import (
+    PREFETCH_THUMB_SIZE,
+    get_or_create_thumbnail,
+    get_thumbnail_store,
+    prefetch_thumbnails,
+)
 from mjr_am_backend.shared import Result, sanitize_error_message
 
-from ..core import _is_path_allowed, _json_response, _normalize_path
+from ..core import _csrf_error, _is_path_allowed, _json_response, _normalize_path, _read_json
+
+_MAX_PREFETCH_PATHS = 2000
 
 
 def register_thumbnail_routes(routes: web.RouteTableDef) -> None:
@@ -22,15 +29,22 @@ def register_thumbnail_routes(routes: web.RouteTableDef) -> None:
         if not normalized or not normalized.exists() or not _is_path_allowed(normalized):
             return _json_response(Result.Err("FORBIDDEN", "Path not allowed"))
         size = request.query.get("size", "320")
-        try:
-            loop = asyncio.get_running_loop()
-            result = await loop.run_in_executor(None, lambda: get_or_create_thumbnail(str(normalized), size=size))
-        except Exception as exc:
-            return _json_response(Result.Err("THUMBNAIL_FAILED", sanitize_error_message(exc, "Failed to generate thumbnail")))
-        if not result.ok:
-            return _json_response(result)
-        thumb_path = Path(str((result.data or {}).get("path") or ""))
-        if not thumb_path.is_file():
+        loop = asyncio.get_running_loop()
+        thumb_path: Path | None = None
+        # A second attempt covers a cached file removed behind the index's back.
+        for _attempt in range(2):
+            try:
+                result = await loop.run_in_executor(None, lambda: get_or_create_thumbnail(str(normalized), size=size))
+            except Exception as exc:
+                return _json_response(Result.Err("THUMBNAIL_FAILED", sanitize_error_message(exc, "Failed to generate thumbnail")))
+            if not result.ok:
+                return _json_response(result)
+            thumb_path = Path(str((result.data or {}).get("path") or ""))
+            if thumb_path.is_file():
+                break
+            get_thumbnail_store().discard(thumb_path.stem)
+            thumb_path = None
+        if thumb_path is None:
             return _json_response(Result.Err("NOT_FOUND", "Thumbnail not found"))
         return web.FileResponse(
             thumb_path,
@@ -39,3 +53,24 @@ def register_thumbnail_routes(routes: web.RouteTableDef) -> None:
                 "Cache-Control": "public, max-age=31536000, immutable",
             },
         )
+
+    @routes.post("/mjr/am/thumbnails/prefetch")
+    async def prefetch(request: web.Request) -> web.Response:
+        csrf = _csrf_error(request)
+        if csrf:
+            return _json_response(Result.Err("CSRF", csrf))
+        body_res = await _read_json(request)
+        if not body_res.ok:
+            return _json_response(body_res)
+        body = body_res.data or {}
+        raw_paths = body.get("filepaths")
+        if not isinstance(raw_paths, list):
+            return _json_response(Result.Err("INVALID_INPUT", "filepaths must be a list"))
+        paths: list[str] = []
+        for raw in raw_paths[:_MAX_PREFETCH_PATHS]:
+            normalized = _normalize_path(str(raw or "").strip()) if raw else None
+            if normalized and _is_path_allowed(normalized):
+                paths.append(str(normalized))
+        size = body.get("size", PREFETCH_THUMB_SIZE)
+        queued = await asyncio.to_thread(prefetch_thumbnails, paths, size=size)
+        return _json_response(Result.Ok({"queued": queued, "skipped": len(raw_paths) - queued}))
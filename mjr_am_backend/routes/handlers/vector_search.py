@@ -140,6 +140,18 @@ def _normalise_vector(vec: list[float]) -> list[float]:
     return [float(v) / norm for v in vec]
 
 
+def _cosine_similarity_rows(mat: Any, vector: list[float]) -> list[float]:
+    """Cosine similarity of every row of *mat* against *vector* (0 for size mismatches)."""
+    import numpy as np
+
+    vec = np.asarray(vector, dtype=np.float32)
+    if mat.size == 0 or vec.shape != (mat.shape[1],):
+        return [0.0] * int(mat.shape[0])
+    norms = np.linalg.norm(mat, axis=1) * float(np.linalg.norm(vec))
+    dots = mat @ vec
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0).tolist()
+
+
 def _mean_vector(vectors: list[list[float]], dim: int) -> list[float]:
     if not vectors or dim <= 0:
         return [0.0] * max(dim, 0)
@@ -1056,28 +1068,24 @@ def register_vector_search_routes(routes: web.RouteTableDef) -> None:
         try:
             import json as _json
 
-            from ...features.index.vector_service import blob_to_vector
+            from ...features.index.vector_service import blobs_to_matrix
 
             DIM = int(getattr(searcher, "_dim", 768) or 768)
+            mat, positions = blobs_to_matrix([row.get("vector") for row in rows.data], DIM)
             id_map: list[int] = []
-            vectors: list[list[float]] = []
             auto_tags_map: dict[int, list[str]] = {}
 
-            for row in rows.data:
+            for pos in positions:
+                row = rows.data[pos]
+                aid = int(row["asset_id"])
+                id_map.append(aid)
+                raw_tags = row.get("auto_tags", "[]") or "[]"
                 try:
-                    vec = blob_to_vector(row["vector"], DIM)
-                    aid = int(row["asset_id"])
-                    vectors.append(vec)
-                    id_map.append(aid)
-                    raw_tags = row.get("auto_tags", "[]") or "[]"
-                    try:
-                        auto_tags_map[aid] = _json.loads(raw_tags)
-                    except Exception:
-                        auto_tags_map[aid] = []
+                    auto_tags_map[aid] = _json.loads(raw_tags)
                 except Exception:
-                    continue
+                    auto_tags_map[aid] = []
 
-            if len(vectors) < k:
+            if len(id_map) < k:
                 return _json_response(
                     Result.Err("INSUFFICIENT_DATA", "Not enough valid embeddings for clustering")
                 )
@@ -1085,9 +1093,6 @@ def register_vector_search_routes(routes: web.RouteTableDef) -> None:
             labels_py: list[int]
             centroids_py: list[list[float]]
             try:
-                import numpy as np
-
-                mat = np.array(vectors, dtype=np.float32)
                 labels_any: Any | None = None
                 centroids_any: Any | None = None
                 try:
@@ -1110,7 +1115,7 @@ def register_vector_search_routes(routes: web.RouteTableDef) -> None:
                         centroids_any = None
 
                 if labels_any is None or centroids_any is None:
-                    labels_py, centroids_py = _kmeans_python(vectors, k)
+                    labels_py, centroids_py = _kmeans_python(mat.tolist(), k)
                 else:
                     labels_py = [int(x) for x in labels_any.tolist()]
                     centroids_py = [
@@ -1118,7 +1123,7 @@ def register_vector_search_routes(routes: web.RouteTableDef) -> None:
                         for row in centroids_any.tolist()
                     ]
             except Exception:
-                labels_py, centroids_py = _kmeans_python(vectors, k)
+                labels_py, centroids_py = _kmeans_python(mat.tolist(), k)
 
             # Fetch filenames for sample thumbnails
             all_ids_flat = list(id_map)
@@ -1140,7 +1145,8 @@ def register_vector_search_routes(routes: web.RouteTableDef) -> None:
                     continue
 
                 centroid = centroids_py[cluster_id] if cluster_id < len(centroids_py) else []
-                scored = [(float(_cosine_similarity(vectors[idx], centroid)), idx) for idx in mask]
+                scores = _cosine_similarity_rows(mat[mask], centroid)
+                scored = [(float(score), idx) for score, idx in zip(scores, mask, strict=True)]
                 scored.sort(key=lambda t: t[0], reverse=True)
                 if scored:
                     top_local = [idx for _, idx in scored[:3]]
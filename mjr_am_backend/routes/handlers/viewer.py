@@ -539,6 +539,10 @@ def register_viewer_routes(routes: web.RouteTableDef) -> None:
                     """,
                     (digest, algo_filter, algo_filter),
                 )
+            if row_res.ok and not row_res.data and svc.get("duplicates") is not None:
+                # Duplicate analysis leaves files of unique size unhashed; hash
+                # them in the background so a retry can find this one.
+                svc["duplicates"].queue_content_hashing()
         except Exception as exc:
             return _json_response(
                 Result.Err("QUERY_FAILED", safe_error_message(exc, "Failed to look up hash"))
@@ -94,6 +94,7 @@ async def list_assets(
             query=query,
             limit=limit,
             offset=offset,
+            cursor=cursor,
             sort_key=sort_key,
             filters=filters,
             include_total=include_total,
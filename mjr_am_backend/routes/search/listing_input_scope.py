@@ -139,6 +139,7 @@ async def _try_indexed_input_response(
     include_total: bool,
     subfolder: str,
     show_folders: bool,
+    cursor: str = "",
     dedupe_result_assets_payload: Callable[[dict[str, Any]], dict[str, Any]],
     list_filesystem_folders: Callable[..., Any],
     json_response: Callable[[Any], web.Response],
@@ -149,15 +150,17 @@ async def _try_indexed_input_response(
     if subfolder:
         scoped_filters["subfolder"] = str(subfolder)
 
-    db_result = await svc["index"].search_scoped(
-        query,
-        roots=[root_path],
-        limit=limit,
-        offset=offset,
-        filters=scoped_filters,
-        include_total=include_total,
-        sort=sort_key,
-    )
+    search_kwargs: dict[str, Any] = {
+        "roots": [root_path],
+        "limit": limit,
+        "offset": offset,
+        "filters": scoped_filters,
+        "include_total": include_total,
+        "sort": sort_key,
+    }
+    if cursor:
+        search_kwargs["cursor"] = cursor
+    db_result = await svc["index"].search_scoped(query, **search_kwargs)
 
     if not db_result.ok:
         return None
@@ -182,6 +185,7 @@ async def handle_input_scope(
     limit: int,
     offset: int,
     sort_key: str,
+    cursor: str = "",
     filters: dict[str, Any],
     include_total: bool,
     subfolder: str,
@@ -247,6 +251,7 @@ async def handle_input_scope(
             include_total=include_total,
             subfolder=subfolder,
             show_folders=_show_folders,
+            cursor=cursor,
             dedupe_result_assets_payload=dedupe_result_assets_payload,
             list_filesystem_folders=list_filesystem_folders,
             json_response=json_response,
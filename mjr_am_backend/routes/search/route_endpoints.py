@@ -195,13 +195,17 @@ async def search_assets(
     offset = request_ctx.offset if request_ctx else 0
     filters = request_ctx.filters if request_ctx else {}
     include_total = request_ctx.include_total if request_ctx else True
+    search_kwargs: dict[str, Any] = {"include_total": include_total}
+    cursor = (request.query.get("cursor") or "").strip()
+    if cursor:
+        search_kwargs["cursor"] = cursor
 
     result = await svc["index"].search(
         query,
         limit,
         offset,
         filters if filters else None,
-        include_total=include_total,
+        **search_kwargs,
     )
     if result.ok and isinstance(result.data, dict):
         result.data = dedupe_result_assets_payload(result.data)
@@ -85,6 +85,48 @@ def schedule_post_execution_ingestion(prompt_id: str | None) -> bool:
         return False
 
 
+def schedule_generated_output_ingestion(records: list[dict[str, Any]], base_dir: str) -> bool:
+    """Hand save-node output records to the index on the server loop (callable from node threads)."""
+    paths = [str(r.get("filepath") or "") for r in records if isinstance(r, dict) and r.get("filepath")]
+    if not paths:
+        return False
+    try:
+        from .adapters.comfy_core import schedule_task
+        from .features.index.direct_ingest import claim_paths, release_paths
+        from .features.index.watcher import mark_recent_generated
+        from .routes.core.services import _build_services
+
+        async def _run() -> None:
+            try:
+                services = await _build_services()
+                index_service = (services or {}).get("index") if isinstance(services, dict) else None
+                if index_service is None:
+                    release_paths(paths)
+                    return
+                await index_service.ingest_generated(records, base_dir=base_dir)
+            except Exception:
+                release_paths(paths)
+                raise
+            finally:
+                done.set_result(None)
+
+        done = claim_paths(paths)
+        coro = _run()
+        scheduled = schedule_task(coro)
+        if not scheduled:
+            release_paths(paths)
+            done.set_result(None)
+            try:
+                coro.close()
+            except Exception:
+                pass
+        else:
+            mark_recent_generated(paths)
+        return scheduled
+    except Exception:
+        return False
+
+
 def is_generation_busy(*, include_cooldown: bool = True) -> bool:
     now = _now()
     with _LOCK:
@@ -27,6 +27,8 @@ except Exception:  # pragma: no cover
 
 HashAlgo = Literal["sha256", "blake3"]
 _CHUNK = 1024 * 1024
+# Bytes read from each end of a file by `compute_partial_hash`.
+PARTIAL_HASH_WINDOW = 64 * 1024
 
 
 class _Hasher(Protocol):
@@ -63,6 +65,41 @@ def compute_file_hash(path: Path | str, *, algo: HashAlgo | None = None) -> tupl
     return hasher.hexdigest(), chosen
 
 
+def compute_partial_hash(
+    path: Path | str,
+    *,
+    algo: HashAlgo | None = None,
+    window: int = PARTIAL_HASH_WINDOW,
+) -> tuple[str, HashAlgo]:
+    """Hash only the first and last *window* bytes of a file.
+
+    A cheap prefilter for exact-duplicate detection: files that differ here
+    cannot be identical, so only matching ``(size, partial)`` groups need a
+    full `compute_file_hash`. Files up to ``2 * window`` bytes are hashed whole.
+    """
+    target = Path(path)
+    chosen: HashAlgo = algo or preferred_algo()
+    if chosen == "blake3" and not _HAS_BLAKE3:
+        chosen = "sha256"
+
+    if chosen == "blake3":
+        hasher: _Hasher = _blake3.blake3()  # type: ignore[union-attr]
+    else:
+        hasher = hashlib.sha256()
+
+    window = max(1, int(window))
+    with target.open("rb") as fh:
+        size = fh.seek(0, 2)
+        fh.seek(0)
+        if size <= 2 * window:
+            hasher.update(fh.read())
+        else:
+            hasher.update(fh.read(window))
+            fh.seek(size - window)
+            hasher.update(fh.read(window))
+    return hasher.hexdigest(), chosen
+
+
 def parse_hash_uri(value: str) -> tuple[HashAlgo, str] | None:
     """Parse a ``blake3:xxx`` / ``sha256:xxx`` URI.
 
@@ -86,6 +123,7 @@ def parse_hash_uri(value: str) -> tuple[HashAlgo, str] | None:
 __all__ = [
     "HashAlgo",
     "compute_file_hash",
+    "compute_partial_hash",
     "parse_hash_uri",
     "preferred_algo",
 ]
@@ -21,8 +21,11 @@ import json
 import logging
 import math
 import os
+import queue
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from fractions import Fraction
 from functools import lru_cache
 from typing import Any
@@ -45,8 +48,14 @@ except ModuleNotFoundError:
     torch = None  # type: ignore[assignment]
 
 try:
+    from .mjr_am_backend.adapters.fs.save_counters import (
+        reserve_save_counter as _reserve_save_counter,
+    )
     from .mjr_am_backend.video_ui import build_video_ui as _build_video_ui
 except ImportError:
+    from mjr_am_backend.adapters.fs.save_counters import (
+        reserve_save_counter as _reserve_save_counter,
+    )
     from mjr_am_backend.video_ui import build_video_ui as _build_video_ui
 
 _log = logging.getLogger("majoor_assets_manager.nodes")
@@ -122,6 +131,93 @@ def _srgb_save_kwargs() -> dict[str, Any]:
     return {"icc_profile": _srgb_icc_profile()}
 
 
+# PNG zlib compression releases the GIL, so a batch encodes in parallel.
+_PNG_ENCODE_WORKERS = max(1, min(8, os.cpu_count() or 1))
+_PNG_COMPRESS_LEVEL = 4
+_PNG_FAST_COMPRESS_LEVEL = 1
+_png_pool: ThreadPoolExecutor | None = None
+_png_pool_lock = threading.Lock()
+
+
+def _png_encode_pool() -> ThreadPoolExecutor:
+    global _png_pool
+    if _png_pool is None:
+        with _png_pool_lock:
+            if _png_pool is None:
+                _png_pool = ThreadPoolExecutor(max_workers=_PNG_ENCODE_WORKERS, thread_name_prefix="mjr-png")
+    return _png_pool
+
+
+def _encode_png(pixels: np.ndarray, path: str, metadata: PngInfo | None, compress_level: int) -> None:
+    Image.fromarray(pixels).save(
+        path,
+        pnginfo=metadata,
+        compress_level=compress_level,
+        icc_profile=_srgb_icc_profile(),
+    )
+
+
+# Video/animation frames are converted in chunks on a worker thread that runs
+# ahead of the encoder, so GPU->CPU transfer and pixel reformat overlap encoding.
+_FRAME_CHUNK_SIZE = 16
+_FRAME_PREFETCH_CHUNKS = 2
+_X264_THREAD_TYPES = ["auto", "frame", "slice"]
+
+
+def _frames_to_uint8(chunk: Any) -> np.ndarray:
+    """Convert an NHWC float [0-1] frame chunk to a uint8 numpy array in one transfer."""
+    if torch is not None and isinstance(chunk, torch.Tensor):
+        return (chunk * 255).clamp_(0, 255).to(torch.uint8).cpu().numpy()
+    return np.clip(255.0 * np.asarray(chunk), 0, 255).astype(np.uint8)
+
+
+def _iter_prefetched_frames(frames: Any, convert: Any, chunk_size: int = _FRAME_CHUNK_SIZE):
+    """
+    Yield ``convert(pixels)`` for every frame, converting chunks on a worker thread.
+
+    The worker stays at most ``_FRAME_PREFETCH_CHUNKS`` chunks ahead, which bounds
+    host memory for long clips. Worker errors are re-raised in the consumer.
+    """
+    done = object()
+    chunks: queue.Queue[Any] = queue.Queue(maxsize=_FRAME_PREFETCH_CHUNKS)
+    stop = threading.Event()
+
+    def _put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            total = len(frames)
+            for start in range(0, total, chunk_size):
+                pixels = _frames_to_uint8(frames[start:start + chunk_size])
+                if not _put([convert(frame) for frame in pixels]):
+                    return
+        except BaseException as exc:
+            _put(exc)
+            return
+        _put(done)
+
+    worker = threading.Thread(target=_produce, name="mjr-frames", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield from item
+    finally:
+        stop.set()
+        worker.join()
+
+
 def _require_torch() -> Any:
     if torch is None:
         raise RuntimeError("torch is required for Majoor image/video node execution")
@@ -166,9 +262,8 @@ def _resolve_filename_prefix_placeholders(filename_prefix: str) -> str:
 
     ComfyUI's frontend only rewrites ``filename_prefix`` for its own core save
     nodes, so custom nodes receive the placeholders verbatim. ``%width%``,
-    ``%height%``, ``%year%``... are already handled by
-    ``folder_paths.get_save_image_path``; only ``%date:...%`` needs resolving
-    here. ``%Node.widget%`` references are resolved by the bundled frontend
+    ``%height%``, ``%year%``... are resolved with the save path
+    (``_resolve_save_target``); only ``%date:...%`` needs resolving here. ``%Node.widget%`` references are resolved by the bundled frontend
     extension when a graph is available.
     """
     now = datetime.datetime.now()
@@ -185,18 +280,66 @@ def _resolve_filename_prefix_placeholders(filename_prefix: str) -> str:
         return filename_prefix
 
 
-def _next_counter(directory: str, prefix: str) -> int:
-    """Find the next available counter for *prefix_NNNNN* in *directory*."""
-    max_counter = 0
-    matcher = re.compile(rf"{re.escape(prefix)}_(\d+)\D*\..+", re.IGNORECASE)
-    try:
-        for entry in os.listdir(directory):
-            m = matcher.fullmatch(entry)
-            if m:
-                max_counter = max(max_counter, int(m.group(1)))
-    except FileNotFoundError:
-        pass
-    return max_counter + 1
+_PATH_VAR_RE = re.compile(r"%(?!batch_num%)[^%]+%")
+
+
+def _compute_path_vars(filename_prefix: str, width: int, height: int) -> str:
+    """Same substitutions as ``folder_paths.get_save_image_path``."""
+    if "%" not in filename_prefix:
+        return filename_prefix
+    now = time.localtime()
+    for token, value in (
+        ("%width%", str(width)),
+        ("%height%", str(height)),
+        ("%year%", str(now.tm_year)),
+        ("%month%", str(now.tm_mon).zfill(2)),
+        ("%day%", str(now.tm_mday).zfill(2)),
+        ("%hour%", str(now.tm_hour).zfill(2)),
+        ("%minute%", str(now.tm_min).zfill(2)),
+        ("%second%", str(now.tm_sec).zfill(2)),
+    ):
+        filename_prefix = filename_prefix.replace(token, value)
+    return filename_prefix
+
+
+def _resolve_save_target(filename_prefix: str, output_dir: str, width: int, height: int) -> tuple[str, str, str]:
+    """
+    Resolve ``(full_output_folder, filename, subfolder)`` like
+    ``folder_paths.get_save_image_path`` without listing the folder: counters
+    come from :func:`_reserve_counter` instead.
+    """
+    resolved = _compute_path_vars(filename_prefix, width, height)
+    if _PATH_VAR_RE.search(resolved):
+        # Placeholders this helper does not know: keep ComfyUI's own resolution.
+        full_output_folder, filename, _counter, subfolder, _prefix = folder_paths.get_save_image_path(
+            filename_prefix, output_dir, width, height
+        )
+        return full_output_folder, filename, subfolder
+    subfolder = os.path.dirname(os.path.normpath(resolved))
+    filename = os.path.basename(os.path.normpath(resolved))
+    full_output_folder = os.path.join(output_dir, subfolder)
+    if os.path.commonpath((output_dir, os.path.abspath(full_output_folder))) != output_dir:
+        raise ValueError(
+            "Saving image outside the output folder is not allowed."
+            f"\n full_output_folder: {os.path.abspath(full_output_folder)}\n output_dir: {output_dir}"
+        )
+    os.makedirs(full_output_folder, exist_ok=True)
+    return full_output_folder, filename, subfolder
+
+
+def _reserve_counter(directory: str, prefix: str, names_for: Any, count: int = 1) -> int:
+    """Next free *prefix_NNNNN* counter(s) in *directory*; ``names_for(counter)`` files are pre-created."""
+    return _reserve_save_counter(directory, prefix, names_for, count)
+
+
+def _discard_reservations(paths: list[str]) -> None:
+    """Remove placeholder files left empty by a failed save."""
+    for path in paths:
+        try:
+            if os.path.getsize(path) == 0:
+                os.unlink(path)
+        except OSError:
+            pass
 
 
 def _build_metadata(
@@ -225,6 +368,57 @@ def _build_metadata(
     return metadata
 
 
+def _submit_direct_ingest(
+    paths: list[str],
+    base_dir: str,
+    *,
+    prompt: Any | None,
+    extra_pnginfo: dict | None,
+    generation_time_ms: int,
+    geninfo_override: Any | None,
+    unique_id: Any | None,
+    width: int,
+    height: int,
+) -> bool:
+    """
+    Hand freshly saved files to the Majoor index together with the metadata
+    embedded in them, so indexing skips re-reading the PNG chunks.
+    """
+    try:
+        from mjr_am_backend.runtime_activity import schedule_generated_output_ingestion
+    except Exception:
+        return False
+    execution = _resolve_execution_metadata(prompt, extra_pnginfo, unique_id)
+    override_payload = _coerce_geninfo_override_payload(geninfo_override)
+    records: list[dict[str, Any]] = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        records.append(
+            {
+                "filepath": path,
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "prompt": prompt,
+                "extra_pnginfo": extra_pnginfo,
+                "geninfo_override": override_payload,
+                "generation_time_ms": generation_time_ms,
+                "execution": execution,
+                "width": width,
+                "height": height,
+            }
+        )
+    if not records:
+        return False
+    try:
+        return schedule_generated_output_ingestion(records, base_dir)
+    except Exception:
+        _log.debug("Direct ingest scheduling failed", exc_info=True)
+        return False
+
+
 def _runtime_active_prompt_id() -> str | None:
     try:
         from mjr_am_backend.runtime_activity import _LOCK, _STATE
@@ -1036,7 +1230,7 @@ class MajoorSaveImage:
         self.output_dir = folder_paths.get_output_directory()
         self.type = "output"
         self.prefix_append = ""
-        self.compress_level = 4
+        self.compress_level = _PNG_COMPRESS_LEVEL
 
     @classmethod
     def INPUT_TYPES(cls):  # noqa: N802
@@ -1064,6 +1258,13 @@ class MajoorSaveImage:
                     "MAJOOR_GENINFO",
                     {"tooltip": "Explicit geninfo override from Majoor Gen Info Override."},
                 ),
+                "fast_compression": (
+                    "BOOLEAN",
+                    {
+                        "default": False,
+                        "tooltip": "Use the fastest PNG compression level (larger files, much faster saves).",
+                    },
+                ),
             },
             "hidden": {
                 "prompt": "PROMPT",
@@ -1084,44 +1285,77 @@ class MajoorSaveImage:
         filename_prefix: str = "Majoor",
         generation_time_ms: int = -1,
         geninfo_override: Any | None = None,
+        fast_compression: bool = False,
         prompt: Any | None = None,
         extra_pnginfo: dict | None = None,
         unique_id: Any | None = None,
     ):
         filename_prefix = _resolve_filename_prefix_placeholders(filename_prefix) + self.prefix_append
-        full_output_folder, filename, counter, subfolder, filename_prefix = (
-            folder_paths.get_save_image_path(
-                filename_prefix,
-                self.output_dir,
-                images[0].shape[1],
-                images[0].shape[0],
-            )
+        full_output_folder, filename, subfolder = _resolve_save_target(
+            filename_prefix,
+            self.output_dir,
+            images[0].shape[1],
+            images[0].shape[0],
         )
+        batch_size = len(images)
+
+        def _batch_names(first: int) -> list[str]:
+            return [f"{filename.replace('%batch_num%', str(n))}_{first + n:05}_.png" for n in range(batch_size)]
+
+        # One counter per image, reserved as a block without listing the folder.
+        counter = _reserve_counter(full_output_folder, filename, _batch_names, batch_size)
 
         gen_time = generation_time_ms if generation_time_ms >= 0 else _get_generation_time_ms()
+        compress_level = _PNG_FAST_COMPRESS_LEVEL if fast_compression else self.compress_level
+
+        # Prompt/workflow JSON is identical for every image of the batch:
+        # serialize it once and share the (read-only) PngInfo.
+        metadata: PngInfo | None = None
+        if not args.disable_metadata:
+            metadata = _build_metadata(prompt, extra_pnginfo, gen_time, geninfo_override, unique_id)
 
         results: list[dict[str, str]] = []
-        progress = _make_progress_bar(len(images))
+        jobs: list[tuple[np.ndarray, str]] = []
         for batch_number, image in enumerate(images):
-            img = Image.fromarray(_tensor_to_bytes(image))
-
-            metadata: PngInfo | None = None
-            if not args.disable_metadata:
-                metadata = _build_metadata(prompt, extra_pnginfo, gen_time, geninfo_override, unique_id)
-
             fname = filename.replace("%batch_num%", str(batch_number))
             file = f"{fname}_{counter:05}_.png"
-            img.save(
-                os.path.join(full_output_folder, file),
-                pnginfo=metadata,
-                compress_level=self.compress_level,
-                icc_profile=_srgb_icc_profile(),
-            )
+            jobs.append((_tensor_to_bytes(image), os.path.join(full_output_folder, file)))
             results.append(
                 {"filename": file, "subfolder": subfolder, "type": self.type}
             )
             counter += 1
-            progress.update(1)
+
+        progress = _make_progress_bar(len(jobs))
+        try:
+            if len(jobs) == 1:
+                _encode_png(jobs[0][0], jobs[0][1], metadata, compress_level)
+                progress.update(1)
+            else:
+                pool = _png_encode_pool()
+                futures = [
+                    pool.submit(_encode_png, pixels, path, metadata, compress_level) for pixels, path in jobs
+                ]
+                # Waiting in submission order re-raises the first failure like the
+                # serial loop did; results keep batch order regardless.
+                for future in futures:
+                    future.result()
+                    progress.update(1)
+        except Exception:
+            _discard_reservations([path for _pixels, path in jobs])
+            raise
+
+        if metadata is not None and self.type == "output":
+            _submit_direct_ingest(
+                [path for _pixels, path in jobs],
+                self.output_dir,
+                prompt=prompt,
+                extra_pnginfo=extra_pnginfo,
+                generation_time_ms=gen_time,
+                geninfo_override=geninfo_override,
+                unique_id=unique_id,
+                width=int(images[0].shape[1]),
+                height=int(images[0].shape[0]),
+            )
 
         return {"ui": {"images": results}}
 
@@ -1218,8 +1452,8 @@ def _save_animated(
     num_frames = resolved_images.size(0)
     frames: list[Image.Image] = []
     progress = progress or _make_progress_bar(num_frames)
-    for index in range(num_frames):
-        frames.append(Image.fromarray(_tensor_to_bytes(resolved_images[index])))
+    for frame in _iter_prefetched_frames(resolved_images, Image.fromarray):
+        frames.append(frame)
         progress.update(1)
     save_kwargs: dict[str, Any] = {
         "save_all": True,
@@ -1347,8 +1581,15 @@ def _encode_mp4(
     audio_input: Any | None,
     num_frames: int,
     progress: Any | None = None,
+    encoder_threads: int = 0,
+    thread_type: str = "auto",
 ) -> None:
-    """Encode frames + optional audio into an MP4 via PyAV."""
+    """
+    Encode frames + optional audio into an MP4 via PyAV.
+
+    Frame conversion and the RGB->YUV reformat run on a prefetch worker, so the
+    muxing loop only feeds x264. ``encoder_threads`` = 0 lets x264 pick a count.
+    """
     fps_fraction = Fraction(round(fps * 1000), 1000)
     audio_info = _prepare_audio(audio_input, fps_fraction, num_frames)
 
@@ -1375,6 +1616,10 @@ def _encode_mp4(
         stream.codec_context.color_trc = 1
         stream.codec_context.colorspace = 1
         stream.codec_context.color_range = 1
+        if encoder_threads > 0:
+            stream.codec_context.thread_count = int(encoder_threads)
+        if thread_type in ("frame", "slice"):
+            stream.codec_context.thread_type = thread_type.upper()
 
         audio_stream = None
         if audio_info is not None:
@@ -1382,10 +1627,11 @@ def _encode_mp4(
             audio_stream = container.add_stream("aac", rate=sample_rate, layout=layout)
 
         progress = progress or _make_progress_bar(num_frames)
-        for frame_tensor in resolved_images:
-            img = (frame_tensor * 255).clamp(0, 255).byte().cpu().numpy()
+        def _to_yuv(img: np.ndarray) -> Any:
             video_frame = av.VideoFrame.from_ndarray(img, format="rgb24")
-            video_frame = video_frame.reformat(format="yuv420p", dst_colorspace="ITU709")
+            return video_frame.reformat(format="yuv420p", dst_colorspace="ITU709")
+
+        for video_frame in _iter_prefetched_frames(resolved_images, _to_yuv):
             for packet in stream.encode(video_frame):
                 container.mux(packet)
             progress.update(1)
@@ -1461,6 +1707,16 @@ class MajoorSaveVideo:
                     {"default": True,
                      "tooltip": "Save a PNG sidecar of the first frame with full metadata."},
                 ),
+                "encoder_threads": (
+                    "INT",
+                    {"default": 0, "min": 0, "max": 64, "step": 1,
+                     "tooltip": "x264 encoder threads (MP4 only). 0 = auto."},
+                ),
+                "encoder_thread_type": (
+                    _X264_THREAD_TYPES,
+                    {"default": "auto",
+                     "tooltip": "x264 threading mode (MP4 only). 'slice' lowers latency, 'frame' maximizes throughput."},
+                ),
             },
             "hidden": {
                 "prompt": "PROMPT",
@@ -1490,6 +1746,8 @@ class MajoorSaveVideo:
         audio: dict | None = None,
         crf: int = 19,
         save_first_frame: bool = True,
+        encoder_threads: int = 0,
+        encoder_thread_type: str = "auto",
         prompt: Any | None = None,
         extra_pnginfo: dict | None = None,
         unique_id: Any | None = None,
@@ -1503,56 +1761,68 @@ class MajoorSaveVideo:
         num_frames = resolved_images.size(0)
 
         filename_prefix = _resolve_filename_prefix_placeholders(filename_prefix)
-        full_output_folder, filename, _counter, subfolder, _prefix = (
-            folder_paths.get_save_image_path(
-                filename_prefix,
-                self.output_dir,
-                resolved_images[0].shape[1],
-                resolved_images[0].shape[0],
-            )
+        full_output_folder, filename, subfolder = _resolve_save_target(
+            filename_prefix,
+            self.output_dir,
+            resolved_images[0].shape[1],
+            resolved_images[0].shape[0],
         )
-        counter = _next_counter(full_output_folder, filename)
-
-        # --- PNG sidecar with full metadata ---
-        png_metadata = _build_metadata(prompt, extra_pnginfo, gen_time, geninfo_override, unique_id)
-
-        sidecar_file: str | None = None
-        if save_first_frame:
-            sidecar_file = f"{filename}_{counter:05}.png"
-            Image.fromarray(_tensor_to_bytes(resolved_images[0])).save(
-                os.path.join(full_output_folder, sidecar_file),
-                pnginfo=png_metadata,
-                compress_level=4,
-                icc_profile=_srgb_icc_profile(),
-            )
+        out_ext = f".{format}" if format in ("gif", "webp") else "_.mp4"
+
+        def _output_names(value: int) -> list[str]:
+            names = [f"{filename}_{value:05}{out_ext}"]
+            if save_first_frame:
+                names.append(f"{filename}_{value:05}.png")
+            return names
+
+        counter = _reserve_counter(full_output_folder, filename, _output_names)
+
+        try:
+            # --- PNG sidecar with full metadata ---
+            png_metadata = _build_metadata(prompt, extra_pnginfo, gen_time, geninfo_override, unique_id)
+
+            sidecar_file: str | None = None
+            if save_first_frame:
+                sidecar_file = f"{filename}_{counter:05}.png"
+                Image.fromarray(_tensor_to_bytes(resolved_images[0])).save(
+                    os.path.join(full_output_folder, sidecar_file),
+                    pnginfo=png_metadata,
+                    compress_level=4,
+                    icc_profile=_srgb_icc_profile(),
+                )
+
+            # --- GIF / WebP via Pillow ---
+            if format in ("gif", "webp"):
+                progress = _make_progress_bar(num_frames)
+                out_file = _save_animated(
+                    resolved_images, format, resolved_fps, loop_count,
+                    full_output_folder, filename, counter, progress,
+                )
+                return _build_video_ui(out_file, subfolder, self.type, out_file)
+
+            # --- MP4 via PyAV ---
+            container_meta = _build_container_metadata(prompt, extra_pnginfo, gen_time, geninfo_override, unique_id)
+            out_file = f"{filename}_{counter:05}{out_ext}"
+            out_path = os.path.join(full_output_folder, out_file)
 
-        # --- GIF / WebP via Pillow ---
-        if format in ("gif", "webp"):
             progress = _make_progress_bar(num_frames)
-            out_file = _save_animated(
-                resolved_images, format, resolved_fps, loop_count,
-                full_output_folder, filename, counter, progress,
+            _encode_mp4(
+                out_path,
+                resolved_images,
+                resolved_fps,
+                crf,
+                container_meta,
+                resolved_audio,
+                num_frames,
+                progress,
+                encoder_threads,
+                encoder_thread_type,
             )
-            return _build_video_ui(out_file, subfolder, self.type, out_file)
-
-        # --- MP4 via PyAV ---
-        container_meta = _build_container_metadata(prompt, extra_pnginfo, gen_time, geninfo_override, unique_id)
-        out_file = f"{filename}_{counter:05}_.mp4"
-        out_path = os.path.join(full_output_folder, out_file)
-
-        progress = _make_progress_bar(num_frames)
-        _encode_mp4(
-            out_path,
-            resolved_images,
-            resolved_fps,
-            crf,
-            container_meta,
-            resolved_audio,
-            num_frames,
-            progress,
-        )
 
-        return _build_video_ui(out_file, subfolder, self.type, sidecar_file)
+            return _build_video_ui(out_file, subfolder, self.type, sidecar_file)
+        except Exception:
+            _discard_reservations([os.path.join(full_output_folder, name) for name in _output_names(counter)])
+            raise
 
 # ---------------------------------------------------------------------------
 # Registration helpers
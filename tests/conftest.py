@@ -1,5 +1,6 @@
 import sys
 
+import pytest
 import pytest_asyncio
 
 from .repo_root import REPO_ROOT
@@ -7,6 +8,16 @@ from .repo_root import REPO_ROOT
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+@pytest.fixture(autouse=True, scope="session")
+def _isolated_thumbnail_store(tmp_path_factory):
+    """Keep scan-triggered thumbnail pre-generation out of the repo's cache dir."""
+    from mjr_am_backend.features.metadata import thumbnail_cache
+
+    thumbnail_cache._store = thumbnail_cache.ThumbnailStore(tmp_path_factory.mktemp("thumbs"), workers=0)
+    yield
+    thumbnail_cache._store = None
+
+
 @pytest_asyncio.fixture
 async def services(tmp_path):
     from mjr_am_backend.deps import build_services
@@ -0,0 +1,119 @@
+import pytest
+from mjr_am_backend.adapters.comfy_event_bus import BATCH_EVENT_NAME, CoalescingEventBus
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def sent():
+    return []
+
+
+def _bus(sent, **kwargs):
+    options = {
+        "window_ms": 60_000,
+        "max_items": 10,
+        "max_pending": 100,
+        "client_high_water_bytes": 1024,
+        "queue_high_water": 50,
+    }
+    options.update(kwargs)
+
+    def _send(event, payload, sid):
+        sent.append((event, payload, sid))
+        return True
+
+    return CoalescingEventBus(_send, **options)
+
+
+def test_updates_are_merged_by_id_and_numbered(sent):
+    bus = _bus(sent)
+    try:
+        bus.publish("mjr-asset-updated", {"id": 1, "rating": 3})
+        bus.publish("mjr-asset-updated", {"id": 1, "tags": ["a"]})
+        bus.publish("mjr-asset-updated", {"id": 2, "rating": 1})
+        bus.publish("mjr-asset-added", {"id": 3})
+        assert bus.pending_count() == 3
+
+        assert bus.flush() == 2
+        assert all(event == BATCH_EVENT_NAME for event, _frame, _sid in sent)
+        frames = {frame["event"]: frame for _event, frame, _sid in sent}
+        updated = frames["mjr-asset-updated"]
+        assert updated["count"] == 2 and updated["dropped"] == 0
+        assert updated["items"][0] == {"id": 1, "rating": 3, "tags": ["a"]}
+        assert sorted(frame["seq"] for frame in frames.values()) == [1, 2]
+        assert bus.pending_count() == 0
+
+        bus.publish("mjr-asset-updated", {"id": 4})
+        bus.flush()
+        assert sent[-1][1]["seq"] == 3
+    finally:
+        bus.stop()
+
+
+def test_overflow_is_reported_as_dropped(sent):
+    bus = _bus(sent, max_pending=2, max_items=1)
+    try:
+        for asset_id in range(5):
+            bus.publish("mjr.asset.indexed", {"id": asset_id})
+        bus.flush()
+        assert [(f["count"], f["dropped"]) for _e, f, _s in sent] == [(1, 3)]
+        bus.flush()
+        assert [(f["count"], f["dropped"]) for _e, f, _s in sent][1:] == [(1, 0)]
+    finally:
+        bus.stop()
+
+
+def test_broadcast_fans_out_and_skips_congested_sessions(sent):
+    sessions = {"a", "b"}
+    buffered = {"a": 0, "b": 4096}
+    bus = _bus(sent, session_ids=lambda: sessions, write_buffer_size=lambda sid: buffered[sid])
+    try:
+        bus.publish("mjr-asset-added", {"id": 7})
+        bus.flush()
+        assert [(sid, frame["items"]) for _e, frame, sid in sent] == [("a", [{"id": 7}])]
+        assert bus.pending_count() == 1
+
+        bus.flush(force=True)
+        assert [sid for _e, _frame, sid in sent] == ["a", "b"]
+
+        bus.publish("mjr-asset-added", {"id": 8}, sid="b")
+        sessions.discard("b")
+        bus.flush(force=True)
+        assert len(sent) == 2
+        assert bus.pending_count() == 0
+    finally:
+        bus.stop()
+
+
+def test_flush_waits_for_backed_up_server_queue(sent):
+    clock = _Clock()
+    depth = {"value": 500}
+    bus = _bus(sent, queue_depth=lambda: depth["value"], clock=clock)
+    try:
+        bus.publish("mjr-asset-updated", {"id": 1})
+        assert bus.flush() == 0 and not sent
+
+        clock.now += 5
+        assert bus.flush() == 1
+
+        bus.publish("mjr-asset-updated", {"id": 2})
+        assert bus.flush() == 0
+        depth["value"] = 0
+        assert bus.flush() == 1
+    finally:
+        bus.stop()
+
+
+def test_disabled_bus_sends_immediately(sent):
+    bus = _bus(sent, window_ms=0)
+    assert not bus.enabled
+    bus.publish("mjr-asset-updated", {"id": 1}, sid="x")
+    assert sent == [("mjr-asset-updated", {"id": 1}, "x")]
+    assert bus.pending_count() == 0
@@ -146,3 +146,21 @@ async def test_sqlite_query_missing_column_triggers_self_heal(tmp_path):
             await db.aclose()
         except Exception:
             pass
+
+
+@pytest.mark.asyncio
+async def test_vec_change_log_records_embedding_writes_and_deletes(tmp_path):
+    from mjr_am_backend.adapters.db.schema import migrate_schema
+    from mjr_am_backend.adapters.db.sqlite import Sqlite
+
+    db = Sqlite(str(tmp_path / "assets.sqlite"), attach={"vec": str(tmp_path / "vectors.sqlite")})
+    try:
+        assert (await migrate_schema(db)).ok
+        await db.aexecute("INSERT INTO vec.asset_embeddings (asset_id, vector) VALUES (1, x'00'), (2, x'00')")
+        await db.aexecute("UPDATE vec.asset_embeddings SET auto_tags = '[\"cat\"]' WHERE asset_id = 1")
+        await db.aexecute("UPDATE vec.asset_embeddings SET vector = x'01' WHERE asset_id = 1")
+        await db.aexecute("DELETE FROM vec.asset_embeddings WHERE asset_id = 2")
+        rows = await db.aquery("SELECT asset_id FROM vec.asset_embedding_changes ORDER BY seq")
+        assert [r["asset_id"] for r in rows.data] == [1, 2, 1, 2]
+    finally:
+        await db.aclose()
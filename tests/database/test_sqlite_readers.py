@@ -0,0 +1,112 @@
+"""Tests for the read-only reader pool behind ``Sqlite.aquery``."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+
+import pytest
+import pytest_asyncio
+from mjr_am_backend.adapters.db.sqlite_facade import Sqlite
+from mjr_am_backend.adapters.db.transaction_manager import is_read_only_sql
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    inst = Sqlite(str(tmp_path / "readers.sqlite"), read_connections=2)
+    await inst.aexecutescript("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT);")
+    yield inst
+    await inst.aclose()
+
+
+def test_is_read_only_sql():
+    assert is_read_only_sql("  select 1")
+    assert is_read_only_sql("WITH x AS (SELECT 1) SELECT * FROM x")
+    assert not is_read_only_sql("WITH x AS (SELECT 1) DELETE FROM t WHERE id IN x")
+    assert not is_read_only_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    assert not is_read_only_sql("INSERT INTO t VALUES (1, 'a')")
+    assert not is_read_only_sql("SELECT last_insert_rowid() AS id")
+    assert not is_read_only_sql("")
+
+
+@pytest.mark.asyncio
+async def test_reads_use_reader_pool_and_see_committed_writes(db):
+    assert (await db.aexecute("INSERT INTO t (v) VALUES ('a')")).ok
+    res = await db.aquery("SELECT v FROM t")
+    assert res.ok and res.data == [{"v": "a"}]
+
+    readers = db.get_runtime_status()["readers"]
+    assert readers["enabled"] and readers["max"] == 2
+    assert readers["queries"] == 1 and readers["fallbacks"] == 0 and readers["open"] == 1
+
+    conn = db._readers._idle[0]
+    cur = await conn.execute("PRAGMA query_only")
+    assert (await cur.fetchone())[0] == 1
+
+
+@pytest.mark.asyncio
+async def test_reads_do_not_wait_for_open_write_transaction(db):
+    await db.aexecute("INSERT INTO t (v) VALUES ('before')")
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _writer():
+        async with db.atransaction("immediate"):
+            await db.aexecute("INSERT INTO t (v) VALUES ('pending')")
+            # Inside the transaction reads stay on the transaction connection.
+            own = await db.aquery("SELECT COUNT(*) AS c FROM t")
+            assert own.data[0]["c"] == 2
+            started.set()
+            await release.wait()
+
+    task = asyncio.create_task(_writer())
+    await started.wait()
+    try:
+        assert db.get_runtime_status()["writer"]["write_lock_held"] is True
+        res = await asyncio.wait_for(db.aquery("SELECT v FROM t"), timeout=5)
+        assert res.data == [{"v": "before"}]
+    finally:
+        release.set()
+        await task
+    assert (await db.aquery("SELECT COUNT(*) AS c FROM t")).data[0]["c"] == 2
+
+
+@pytest.mark.asyncio
+async def test_reader_attaches_secondary_databases_read_only(tmp_path):
+    vec = tmp_path / "vectors.sqlite"
+    inst = Sqlite(str(tmp_path / "main.sqlite"), attach={"vec": str(vec)}, read_connections=1)
+    try:
+        await inst.aexecutescript("CREATE TABLE vec.items (id INTEGER);")
+        await inst.aexecute("INSERT INTO vec.items VALUES (7)")
+        res = await inst.aquery("SELECT id FROM vec.items")
+        assert res.ok and res.data == [{"id": 7}]
+        assert inst.get_runtime_status()["readers"]["fallbacks"] == 0
+        conn = inst._readers._idle[0]
+        with pytest.raises(sqlite3.OperationalError):
+            await conn.execute("INSERT INTO vec.items VALUES (8)")
+    finally:
+        await inst.aclose()
+
+
+@pytest.mark.asyncio
+async def test_reader_errors_fall_back_to_writer(db, monkeypatch):
+    await db.aexecute("INSERT INTO t (v) VALUES ('a')")
+
+    async def _locked(*_args):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(db._readers, "_fetch", _locked)
+    res = await db.aquery("SELECT v FROM t")
+    assert res.ok and res.data == [{"v": "a"}]
+    readers = db.get_runtime_status()["readers"]
+    assert readers["fallbacks"] == 1 and readers["open"] == 0
+
+
+@pytest.mark.asyncio
+async def test_readers_can_be_disabled(tmp_path):
+    inst = Sqlite(str(tmp_path / "off.sqlite"), read_connections=0)
+    try:
+        assert (await inst.aquery("SELECT 1 AS one")).data == [{"one": 1}]
+        assert inst.get_runtime_status()["readers"] == {"enabled": False, "max": 0}
+    finally:
+        await inst.aclose()
@@ -439,3 +439,31 @@ def test_api_error_response_maps_stable_codes_to_http_statuses():
 
     assert invalid.status == 400
     assert unavailable.status == 503
+
+
+@pytest.mark.asyncio
+async def test_blake3_misses_queue_background_hashing(monkeypatch):
+    queued = []
+
+    class _Dup:
+        def queue_content_hashing(self):
+            queued.append(True)
+            return True
+
+    def _handle(sql, params):
+        return Result.Ok([])
+
+    async def _services():
+        return {"db": _FakeDB(_handle), "duplicates": _Dup()}, None
+
+    monkeypatch.setattr(api_v2_assets, "_require_services", _services)
+    req = make_mocked_request("GET", f"/api/v2/assets/blake3:{'c' * 64}")
+    req.match_info["id"] = "blake3:" + "c" * 64
+    assert (await api_v2_assets._get_asset(req)).status == 404
+    req = make_mocked_request("HEAD", f"/api/v2/assets/hash/{'c' * 64}")
+    req.match_info["hash"] = "c" * 64
+    assert (await api_v2_assets._check_asset_by_hash(req)).status == 404
+    req = make_mocked_request("GET", "/api/v2/assets/missing.png")
+    req.match_info["id"] = "missing.png"
+    assert (await api_v2_assets._get_asset(req)).status == 404
+    assert len(queued) == 2
@@ -0,0 +1,108 @@
+"""Tests for the trigger-maintained ``asset_counters`` table (v31)."""
+
+from __future__ import annotations
+
+import pytest
+from mjr_am_backend.adapters.db.migrations import m031_asset_counters as m031
+from mjr_am_backend.data.repositories import AssetCountersRepository, counter_scopes_for
+
+pytestmark = pytest.mark.asyncio
+
+_DAY = 86400
+_JAN_2026 = 20454 * _DAY  # 2026-01-01T00:00:00Z
+
+
+async def _insert(db, filepath: str, *, source: str, kind: str, mtime: int, root_id: str | None = None) -> int:
+    res = await db.aexecute(
+        "INSERT INTO assets (filename, subfolder, filepath, source, root_id, kind, ext, size, mtime) "
+        "VALUES (?, '', ?, ?, ?, ?, '', 1, ?)",
+        (filepath.rsplit("/", 1)[-1], filepath, source, root_id, kind, mtime),
+    )
+    assert res.ok, res.error
+    rows = await db.aquery("SELECT id FROM assets WHERE filepath = ?", (filepath,))
+    return int(rows.data[0]["id"])
+
+
+async def _set_metadata(db, asset_id: int, *, rating: int = 0, has_workflow: int = 0, has_generation: int = 0):
+    res = await db.aexecute(
+        "INSERT INTO asset_metadata (asset_id, rating, has_workflow, has_generation_data) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(asset_id) DO UPDATE SET rating = excluded.rating, has_workflow = excluded.has_workflow, "
+        "has_generation_data = excluded.has_generation_data",
+        (asset_id, rating, has_workflow, has_generation),
+    )
+    assert res.ok, res.error
+
+
+async def test_counters_follow_asset_and_metadata_changes(services):
+    db = services["db"]
+    repo = AssetCountersRepository(db)
+    day1, day2 = _JAN_2026 + 3600, _JAN_2026 + 4 * _DAY + 60
+
+    first = await _insert(db, "/out/a.png", source="output", kind="image", mtime=day1)
+    second = await _insert(db, "/out/b.mp4", source="output", kind="video", mtime=day2)
+    third = await _insert(db, "/out/c.png", source="output", kind="image", mtime=day2)
+    await _insert(db, "/in/d.png", source="input", kind="image", mtime=day1)
+    custom = await _insert(db, "/custom/e.png", source="custom", kind="image", mtime=day1, root_id="r1")
+
+    await _set_metadata(db, first, rating=4, has_workflow=1)
+    await _set_metadata(db, second, has_generation=1)
+    await _set_metadata(db, second, rating=2, has_generation=1)
+    await _set_metadata(db, custom, rating=5)
+
+    output = (await repo.totals(counter_scopes_for("output"))).data
+    assert output == {
+        "total": 3,
+        "rated": 2,
+        "with_workflow": 1,
+        "with_generation_data": 1,
+        "by_kind": {"image": 2, "video": 1},
+    }
+    assert (await repo.totals(counter_scopes_for("all"))).data["total"] == 4
+    assert (await repo.totals(counter_scopes_for("custom", "r1"))).data["rated"] == 1
+
+    histogram = await repo.day_histogram(counter_scopes_for("output"), "2026-01-01", "2026-02-01")
+    assert histogram.data == {"2026-01-01": 1, "2026-01-05": 2}
+    videos = await repo.day_histogram(counter_scopes_for("output"), "2026-01-01", "2026-02-01", kind="video")
+    assert videos.data == {"2026-01-05": 1}
+
+    # Moving an asset to another day, deleting one and clearing flags.
+    await db.aexecute("UPDATE assets SET mtime = ? WHERE id = ?", (day1 + 60, third))
+    await db.aexecute("DELETE FROM assets WHERE id = ?", (second,))
+    await _set_metadata(db, first, rating=0, has_workflow=1)
+    output = (await repo.totals(counter_scopes_for("output"))).data
+    assert (output["total"], output["rated"], output["with_workflow"], output["with_generation_data"]) == (2, 0, 1, 0)
+    assert output["by_kind"] == {"image": 2}
+    histogram = await repo.day_histogram(counter_scopes_for("output"), "2026-01-01", "2026-02-01")
+    assert histogram.data == {"2026-01-01": 2}
+
+    # Live searcher grouping agrees; the backfill rebuilds the same buckets.
+    live = await services["index"].date_histogram_scoped(["/out"], _JAN_2026, _JAN_2026 + 31 * _DAY)
+    assert live.data == histogram.data
+    before = (await db.aquery("SELECT * FROM asset_counters ORDER BY source, root_id, kind, day")).data
+    assert (await db.aexecutescript(m031._backfill_sql())).ok
+    after = (await db.aquery("SELECT * FROM asset_counters ORDER BY source, root_id, kind, day")).data
+    assert before == after
+
+
+async def test_health_and_histogram_read_counters_without_adhoc_filters(services):
+    db = services["db"]
+    await _insert(db, "/out/a.png", source="output", kind="image", mtime=_JAN_2026 + 10)
+    # A bucket that the roots-based live query would not see proves the counter path is used.
+    await db.aexecute(
+        "INSERT INTO asset_counters (source, root_id, kind, day, total) VALUES ('output', '', 'image', '2026-01-09', 7)"
+    )
+    scopes = counter_scopes_for("output")
+
+    counters = await services["health"].get_counters(roots=["/out"], scopes=scopes)
+    assert counters.ok and counters.data["total_assets"] == 8
+    live_counters = await services["health"].get_counters(roots=["/out"])
+    assert live_counters.data["total_assets"] == 1
+
+    index = services["index"]
+    month = (_JAN_2026, _JAN_2026 + 31 * _DAY)
+    fast = await index.date_histogram_scoped(["/out"], *month, {"kind": "image"}, scopes=scopes)
+    assert fast.data == {"2026-01-01": 1, "2026-01-09": 7}
+    filtered = await index.date_histogram_scoped(["/out"], *month, {"min_rating": 1}, scopes=scopes)
+    assert filtered.data == {}
+    unaligned = await index.date_histogram_scoped(["/out"], month[0] + 1, month[1], None, scopes=scopes)
+    assert unaligned.data == {"2026-01-01": 1}
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from mjr_am_backend import deps
+from mjr_am_backend.adapters.db.migrations import m027_asset_generation as m027
+from mjr_am_backend.features.index.asset_generation import extract_generation_fields
+from mjr_am_backend.features.index.metadata_helpers import MetadataHelpers
+from mjr_am_backend.shared import Result
+
+_FLUX_META = {
+    "geninfo": {
+        "checkpoint": {"name": "flux1-dev.safetensors"},
+        "models": {"checkpoint": {"name": "flux1-dev.safetensors"}, "vae": {"name": "ae.safetensors"}},
+        "loras": [{"name": "detail_tweaker", "strength_model": 0.8}],
+        "sampler": {"name": "euler"},
+        "scheduler": {"name": "simple"},
+        "seed": {"value": 1234},
+        "steps": {"value": 28},
+        "cfg": {"value": 3.5},
+        "positive": {"value": "a cat in the rain"},
+    }
+}
+
+
+def test_extract_generation_fields_prefers_geninfo():
+    row = extract_generation_fields(_FLUX_META)
+    assert row is not None
+    assert row["model"] == "flux1-dev.safetensors"
+    assert row["models"].split("\n") == ["flux1-dev.safetensors", "ae.safetensors"]
+    assert (row["sampler"], row["scheduler"]) == ("euler", "simple")
+    assert (row["seed"], row["steps"], row["cfg"]) == (1234, 28, 3.5)
+    assert row["loras"] == "detail_tweaker"
+
+
+def test_extract_generation_fields_parses_a1111_parameters():
+    row = extract_generation_fields(
+        {
+            "parameters": "portrait <lora:film_grain:0.6>\n"
+            "Steps: 30, Sampler: DPM++ 2M, Schedule type: Karras, CFG scale: 7, Seed: 42, Model: sdxl_base"
+        }
+    )
+    assert row is not None
+    assert (row["model"], row["sampler"], row["scheduler"]) == ("sdxl_base", "DPM++ 2M", "Karras")
+    assert (row["seed"], row["steps"], row["cfg"]) == (42, 30, 7.0)
+    assert row["loras"] == "film_grain"
+    assert extract_generation_fields({"width": 512}) is None
+
+
+@pytest.mark.asyncio
+async def test_metadata_terms_filter_on_asset_generation(tmp_path: Path, monkeypatch):
+    root = tmp_path / "assets"
+    root.mkdir()
+    for name in ("flux.png", "sdxl.png", "plain.png"):
+        (root / name).write_bytes(b"not-a-real-png")
+
+    monkeypatch.setattr(deps, "WATCHER_ENABLED", False)
+    services_res = await deps.build_services(str(tmp_path / "gen.sqlite"))
+    assert services_res.ok, services_res.error
+    services = services_res.data
+    index = services["index"]
+    db = services["db"]
+    sync_worker = services.get("rating_tags_sync")
+
+    async def _search(terms):
+        out = await index.search_scoped(
+            "*",
+            roots=[str(root)],
+            limit=50,
+            offset=0,
+            filters={"metadata_terms": terms, "metadata_terms_mode": "AND"},
+        )
+        assert out.ok, out.error
+        return {a["filename"] for a in out.data.get("assets") or []}
+
+    try:
+        idx = await index.index_paths(
+            paths=sorted(root.iterdir()),
+            base_dir=str(root),
+            incremental=False,
+            source="output",
+            root_id=None,
+        )
+        assert idx.ok, idx.error
+        rows = await db.aquery("SELECT id, filename FROM assets")
+        ids = {r["filename"]: int(r["id"]) for r in rows.data}
+
+        sdxl_meta = {"model": "sd_xl_base_1.0", "sampler": "dpmpp_2m", "steps": 30, "denoise": 0.55, "positive_prompt": "flux capacitor"}
+        for name, meta in (("flux.png", _FLUX_META), ("sdxl.png", sdxl_meta)):
+            res = await MetadataHelpers.write_asset_metadata_row(db, ids[name], Result.Ok({**meta, "quality": "full"}))
+            assert res.ok, res.error
+
+        assert await _search([{"field": "model", "value": "FLUX", "exclude": False}]) == {"flux.png"}
+        assert await _search([{"field": "ckpt", "value": "sd_xl", "exclude": False}]) == {"sdxl.png"}
+        assert await _search([{"field": "model", "value": "sd%xl", "exclude": False}]) == set()
+        assert await _search([{"field": "lora", "value": "detail", "exclude": False}]) == {"flux.png"}
+        assert await _search([{"field": "sampler", "value": "30", "exclude": False}]) == {"sdxl.png"}
+        assert await _search([{"field": "steps", "value": "28", "exclude": False}]) == {"flux.png"}
+        # No denoise column: the alias keeps probing metadata_raw.
+        assert await _search([{"field": "denoise", "value": "0.55", "exclude": False}]) == {"sdxl.png"}
+        assert await _search([{"field": "model", "value": "flux", "exclude": True}]) == {"sdxl.png", "plain.png"}
+        assert await _search([{"field": "prompt", "value": "capacitor", "exclude": False}]) == {"sdxl.png"}
+
+        plan = await db.aquery(
+            "EXPLAIN QUERY PLAN SELECT asset_id FROM asset_generation WHERE steps = ?",
+            (30,),
+        )
+        assert any("idx_asset_generation_steps" in str(r.get("detail")) for r in plan.data)
+
+        # Migration backfill projects already-stored metadata_raw rows.
+        await db.aexecute("DELETE FROM asset_generation")
+        backfill = await db.aexecute(m027._backfill_sql())
+        assert backfill.ok, backfill.error
+        backfilled = await db.aquery(
+            "SELECT asset_id, model, models, sampler, steps, cfg, loras FROM asset_generation ORDER BY asset_id"
+        )
+        by_id = {int(r["asset_id"]): r for r in backfilled.data}
+        assert by_id[ids["flux.png"]]["models"].split("\n") == ["flux1-dev.safetensors", "ae.safetensors"]
+        assert by_id[ids["flux.png"]]["loras"] == "detail_tweaker"
+        assert by_id[ids["flux.png"]]["cfg"] == 3.5
+        assert (by_id[ids["sdxl.png"]]["model"], by_id[ids["sdxl.png"]]["steps"]) == ("sd_xl_base_1.0", 30)
+        assert ids["plain.png"] not in by_id
+    finally:
+        if sync_worker is not None:
+            try:
+                sync_worker.stop()
+            except Exception:
+                pass
+        await db.aclose()
@@ -35,14 +35,22 @@ async def test_collections_create_csrf_short_circuit(monkeypatch) -> None:
     assert payload.get("code") == "CSRF"
 
 
+def _use_collections_service(monkeypatch, svc) -> None:
+    async def _require_services():
+        return {"db": object()}, None
+
+    monkeypatch.setattr(collections_mod, "_require_services", _require_services)
+    monkeypatch.setattr(collections_mod, "_collections_service", lambda _services: svc)
+
+
 @pytest.mark.asyncio
 async def test_collections_list_handles_internal_exception(monkeypatch) -> None:
     class _FailSvc:
-        def list(self):
+        async def list(self):
             raise RuntimeError("boom")
 
     app = _app_with(collections_mod.register_collections_routes)
-    monkeypatch.setattr(collections_mod, "_collections", _FailSvc())
+    _use_collections_service(monkeypatch, _FailSvc())
 
     req = make_mocked_request("GET", "/mjr/am/collections", app=app)
     match = await app.router.resolve(req)
@@ -58,7 +66,7 @@ async def test_collections_add_filters_invalid_assets(monkeypatch) -> None:
     captured = {}
 
     class _Svc:
-        def add_assets(self, cid, assets):
+        async def add_assets(self, cid, assets):
             captured["cid"] = cid
             captured["assets"] = assets
             return Result.Ok({"count": len(assets)})
@@ -76,7 +84,7 @@ async def test_collections_add_filters_invalid_assets(monkeypatch) -> None:
         )
 
     app = _app_with(collections_mod.register_collections_routes)
-    monkeypatch.setattr(collections_mod, "_collections", _Svc())
+    _use_collections_service(monkeypatch, _Svc())
     monkeypatch.setattr(collections_mod, "_csrf_error", lambda _request: None)
     monkeypatch.setattr(collections_mod, "_require_write_access", _ok_write)
     monkeypatch.setattr(collections_mod, "_read_json", _read_json)
@@ -98,25 +106,21 @@ async def test_collections_create_writes_audit_log(monkeypatch) -> None:
     calls = []
 
     class _Svc:
-        def create(self, name):
+        async def create(self, name):
             return Result.Ok({"id": "c1", "name": name})
 
     async def _read_json(_request):
         return Result.Ok({"name": "Favorites"})
 
-    async def _require_services():
-        return {"db": object()}, None
-
     async def _audit_log_write(_services, **kwargs):
         calls.append(kwargs)
         return True
 
     app = _app_with(collections_mod.register_collections_routes)
-    monkeypatch.setattr(collections_mod, "_collections", _Svc())
+    _use_collections_service(monkeypatch, _Svc())
     monkeypatch.setattr(collections_mod, "_csrf_error", lambda _request: None)
     monkeypatch.setattr(collections_mod, "_require_write_access", _ok_write)
     monkeypatch.setattr(collections_mod, "_read_json", _read_json)
-    monkeypatch.setattr(collections_mod, "_require_services", _require_services)
     monkeypatch.setattr(collections_mod, "audit_log_write", _audit_log_write)
 
     req = make_mocked_request("POST", "/mjr/am/collections", app=app)
@@ -134,25 +138,21 @@ async def test_collections_add_writes_audit_log(monkeypatch) -> None:
     calls = []
 
     class _Svc:
-        def add_assets(self, cid, assets):
+        async def add_assets(self, cid, assets):
             return Result.Ok({"cid": cid, "count": len(assets)})
 
     async def _read_json(_request):
         return Result.Ok({"assets": [{"filepath": "C:/ok/a.png"}]})
 
-    async def _require_services():
-        return {"db": object()}, None
-
     async def _audit_log_write(_services, **kwargs):
         calls.append(kwargs)
         return True
 
     app = _app_with(collections_mod.register_collections_routes)
-    monkeypatch.setattr(collections_mod, "_collections", _Svc())
+    _use_collections_service(monkeypatch, _Svc())
     monkeypatch.setattr(collections_mod, "_csrf_error", lambda _request: None)
     monkeypatch.setattr(collections_mod, "_require_write_access", _ok_write)
     monkeypatch.setattr(collections_mod, "_read_json", _read_json)
-    monkeypatch.setattr(collections_mod, "_require_services", _require_services)
     monkeypatch.setattr(collections_mod, "audit_log_write", _audit_log_write)
 
     req = make_mocked_request("POST", "/mjr/am/collections/c1/add", app=app)
@@ -168,73 +168,88 @@ async def test_collections_add_writes_audit_log(monkeypatch) -> None:
 
 
 @pytest.mark.asyncio
-async def test_collections_get_assets_enriches_index_fields(monkeypatch, tmp_path: Path) -> None:
+async def test_collections_get_assets_uses_joined_index_fields(monkeypatch, tmp_path: Path) -> None:
     fp = str(tmp_path / "x.png")
+    missing_fp = str(tmp_path / "missing.png")
+    captured = {}
 
     class _Svc:
-        def get(self, cid):
-            _ = cid
-            return Result.Ok({"name": "A", "items": [{"filepath": fp, "type": "output"}]})
-
-    class _Index:
-        async def lookup_assets_by_filepaths(self, filepaths):
-            assert filepaths == [fp]
+        async def list_items(self, cid, *, limit=None, offset=0):
+            captured.update(cid=cid, limit=limit, offset=offset)
             return Result.Ok(
                 {
-                    fp: {
-                        "id": 7,
-                        "rating": 4,
-                        "tags": ["t1"],
-                        "has_workflow": True,
-                        "has_generation_data": False,
-                        "root_id": "r1",
-                    }
+                    "id": cid,
+                    "name": "A",
+                    "total": 7,
+                    "limit": limit,
+                    "offset": offset,
+                    "items": [
+                        {
+                            "filepath": fp,
+                            "type": "output",
+                            "asset": {
+                                "id": 7,
+                                "rating": 4,
+                                "tags": ["t1"],
+                                "has_workflow": True,
+                                "has_generation_data": False,
+                                "root_id": "r1",
+                                "size": 10,
+                                "mtime": 20,
+                                "width": 64,
+                                "height": 32,
+                                "duration": None,
+                            },
+                        },
+                        {"filepath": missing_fp, "asset": None},
+                    ],
                 }
             )
 
-    async def _require_services():
-        return {"index": _Index()}, None
-
     app = _app_with(collections_mod.register_collections_routes)
-    monkeypatch.setattr(collections_mod, "_collections", _Svc())
-    monkeypatch.setattr(collections_mod, "_require_services", _require_services)
+    _use_collections_service(monkeypatch, _Svc())
 
-    req = make_mocked_request("GET", "/mjr/am/collections/c1/assets", app=app)
+    req = make_mocked_request("GET", "/mjr/am/collections/c1/assets?limit=2&offset=4", app=app)
     req._match_info = {"collection_id": "c1"}  # type: ignore[assignment]
     match = await app.router.resolve(req)
     resp = await match.handler(req)
     payload = json.loads(resp.text)
 
     assert payload.get("ok") is True
-    assets = payload.get("data", {}).get("assets", [])
-    assert len(assets) == 1
-    assert assets[0]["id"] == 7
-    assert assets[0]["rating"] == 4
-    assert assets[0]["root_id"] == "r1"
+    assert captured == {"cid": "c1", "limit": 2, "offset": 4}
+    data = payload.get("data", {})
+    assert data["total"] == 7
+    assets = data.get("assets", [])
+    assert len(assets) == 2
+    assert (assets[0]["id"], assets[0]["rating"], assets[0]["root_id"]) == (7, 4, "r1")
+    assert (assets[0]["size"], assets[0]["mtime"], assets[0]["width"]) == (10, 20, 64)
+    assert assets[1]["id"] is None and assets[1]["size"] == 0
 
 
 @pytest.mark.asyncio
-async def test_collections_get_assets_tolerates_enrichment_failure(monkeypatch) -> None:
-    class _Svc:
-        def get(self, cid):
-            _ = cid
-            return Result.Ok({"name": "A", "items": [{"filepath": "C:/x.png"}]})
+async def test_collections_by_asset_route(monkeypatch) -> None:
+    captured = {}
 
-    async def _boom_services():
-        raise RuntimeError("skip")
+    class _Svc:
+        async def collections_for_asset(self, *, filepath=None, asset_id=None):
+            captured.update(filepath=filepath, asset_id=asset_id)
+            return Result.Ok([{"id": "c1", "name": "A", "count": 1, "updated_at": ""}])
 
     app = _app_with(collections_mod.register_collections_routes)
-    monkeypatch.setattr(collections_mod, "_collections", _Svc())
-    monkeypatch.setattr(collections_mod, "_require_services", _boom_services)
+    _use_collections_service(monkeypatch, _Svc())
 
-    req = make_mocked_request("GET", "/mjr/am/collections/c1/assets", app=app)
-    req._match_info = {"collection_id": "c1"}  # type: ignore[assignment]
+    req = make_mocked_request("GET", "/mjr/am/collections/by-asset?asset_id=5", app=app)
     match = await app.router.resolve(req)
     resp = await match.handler(req)
     payload = json.loads(resp.text)
 
     assert payload.get("ok") is True
-    assert len(payload.get("data", {}).get("assets", [])) == 1
+    assert captured == {"filepath": None, "asset_id": 5}
+
+    req = make_mocked_request("GET", "/mjr/am/collections/by-asset", app=app)
+    match = await app.router.resolve(req)
+    payload = json.loads((await match.handler(req)).text)
+    assert payload.get("code") == "INVALID_INPUT"
 
 
 def test_duplicates_roots_for_scope_variants(monkeypatch, tmp_path: Path) -> None:
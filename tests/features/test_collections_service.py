@@ -1,28 +1,42 @@
+import json
 from pathlib import Path
 
+import pytest
+from mjr_am_backend.adapters.db.migrations import MIGRATIONS, MigrationRunner
+from mjr_am_backend.adapters.db.schema import migrate_schema
+from mjr_am_backend.adapters.db.sqlite_facade import Sqlite
 from mjr_am_backend.features.collections import service as c
 
 
-def test_collections_crud_and_add_remove(monkeypatch, tmp_path: Path):
+@pytest.fixture
+async def db(tmp_path: Path):
+    sqlite = Sqlite(str(tmp_path / "collections.sqlite"), attach={"vec": str(tmp_path / "vectors.sqlite")})
+    migrated = await migrate_schema(sqlite)
+    assert migrated.ok, migrated.error
+    applied = await MigrationRunner(MIGRATIONS).run(sqlite)
+    assert applied.ok, applied.error
+    try:
+        yield sqlite
+    finally:
+        await sqlite.aclose()
+
+
+@pytest.mark.asyncio
+async def test_collections_crud_and_add_remove(monkeypatch, tmp_path: Path, db):
     monkeypatch.setattr(c, "_MAX_COLLECTION_ITEMS", 3)
-    monkeypatch.setattr(
-        c,
-        "_collection_path",
-        lambda cid: (tmp_path / f"{cid}.json") if c._safe_id(cid) else None,
-    )
-    svc = c.CollectionsService(base_dir=tmp_path)
+    svc = c.CollectionsService(db, legacy_dir=tmp_path / "legacy")
 
-    created = svc.create("My Collection")
+    created = await svc.create("My Collection")
     assert created.ok
     cid = created.data["id"]
 
-    listed = svc.list()
+    listed = await svc.list()
     assert listed.ok and listed.data
 
-    got = svc.get(cid)
+    got = await svc.get(cid)
     assert got.ok and got.data["id"] == cid
 
-    add = svc.add_assets(
+    add = await svc.add_assets(
         cid,
         [
             {"filepath": str(tmp_path / "a.png"), "filename": "a.png"},
@@ -33,41 +47,166 @@ def test_collections_crud_and_add_remove(monkeypatch, tmp_path: Path):
         ],
     )
     assert add.ok
-    assert add.data["added"] >= 3
-    assert add.data["skipped_existing"] >= 1 or add.data["skipped_duplicate"] >= 1
+    assert add.data["added"] == 3
+    assert add.data["skipped_duplicate"] == 1
+    assert add.data["skipped_limit"] == 1
+    assert add.data["count"] == 3
 
-    rem = svc.remove_filepaths(cid, [str(tmp_path / "a.png")])
-    assert rem.ok and rem.data["removed"] >= 1
+    again = await svc.add_assets(cid, [{"filepath": str(tmp_path / "b.png")}])
+    assert again.ok and again.data["skipped_existing"] == 1 and again.data["added"] == 0
 
-    deleted = svc.delete(cid)
+    rem = await svc.remove_filepaths(cid, [str(tmp_path / "a.png")])
+    assert rem.ok and rem.data["removed"] == 1 and rem.data["count"] == 2
+    assert (await svc.list()).data[0]["count"] == 2
+
+    deleted = await svc.delete(cid)
     assert deleted.ok
-    missing = svc.get(cid)
+    missing = await svc.get(cid)
     assert missing.code == "NOT_FOUND"
+    orphans = await db.aquery("SELECT COUNT(*) AS n FROM collection_items")
+    assert orphans.data[0]["n"] == 0
 
 
-def test_collections_invalid_inputs(tmp_path: Path):
-    svc = c.CollectionsService(base_dir=tmp_path)
-    assert not svc.create("").ok
-    assert svc.get("bad").code == "INVALID_INPUT"
-    assert svc.delete("bad").code == "INVALID_INPUT"
-    assert svc.add_assets("bad", []).code == "INVALID_INPUT"
-    assert svc.remove_filepaths("bad", []).code == "INVALID_INPUT"
+@pytest.mark.asyncio
+async def test_collections_invalid_inputs(tmp_path: Path, db):
+    svc = c.CollectionsService(db, legacy_dir=tmp_path)
+    assert not (await svc.create("")).ok
+    assert (await svc.get("bad")).code == "INVALID_INPUT"
+    assert (await svc.delete("bad")).code == "INVALID_INPUT"
+    assert (await svc.add_assets("bad", [])).code == "INVALID_INPUT"
+    assert (await svc.remove_filepaths("bad", [])).code == "INVALID_INPUT"
+    assert (await svc.collections_for_asset()).code == "INVALID_INPUT"
 
 
-def test_collections_user_scoped_base_dirs(tmp_path: Path):
-    svc1 = c.CollectionsService(base_dir=tmp_path, user_id="user-one")
-    svc2 = c.CollectionsService(base_dir=tmp_path, user_id="user-two")
+@pytest.mark.asyncio
+async def test_collections_are_scoped_per_user(tmp_path: Path, db):
+    svc1 = c.CollectionsService(db, legacy_dir=tmp_path, user_id="user-one")
+    svc2 = c.CollectionsService(db, legacy_dir=tmp_path, user_id="user-two")
 
-    created1 = svc1.create("One")
-    created2 = svc2.create("Two")
+    created1 = await svc1.create("One")
+    created2 = await svc2.create("Two")
 
     assert created1.ok and created2.ok
-    assert len(svc1.list().data or []) == 1
-    assert len(svc2.list().data or []) == 1
+    assert [row["name"] for row in (await svc1.list()).data] == ["One"]
+    assert [row["name"] for row in (await svc2.list()).data] == ["Two"]
+    assert (await svc2.get(created1.data["id"])).code == "NOT_FOUND"
+
+
+@pytest.mark.asyncio
+async def test_list_items_pages_and_joins_assets(tmp_path: Path, db):
+    svc = c.CollectionsService(db, legacy_dir=tmp_path)
+    cid = (await svc.create("Paged")).data["id"]
+    paths = [str(tmp_path / f"img_{i}.png") for i in range(5)]
+    assert (await svc.add_assets(cid, [{"filepath": fp} for fp in paths])).ok
+
+    await db.aexecute(
+        "INSERT INTO assets (filename, subfolder, filepath, source, kind, ext, size, mtime, width, height) "
+        "VALUES ('img_1.png', '', ?, 'output', 'image', '.png', 42, 1700000000, 64, 32)",
+        (paths[1],),
+    )
+    asset_id = (await db.aquery("SELECT id FROM assets WHERE filepath = ?", (paths[1],))).data[0]["id"]
+    await db.aexecute("INSERT INTO asset_metadata (asset_id, rating) VALUES (?, 4)", (asset_id,))
+
+    page = await svc.list_items(cid, limit=2, offset=1)
+    assert page.ok, page.error
+    assert page.data["total"] == 5
+    assert [item["filepath"] for item in page.data["items"]] == paths[1:3]
+    joined = page.data["items"][0]["asset"]
+    assert (joined["id"], joined["rating"], joined["size"], joined["width"]) == (asset_id, 4, 42, 64)
+    assert page.data["items"][1]["asset"] is None
+
+    everything = await svc.list_items(cid)
+    assert [item["filepath"] for item in everything.data["items"]] == paths
+
+
+@pytest.mark.asyncio
+async def test_collections_for_asset_reverse_lookup(tmp_path: Path, db):
+    svc = c.CollectionsService(db, legacy_dir=tmp_path)
+    fp = str(tmp_path / "shared.png")
+    first = (await svc.create("First")).data["id"]
+    second = (await svc.create("Second")).data["id"]
+    assert (await svc.create("Empty")).ok
+    for cid in (first, second):
+        assert (await svc.add_assets(cid, [{"filepath": fp}])).ok
+
+    by_path = await svc.collections_for_asset(filepath=fp)
+    assert by_path.ok
+    assert {row["id"] for row in by_path.data} == {first, second}
+
+    await db.aexecute(
+        "INSERT INTO assets (filename, filepath, kind, ext, size, mtime) VALUES ('shared.png', ?, 'image', '.png', 1, 1)",
+        (fp,),
+    )
+    asset_id = (await db.aquery("SELECT id FROM assets WHERE filepath = ?", (fp,))).data[0]["id"]
+    by_id = await svc.collections_for_asset(asset_id=asset_id)
+    assert {row["id"] for row in by_id.data} == {first, second}
+    assert (await svc.collections_for_asset(asset_id=asset_id + 100)).code == "NOT_FOUND"
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_collections_are_imported_once(tmp_path: Path, db):
+    legacy = tmp_path / "legacy"
+    user_dir = c.collections_base_dir_for_user("user-one", base_dir=legacy)
+    user_dir.mkdir(parents=True)
+    legacy_file = user_dir / "abcdef123456.json"
+    legacy_file.write_text(
+        json.dumps(
+            {
+                "id": "abcdef123456",
+                "name": "Old",
+                "created_at": "2024-01-01T00:00:00Z",
+                "updated_at": "2024-01-02T00:00:00Z",
+                "items": [
+                    {"filepath": str(tmp_path / "x.png"), "added_at": "2024-01-01T00:00:00Z"},
+                    {"filepath": str(tmp_path / "x.png")},
+                    {"filepath": str(tmp_path / "y.mp4"), "kind": "video"},
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    svc = c.CollectionsService(db, legacy_dir=legacy, user_id="user-one")
+    listed = await svc.list()
+    assert listed.ok
+    assert listed.data == [{"id": "abcdef123456", "name": "Old", "count": 2, "updated_at": "2024-01-02T00:00:00Z"}]
+    assert not legacy_file.exists()
+    assert (user_dir / "abcdef123456.json.migrated").exists()
+
+    got = await svc.get("abcdef123456")
+    assert [item["kind"] for item in got.data["items"]] == ["image", "video"]
+    assert got.data["items"][0]["added_at"] == "2024-01-01T00:00:00Z"
 
-    user_one_dir = c.collections_base_dir_for_user("user-one", base_dir=tmp_path)
-    user_two_dir = c.collections_base_dir_for_user("user-two", base_dir=tmp_path)
+    other = c.CollectionsService(db, legacy_dir=legacy, user_id="user-two")
+    assert (await other.list()).data == []
 
-    assert user_one_dir != user_two_dir
-    assert list(user_one_dir.glob("*.json"))
-    assert list(user_two_dir.glob("*.json"))
+    # Exported files come back on the next import (Delete DB keeps collections).
+    exported = await c.export_collections_to_legacy_dir(db, legacy)
+    assert exported.ok and exported.data == 1
+    assert json.loads(legacy_file.read_text(encoding="utf-8"))["name"] == "Old"
+
+
+@pytest.mark.asyncio
+async def test_exported_collections_replace_restored_copies(tmp_path: Path, db):
+    legacy = tmp_path / "legacy"
+    svc = c.CollectionsService(db, legacy_dir=legacy, user_id="user-one")
+    created = await svc.create("Current")
+    cid = created.data["id"]
+    await svc.add_assets(cid, [{"filepath": str(tmp_path / "a.png")}, {"filepath": str(tmp_path / "b.png")}])
+    shared = await c.CollectionsService(db, legacy_dir=legacy).create("Shared")
+
+    exported = await c.export_collections_to_legacy_dir(db, legacy)
+    assert exported.ok and exported.data == 2
+
+    # Simulate the older backup: same collection id, stale contents.
+    await db.aexecute("DELETE FROM collection_items")
+    await db.aexecute("UPDATE collections SET name = 'Stale'")
+
+    imported = await c.import_collections_from_legacy_dir(db, legacy)
+    assert imported.ok and imported.data == 2
+    fresh = c.CollectionsService(db, legacy_dir=legacy, user_id="user-one")
+    assert (await fresh.list()).data[0]["name"] == "Current"
+    assert (await fresh.list()).data[0]["count"] == 2
+    anonymous = await c.CollectionsService(db, legacy_dir=legacy).get(shared.data["id"])
+    assert anonymous.ok and anonymous.data["name"] == "Shared"
+    assert not list(legacy.rglob("*.json"))
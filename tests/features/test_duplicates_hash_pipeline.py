@@ -0,0 +1,190 @@
+import os
+from pathlib import Path
+
+import pytest
+from mjr_am_backend.adapters.db.migrations import MigrationRunner
+from mjr_am_backend.adapters.db.migrations.registry import MIGRATIONS
+from mjr_am_backend.adapters.db.schema import migrate_schema
+from mjr_am_backend.adapters.db.sqlite import Sqlite
+from mjr_am_backend.features.duplicates import service as dup_service
+from mjr_am_backend.features.duplicates.service import DuplicatesService
+from mjr_am_shared.hashing import PARTIAL_HASH_WINDOW, compute_partial_hash
+
+
+async def _make_db(tmp_path: Path) -> Sqlite:
+    db = Sqlite(str(tmp_path / "dup.db"), attach={"vec": str(tmp_path / "vectors.sqlite")})
+    assert (await migrate_schema(db)).ok
+    assert (await MigrationRunner(MIGRATIONS).run(db)).ok
+    return db
+
+
+async def _add_file(db: Sqlite, path: Path, data: bytes) -> int:
+    path.write_bytes(data)
+    st = path.stat()
+    res = await db.aexecute(
+        "INSERT INTO assets (filename, subfolder, filepath, source, kind, ext, size, mtime) "
+        "VALUES (?, '', ?, 'output', 'other', 'bin', ?, ?)",
+        (path.name, str(path), st.st_size, int(st.st_mtime)),
+    )
+    assert res.ok, res.error
+    row = await db.aquery("SELECT id FROM assets WHERE filepath = ?", (str(path),))
+    return int(row.data[0]["id"])
+
+
+async def _hashes(db: Sqlite) -> dict[str, dict]:
+    rows = await db.aquery("SELECT filename, content_hash, partial_hash, hash_state FROM assets")
+    return {r["filename"]: r for r in rows.data}
+
+
+async def _analyze(svc: DuplicatesService, limit: int = 10) -> dict:
+    await svc.start_background_analysis(limit=limit)
+    assert svc._task is not None
+    await svc._task
+    status = (await svc.get_status()).data
+    assert status is not None
+    return status
+
+
+def test_partial_hash_reads_only_head_and_tail(tmp_path: Path):
+    body = os.urandom(4 * PARTIAL_HASH_WINDOW)
+    a = tmp_path / "a.bin"
+    b = tmp_path / "b.bin"
+    a.write_bytes(body)
+    middle = 2 * PARTIAL_HASH_WINDOW
+    b.write_bytes(body[:middle] + bytes([body[middle] ^ 0xFF]) + body[middle + 1 :])
+    assert compute_partial_hash(a) == compute_partial_hash(b)
+
+    b.write_bytes(body[:-1] + bytes([body[-1] ^ 0xFF]))
+    assert compute_partial_hash(a) != compute_partial_hash(b)
+
+
+@pytest.mark.asyncio
+async def test_only_size_and_partial_collisions_are_fully_hashed(tmp_path: Path):
+    db = await _make_db(tmp_path)
+    try:
+        window = PARTIAL_HASH_WINDOW
+        same = os.urandom(3 * window)
+        await _add_file(db, tmp_path / "dup1.bin", same)
+        await _add_file(db, tmp_path / "dup2.bin", same)
+        # Same size and same head/tail, different middle: needs the full hash.
+        tweaked = same[: window + 5] + bytes([same[window + 5] ^ 0xFF]) + same[window + 6 :]
+        await _add_file(db, tmp_path / "mid.bin", tweaked)
+        # Same size, different head: rejected by the partial hash.
+        await _add_file(db, tmp_path / "head.bin", b"\0" + same[1:])
+        await _add_file(db, tmp_path / "unique.bin", os.urandom(100))
+
+        status = await _analyze(DuplicatesService(db), limit=10)
+
+        assert status["errors"] == 0
+        assert status["processed"] == 5
+        assert status["updated"] == 5
+        assert status["full_hashed"] == 3
+        assert status["partial_hashed"] == 4
+        hashes = await _hashes(db)
+        assert hashes["dup1.bin"]["content_hash"] == hashes["dup2.bin"]["content_hash"]
+        assert hashes["mid.bin"]["content_hash"] not in (None, hashes["dup1.bin"]["content_hash"])
+        assert hashes["head.bin"]["content_hash"] is None
+        assert hashes["head.bin"]["partial_hash"]
+        assert hashes["unique.bin"]["content_hash"] is None
+        assert hashes["unique.bin"]["partial_hash"] is None
+        assert all(h["hash_state"] for h in hashes.values())
+
+        alerts = await DuplicatesService(db).get_alerts()
+        assert alerts.ok and alerts.data is not None
+        [group] = alerts.data["exact_groups"]
+        assert {a["filename"] for a in group["assets"]} == {"dup1.bin", "dup2.bin"}
+
+        # Second run: everything is settled, nothing is read again.
+        again = await _analyze(DuplicatesService(db), limit=10)
+        assert again["updated"] == 0
+        assert again["partial_hashed"] == 0
+        assert again["full_hashed"] == 0
+    finally:
+        await db.aclose()
+
+
+@pytest.mark.asyncio
+async def test_new_peer_promotes_previously_unique_file(tmp_path: Path):
+    db = await _make_db(tmp_path)
+    try:
+        data = os.urandom(5000)
+        await _add_file(db, tmp_path / "old.bin", data)
+        await _add_file(db, tmp_path / "other.bin", b"\0" + data[1:])
+        await _analyze(DuplicatesService(db))
+        settled = (await _hashes(db))["old.bin"]
+        assert settled["content_hash"] is None and settled["partial_hash"]
+
+        await _add_file(db, tmp_path / "new.bin", data)
+        status = await _analyze(DuplicatesService(db))
+
+        # Only the new file is stale; its settled peer is hashed alongside.
+        assert status["updated"] == 1
+        assert status["full_hashed"] == 2
+        hashes = await _hashes(db)
+        assert hashes["other.bin"]["content_hash"] is None
+        assert hashes["old.bin"]["content_hash"]
+        assert hashes["old.bin"]["content_hash"] == hashes["new.bin"]["content_hash"]
+    finally:
+        await db.aclose()
+
+
+@pytest.mark.asyncio
+async def test_analysis_pages_through_library(tmp_path: Path):
+    db = await _make_db(tmp_path)
+    try:
+        for i in range(25):
+            await _add_file(db, tmp_path / f"f{i}.bin", b"x" * (i + 1))
+        status = await _analyze(DuplicatesService(db), limit=10)
+        assert status["total"] == 25
+        assert status["processed"] == 25
+        assert status["updated"] == 25
+        assert status["phase"] == "done"
+    finally:
+        await db.aclose()
+
+
+@pytest.mark.asyncio
+async def test_thread_pool_path(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(dup_service, "DUPLICATES_HASH_WORKERS", 2)
+    db = await _make_db(tmp_path)
+    try:
+        data = os.urandom(2048)
+        for i in range(3):
+            await _add_file(db, tmp_path / f"p{i}.bin", data)
+        svc = DuplicatesService(db)
+        status = await _analyze(svc)
+        assert status["errors"] == 0
+        assert status["full_hashed"] == 3
+        hashes = await _hashes(db)
+        assert len({h["content_hash"] for h in hashes.values()}) == 1
+        assert svc._pool is None
+    finally:
+        await db.aclose()
+
+
+@pytest.mark.asyncio
+async def test_missed_content_hash_lookup_queues_background_hashing(tmp_path: Path):
+    from mjr_am_shared.hashing import compute_file_hash
+
+    db = await _make_db(tmp_path)
+    try:
+        await _add_file(db, tmp_path / "target.bin", b"t" * 300)
+        await _add_file(db, tmp_path / "newer.bin", b"n" * 200)
+        svc = DuplicatesService(db)
+        status = await _analyze(svc)
+        assert status["full_hashed"] == 0
+        digest, _algo = compute_file_hash(tmp_path / "target.bin")
+
+        assert svc.queue_content_hashing() is True
+        assert svc.queue_content_hashing() is False
+        await svc._content_backfill._task
+        assert svc.queue_content_hashing() is False
+        hashes = await _hashes(db)
+        assert hashes["target.bin"]["content_hash"] == digest
+        assert hashes["newer.bin"]["content_hash"]
+
+        # Stored digests survive the next analysis pass.
+        await _analyze(DuplicatesService(db))
+        assert (await _hashes(db))["target.bin"]["content_hash"] == digest
+    finally:
+        await db.aclose()
@@ -0,0 +1,139 @@
+import random
+from itertools import combinations
+from pathlib import Path
+
+import pytest
+from mjr_am_backend.adapters.db.migrations import MigrationRunner
+from mjr_am_backend.adapters.db.migrations.registry import MIGRATIONS
+from mjr_am_backend.adapters.db.schema import migrate_schema
+from mjr_am_backend.adapters.db.sqlite import Sqlite
+from mjr_am_backend.features.duplicates import phash_index as pi
+from mjr_am_backend.features.duplicates.service import DuplicatesService
+
+
+def _brute(entries, max_distance):
+    out = []
+    for (a, ha), (b, hb) in combinations(entries, 2):
+        d = (ha ^ hb).bit_count()
+        if d <= max_distance:
+            out.append((d, a, b))
+    return sorted(out)
+
+
+def _flip(value, bits):
+    for bit in bits:
+        value ^= 1 << bit
+    return value
+
+
+@pytest.mark.parametrize("max_distance", [0, 3, 6, 11])
+def test_find_pairs_within_matches_brute_force(max_distance):
+    rng = random.Random(max_distance)
+    entries = []
+    for base_id in range(60):
+        base = rng.getrandbits(64)
+        entries.append((base_id * 10, base))
+        for k in range(1, 4):
+            entries.append((base_id * 10 + k, _flip(base, rng.sample(range(64), rng.randint(1, 12)))))
+
+    assert pi.find_pairs_within(entries, max_distance) == _brute(entries, max_distance)
+    for limit in (0, 1, 7, 10_000):
+        assert pi.find_pairs_within(entries, max_distance, limit=limit) == _brute(entries, max_distance)[:limit]
+
+
+def test_find_pairs_within_clamps_distance_to_index_range():
+    entries = [(1, 0), (2, (1 << 11) - 1), (3, (1 << 12) - 1), (4, (1 << 20) - 1)]
+    assert pi.MAX_PHASH_DISTANCE == 11
+    assert pi.find_pairs_within(entries, 32) == pi.find_pairs_within(entries, 11) == [(1, 2, 3), (8, 3, 4), (9, 2, 4), (11, 1, 2)]
+
+
+def test_find_pairs_within_limit_keeps_closest_pairs():
+    entries = [(1, 0), (2, 0b1), (3, 0b111), (4, (1 << 64) - 1)]
+    assert pi.find_pairs_within(entries, 6, limit=2) == [(1, 1, 2), (2, 2, 3)]
+
+
+def test_signed_roundtrip_and_bands():
+    value = 0xFEDC_BA98_7654_3210
+    assert pi.from_signed64(pi.to_signed64(value)) == value
+    assert pi.to_signed64(value) < 0
+    assert pi.split_bands(value) == (0x3210, 0x7654, 0xBA98, 0xFEDC)
+
+
+async def _make_db(tmp_path: Path) -> Sqlite:
+    db = Sqlite(str(tmp_path / "phash.db"), attach={"vec": str(tmp_path / "vectors.sqlite")})
+    assert (await migrate_schema(db)).ok
+    assert (await MigrationRunner(MIGRATIONS).run(db)).ok
+    return db
+
+
+async def _insert_image(db: Sqlite, name: str, phash: str | None) -> int:
+    res = await db.aexecute(
+        "INSERT INTO assets (filename, subfolder, filepath, source, kind, ext, size, mtime, phash) "
+        "VALUES (?, '', ?, 'output', 'image', 'png', 1, 1, ?)",
+        (name, f"/tmp/phash/{name}", phash),
+    )
+    assert res.ok, res.error
+    row = await db.aquery("SELECT id FROM assets WHERE filename = ?", (name,))
+    return int(row.data[0]["id"])
+
+
+@pytest.mark.asyncio
+async def test_alerts_use_phash_index_over_whole_library(tmp_path):
+    db = await _make_db(tmp_path)
+    try:
+        svc = DuplicatesService(db)
+        near_a = await _insert_image(db, "a.png", None)
+        near_b = await _insert_image(db, "b.png", None)
+        far = await _insert_image(db, "c.png", None)
+        await pi.upsert_phash(db, near_a, "ffff000000000000")
+        await pi.upsert_phash(db, near_b, "ffff000000000003")
+        await pi.upsert_phash(db, far, "00000000ffffffff")
+
+        alerts = await svc.get_alerts(roots=[], max_pairs=10, phash_distance=4)
+        assert alerts.ok, alerts.error
+        pairs = alerts.data["similar_pairs"]
+        assert [(p["distance"], p["left"]["id"], p["right"]["id"]) for p in pairs] == [(2, near_a, near_b)]
+        assert pairs[0]["left"]["filename"] == "a.png"
+
+        similar = await svc.find_similar_to_asset(near_b, phash_distance=4)
+        assert similar.ok and similar.data == [{"asset_id": near_a, "distance": 2}]
+
+        await db.aexecute("UPDATE assets SET phash = NULL WHERE id = ?", (near_a,))
+        left = await db.aquery("SELECT asset_id FROM asset_phash_index ORDER BY asset_id")
+        assert [r["asset_id"] for r in left.data] == [near_b, far]
+    finally:
+        await db.aclose()
+
+
+@pytest.mark.asyncio
+async def test_migration_backfills_existing_phashes(tmp_path):
+    db = await _make_db(tmp_path)
+    try:
+        aid = await _insert_image(db, "old.png", "8000000000000001")
+        await db.aexecute("DELETE FROM asset_phash_index")
+        from mjr_am_backend.adapters.db.migrations.m022_phash_index import MIGRATION as M022
+
+        assert (await M022.upgrade(db)).ok
+        row = await db.aquery("SELECT phash_int, band0, band3 FROM asset_phash_index WHERE asset_id = ?", (aid,))
+        assert pi.from_signed64(row.data[0]["phash_int"]) == 0x8000000000000001
+        assert (row.data[0]["band0"], row.data[0]["band3"]) == (1, 0x8000)
+    finally:
+        await db.aclose()
+
+
+@pytest.mark.asyncio
+async def test_similar_lookup_clamps_distance_to_index_range(tmp_path):
+    db = await _make_db(tmp_path)
+    try:
+        svc = DuplicatesService(db)
+        base = await _insert_image(db, "base.png", None)
+        at_11 = await _insert_image(db, "eleven.png", None)
+        at_12 = await _insert_image(db, "twelve.png", None)
+        await pi.upsert_phash(db, base, "0000000000000000")
+        await pi.upsert_phash(db, at_11, "00000000000007ff")
+        await pi.upsert_phash(db, at_12, "0000000000000fff")
+
+        similar = await svc.find_similar_to_asset(base, phash_distance=32)
+        assert similar.ok and similar.data == [{"asset_id": at_11, "distance": 11}]
+    finally:
+        await db.aclose()
@@ -37,6 +37,10 @@ class _DB:
         self.executed.append((_sql, _params))
         return Result.Ok({"ok": True})
 
+    async def aexecutemany(self, _sql, _params_list):
+        self.executed.extend((_sql, params) for params in _params_list)
+        return Result.Ok(len(_params_list))
+
 
 @pytest.mark.asyncio
 async def test_duplicates_alerts_and_merge_tags():
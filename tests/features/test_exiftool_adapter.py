@@ -269,6 +269,55 @@ def test_write_helpers_and_write_flow(ex, tmp_path: Path, monkeypatch):
     assert out2.code == ErrorCode.EXIFTOOL_ERROR
 
 
+def test_write_batch_uses_one_argfile_run(ex, tmp_path: Path, monkeypatch):
+    paths = []
+    for name in ("a.png", "b.png", "c.png"):
+        (tmp_path / name).write_text("x")
+        paths.append(str(tmp_path / name))
+    runs = []
+
+    def _run(cmd, *, timeout, stdin_input=None):
+        runs.append((cmd, Path(cmd[2]).read_text(encoding="utf-8").splitlines()))
+        stderr = "==mjr-write-done:0==\nError: Not a valid PNG - b.png\n==mjr-write-done:1==\n==mjr-write-done:2==\n"
+        return _mk_completed(1, b"", stderr.encode())
+
+    monkeypatch.setattr(ex, "_run_one_shot", _run)
+    out = ex.write_batch(
+        [(paths[0], {"XMP:Rating": 1}), (paths[1], {"XMP:Rating": 2}), (paths[2], {"XMP:Subject": ["x"]})]
+        + [(str(tmp_path / "missing.png"), {"XMP:Rating": 3})]
+    )
+
+    assert len(runs) == 1
+    cmd, lines = runs[0]
+    assert cmd[-3:] == ["-common_args", "-charset", "filename=utf8"]
+    assert not Path(cmd[2]).exists()
+    assert lines.count("-execute") == 2
+    tail = ["-XMP:Subject=", "-XMP:Subject+=x", "-overwrite_original", paths[2], "-echo4", "==mjr-write-done:2=="]
+    assert lines[lines.index(paths[2]) - 3 :] == tail
+    assert out[paths[0]].ok and out[paths[2]].ok
+    assert out[paths[1]].code == ErrorCode.EXIFTOOL_ERROR
+    assert out[str(tmp_path / "missing.png")].code == ErrorCode.NOT_FOUND
+
+
+def test_write_batch_single_file_and_missing_marker_share_the_batch_parser(ex, tmp_path: Path, monkeypatch):
+    (tmp_path / "a.png").write_text("x")
+    path = str(tmp_path / "a.png")
+    runs = []
+
+    def _run(cmd, *, timeout, stdin_input=None):
+        runs.append(cmd)
+        # Exit status 0 but the section's marker never arrived.
+        return _mk_completed(0, b"", b"")
+
+    monkeypatch.setattr(ex, "_run_one_shot", _run)
+    monkeypatch.setattr(ex, "write", lambda *_a, **_k: pytest.fail("single files go through the batch run"))
+    out = ex.write_batch([(path, {"XMP:Rating": 1})])
+
+    assert len(runs) == 1 and "-@" in runs[0]
+    assert not out[path].ok
+    assert out[path].code == ErrorCode.EXIFTOOL_ERROR
+
+
 def test_write_errors_and_tool_missing(tmp_path: Path, monkeypatch):
     monkeypatch.setattr(m.ExifTool, "_check_available", lambda self: False)
     ex = m.ExifTool()
@@ -0,0 +1,177 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from mjr_am_backend.adapters.tools import exiftool as m
+from mjr_am_backend.adapters.tools.exiftool_pool import (
+    ExifToolPool,
+    ExifToolPoolUnavailable,
+    stay_open_args,
+)
+
+# Minimal stand-in for `exiftool -stay_open True -@ -`: arguments arrive one
+# per line, `-executeN` runs them, `-echo4` text goes to stderr afterwards.
+_FAKE_EXIFTOOL = r'''
+import json, os, sys, time
+
+args = []
+for raw in sys.stdin:
+    line = raw.rstrip("\n")
+    if args[-1:] == ["-stay_open"] and line == "False":
+        sys.exit(0)
+    if not line.startswith("-execute"):
+        args.append(line)
+        continue
+    seq = line[len("-execute"):]
+    echo = ""
+    if "-echo4" in args:
+        i = args.index("-echo4")
+        echo = args[i + 1]
+        del args[i : i + 2]
+    if any(a.endswith("hang") for a in args):
+        time.sleep(60)
+    if "die" in args:
+        sys.exit(3)
+    status = "0"
+    if "fail" in args:
+        status = "1"
+        sys.stderr.write("Error: fake failure\n")
+    sys.stdout.write(json.dumps([{"SourceFile": args[-1], "Args": args, "Pid": os.getpid()}]) + "\n")
+    sys.stdout.write("{ready%s}\n" % seq)
+    sys.stdout.flush()
+    sys.stderr.write(echo.replace("${status}", status) + "\n")
+    sys.stderr.flush()
+    args = []
+'''
+
+
+@pytest.fixture
+def fake_cmd(tmp_path: Path) -> list[str]:
+    script = tmp_path / "fake_exiftool.py"
+    script.write_text(_FAKE_EXIFTOOL, encoding="utf-8")
+    return [sys.executable, "-u", str(script)]
+
+
+@pytest.fixture
+def pool(fake_cmd):
+    p = ExifToolPool(fake_cmd, size=2)
+    yield p
+    p.close()
+
+
+def _pid(process: subprocess.CompletedProcess) -> int:
+    return json.loads(process.stdout)[0]["Pid"]
+
+
+def test_stay_open_args_splices_stdin_file_list():
+    args = stay_open_args(["-j", "-charset", "filename=utf8", "-@", "-", "-overwrite_original"], b"C:/a b.png\r\nC:/c.png\r\n")
+    assert args == ["-j", "-charset", "filename=utf8", "C:/a b.png", "C:/c.png", "-overwrite_original"]
+    assert stay_open_args(["-j", "/tmp/a.png"], None) == ["-j", "/tmp/a.png"]
+    assert stay_open_args(["-j", "/tmp/line\nbreak.png"], None) is None
+    assert stay_open_args(["-j", "/tmp/trailing.png "], None) is None
+    assert stay_open_args(["-j"], b"/tmp/a.png\n") is None
+
+
+def test_pool_reuses_worker_between_commands(pool):
+    first = pool.execute(["-j", "/tmp/a.png"], timeout=10)
+    second = pool.execute(["-j", "/tmp/b.png"], timeout=10)
+
+    assert first.returncode == 0 and second.returncode == 0
+    assert _pid(first) == _pid(second)
+    assert pool.worker_count == 1
+
+
+def test_pool_reports_command_status(pool):
+    res = pool.execute(["-j", "fail", "/tmp/a.png"], timeout=10)
+    assert res.returncode == 1
+    assert b"fake failure" in res.stderr
+
+
+def test_pool_restarts_hung_worker(pool):
+    before = _pid(pool.execute(["-j", "/tmp/a.png"], timeout=10))
+    with pytest.raises(subprocess.TimeoutExpired):
+        pool.execute(["-j", "hang", "/tmp/a.png"], timeout=0.5)
+    after = _pid(pool.execute(["-j", "/tmp/a.png"], timeout=10))
+
+    assert after != before
+    assert pool.worker_count == 1
+
+
+def test_pool_replaces_dead_worker(pool):
+    with pytest.raises(ExifToolPoolUnavailable):
+        pool.execute(["-j", "die", "/tmp/a.png"], timeout=10)
+    assert pool.execute(["-j", "/tmp/a.png"], timeout=10).returncode == 0
+
+
+def test_pool_unavailable_when_binary_missing(tmp_path: Path):
+    p = ExifToolPool([str(tmp_path / "missing-exiftool")], size=1)
+    with pytest.raises(ExifToolPoolUnavailable):
+        p.execute(["-ver"], timeout=1)
+    assert p.worker_count == 0
+
+
+def test_close_stops_idle_workers(fake_cmd):
+    p = ExifToolPool(fake_cmd, size=1)
+    p.execute(["-ver"], timeout=10)
+    worker = p._idle.queue[0]
+    p.close()
+    assert worker.proc.poll() is not None
+    with pytest.raises(ExifToolPoolUnavailable):
+        p.execute(["-ver"], timeout=1)
+
+
+@pytest.fixture
+def pooled_ex(monkeypatch, fake_cmd):
+    monkeypatch.setattr(m.ExifTool, "_check_available", lambda self: True)
+    ex = m.ExifTool(bin_name="exiftool", timeout=10.0, pool_size=1)
+    ex._pool = ExifToolPool(fake_cmd, size=1)
+    yield ex
+    ex.close()
+
+
+def test_adapter_read_and_write_go_through_pool(pooled_ex, tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(m.subprocess, "run", lambda *_a, **_k: pytest.fail("one-shot process spawned"))
+    f = tmp_path / "a.png"
+    f.write_bytes(b"x")
+
+    single = pooled_ex.read(str(f), ["XMP:Rating"])
+    assert single.ok
+    assert single.data["SourceFile"] == str(f)
+    assert "-XMP:Rating" in single.data["Args"]
+
+    batch = pooled_ex.read_batch([str(f)])
+    assert batch[str(f)].ok
+
+    assert pooled_ex.write(str(f), {"XMP:Rating": 5}).ok
+    assert pooled_ex._pool.worker_count == 1
+
+
+def test_adapter_falls_back_to_one_shot_for_unframeable_args(pooled_ex, monkeypatch):
+    calls = []
+
+    def _run(cmd, **_kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, b"[]", b"")
+
+    monkeypatch.setattr(m.subprocess, "run", _run)
+    pooled_ex._execute(["exiftool", "-j", "/tmp/new\nline.png"], timeout=1)
+    assert calls and calls[0][-1] == "/tmp/new\nline.png"
+
+
+def test_pool_disabled_uses_one_shot(monkeypatch):
+    monkeypatch.setattr(m.ExifTool, "_check_available", lambda self: True)
+    ex = m.ExifTool(bin_name="exiftool", pool_size=0)
+    monkeypatch.setattr(m.subprocess, "run", lambda cmd, **_k: subprocess.CompletedProcess(cmd, 0, b"", b""))
+    assert ex._execute(["exiftool", "-ver"], timeout=1).returncode == 0
+    assert ex._pool is None
+
+
+def test_adapter_maps_pool_timeout_to_result(pooled_ex, tmp_path: Path):
+    f = tmp_path / "hang"
+    f.write_bytes(b"x")
+    pooled_ex.timeout = 0.5
+    res = pooled_ex.read(str(f))
+    assert not res.ok
+    assert res.code == m.ErrorCode.TIMEOUT
@@ -0,0 +1,59 @@
+import time
+
+from mjr_am_backend.adapters.fs import save_counters
+from mjr_am_backend.adapters.fs.save_counters import SaveCounterCache, scan_max_counter
+
+
+def _png_names(prefix):
+    return lambda value: [f"{prefix}_{value:05}_.png"]
+
+
+def test_scan_max_counter_matches_prefix_only(tmp_path):
+    for name in ("img_00003_.png", "img_00010.mp4", "img_00004.png", "image_00099_.png", "img_x.png"):
+        (tmp_path / name).write_bytes(b"x")
+    assert scan_max_counter(str(tmp_path), "img") == 10
+    assert scan_max_counter(str(tmp_path / "missing"), "img") == 0
+
+
+def test_reserve_seeds_once_and_steps_over_foreign_files(tmp_path, monkeypatch):
+    (tmp_path / "img_00004_.png").write_bytes(b"x")
+    cache = SaveCounterCache()
+    assert cache.reserve(str(tmp_path), "img", _png_names("img")) == 5
+    assert (tmp_path / "img_00005_.png").exists()
+
+    listings = []
+    real_scan = save_counters.scan_max_counter
+    monkeypatch.setattr(save_counters, "scan_max_counter", lambda *a: listings.append(a) or real_scan(*a))
+    (tmp_path / "img_00006_.png").write_bytes(b"foreign")
+    assert cache.reserve(str(tmp_path), "img", _png_names("img")) == 7
+    assert (tmp_path / "img_00006_.png").read_bytes() == b"foreign"
+    assert listings == []
+
+
+def test_reserve_allocates_consecutive_blocks(tmp_path):
+    cache = SaveCounterCache()
+
+    def batch(value):
+        return [f"b_{value + n:05}_.png" for n in range(3)]
+
+    assert cache.reserve(str(tmp_path), "b", batch, count=3) == 1
+    assert cache.reserve(str(tmp_path), "b", batch, count=3) == 4
+    assert sorted(p.name for p in tmp_path.iterdir())[-1] == "b_00006_.png"
+
+
+def test_token_change_refreshes_in_background_and_follows_deletions(tmp_path, monkeypatch):
+    token = {"value": 1}
+    monkeypatch.setattr(save_counters, "ensure_fs_list_cache_watching", lambda _d: None)
+    monkeypatch.setattr(save_counters, "get_fs_list_cache_token", lambda _d: token["value"])
+    cache = SaveCounterCache(reseed_interval_s=0)
+    assert cache.reserve(str(tmp_path), "img", _png_names("img")) == 1
+    assert cache.reserve(str(tmp_path), "img", _png_names("img")) == 2
+    (tmp_path / "img_00002_.png").unlink()
+
+    token["value"] = 2
+    counter = cache._counter(str(tmp_path), "img")
+    deadline = time.monotonic() + 5
+    while counter.refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert counter.token == 2 and not counter.refreshing
+    assert cache.reserve(str(tmp_path), "img", _png_names("img")) == 2
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from mjr_am_backend.features.geninfo import parse_cache as pc
+from mjr_am_backend.shared import Result
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache(monkeypatch):
+    monkeypatch.setattr(pc, "_CACHE", pc.GeninfoParseCache(8))
+    monkeypatch.setattr(pc, "_INFLIGHT", {})
+    monkeypatch.setattr(pc, "_persist_state", {"inserts": 0, "purged_versions": False})
+
+
+def _counting_parser(monkeypatch):
+    calls = []
+
+    def _parse(prompt_graph, workflow=None):
+        calls.append(prompt_graph)
+        return Result.Ok({"seed": {"value": len(calls)}, "nodes": len(prompt_graph or {})})
+
+    monkeypatch.setattr(pc, "parse_geninfo_from_prompt", _parse)
+    return calls
+
+
+class _FakeDb:
+    def __init__(self):
+        self.rows = {}
+
+    async def aquery(self, sql, params=()):
+        row = self.rows.get(params[0])
+        return Result.Ok([{"geninfo_json": row}] if row is not None else [])
+
+    async def aexecute(self, sql, params=()):
+        if sql.startswith("INSERT"):
+            self.rows[params[0]] = params[2]
+        return Result.Ok(1)
+
+
+def test_cache_key_is_canonical_and_versioned(monkeypatch):
+    a = pc.geninfo_cache_key({"1": {"class_type": "KSampler", "inputs": {"seed": 1, "steps": 20}}}, {"nodes": []})
+    b = pc.geninfo_cache_key({"1": {"inputs": {"steps": 20, "seed": 1}, "class_type": "KSampler"}}, {"nodes": []})
+    assert a == b
+    assert pc.geninfo_cache_key(None, None) is None
+    monkeypatch.setattr(pc, "PARSER_FAMILY_VERSION", "next")
+    assert pc.geninfo_cache_key({"1": {"class_type": "KSampler", "inputs": {"seed": 1, "steps": 20}}}, {"nodes": []}) != a
+
+
+def test_sync_parse_runs_once_per_graph_and_returns_copies(monkeypatch):
+    calls = _counting_parser(monkeypatch)
+    graph = {"1": {"class_type": "KSampler"}}
+
+    first = pc.parse_geninfo_cached(graph)
+    first.data["seed"]["value"] = 99
+    second = pc.parse_geninfo_cached(dict(graph))
+
+    assert len(calls) == 1
+    assert second.data == {"seed": {"value": 1}, "nodes": 1}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_batch_parses_each_graph_once(monkeypatch):
+    calls = _counting_parser(monkeypatch)
+    graph = {"1": {"class_type": "KSampler"}, "2": {"class_type": "SaveImage"}}
+
+    results = await asyncio.gather(*(pc.aparse_geninfo_cached(graph, {"w": 1}) for _ in range(6)))
+
+    assert len(calls) == 1
+    assert all(r.ok and r.data["nodes"] == 2 for r in results)
+    assert len({id(r.data) for r in results}) == 6
+
+
+@pytest.mark.asyncio
+async def test_persisted_parse_survives_memory_eviction(monkeypatch):
+    calls = _counting_parser(monkeypatch)
+    db = _FakeDb()
+    graph = {"7": {"class_type": "KSampler"}}
+
+    await pc.aparse_geninfo_cached(graph, db=db)
+    pc._CACHE.clear()
+    again = await pc.aparse_geninfo_cached(graph, db=db)
+
+    assert len(calls) == 1
+    assert again.data == {"seed": {"value": 1}, "nodes": 1}
+    assert len(db.rows) == 1
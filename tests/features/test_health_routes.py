@@ -51,7 +51,7 @@ async def test_health_returns_service_error(monkeypatch) -> None:
 @pytest.mark.asyncio
 async def test_health_counters_unknown_scope(monkeypatch) -> None:
     class _Health:
-        async def get_counters(self, roots=None):
+        async def get_counters(self, roots=None, scopes=None):
             _ = roots
             return Result.Ok({"total": 0})
 
@@ -170,7 +170,7 @@ async def test_update_execution_runtime_route(monkeypatch) -> None:
 @pytest.mark.asyncio
 async def test_health_counters_watcher_callable_state(monkeypatch) -> None:
     class _Health:
-        async def get_counters(self, roots=None):
+        async def get_counters(self, roots=None, scopes=None):
             _ = roots
             return Result.Ok({"total_assets": 3})
 
@@ -541,12 +541,15 @@ class _Settings:
 
 @pytest.mark.asyncio
 async def test_health_and_counters_success_timeout_degraded(monkeypatch, tmp_path: Path) -> None:
+    seen_scopes = []
+
     class _Health:
         async def status(self):
             return Result.Ok({"up": True})
 
-        async def get_counters(self, roots=None):
+        async def get_counters(self, roots=None, scopes=None):
             _ = roots
+            seen_scopes.append(scopes)
             return Result.Ok({"total": 1})
 
     async def _svc():
@@ -563,12 +566,13 @@ async def test_health_and_counters_success_timeout_degraded(monkeypatch, tmp_pat
     req2 = make_mocked_request("GET", "/mjr/am/health/counters?scope=custom&custom_root_id=r1", app=app)
     resp2 = await (await app.router.resolve(req2)).handler(req2)
     assert json.loads(resp2.text).get("ok") is True
+    assert seen_scopes == [[("custom", "r1")]]
 
     class _HealthTimeout:
         async def status(self):
             raise asyncio.TimeoutError()
 
-        async def get_counters(self, roots=None):
+        async def get_counters(self, roots=None, scopes=None):
             _ = roots
             raise RuntimeError("x")
 
@@ -248,6 +248,7 @@ async def test_update_asset_persists_execution_metadata(monkeypatch):
     assert result.ok
     update_sql, update_params = db.calls[0]
     assert "job_id = COALESCE" in update_sql
+    assert "partial_hash = NULL" in update_sql
     assert update_params[-4:-1] == ("job-1", "workflow-1", "node-1")
 
 
@@ -0,0 +1,98 @@
+import os
+from pathlib import Path
+
+import pytest
+from mjr_am_backend.features.index import direct_ingest
+from PIL import Image
+
+_PROMPT = {
+    "3": {
+        "class_type": "KSampler",
+        "inputs": {
+            "seed": 5,
+            "steps": 20,
+            "cfg": 7,
+            "sampler_name": "euler",
+            "scheduler": "normal",
+            "denoise": 1,
+            "model": ["4", 0],
+            "positive": ["6", 0],
+            "negative": ["7", 0],
+            "latent_image": ["5", 0],
+        },
+    },
+    "4": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": "sd15.safetensors"}},
+    "6": {"class_type": "CLIPTextEncode", "inputs": {"text": "a cat", "clip": ["4", 1]}},
+    "7": {"class_type": "CLIPTextEncode", "inputs": {"text": "blurry", "clip": ["4", 1]}},
+    "9": {"class_type": "MajoorSaveImage", "inputs": {"images": ["8", 0]}},
+}
+
+
+def _record(path: Path, **overrides):
+    st = os.stat(path)
+    record = {
+        "filepath": str(path),
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "prompt": _PROMPT,
+        "extra_pnginfo": {"workflow": {"nodes": [{"id": 9, "type": "MajoorSaveImage"}], "links": []}},
+        "generation_time_ms": 1234,
+        "execution": {"job_id": "p1", "prompt_id": "p1", "source_node_id": "9", "source_node_type": "MajoorSaveImage"},
+        "width": 64,
+        "height": 32,
+    }
+    record.update(overrides)
+    return record
+
+
+def _save(path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    Image.new("RGB", (64, 32)).save(path)
+    return path
+
+
+@pytest.mark.asyncio
+async def test_ingest_generated_writes_asset_metadata_and_journal_without_extraction(services, tmp_path, monkeypatch):
+    out = tmp_path / "out"
+    png = _save(out / "sub" / "a.png")
+    index, db = services["index"], services["db"]
+
+    async def _no_extract(*_args, **_kwargs):
+        raise AssertionError("direct ingest must not extract metadata")
+
+    monkeypatch.setattr(services["metadata"], "get_metadata", _no_extract)
+    res = await index.ingest_generated([_record(png)], base_dir=str(out))
+    assert res.ok and res.data["added"] == 1 and res.data["errors"] == 0
+
+    asset = (await db.aquery("SELECT * FROM assets")).data[0]
+    assert asset["subfolder"] == "sub" and (asset["width"], asset["height"]) == (64, 32)
+    assert (asset["job_id"], asset["source_node_id"], asset["source_node_type"]) == ("p1", "9", "MajoorSaveImage")
+    meta = (await db.aquery("SELECT * FROM asset_metadata WHERE asset_id = ?", (asset["id"],))).data[0]
+    assert meta["metadata_quality"] == "full" and meta["has_workflow"] == 1 and meta["has_generation_data"] == 1
+    assert meta["positive_prompt"] == "a cat" and meta["generation_time_ms"] == 1234
+    journal = (await db.aquery("SELECT dir_path FROM scan_journal WHERE filepath = ?", (asset["filepath"],))).data
+    assert journal and journal[0]["dir_path"] == str(out.resolve())
+    assert (await index.search("cat")).data["total"] == 1
+
+    # The watcher / post-execution path now hits the journal.
+    again = await index.index_paths([png], base_dir=str(out))
+    assert again.ok and again.data["skipped"] == 1 and again.data["added"] == 0
+
+
+@pytest.mark.asyncio
+async def test_ingest_generated_falls_back_when_file_changed(services, tmp_path):
+    out = tmp_path / "out"
+    png = _save(out / "b.png")
+    direct_ingest.claim_paths([str(png)])
+    res = await services["index"].ingest_generated([_record(png, size=1)], base_dir=str(out))
+    assert res.ok and res.data["errors"] == 1 and res.data["fallback"]["added"] == 1
+    assert not direct_ingest.is_claimed(png)
+    rows = (await services["db"].aquery("SELECT COUNT(*) AS n FROM assets")).data
+    assert rows[0]["n"] == 1
+
+
+def test_claims_expire(monkeypatch):
+    direct_ingest.claim_paths(["/out/c.png"])
+    assert direct_ingest.is_claimed("/out/c.png")
+    monkeypatch.setattr(direct_ingest.time, "time", lambda: 10**12)
+    assert not direct_ingest.is_claimed("/out/c.png")
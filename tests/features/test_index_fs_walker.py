@@ -45,3 +45,51 @@ def test_jxl_extension_is_experimental_and_disabled_by_default(monkeypatch) -> N
 def test_jxl_extension_can_be_enabled(monkeypatch) -> None:
     monkeypatch.setenv("MAJOOR_ENABLE_JXL", "1")
     assert _is_enabled_extension(".jxl") is True
+
+
+def _age_tree(root: Path, seconds: float = 120.0) -> None:
+    import os
+    import time
+
+    stamp = time.time() - seconds
+    for path in [root, *[p for p in root.rglob("*") if p.is_dir()]]:
+        os.utime(path, (stamp, stamp))
+
+
+def test_iter_files_skips_unchanged_directories_from_snapshots(tmp_path: Path) -> None:
+    from mjr_am_backend.features.index.fs_walker import WalkSnapshots
+
+    for name in ("a", "b"):
+        sub = tmp_path / name
+        (sub / "deep").mkdir(parents=True)
+        (sub / f"{name}.png").write_bytes(b"png")
+        (sub / "deep" / f"{name}_deep.png").write_bytes(b"png")
+    _age_tree(tmp_path)
+
+    walker = FileSystemWalker(scan_iops_limit=0.0)
+    first = WalkSnapshots()
+    assert len(list(walker.iter_files(tmp_path, recursive=True, snapshots=first))) == 4
+    assert len(first.current) == 5
+
+    (tmp_path / "b" / "deep" / "added.png").write_bytes(b"png")
+    second = WalkSnapshots(previous=dict(first.current))
+    found = {p.name for p in walker.iter_files(tmp_path, recursive=True, snapshots=second)}
+
+    assert found == {"b_deep.png", "added.png"}
+    assert str(tmp_path / "a" / "deep") in second.unchanged_dirs
+    assert str(tmp_path / "b" / "deep") not in second.unchanged_dirs
+    assert set(second.current) == set(first.current)
+
+
+def test_iter_files_lists_recently_modified_directories_again(tmp_path: Path) -> None:
+    from mjr_am_backend.features.index.fs_walker import WalkSnapshots
+
+    (tmp_path / "fresh.png").write_bytes(b"png")
+    walker = FileSystemWalker(scan_iops_limit=0.0)
+    first = WalkSnapshots()
+    list(walker.iter_files(tmp_path, recursive=True, snapshots=first))
+
+    # The directory mtime is within the racy window of the listing, so it is not trusted.
+    second = WalkSnapshots(previous=dict(first.current))
+    assert [p.name for p in walker.iter_files(tmp_path, recursive=True, snapshots=second)] == ["fresh.png"]
+    assert not second.unchanged_dirs
@@ -70,12 +70,12 @@ def test_cursor_helpers_build_keyset_clauses():
     cursor = m._encode_page_cursor({"id": 42, "mtime": 123, "filename": "B.png"}, "mtime_desc")
     clause, params = m._build_cursor_where_clause(cursor, "mtime_desc")
     assert "a.mtime < ?" in clause
-    assert params == [123, 123, 42]
+    assert params == [123, 123, 123, 42]
 
     name_cursor = m._encode_page_cursor({"id": 7, "filename": "Bee.png"}, "name_asc")
     clause, params = m._build_cursor_where_clause(name_cursor, "name_asc")
     assert "LOWER(a.filename) > ?" in clause
-    assert params == ["bee.png", "bee.png", 7]
+    assert params == ["bee.png", "bee.png", "bee.png", 7]
 
     stale_clause, stale_params = m._build_cursor_where_clause(name_cursor, "mtime_desc")
     assert stale_clause == ""
@@ -519,3 +519,290 @@ async def test_paginate_grouped_assets_preserves_generation_time_on_selected_sta
     assert assets[0]["filename"] == "LTX-23_00001-audio.mp4"
     assert assets[0]["generation_time_ms"] == 218600
     assert assets[0]["stack_asset_count"] == 2
+
+
+def test_cursor_clauses_cover_rating_size_and_rank_sorts():
+    asset = {"id": 9, "mtime": 100, "size": 2048, "rating": 4, "rank": -1.5, "filename": "X.png"}
+
+    clause, params = m._build_cursor_where_clause(m._encode_page_cursor(asset, "size_asc"), "size_asc")
+    assert clause == (
+        "AND COALESCE(a.size, 0) >= ? AND (COALESCE(a.size, 0) > ? OR (COALESCE(a.size, 0) = ? AND "
+        "(a.mtime < ? OR (a.mtime = ? AND a.id < ?))))"
+    )
+    assert params == [2048, 2048, 2048, 100, 100, 9]
+
+    clause, params = m._build_cursor_where_clause(m._encode_page_cursor(asset, "rating_desc"), "rating_desc")
+    assert clause.startswith("AND COALESCE(m.rating, 0) <= ? AND (COALESCE(m.rating, 0) < ?")
+    assert params == [4, 4, 4, 100, 100, 9]
+
+    rank_cursor = m._encode_page_cursor(asset, m._RANK_SORT, rank_alias="best.rank")
+    clause, params = m._build_cursor_where_clause(rank_cursor, m._RANK_SORT, rank_alias="best.rank")
+    assert clause == "AND best.rank >= ? AND (best.rank > ? OR (best.rank = ? AND a.id < ?))"
+    assert params == [-1.5, -1.5, -1.5, 9]
+    # A rank cursor never applies to the plain mtime browse ordering.
+    assert m._build_cursor_where_clause(rank_cursor, "mtime_desc") == ("", [])
+    assert m._build_sort_sql(m._RANK_SORT, rank_alias="best.rank") == "ORDER BY best.rank ASC, a.id DESC"
+
+
+@pytest.mark.asyncio
+async def test_grouped_pagination_returns_cursor_of_last_consumed_row():
+    rows = [
+        {"id": 6, "mtime": 60, "filename": "a.png", "stack_id": 1},
+        {"id": 5, "mtime": 50, "filename": "b.png", "stack_id": 1},
+        {"id": 4, "mtime": 40, "filename": "c.png", "stack_id": 2},
+        {"id": 3, "mtime": 30, "filename": "d.png", "stack_id": 3},
+    ]
+
+    async def _fetch(raw_limit, raw_offset):
+        return Result.Ok({"rows": rows[raw_offset: raw_offset + raw_limit]})
+
+    async def _encode(asset, stack_ids):
+        return m._encode_page_cursor(asset, "mtime_desc", stack_ids=stack_ids)
+
+    res = await m._paginate_grouped_assets(
+        _fetch,
+        lambda chunk: [dict(r) for r in chunk],
+        limit=2,
+        offset=0,
+        include_total=False,
+        encode_cursor=_encode,
+    )
+    assert res.ok
+    assert [a["stack_id"] for a in res.data["assets"]] == [1, 2]
+    cursor = m._decode_page_cursor(res.data["next_cursor"], "mtime_desc")
+    assert cursor["id"] == 4 and m._cursor_stack_ids(cursor) == {1, 2}
+
+
+async def _seed_paging_assets(db, count: int = 23) -> None:
+    for i in range(count):
+        ins = await db.aexecute(
+            "INSERT INTO assets (filename, subfolder, filepath, source, kind, ext, size, mtime) "
+            "VALUES (?, '', ?, 'output', 'image', 'png', ?, ?)",
+            (f"Cat_{i % 7:02d}.png", f"/out/cat_{i:03d}.png", (i % 4) * 100, 1_000 + (i % 5)),
+        )
+        assert ins.ok, ins.error
+        await db.aexecute(
+            "INSERT OR REPLACE INTO asset_metadata (asset_id, rating) "
+            "SELECT id, ? FROM assets WHERE filepath = ?",
+            (i % 3, f"/out/cat_{i:03d}.png"),
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query", ["*", "cat"])
+async def test_cursor_pages_match_single_ordered_listing(services, query):
+    await _seed_paging_assets(services["db"])
+    index = services["index"]
+
+    for sort in sorted(m.VALID_SORT_KEYS):
+        full = await index.search_scoped(query, roots=["/out"], limit=100, sort=sort)
+        assert full.ok, full.error
+        expected = [a["id"] for a in full.data["assets"]]
+        assert len(expected) == 23
+
+        seen: list[int] = []
+        cursor = None
+        while True:
+            page = await index.search_scoped(query, roots=["/out"], limit=5, offset=len(seen), sort=sort, cursor=cursor)
+            assert page.ok, page.error
+            assert page.data["offset"] == len(seen)
+            seen.extend(a["id"] for a in page.data["assets"])
+            if not page.data["has_more"]:
+                break
+            cursor = page.data["next_cursor"]
+        assert seen == expected, sort
+
+    seen = []
+    cursor = None
+    while True:
+        page = await index.search(query, limit=4, offset=len(seen), cursor=cursor)
+        assert page.ok, page.error
+        seen.extend(a["id"] for a in page.data["assets"])
+        if not page.data["has_more"]:
+            break
+        cursor = page.data["next_cursor"]
+    full = await index.search(query, limit=100)
+    assert seen == [a["id"] for a in full.data["assets"]]
+
+
+@pytest.mark.asyncio
+async def test_grouped_browse_uses_materialized_stack_representatives(services):
+    from mjr_am_backend.features.stacks.service import StacksService
+
+    db = services["db"]
+    seed = [
+        # (filename, kind, mtime, job_id)
+        ("a_image.png", "image", 10, "job-a"),
+        ("a_clip.mp4", "video", 5, "job-a"),
+        ("a_clip-audio.mp4", "video", 1, "job-a"),
+        ("b_old.png", "image", 20, "job-b"),
+        ("b_new.png", "image", 30, "job-b"),
+        ("c_loose.png", "image", 15, None),
+        ("d_loose.png", "image", 25, None),
+    ]
+    for filename, kind, mtime, job_id in seed:
+        ins = await db.aexecute(
+            "INSERT INTO assets (filename, subfolder, filepath, source, kind, ext, size, mtime, job_id) "
+            "VALUES (?, '', ?, 'output', ?, '', 1, ?, ?)",
+            (filename, f"/out/{filename}", kind, mtime, job_id),
+        )
+        assert ins.ok, ins.error
+    stacked = await StacksService(db).auto_stack_by_job_id()
+    assert stacked.ok and stacked.data["created"] == 2
+
+    rows = await db.aquery(
+        "SELECT s.job_id, s.asset_count, a.filename FROM asset_stacks s JOIN assets a ON a.id = s.rep_asset_id"
+    )
+    assert {r["job_id"]: (r["asset_count"], r["filename"]) for r in rows.data} == {
+        "job-a": (3, "a_clip-audio.mp4"),
+        "job-b": (2, "b_new.png"),
+    }
+
+    index = services["index"]
+    filters = {"group_stacks": True}
+    seen: list[tuple[str, int]] = []
+    cursor = None
+    while True:
+        page = await index.search_scoped(
+            "*", roots=["/out"], limit=2, offset=len(seen), filters=filters,
+            include_total=True, sort="mtime_desc", cursor=cursor,
+        )
+        assert page.ok, page.error
+        assert page.data["total"] == 4
+        seen.extend((a["filename"], a["stack_asset_count"]) for a in page.data["assets"])
+        if not page.data["has_more"]:
+            break
+        cursor = page.data["next_cursor"]
+    assert seen == [("b_new.png", 2), ("d_loose.png", 1), ("c_loose.png", 1), ("a_clip-audio.mp4", 3)]
+
+    unscoped = await index.search("*", limit=10, filters=filters, include_total=True)
+    assert unscoped.ok, unscoped.error
+    assert unscoped.data["total"] == 4
+
+    # Deleting the representative promotes the next member via trigger.
+    await db.aexecute("DELETE FROM assets WHERE filename = 'a_clip-audio.mp4'")
+    rows = await db.aquery(
+        "SELECT s.asset_count, a.filename FROM asset_stacks s JOIN assets a ON a.id = s.rep_asset_id "
+        "WHERE s.job_id = 'job-a'"
+    )
+    assert (rows.data[0]["asset_count"], rows.data[0]["filename"]) == (2, "a_clip.mp4")
+
+    # In-place rescans of a member re-pick the representative via triggers.
+    async def _rep(job_id):
+        res = await db.aquery(
+            "SELECT a.filename FROM asset_stacks s JOIN assets a ON a.id = s.rep_asset_id WHERE s.job_id = ?",
+            (job_id,),
+        )
+        return res.data[0]["filename"]
+
+    await db.aexecute("UPDATE assets SET mtime = 40 WHERE filename = 'b_old.png'")
+    assert await _rep("job-b") == "b_old.png"
+    await db.aexecute("UPDATE assets SET kind = 'image' WHERE filename = 'a_clip.mp4'")
+    assert await _rep("job-a") == "a_image.png"
+    await db.aexecute("UPDATE assets SET mtime = 40 WHERE filename = 'b_new.png'")
+    await db.aexecute(
+        "INSERT INTO asset_metadata (asset_id, has_generation_data) "
+        "SELECT id, 1 FROM assets WHERE filename = 'b_new.png'"
+    )
+    assert await _rep("job-b") == "b_new.png"
+    await db.aexecute(
+        "UPDATE asset_metadata SET has_generation_data = 0 "
+        "WHERE asset_id = (SELECT id FROM assets WHERE filename = 'b_new.png')"
+    )
+    assert await _rep("job-b") == "b_old.png"
+
+
+@pytest.mark.asyncio
+async def test_stack_representative_triggers_match_in_memory_grouping(services):
+    import random
+
+    from mjr_am_backend.features.stacks.service import StacksService
+
+    db = services["db"]
+    rng = random.Random(21)
+    names = ["clip.mp4", "clip-audio.mp4", "take_audio.mp4", "frame.png", "mask.png"]
+    for i in range(40):
+        filename = f"{i:02d}_{rng.choice(names)}"
+        kind = "video" if filename.endswith(".mp4") else "image"
+        ins = await db.aexecute(
+            "INSERT INTO assets (filename, subfolder, filepath, source, kind, ext, size, mtime, job_id) "
+            "VALUES (?, '', ?, 'output', ?, '', ?, ?, ?)",
+            (filename, f"/out/{filename}", kind, rng.choice([1, 2]), rng.choice([1, 2]), f"job-{i % 4}"),
+        )
+        assert ins.ok, ins.error
+        if rng.random() < 0.5:
+            await db.aexecute(
+                "INSERT INTO asset_metadata (asset_id, has_generation_data) "
+                "SELECT id, 1 FROM assets WHERE filename = ?",
+                (filename,),
+            )
+    assert (await StacksService(db).auto_stack_by_job_id()).ok
+
+    async def _check() -> None:
+        members = await db.aquery(
+            "SELECT a.id, a.filename, a.kind, a.mtime, a.size, a.stack_id, "
+            "COALESCE(md.has_generation_data, 0) AS has_generation_data "
+            "FROM assets a LEFT JOIN asset_metadata md ON md.asset_id = a.id ORDER BY a.id DESC"
+        )
+        expected: dict[int, dict] = {}
+        for row in members.data:
+            current = expected.get(row["stack_id"])
+            expected[row["stack_id"]] = row if current is None else m._select_group_representative(current, row)
+        stacks = await db.aquery("SELECT id, rep_asset_id FROM asset_stacks WHERE asset_count > 0")
+        assert {r["id"]: r["rep_asset_id"] for r in stacks.data} == {k: v["id"] for k, v in expected.items()}
+
+    await _check()
+    # Rescans rewrite members in place; every trigger path must agree too.
+    for _ in range(15):
+        ids = [r["id"] for r in (await db.aquery("SELECT id FROM assets ORDER BY id")).data]
+        await db.aexecute(
+            "UPDATE assets SET mtime = ?, size = ? WHERE id = ?",
+            (rng.choice([1, 2, 3]), rng.choice([1, 2, 3]), rng.choice(ids)),
+        )
+        await db.aexecute(
+            "INSERT INTO asset_metadata (asset_id, has_generation_data) VALUES (?, 1) "
+            "ON CONFLICT(asset_id) DO UPDATE SET has_generation_data = 1 - COALESCE(has_generation_data, 0)",
+            (rng.choice(ids),),
+        )
+        await db.aexecute("DELETE FROM assets WHERE id = ?", (rng.choice(ids),))
+        await _check()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort", ["mtime_desc", "name_asc", "size_desc"])
+async def test_grouped_search_cursor_never_repeats_a_stack(services, sort):
+    from mjr_am_backend.features.stacks.service import StacksService
+
+    db = services["db"]
+    seed = [
+        # (filename, mtime, size, job_id): stack members are not contiguous in any sort.
+        ("cat_a1.png", 50, 5, "job-a"),
+        ("cat_loose1.png", 40, 4, None),
+        ("cat_b1.png", 30, 3, "job-b"),
+        ("cat_a2.png", 20, 1, "job-a"),
+        ("cat_loose2.png", 10, 2, None),
+        ("cat_b2.png", 5, 0, "job-b"),
+    ]
+    for filename, mtime, size, job_id in seed:
+        ins = await db.aexecute(
+            "INSERT INTO assets (filename, subfolder, filepath, source, kind, ext, size, mtime, job_id) "
+            "VALUES (?, '', ?, 'output', 'image', 'png', ?, ?, ?)",
+            (filename, f"/out/{filename}", size, mtime, job_id),
+        )
+        assert ins.ok, ins.error
+    assert (await StacksService(db).auto_stack_by_job_id()).data["created"] == 2
+
+    index = services["index"]
+    groups: list[int | str] = []
+    cursor = None
+    while True:
+        page = await index.search_scoped(
+            "cat", roots=["/out"], limit=1, offset=len(groups), filters={"group_stacks": True},
+            sort=sort, cursor=cursor,
+        )
+        assert page.ok, page.error
+        groups.extend(a.get("stack_id") or a["filename"] for a in page.data["assets"])
+        if not page.data["has_more"]:
+            break
+        cursor = page.data["next_cursor"]
+    assert len(groups) == 4 and len(set(groups)) == 4, groups
@@ -183,7 +183,11 @@ async def test_index_paths_and_runtime_helpers(monkeypatch) -> None:
     res = await svc.index_paths([Path("x")], base_dir=".")
     assert res.ok
     assert any(event == "mjr.scan.progress" for event, _payload in emitted)
-    assert any(event == "mjr.asset.indexed" for event, _payload in emitted)
+    from mjr_am_backend.adapters.comfy_events import get_event_bus
+
+    get_event_bus().flush(force=True)
+    batches = [payload for event, payload in emitted if event == "mjr.asset.batch"]
+    assert any(batch["event"] == "mjr.asset.indexed" and batch["items"][0]["id"] == 1 for batch in batches)
 
     svc.pause_enrichment_for_interaction(seconds=2.0)
     assert svc.get_runtime_status()["enrichment_queue_length"] == 3
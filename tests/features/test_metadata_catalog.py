@@ -3,6 +3,11 @@ from __future__ import annotations
 import json
 import sqlite3
 
+import pytest
+from mjr_am_backend.adapters.db.migrations import m027_asset_generation as m027
+from mjr_am_backend.adapters.db.migrations import m032_metadata_keys as m032
+from mjr_am_backend.data.repositories.metadata_keys_repository import MetadataKeysRepository
+from mjr_am_backend.features.index.metadata_helpers import MetadataHelpers
 from mjr_am_backend.features.index.searcher import _build_filter_clauses
 from mjr_am_backend.features.metadata.key_aggregator import aggregate_metadata_keys
 from mjr_am_backend.features.metadata.section_catalog import (
@@ -10,6 +15,7 @@ from mjr_am_backend.features.metadata.section_catalog import (
     paths_for_search_field,
 )
 from mjr_am_backend.features.search.prefix_query import parse_prefixed_query
+from mjr_am_backend.shared import Result
 
 
 def test_metadata_section_catalog_exposes_search_aliases() -> None:
@@ -32,9 +38,11 @@ def test_parse_prefixed_query_extracts_terms_and_keeps_plain_text() -> None:
 
 
 class _FakeDb:
-    async def aquery(self, _sql, _params):
-        from mjr_am_backend.shared import Result
+    """Database without the v32 catalog tables: only ``metadata_raw`` reads work."""
 
+    async def aquery(self, sql, _params=()):
+        if "metadata_raw" not in sql:
+            return Result.Err("QUERY_FAILED", "no such table: metadata_keys")
         return Result.Ok(
             [
                 {
@@ -56,11 +64,62 @@ def test_aggregate_metadata_keys_collects_paths_and_workflow_nodes() -> None:
     import asyncio
 
     data = asyncio.run(aggregate_metadata_keys(_FakeDb()))
+    assert data["source"] == "sample"
     assert "geninfo.positive.value" in data["keys"]
     assert data["workflow_nodes"]["KSampler"] == ["seed"]
     assert data["workflow_nodes"]["CheckpointLoaderSimple"] == ["ckpt_name"]
 
 
+_KSAMPLER_META = {
+    "geninfo": {"positive": {"value": "a cat"}, "workflow_nodes": [{"class_type": "KSampler", "params": {"seed": 1}}]},
+    "quality": "full",
+}
+
+
+@pytest.mark.asyncio
+async def test_metadata_key_catalog_is_maintained_at_write_time(services):
+    db = services["db"]
+    ids = []
+    for name in ("a.png", "b.png", "c.png"):
+        await db.aexecute(
+            "INSERT INTO assets (filename, subfolder, filepath, source, kind, ext, size, mtime) "
+            "VALUES (?, '', ?, 'output', 'image', 'png', 1, 1)",
+            (name, f"/out/{name}"),
+        )
+        rows = await db.aquery("SELECT id FROM assets WHERE filename = ?", (name,))
+        ids.append(int(rows.data[0]["id"]))
+
+    for asset_id in ids[:2]:
+        assert (await MetadataHelpers.write_asset_metadata_row(db, asset_id, Result.Ok(dict(_KSAMPLER_META)))).ok
+    loader = {"workflow": {"nodes": [{"type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": "x"}}]}, "quality": "full"}
+    assert (await MetadataHelpers.write_asset_metadata_row(db, ids[2], Result.Ok(loader))).ok
+
+    data = await aggregate_metadata_keys(db)
+    assert data["source"] == "catalog" and data["scanned"] == 3
+    assert data["key_counts"]["geninfo.positive.value"] == 2
+    assert data["key_counts"]["workflow.nodes.type"] == 1
+    assert data["workflow_nodes"] == {"CheckpointLoaderSimple": ["ckpt_name"], "KSampler": ["seed"]}
+    assert data["key_last_seen"]["geninfo.positive.value"] > 0 and data["truncated"] is False
+    capped = await MetadataKeysRepository(db).catalog(max_keys=1, max_node_types=1)
+    assert capped.ok and capped.data["truncated"] is True
+    assert list(capped.data["keys"]) == ["quality"]
+    assert capped.data["workflow_nodes"] == {"KSampler": {"seed": 2}}
+    sets = await db.aquery("SELECT COUNT(*) AS n FROM metadata_key_sets")
+    assert sets.data[0]["n"] == 2
+
+    # Deleting an asset releases its keys; the migration backfill rebuilds the same counts.
+    await db.aexecute("DELETE FROM assets WHERE id = ?", (ids[2],))
+    data = await aggregate_metadata_keys(db)
+    assert data["scanned"] == 2 and "workflow.nodes.type" not in data["keys"]
+    assert list(data["workflow_nodes"]) == ["KSampler"]
+    before = (await db.aquery("SELECT node_type, path, occurrences FROM metadata_keys ORDER BY id")).data
+    await db.aexecute("DELETE FROM asset_key_sets")
+    backfill = await m032.backfill_metadata_keys(db)
+    assert backfill.ok and backfill.data == 2
+    after = (await db.aquery("SELECT node_type, path, occurrences FROM metadata_keys ORDER BY id")).data
+    assert before == after
+
+
 def _metadata_search_rows(query: str) -> list[str]:
     conn = sqlite3.connect(":memory:")
     conn.row_factory = sqlite3.Row
@@ -115,6 +174,8 @@ def _metadata_search_rows(query: str) -> list[str]:
             "INSERT INTO asset_metadata (asset_id, metadata_text, metadata_raw, rating) VALUES (?, ?, ?, 0)",
             (asset_id, text, json.dumps(raw)),
         )
+    conn.executescript(m027._CREATE_ASSET_GENERATION)
+    conn.execute(m027._backfill_sql())
     plain_query, filters = parse_prefixed_query(query)
     assert plain_query == ""
     clauses, params = _build_filter_clauses(filters)
@@ -0,0 +1,210 @@
+import json
+import struct
+import zlib
+
+import pytest
+from mjr_am_backend.features.metadata import metadata_service_impl as m
+from mjr_am_backend.features.metadata.native_reader import (
+    has_generation_data,
+    native_metadata_is_complete,
+    read_native_metadata,
+)
+from mjr_am_backend.shared import Result
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+_PROMPT = {
+    "3": {"class_type": "KSampler", "inputs": {"seed": 1, "steps": 20}},
+    "4": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": "m.safetensors"}},
+}
+_WORKFLOW = {"nodes": [{"id": 3, "type": "KSampler"}], "links": []}
+_XMP = (
+    '<x:xmpmeta xmlns:x="adobe:ns:meta/"><rdf:RDF><rdf:Description xmp:Rating="4">'
+    "<dc:subject><rdf:Bag><rdf:li>cat</rdf:li><rdf:li>a &amp; b</rdf:li></rdf:Bag></dc:subject>"
+    "</rdf:Description></rdf:RDF></x:xmpmeta>"
+)
+
+
+def _png_chunk(ctype: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body)) + ctype + body + struct.pack(">I", zlib.crc32(ctype + body))
+
+
+def _comfy_png(path, **extra_text):
+    info = PngInfo()
+    info.add_text("prompt", json.dumps(_PROMPT))
+    info.add_text("workflow", json.dumps(_WORKFLOW), zip=True)
+    for key, value in extra_text.items():
+        info.add_text(key, value)
+    Image.new("RGB", (64, 48), "red").save(path, pnginfo=info)
+
+
+def _box(btype: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", 8 + len(body)) + btype + body
+
+
+def _mp4_with_keys(path, items: dict[str, str]):
+    mvhd = _box(b"mvhd", b"\0" * 4 + struct.pack(">IIII", 3_786_912_000, 0, 1000, 2500) + b"\0" * 80)
+    tkhd = _box(b"tkhd", b"\0" * 76 + struct.pack(">II", 640 << 16, 360 << 16))
+    hdlr = _box(b"hdlr", b"\0" * 8 + b"vide" + b"\0" * 12)
+    trak = _box(b"trak", tkhd + _box(b"mdia", hdlr))
+    names = list(items)
+    keys = _box(
+        b"keys",
+        b"\0" * 4 + struct.pack(">I", len(names)) + b"".join(_box(b"mdta", n.encode()) for n in names),
+    )
+    ilst = _box(
+        b"ilst",
+        b"".join(
+            _box(struct.pack(">I", i + 1), _box(b"data", b"\0\0\0\1" + b"\0" * 4 + items[n].encode()))
+            for i, n in enumerate(names)
+        ),
+    )
+    meta = _box(b"meta", _box(b"hdlr", b"\0" * 8 + b"mdta" + b"\0" * 12) + keys + ilst)
+    # moov after mdat, as written without +faststart
+    data = _box(b"ftyp", b"isom\0\0\2\0isomiso2mp41") + _box(b"mdat", b"\0" * 4096) + _box(b"moov", mvhd + trak + meta)
+    path.write_bytes(data)
+
+
+def test_png_text_chunks_and_dimensions(tmp_path):
+    p = tmp_path / "a.png"
+    _comfy_png(p, job_id="j-1")
+    data = read_native_metadata(str(p))
+    assert json.loads(data["PNG:Prompt"]) == _PROMPT
+    assert json.loads(data["PNG:Workflow"]) == _WORKFLOW
+    assert data["PNG:Job_id"] == "j-1"
+    assert data["Image:ImageWidth"] == 64 and data["Image:ImageHeight"] == 48
+    assert native_metadata_is_complete(data, "image")
+
+
+def test_png_itxt_xmp_and_chunks_after_idat(tmp_path):
+    p = tmp_path / "a.png"
+    Image.new("RGB", (8, 8)).save(p)
+    raw = p.read_bytes()
+    iend = raw.rindex(b"IEND") - 4
+    itxt = _png_chunk(b"iTXt", b"parameters\0\0\0\0\0" + b"cat, Steps: 20, Sampler: Euler")
+    xmp = _png_chunk(b"iTXt", b"XML:com.adobe.xmp\0\0\0\0\0" + _XMP.encode())
+    p.write_bytes(raw[:iend] + itxt + xmp + raw[iend:])
+
+    data = read_native_metadata(str(p))
+    assert data["PNG:Parameters"].startswith("cat")
+    assert data["XMP-xmp:Rating"] == "4"
+    assert data["XMP-dc:Subject"] == ["cat", "a & b"]
+    assert has_generation_data(data)
+
+
+def test_webp_exif_ifd0(tmp_path):
+    p = tmp_path / "a.webp"
+    exif = Image.Exif()
+    exif[0x010F] = "workflow:" + json.dumps(_WORKFLOW)
+    exif[0x0110] = "prompt:" + json.dumps(_PROMPT)
+    Image.new("RGB", (30, 20), "blue").save(p, exif=exif)
+    data = read_native_metadata(str(p))
+    assert data["IFD0:Make"].startswith("workflow:")
+    assert data["IFD0:Model"].startswith("prompt:")
+    assert data["Composite:ImageSize"] == "30 20"
+    assert native_metadata_is_complete(data, "image")
+
+
+def test_mp4_keys_and_track_geometry(tmp_path):
+    p = tmp_path / "a.mp4"
+    _mp4_with_keys(p, {"prompt": json.dumps(_PROMPT), "com.example.workflow": json.dumps(_WORKFLOW)})
+    data = read_native_metadata(str(p))
+    assert json.loads(data["Keys:Prompt"]) == _PROMPT
+    assert json.loads(data["Keys:Workflow"]) == _WORKFLOW
+    assert data["QuickTime:ImageWidth"] == 640 and data["QuickTime:ImageHeight"] == 360
+    assert data["QuickTime:Duration"] == 2.5
+    assert data["QuickTime:CreateDate"].startswith("2024:")
+    assert native_metadata_is_complete(data, "video")
+
+
+def test_unsupported_or_damaged_files(tmp_path):
+    other = tmp_path / "a.bin"
+    other.write_bytes(b"not an image")
+    assert read_native_metadata(str(other)) == {}
+    assert read_native_metadata(str(tmp_path / "missing.png")) == {}
+
+    p = tmp_path / "cut.png"
+    _comfy_png(p)
+    raw = p.read_bytes()
+    p.write_bytes(raw[: raw.index(b"IDAT") + 10])
+    data = read_native_metadata(str(p))
+    assert "PNG:Prompt" in data
+    assert not native_metadata_is_complete({"Image:ImageWidth": 1, "Image:ImageHeight": 1}, "image")
+
+
+class _CountingExif:
+    def __init__(self):
+        self.single = 0
+        self.batch: list[list[str]] = []
+
+    async def aread(self, _path):
+        self.single += 1
+        return Result.Ok({})
+
+    async def aread_batch(self, paths):
+        self.batch.append(list(paths))
+        return {p: Result.Ok({}) for p in paths}
+
+
+class _FF:
+    async def aread(self, _path):
+        return Result.Ok({})
+
+    async def aread_batch(self, paths):
+        return {p: Result.Ok({}) for p in paths}
+
+
+def _all_backends(monkeypatch):
+    from mjr_am_backend.features.metadata import extractor_registry
+
+    def pick(*_args, **_kwargs):
+        return ["exiftool", "ffprobe"]
+
+    monkeypatch.setattr(m, "pick_probe_backend", pick)
+    monkeypatch.setattr(extractor_registry, "pick_probe_backend", pick)
+
+
+class _Settings:
+    async def get_probe_backend(self):
+        return "auto"
+
+    async def get_metadata_fallback_prefs(self):
+        return {"image": True, "media": True}
+
+
+@pytest.mark.asyncio
+async def test_service_skips_exiftool_for_comfy_outputs(tmp_path, monkeypatch):
+    _all_backends(monkeypatch)
+    png = tmp_path / "a.png"
+    _comfy_png(png)
+    plain = tmp_path / "b.png"
+    Image.new("RGB", (4, 4)).save(plain)
+    exif = _CountingExif()
+    svc = m.MetadataService(exif, _FF(), _Settings())
+
+    single = await svc.get_metadata(str(png))
+    assert single.ok and single.data
+    assert single.data["prompt"] == _PROMPT
+    assert single.data["width"] == 64
+    assert exif.single == 0
+
+    workflow_only = await svc.get_workflow_only(str(png))
+    assert workflow_only.ok and workflow_only.data["workflow"] == _WORKFLOW
+    assert exif.single == 0
+
+    batch = await svc.get_metadata_batch([str(png), str(plain)])
+    assert batch[str(png)].ok and batch[str(png)].data["prompt"] == _PROMPT
+    assert exif.batch == [[str(plain)]]
+
+
+@pytest.mark.asyncio
+async def test_service_native_reader_can_be_disabled(tmp_path, monkeypatch):
+    _all_backends(monkeypatch)
+    monkeypatch.setattr(m, "METADATA_NATIVE_READER", False)
+    png = tmp_path / "a.png"
+    _comfy_png(png)
+    exif = _CountingExif()
+    svc = m.MetadataService(exif, _FF(), _Settings())
+    res = await svc.get_metadata(str(png))
+    assert res.ok
+    assert exif.single == 1
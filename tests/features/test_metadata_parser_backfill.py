@@ -0,0 +1,199 @@
+import json
+from pathlib import Path
+
+import pytest
+from mjr_am_backend.adapters.db.migrations import MigrationRunner
+from mjr_am_backend.adapters.db.migrations.registry import MIGRATIONS
+from mjr_am_backend.adapters.db.schema import migrate_schema
+from mjr_am_backend.adapters.db.sqlite import Sqlite
+from mjr_am_backend.features.metadata import parser_backfill
+from mjr_am_backend.features.metadata.parser_backfill import (
+    metadata_parser_backfill_status,
+    run_metadata_parser_backfill,
+)
+from mjr_am_backend.features.metadata.section_catalog import PARSER_FAMILY_VERSION
+from mjr_am_backend.routes.db_maintenance import backfill_jobs as bj
+
+_PROMPT = {
+    "4": {"class_type": "CheckpointLoaderSimple", "inputs": {"ckpt_name": "sdxl.safetensors"}},
+    "6": {"class_type": "CLIPTextEncode", "inputs": {"text": "a red fox", "clip": ["4", 1]}},
+    "7": {"class_type": "CLIPTextEncode", "inputs": {"text": "blurry", "clip": ["4", 1]}},
+    "5": {"class_type": "EmptyLatentImage", "inputs": {"width": 512, "height": 512, "batch_size": 1}},
+    "3": {
+        "class_type": "KSampler",
+        "inputs": {
+            "seed": 42,
+            "steps": 20,
+            "cfg": 7,
+            "sampler_name": "euler",
+            "scheduler": "normal",
+            "denoise": 1,
+            "model": ["4", 0],
+            "positive": ["6", 0],
+            "negative": ["7", 0],
+            "latent_image": ["5", 0],
+        },
+    },
+    "8": {"class_type": "VAEDecode", "inputs": {"samples": ["3", 0], "vae": ["4", 2]}},
+    "9": {"class_type": "SaveImage", "inputs": {"images": ["8", 0], "filename_prefix": "x"}},
+}
+
+
+async def _make_db(tmp_path: Path) -> Sqlite:
+    db = Sqlite(str(tmp_path / "backfill.db"))
+    assert (await migrate_schema(db)).ok
+    assert (await MigrationRunner(MIGRATIONS).run(db)).ok
+    return db
+
+
+async def _add_asset(db: Sqlite, name: str, meta: dict, **columns) -> int:
+    await db.aexecute(
+        "INSERT INTO assets (filename, subfolder, filepath, source, kind, ext, size, mtime) "
+        "VALUES (?, '', ?, 'output', 'image', 'png', 1, 1)",
+        (name, f"/out/{name}"),
+    )
+    asset_id = int((await db.aquery("SELECT id FROM assets WHERE filename = ?", (name,))).data[0]["id"])
+    res = await db.aexecute(
+        "INSERT INTO asset_metadata (asset_id, metadata_quality, positive_prompt, metadata_text, metadata_raw) "
+        "VALUES (?, 'full', ?, ?, ?)",
+        (asset_id, columns.get("positive_prompt", ""), columns.get("metadata_text", ""), json.dumps(meta)),
+    )
+    assert res.ok, res.error
+    return asset_id
+
+
+def _stale(meta: dict) -> dict:
+    return {**meta, "quality": "full", "metadata_parser_version": "geninfo-catalog-v0"}
+
+
+@pytest.mark.asyncio
+async def test_backfill_rederives_columns_fts_and_generation_row(tmp_path: Path):
+    db = await _make_db(tmp_path)
+    try:
+        parsed = await _add_asset(
+            db,
+            "a.png",
+            _stale({"prompt": _PROMPT, "geninfo": {"positive": {"value": "old"}}}),
+            positive_prompt="old",
+            metadata_text="old",
+        )
+        plain = await _add_asset(db, "b.png", _stale({"width": 64, "geninfo": {"note": "kept"}}))
+        progress: list[dict] = []
+
+        res = await run_metadata_parser_backfill(db, limit=None, workers=0, on_progress=progress.append)
+
+        assert res.ok, res.error
+        assert res.data["updated"] == 2 and res.data["remaining"] == 0
+        assert progress[0]["candidates"] == 2 and progress[-1]["processed"] == 2
+
+        row = (await db.aquery("SELECT * FROM asset_metadata WHERE asset_id = ?", (parsed,))).data[0]
+        meta = json.loads(row["metadata_raw"])
+        assert meta["metadata_parser_version"] == PARSER_FAMILY_VERSION
+        assert meta["geninfo"]["positive"]["value"] == "a red fox"
+        assert row["positive_prompt"] == "a red fox" and row["workflow_type"] == "T2I"
+        hits = await db.aquery(
+            "SELECT rowid AS r FROM asset_metadata_fts WHERE asset_metadata_fts MATCH ?", ('"red fox"',)
+        )
+        assert [h["r"] for h in hits.data] == [parsed]
+        generation = (await db.aquery("SELECT seed, sampler FROM asset_generation WHERE asset_id = ?", (parsed,))).data
+        assert generation == [{"seed": 42, "sampler": "euler"}]
+        keys = await db.aquery("SELECT path FROM metadata_keys WHERE path = 'geninfo.positive.value' AND occurrences = 1")
+        assert keys.data
+
+        # Payloads without anything to parse keep their geninfo and are only stamped.
+        raw = (await db.aquery("SELECT metadata_raw FROM asset_metadata WHERE asset_id = ?", (plain,))).data[0]
+        assert json.loads(raw["metadata_raw"])["geninfo"] == {"note": "kept"}
+    finally:
+        await db.aclose()
+
+
+@pytest.mark.asyncio
+async def test_backfill_drops_generation_row_when_reparse_finds_none(tmp_path: Path):
+    db = await _make_db(tmp_path)
+    try:
+        prompt = {
+            "1": {"class_type": "LoadImage", "inputs": {"image": "in.png"}},
+            "2": {"class_type": "SaveImage", "inputs": {"images": ["1", 0], "filename_prefix": "x"}},
+        }
+        asset_id = await _add_asset(db, "a.png", _stale({"prompt": prompt}))
+        await db.aexecute("INSERT INTO asset_generation (asset_id, seed, sampler) VALUES (?, 7, 'euler')", (asset_id,))
+
+        res = await run_metadata_parser_backfill(db, limit=None, workers=0)
+
+        assert res.ok and res.data["updated"] == 1
+        assert (await db.aquery("SELECT 1 FROM asset_generation WHERE asset_id = ?", (asset_id,))).data == []
+    finally:
+        await db.aclose()
+
+
+@pytest.mark.asyncio
+async def test_backfill_resumes_from_version_stamp_and_waits_for_priority_window(tmp_path: Path):
+    db = await _make_db(tmp_path)
+    try:
+        for i in range(5):
+            await _add_asset(db, f"{i}.png", _stale({"prompt": _PROMPT}))
+        waits = []
+
+        async def _wait() -> None:
+            waits.append(1)
+
+        first = await run_metadata_parser_backfill(db, limit=3, batch_size=2, workers=0, wait_for_priority_window_fn=_wait)
+        assert first.ok and first.data["updated"] == 3 and first.data["remaining"] == 2
+        assert len(waits) == 2
+
+        second = await run_metadata_parser_backfill(db, limit=None, workers=0)
+        assert second.ok and second.data["updated"] == 2
+        assert (await metadata_parser_backfill_status(db)).data["outdated"] == 0
+    finally:
+        await db.aclose()
+
+
+@pytest.mark.asyncio
+async def test_backfill_skips_rows_rewritten_during_parse(tmp_path: Path, monkeypatch):
+    db = await _make_db(tmp_path)
+    try:
+        asset_id = await _add_asset(db, "a.png", _stale({"prompt": _PROMPT}))
+        newer = json.dumps({"prompt": _PROMPT, "quality": "full", "metadata_parser_version": "indexer"})
+        real_run = parser_backfill._Rederiver.run
+
+        async def _racing_run(self, rows):
+            # The indexer rewrites the row while the page is being parsed.
+            await db.aexecute("UPDATE asset_metadata SET metadata_raw = ? WHERE asset_id = ?", (newer, asset_id))
+            return await real_run(self, rows)
+
+        monkeypatch.setattr(parser_backfill._Rederiver, "run", _racing_run)
+        res = await run_metadata_parser_backfill(db, limit=1, workers=0)
+        assert res.ok and res.data["updated"] == 0 and res.data["skipped"] == 1
+        raw = (await db.aquery("SELECT metadata_raw FROM asset_metadata WHERE asset_id = ?", (asset_id,))).data[0]
+        assert raw["metadata_raw"] == newer
+    finally:
+        await db.aclose()
+
+
+@pytest.mark.asyncio
+async def test_backfill_thread_pool_path(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(parser_backfill, "_POOL_MIN_ROWS", 1)
+    db = await _make_db(tmp_path)
+    try:
+        for i in range(3):
+            await _add_asset(db, f"{i}.png", _stale({"prompt": _PROMPT}))
+        res = await run_metadata_parser_backfill(db, limit=None, workers=2)
+        assert res.ok and res.data["updated"] == 3 and res.data["errors"] == 0
+        rows = await db.aquery("SELECT DISTINCT positive_prompt FROM asset_metadata")
+        assert [r["positive_prompt"] for r in rows.data] == ["a red fox"]
+    finally:
+        await db.aclose()
+
+
+def test_backfill_jobs_track_kind():
+    vector = bj.register_job(batch_size=8)
+    bj.complete_job(vector["backfill_id"], scope="output", custom_root_id="", payload={})
+    bj.clear_active_job_id(vector["backfill_id"])
+    metadata = bj.register_job(batch_size=8, scope="all", kind=bj.KIND_METADATA_PARSER)
+    try:
+        assert bj.is_active()
+        assert bj.job_public(metadata)["kind"] == bj.KIND_METADATA_PARSER
+        assert bj.get_active_or_latest_job(kind=bj.KIND_VECTOR)["backfill_id"] == vector["backfill_id"]
+        assert bj.get_active_or_latest_job()["backfill_id"] == metadata["backfill_id"]
+    finally:
+        bj.clear_active_job_id(metadata["backfill_id"])
@@ -172,9 +172,15 @@ async def test_read_with_transient_retry(monkeypatch):
 
 @pytest.mark.asyncio
 async def test_enrich_with_geninfo_async(monkeypatch):
+    from mjr_am_backend.features.geninfo import parse_cache
+
     s = _svc()
 
-    monkeypatch.setattr(m, "parse_geninfo_from_prompt", lambda *args, **kwargs: Result.Ok({"g": 1}))
+    def _patch_parser(fn):
+        monkeypatch.setattr(parse_cache, "_CACHE", parse_cache.GeninfoParseCache(8))
+        monkeypatch.setattr(parse_cache, "parse_geninfo_from_prompt", fn)
+
+    _patch_parser(lambda *args, **kwargs: Result.Ok({"g": 1}))
     c = {"prompt": {"1": {}}, "workflow": {"nodes": []}}
     await s._enrich_with_geninfo_async(c)
     assert c["geninfo"] == {"g": 1}
@@ -192,7 +198,7 @@ async def test_enrich_with_geninfo_async(monkeypatch):
     assert c_override["geninfo"]["seed"]["value"] == 9
     assert c_override["geninfo"]["custom_info"][0]["color"] == "#123ABC"
 
-    monkeypatch.setattr(m, "parse_geninfo_from_prompt", lambda *args, **kwargs: Result.Err("E", "x"))
+    _patch_parser(lambda *args, **kwargs: Result.Err("E", "x"))
     monkeypatch.setattr(m, "registry_build_geninfo_from_parameters", lambda combined: None)
     monkeypatch.setattr(m, "registry_looks_like_media_pipeline", lambda p: True)
     c2 = {"prompt": {"1": {}}, "workflow": {"nodes": []}}
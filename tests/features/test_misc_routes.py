@@ -107,12 +107,13 @@ def test_calendar_month_bounds_use_utc() -> None:
 
 @pytest.mark.asyncio
 async def test_calendar_success_output_scope(monkeypatch) -> None:
-    captured: dict[str, dict[str, Any] | None] = {"filters": None}
+    captured: dict[str, Any] = {"filters": None, "scopes": None}
 
     class _Index:
-        async def date_histogram_scoped(self, roots, month_start, month_end, filters=None):
+        async def date_histogram_scoped(self, roots, month_start, month_end, filters=None, scopes=None):
             _ = (roots, month_start, month_end)
             captured["filters"] = filters
+            captured["scopes"] = scopes
             return Result.Ok({"2026-01-01": 2})
 
     async def _require_services():
@@ -137,6 +138,7 @@ async def test_calendar_success_output_scope(monkeypatch) -> None:
     mtime_start = cast(int, filters.get("mtime_start"))
     mtime_end = cast(int, filters.get("mtime_end"))
     assert mtime_start < mtime_end
+    assert captured["scopes"] == [("output", None)]
 
 
 @pytest.mark.asyncio
@@ -230,3 +230,84 @@ async def test_ingest_prompt_outputs_assigns_rodin_package_context(monkeypatch,
     ]
     assert len(rodin_updates) == 2
     assert all(params[0] == "prompt-rodin" for params in rodin_updates)
+
+
+@pytest.mark.asyncio
+async def test_ingest_prompt_outputs_skips_directly_ingested_files(monkeypatch, tmp_path: Path):
+    from mjr_am_backend.features.index import direct_ingest
+
+    output = tmp_path / "out"
+    output.mkdir()
+    direct = output / "direct.png"
+    other = output / "other.png"
+    direct.write_bytes(b"x")
+    other.write_bytes(b"y")
+    index = _Index()
+    monkeypatch.setattr(
+        mod,
+        "get_prompt_output_files",
+        lambda _prompt_id: [
+            PromptOutputFile(str(direct), node_id="9", node_type="MajoorSaveImage", item_type="output"),
+            PromptOutputFile(str(other), node_id="7", node_type="SaveImage", item_type="output"),
+        ],
+    )
+    monkeypatch.setattr(mod, "fetch_by_job_id", lambda _prompt_id: _async_result([]))
+    monkeypatch.setattr(mod, "get_runtime_output_root", lambda: str(output))
+    monkeypatch.setattr(mod, "get_prompt_metadata_for_prompt", lambda _prompt_id: {})
+    monkeypatch.setattr(mod, "send_event", lambda *_args, **_kwargs: True)
+    direct_ingest.claim_paths([str(direct.resolve())]).set_result(None)
+    try:
+        result = await mod.ingest_prompt_outputs(index, "prompt-direct")
+    finally:
+        direct_ingest.release_paths([str(direct.resolve())])
+
+    assert result.ok
+    assert index.calls[0][0] == [other.resolve()]
+    assert result.data["indexed"] == 2 and result.data["stats"]["direct"] == 1
+    # Execution context is still assigned to both outputs.
+    assert len(index.db.executed) == 2
+
+
+@pytest.mark.asyncio
+async def test_ingest_prompt_outputs_waits_for_direct_ingest_to_commit(monkeypatch, tmp_path: Path):
+    import asyncio
+
+    from mjr_am_backend.features.index import direct_ingest
+
+    output = tmp_path / "out"
+    output.mkdir()
+    direct = output / "direct.png"
+    direct.write_bytes(b"x")
+    committed: list[str] = []
+
+    class _CommitDB(_DB):
+        async def aexecute(self, sql, params=(), **_kwargs):
+            self.executed.append((sql, params, list(committed)))
+            return Result.Ok(1)
+
+    index = _Index()
+    index.db = _CommitDB()
+    monkeypatch.setattr(
+        mod,
+        "get_prompt_output_files",
+        lambda _prompt_id: [
+            PromptOutputFile(str(direct), node_id="9", node_type="MajoorSaveImage", item_type="output"),
+        ],
+    )
+    monkeypatch.setattr(mod, "fetch_by_job_id", lambda _prompt_id: _async_result([]))
+    monkeypatch.setattr(mod, "get_runtime_output_root", lambda: str(output))
+    monkeypatch.setattr(mod, "get_prompt_metadata_for_prompt", lambda _prompt_id: {})
+    monkeypatch.setattr(mod, "send_event", lambda *_args, **_kwargs: True)
+    done = direct_ingest.claim_paths([str(direct.resolve())])
+    try:
+        task = asyncio.create_task(mod.ingest_prompt_outputs(index, "prompt-late"))
+        await asyncio.sleep(0.05)
+        assert not task.done() and index.db.executed == []
+        committed.append(str(direct.resolve()))
+        done.set_result(None)
+        result = await asyncio.wait_for(task, timeout=5)
+    finally:
+        direct_ingest.release_paths([str(direct.resolve())])
+
+    assert result.ok and index.calls == []
+    assert index.db.executed and all(seen == [str(direct.resolve())] for _sql, _params, seen in index.db.executed)
@@ -126,3 +126,50 @@ async def test_scan_prunes_files_deleted_outside_majoor(tmp_path: Path, monkeypa
             except Exception:
                 pass
         await db.aclose()
+
+
+@pytest.mark.asyncio
+async def test_incremental_scan_skips_unchanged_directories(tmp_path: Path, monkeypatch):
+    import os
+    import time
+
+    db_path = tmp_path / "scan.sqlite"
+    root = tmp_path / "scan_root"
+    (root / "old").mkdir(parents=True)
+    (root / "new").mkdir()
+    (root / "old" / "one.png").write_bytes(b"x")
+    (root / "new" / "two.png").write_bytes(b"y")
+    stamp = time.time() - 120
+    for path in (root, root / "old", root / "new"):
+        os.utime(path, (stamp, stamp))
+
+    monkeypatch.setattr(deps, "WATCHER_ENABLED", False)
+    services_res = await deps.build_services(str(db_path))
+    assert services_res.ok, services_res.error
+    services = services_res.data
+    index = services["index"]
+    db = services["db"]
+    sync_worker = services.get("rating_tags_sync")
+
+    try:
+        first = await index.scan_directory(directory=str(root), recursive=True, incremental=False, source="output")
+        assert first.ok, first.error
+        assert first.data["scanned"] == 2
+
+        (root / "new" / "three.png").write_bytes(b"z")
+        second = await index.scan_directory(directory=str(root), recursive=True, incremental=True, source="output")
+        assert second.ok, second.error
+        assert second.data["scanned"] == 2
+        assert second.data["dirs_unchanged"] == 2
+        assert second.data["pruned"] == 0
+
+        searched = await index.search_scoped("*", roots=[str(root)], limit=50, offset=0, filters=None, include_total=True)
+        names = {str(a.get("filename") or "") for a in searched.data.get("assets") or []}
+        assert names == {"one.png", "two.png", "three.png"}
+    finally:
+        if sync_worker is not None:
+            try:
+                sync_worker.stop()
+            except Exception:
+                pass
+        await db.aclose()
@@ -0,0 +1,123 @@
+"""Tests for the trigram name index and materialized autocomplete terms (v33)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from mjr_am_backend.data.repositories import SearchTermsRepository
+from mjr_am_backend.data.repositories import search_terms_repository as terms_mod
+from mjr_am_backend.features.index import searcher as searcher_mod
+
+
+async def _insert(db, filename: str, *, subfolder: str = "", metadata_text: str | None = None) -> int:
+    res = await db.aexecute(
+        "INSERT INTO assets (filename, subfolder, filepath, source, kind, ext, size, mtime) "
+        "VALUES (?, ?, ?, 'output', 'image', 'png', 1, 1)",
+        (filename, subfolder, f"/out/{subfolder}/{filename}"),
+    )
+    assert res.ok, res.error
+    asset_id = int((await db.aquery("SELECT id FROM assets WHERE filename = ?", (filename,))).data[0]["id"])
+    if metadata_text is not None:
+        res = await db.aexecute(
+            "INSERT INTO asset_metadata (asset_id, metadata_text) VALUES (?, ?)", (asset_id, metadata_text)
+        )
+        assert res.ok, res.error
+    return asset_id
+
+
+async def _names(index, query: str) -> set[str]:
+    out = await index.search(query, include_total=True)
+    assert out.ok, out.error
+    names = {a["filename"] for a in out.data["assets"]}
+    assert out.data["total"] == len(names)
+    return names
+
+
+@pytest.mark.asyncio
+async def test_substring_name_search_follows_asset_changes(services):
+    db, index = services["db"], services["index"]
+    first = await _insert(db, "ComfyUI_00042_.png")
+    await _insert(db, "ComfyUI_00142_.png", subfolder="portraits")
+    await _insert(db, "landscape.png", metadata_text="a red fox")
+
+    # Word tokens are "comfyui", "00042" and "png": neither matches mid-word.
+    assert await _names(index, "0042") == {"ComfyUI_00042_.png"}
+    assert await _names(index, "_00") == {"ComfyUI_00042_.png", "ComfyUI_00142_.png"}
+    assert await _names(index, "fyui trait") == {"ComfyUI_00142_.png"}
+    assert await _names(index, "fox") == {"landscape.png"}
+    scoped = await index.search_scoped("0042", roots=["/out"], include_total=True)
+    assert scoped.ok and scoped.data["total"] == 1
+
+    await db.aexecute("UPDATE assets SET filename = 'renamed_99.png' WHERE id = ?", (first,))
+    await db.aexecute("UPDATE assets SET mtime = 5 WHERE id = ?", (first,))
+    assert await _names(index, "0042") == set()
+    assert await _names(index, "med_9") == {"renamed_99.png"}
+    await db.aexecute("DELETE FROM assets WHERE id = ?", (first,))
+    assert await _names(index, "med_9") == set()
+    check = await db.aexecute("INSERT INTO assets_name_trigram(assets_name_trigram) VALUES('integrity-check')")
+    assert check.ok, check.error
+
+
+def test_name_substring_query_needs_three_characters_per_token():
+    assert searcher_mod._build_name_substring_query('_00042_ "Fyui" *png*') == '"_00042_" "fyui" "png"'
+    assert searcher_mod._build_name_substring_query("fox 42") == ""
+
+
+@pytest.mark.asyncio
+async def test_search_terms_refresh_and_prefix_lookup(services):
+    db, index = services["db"], services["index"]
+    repo = SearchTermsRepository(db)
+    await _insert(db, "a.png", metadata_text="cat portrait")
+    await _insert(db, "b.png", metadata_text="catalog cat")
+    await _insert(db, "c.png", metadata_text="cathedral")
+    assert (await repo.needs_refresh()).data is True
+
+    assert (await repo.refresh()).data == 4
+    assert (await repo.needs_refresh()).data is False
+    assert (await repo.suggest("CAT", 2)).data == ["cat", "catalog"]
+    assert (await index.searcher.autocomplete("Cât", 10)).data == ["cat", "catalog", "cathedral"]
+
+    # Rating writes leave the terms alone; text changes flag them dirty.
+    await db.aexecute("UPDATE asset_metadata SET rating = 3")
+    assert (await repo.needs_refresh()).data is False
+    await db.aexecute("UPDATE asset_metadata SET metadata_text = 'dog' WHERE metadata_text = 'cathedral'")
+    assert (await repo.needs_refresh(min_age_s=3600)).data is False
+    assert (await repo.needs_refresh()).data is True
+    await repo.refresh()
+    assert (await repo.suggest("cat")).data == ["cat", "catalog"]
+    assert (await repo.suggest("do")).data == ["dog"]
+
+
+@pytest.mark.asyncio
+async def test_search_terms_refresh_pages_through_the_vocabulary(services, monkeypatch):
+    db = services["db"]
+    repo = SearchTermsRepository(db)
+    monkeypatch.setattr(terms_mod, "_REFRESH_PAGE_SIZE", 2)
+    await _insert(db, "a.png", metadata_text="apple berry cherry date")
+    await _insert(db, "b.png", metadata_text="berry elder fig grape")
+    await repo.refresh()
+    await db.aexecute("UPDATE asset_metadata SET metadata_text = 'berry kiwi' WHERE metadata_text LIKE 'apple%'")
+    await repo.refresh()
+
+    expected = (await db.aquery("SELECT term, doc FROM asset_metadata_vocab WHERE length(term) >= 2 ORDER BY term")).data
+    stored = (await db.aquery("SELECT term, doc FROM search_terms ORDER BY term")).data
+    assert stored == expected
+    assert "apple" not in {row["term"] for row in stored} and "kiwi" in {row["term"] for row in stored}
+
+
+@pytest.mark.asyncio
+async def test_background_search_terms_refresh_failure_is_retrieved(services, monkeypatch, caplog):
+    searcher = services["index"].searcher
+
+    async def _boom(self, *_args):
+        raise RuntimeError("vocab unavailable")
+
+    monkeypatch.setattr(SearchTermsRepository, "needs_refresh", _boom)
+    searcher._search_terms_checked_at = 0.0
+    searcher._schedule_search_terms_refresh()
+    task = searcher._search_terms_task
+    await asyncio.gather(task, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert task.done() and task._log_traceback is False
+    assert "vocab unavailable" in caplog.text
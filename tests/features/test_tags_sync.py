@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
+from mjr_am_backend.adapters.db.migrations import MIGRATIONS, MigrationRunner
+from mjr_am_backend.adapters.db.schema import migrate_schema
+from mjr_am_backend.adapters.db.sqlite_facade import Sqlite
 from mjr_am_backend.features.tags import sync
 from mjr_am_backend.shared import ErrorCode, Result
 
@@ -227,3 +232,53 @@ def test_worker_process_off_and_fallback(monkeypatch):
     w._process(task_on)
     assert called["win"] == 1
 
+
+
+@pytest.mark.asyncio
+async def test_persistent_queue_coalesces_and_writes_in_batches(monkeypatch, tmp_path: Path):
+    class _ExifBatch(_ExifOk):
+        def __init__(self):
+            self.batches = []
+
+        def write_batch(self, items, preserve_workflow=True):
+            self.batches.append([(path, payload["XMP:Rating"], payload["XMP:Subject"]) for path, payload in items])
+            return {path: Result.Ok(True) for path, _payload in items}
+
+    # Cycles are driven by the test instead of the background thread.
+    monkeypatch.setattr(sync.RatingTagsSyncWorker, "_run", lambda self: None)
+    monkeypatch.setattr(sync.time, "sleep", lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(sync, "mark_recent_generated", lambda _paths: None)
+    db = Sqlite(str(tmp_path / "sync.sqlite"))
+    assert (await migrate_schema(db)).ok
+    assert (await MigrationRunner(MIGRATIONS).run(db)).ok
+    files = []
+    for name in ("a.png", "b.png", "c.png"):
+        (tmp_path / name).write_bytes(b"x")
+        files.append(str(tmp_path / name))
+    try:
+        exif = _ExifBatch()
+        w = sync.RatingTagsSyncWorker(exif, db, batch_size=2)
+        await w.aenqueue(files[0], 1, ["x"], "on")
+        await w.aenqueue(files[1], 2, [], "on")
+        await w.aenqueue(files[0], 5, ["y"], "both")
+        await w.aenqueue(files[2], 3, [], "on")
+        assert w.get_runtime_status()["queue_depth"] == 3
+
+        # A restarted worker picks the rows up; the second edit to a.png replaced the first.
+        w2 = sync.RatingTagsSyncWorker(exif, db, batch_size=2)
+        await asyncio.to_thread(w2._run_cycle)
+        await w2.aenqueue(files[1], 4, ["z"], "on")  # edited after its batch was claimed
+        await asyncio.to_thread(w2._run_cycle)
+        await asyncio.to_thread(w2._run_cycle)
+        assert exif.batches == [
+            [(files[1], 2, []), (files[0], 5, ["y"])],
+            [(files[2], 3, []), (files[1], 4, ["z"])],
+        ]
+
+        left = await db.aquery("SELECT COUNT(*) AS n FROM rating_tags_sync_queue")
+        assert left.data[0]["n"] == 0
+        status = w2.get_runtime_status()
+        assert (status["queue_depth"], status["written"], status["batches"]) == (0, 4, 2)
+        assert status["persistent"] is True
+    finally:
+        await db.aclose()
@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+from mjr_am_backend.features.metadata import thumbnail_cache as tc
+from mjr_am_backend.routes.handlers import thumbnails as thumb_routes
+from mjr_am_backend.shared import Result
+from PIL import Image
+
+
+def _image(path: Path, size=(200, 120), color="red") -> Path:
+    Image.new("RGB", size, color).save(path)
+    return path
+
+
+def _store(tmp_path: Path, **kwargs) -> tc.ThumbnailStore:
+    return tc.ThumbnailStore(tmp_path / "thumbs", **kwargs)
+
+
+def test_miss_then_hit_uses_sharded_path_and_index(tmp_path, monkeypatch):
+    src = _image(tmp_path / "a.png")
+    store = _store(tmp_path, workers=0)
+    first = store.get_or_create(str(src), size=128)
+    assert first.ok and first.data["cache"] == "miss"
+    thumb = Path(first.data["path"])
+    assert thumb.parent.parent == store.root and thumb.parent.name == thumb.stem[:2]
+
+    def _no_generate(*_args):
+        raise AssertionError("hit must not render")
+
+    monkeypatch.setattr(tc, "_generate_thumb", _no_generate)
+    second = store.get_or_create(str(src), size=128)
+    assert second.ok and second.data["cache"] == "hit"
+    assert store.total_bytes == thumb.stat().st_size
+
+    store.flush()
+    reloaded = _store(tmp_path, workers=0)
+    assert reloaded.get_or_create(str(src), size=128).data["cache"] == "hit"
+    assert len(reloaded) == 1
+
+
+def test_gc_evicts_least_recently_used(tmp_path):
+    store = _store(tmp_path, workers=0)
+    paths = [_image(tmp_path / f"{i}.png", color=(i * 40, 0, 0)) for i in range(4)]
+    thumbs = [Path(store.get_or_create(str(p), size=64).data["path"]) for p in paths]
+    # Touch the oldest so it becomes most recently used.
+    store.get_or_create(str(paths[0]), size=64)
+
+    budget = store.total_bytes - 1
+    evicted = store.gc(budget)
+    assert evicted >= 1
+    assert store.total_bytes <= budget
+    assert thumbs[0].exists()
+    assert not thumbs[1].exists()
+
+
+def test_rebuild_moves_legacy_flat_files_into_shards(tmp_path):
+    root = tmp_path / "thumbs"
+    root.mkdir()
+    legacy = root / ("ab" + "0" * 30 + ".jpg")
+    legacy.write_bytes(b"x" * 10)
+    (root / "tmp_stale.jpg").write_bytes(b"y")
+    store = tc.ThumbnailStore(root, workers=0)
+    store.gc()
+    assert len(store) == 1 and store.total_bytes == 10
+    assert (root / "ab" / legacy.name).exists()
+    assert not legacy.exists() and not (root / "tmp_stale.jpg").exists()
+
+
+def test_concurrent_requests_render_once(tmp_path, monkeypatch):
+    src = _image(tmp_path / "a.png")
+    store = _store(tmp_path, workers=0)
+    calls = []
+    real = tc._generate_thumb
+
+    def _slow(source, target, size):
+        calls.append(1)
+        time.sleep(0.1)
+        return real(source, target, size)
+
+    monkeypatch.setattr(tc, "_generate_thumb", _slow)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.get_or_create(str(src)))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert all(r.ok for r in results)
+
+
+def test_prefetch_renders_on_pool(tmp_path):
+    srcs = [_image(tmp_path / f"{i}.png") for i in range(3)]
+    (tmp_path / "notes.txt").write_text("x")
+    store = _store(tmp_path, workers=2)
+    try:
+        assert store.prefetch([*map(str, srcs), str(tmp_path / "notes.txt")], size=96) == 3
+        deadline = time.time() + 10
+        while len(store) < 3 and time.time() < deadline:
+            time.sleep(0.02)
+        assert len(store) == 3
+        assert all(store.get_or_create(str(p), size=96).data["cache"] == "hit" for p in srcs)
+    finally:
+        store.close()
+    assert (store.root / "index.json").exists()
+    assert _store(tmp_path, workers=0).prefetch([str(srcs[0])]) == 0
+
+
+def _app():
+    app = web.Application()
+    routes = web.RouteTableDef()
+    thumb_routes.register_thumbnail_routes(routes)
+    app.add_routes(routes)
+    return app
+
+
+@pytest.mark.asyncio
+async def test_prefetch_route_filters_disallowed_paths(tmp_path, monkeypatch):
+    captured = {}
+
+    def _prefetch(paths, *, size):
+        captured["paths"] = list(paths)
+        captured["size"] = size
+        return len(paths)
+
+    async def _read_json(_request):
+        return Result.Ok({"filepaths": [str(tmp_path / "ok.png"), str(tmp_path / "no.png"), ""], "size": 256})
+
+    monkeypatch.setattr(thumb_routes, "_csrf_error", lambda _r: None)
+    monkeypatch.setattr(thumb_routes, "_read_json", _read_json)
+    monkeypatch.setattr(thumb_routes, "_normalize_path", lambda p: Path(p) if p else None)
+    monkeypatch.setattr(thumb_routes, "_is_path_allowed", lambda p: p.name == "ok.png")
+    monkeypatch.setattr(thumb_routes, "prefetch_thumbnails", _prefetch)
+
+    app = _app()
+    req = make_mocked_request("POST", "/mjr/am/thumbnails/prefetch", app=app)
+    match = await app.router.resolve(req)
+    resp = await match.handler(req)
+    payload = json.loads(resp.text)
+    assert payload["ok"] is True
+    assert payload["data"] == {"queued": 1, "skipped": 2}
+    assert captured == {"paths": [str(tmp_path / "ok.png")], "size": 256}
+
+
+
+@pytest.mark.asyncio
+async def test_index_service_queues_added_assets(monkeypatch):
+    from types import SimpleNamespace
+
+    from mjr_am_backend.features.index import service as index_service
+
+    monkeypatch.setattr(index_service, "_THUMB_PREFETCH_CHUNK", 2)
+    queued: list[list[str]] = []
+    monkeypatch.setattr(tc, "prefetch_thumbnails", lambda paths: queued.append(list(paths)) or len(paths))
+
+    class _DB:
+        async def aquery_in(self, _query, _column, values):
+            return Result.Ok([{"filepath": f"/out/{v}.png"} for v in values])
+
+    fake = SimpleNamespace(db=_DB())
+    await index_service.IndexService._prefetch_added_thumbnails(fake, {"added_ids": [1, 2, 3]})
+    assert queued == [["/out/1.png", "/out/2.png"], ["/out/3.png"]]
+    await index_service.IndexService._prefetch_added_thumbnails(fake, {"added": 0})
+    assert len(queued) == 2
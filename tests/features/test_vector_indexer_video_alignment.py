@@ -11,6 +11,10 @@ class _DB:
         self.calls.append((sql, params))
         return Result.Ok(True)
 
+    async def aexecutemany(self, sql, params_seq):
+        self.calls.append((sql, list(params_seq)))
+        return Result.Ok(True)
+
 
 class _VS:
     def __init__(self):
@@ -222,3 +226,76 @@ async def test_autotag_embeddings_rebuild_when_model_changes(monkeypatch):
     assert len(vs_a.text_calls) == 1
     assert len(vs_b.text_calls) == 1
     m.invalidate_autotag_cache()
+
+
+@pytest.mark.asyncio
+async def test_index_assets_vector_batch_writes_packed_blobs_in_one_call(monkeypatch):
+    from mjr_am_backend.features.index.vector_service import blob_to_vector
+
+    db = _DB()
+    vs = _VS()
+    monkeypatch.setattr(m, "is_vector_search_enabled", lambda: True)
+
+    async def _noop_autotags(_db, _vs, _asset_id, _image_vector):
+        return None
+
+    monkeypatch.setattr(m, "_apply_autotags", _noop_autotags)
+
+    out = await m.index_assets_vector_batch(
+        db,
+        vs,
+        [
+            {"asset_id": 1, "filepath": "C:/a.png", "kind": "image"},
+            {"asset_id": 2, "filepath": "C:/b.txt", "kind": "text"},
+            {"asset_id": 3, "filepath": "C:/c.mp4", "kind": "video"},
+        ],
+    )
+
+    assert out.ok and out.data == {"indexed": 2, "skipped": 1, "errors": 0}
+    writes = [params for sql, params in db.calls if "vec.asset_embeddings" in sql]
+    assert len(writes) == 1
+    assert [row[0] for row in writes[0]] == [1, 3]
+    assert blob_to_vector(writes[0][0][1], 2) == [1.0, 0.0]
+
+
+@pytest.mark.asyncio
+async def test_index_assets_vector_batch_isolates_per_entry_failures(monkeypatch):
+    class _FlakyDB(_DB):
+        async def aexecutemany(self, sql, params_seq):
+            return Result.Err("DB_ERROR", "batch failed")
+
+        async def aexecute(self, sql, params=()):
+            self.calls.append((sql, params))
+            if params[0] == 3:
+                return Result.Err("DB_ERROR", "row failed")
+            return Result.Ok(True)
+
+    class _FlakyVS(_VS):
+        async def get_image_embedding(self, filepath):
+            if filepath.endswith("broken.png"):
+                raise RuntimeError("decoder crashed")
+            return await super().get_image_embedding(filepath)
+
+    db = _FlakyDB()
+    tagged = []
+    monkeypatch.setattr(m, "is_vector_search_enabled", lambda: True)
+
+    async def _record_autotags(_db, _vs, asset_id, _image_vector):
+        tagged.append(asset_id)
+
+    monkeypatch.setattr(m, "_apply_autotags", _record_autotags)
+
+    out = await m.index_assets_vector_batch(
+        db,
+        _FlakyVS(),
+        [
+            {"asset_id": 1, "filepath": "C:/a.png", "kind": "image"},
+            {"asset_id": 2, "filepath": "C:/broken.png", "kind": "image"},
+            {"asset_id": 3, "filepath": "C:/c.png", "kind": "image"},
+            {"asset_id": 4, "filepath": "C:/d.mp4", "kind": "video"},
+        ],
+    )
+
+    assert out.ok and out.data == {"indexed": 2, "skipped": 0, "errors": 2}
+    assert [params[0] for _sql, params in db.calls] == [1, 3, 4]
+    assert tagged == [1, 4]
@@ -729,6 +729,7 @@ async def test_vector_suggest_collections_route_returns_clusters(monkeypatch) ->
                     {"asset_id": 1, "vector": vec_a, "auto_tags": '["portrait"]'},
                     {"asset_id": 2, "vector": vec_b, "auto_tags": '["portrait"]'},
                     {"asset_id": 3, "vector": vec_c, "auto_tags": '["landscape"]'},
+                    {"asset_id": 4, "vector": b"truncated", "auto_tags": "[]"},
                 ])
             if "FROM assets WHERE id IN" in sql:
                 return Result.Ok([
@@ -767,6 +768,7 @@ async def test_vector_suggest_collections_route_returns_clusters(monkeypatch) ->
     assert body.get("ok") is True
     assert isinstance(body.get("data"), list)
     assert len(body.get("data") or []) >= 1
+    assert sum(c["size"] for c in body["data"]) == 3
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,294 @@
+import sqlite3
+
+import numpy as np
+import pytest
+from mjr_am_backend.adapters.db.schema_sql import VEC_CHANGE_LOG
+from mjr_am_backend.features.index import vector_searcher as m
+from mjr_am_backend.features.index.vector_service import vector_to_blob
+from mjr_am_backend.shared import Result
+
+_DIM = 8
+
+
+class _VecDB:
+    """Minimal async facade over sqlite3 with an attached ``vec`` schema."""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("ATTACH DATABASE ':memory:' AS vec")
+        self.conn.execute(
+            "CREATE TABLE vec.asset_embeddings ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, asset_id INTEGER UNIQUE, vector BLOB)"
+        )
+        self.conn.executescript(VEC_CHANGE_LOG)
+
+    async def aquery(self, sql, params=()):
+        return Result.Ok([dict(r) for r in self.conn.execute(sql, params).fetchall()])
+
+    async def aexecute(self, sql, params=()):
+        return Result.Ok(self.conn.execute(sql, params).rowcount)
+
+    def put(self, asset_id, vec):
+        self.conn.execute(
+            "INSERT INTO vec.asset_embeddings (asset_id, vector) VALUES (?, ?) "
+            "ON CONFLICT(asset_id) DO UPDATE SET vector = excluded.vector",
+            (asset_id, vector_to_blob(vec)),
+        )
+
+    def delete(self, asset_id):
+        self.conn.execute("DELETE FROM vec.asset_embeddings WHERE asset_id = ?", (asset_id,))
+
+
+class _StubIndex:
+    """Exact inner-product index keyed by id, standing in for ``IndexIDMap2``."""
+
+    def __init__(self, dim):
+        self.vectors = {}
+        self.dim = dim
+
+    @property
+    def ntotal(self):
+        return len(self.vectors)
+
+    @property
+    def id_map(self):
+        return list(self.vectors)
+
+    def add_with_ids(self, mat, ids):
+        for vec, aid in zip(mat, ids, strict=True):
+            self.vectors[int(aid)] = np.array(vec, dtype=np.float32)
+
+    def remove_ids(self, ids):
+        for aid in ids:
+            self.vectors.pop(int(aid), None)
+
+    def search(self, q, k):
+        scored = sorted(((float(v @ q[0]), aid) for aid, v in self.vectors.items()), reverse=True)[:k]
+        return np.array([[s for s, _ in scored]]), np.array([[aid for _, aid in scored]])
+
+
+class _StubFaiss:
+    """The slice of the faiss API the searcher uses for the flat tier."""
+
+    def __init__(self):
+        self.reads = 0
+
+    @staticmethod
+    def normalize_L2(mat):
+        norms = np.linalg.norm(mat, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        mat /= norms
+
+    @staticmethod
+    def IndexFlatIP(dim):
+        return dim
+
+    @staticmethod
+    def IndexIDMap2(dim):
+        return _StubIndex(dim)
+
+    @staticmethod
+    def vector_to_array(values):
+        return np.asarray(values, dtype=np.int64)
+
+    @staticmethod
+    def write_index(index, path):
+        ids = np.array(list(index.vectors), dtype=np.int64)
+        mat = np.array(list(index.vectors.values()), dtype=np.float32).reshape(-1, index.dim)
+        with open(path, "wb") as fh:
+            np.savez(fh, ids=ids, mat=mat)
+
+    def read_index(self, path):
+        self.reads += 1
+        data = np.load(path)
+        index = _StubIndex(data["mat"].shape[1])
+        index.add_with_ids(data["mat"], data["ids"])
+        return index
+
+
+class _VS:
+    _model_name = "test-model"
+
+
+def _unit(i):
+    vec = [0.0] * _DIM
+    vec[i % _DIM] = 1.0
+    return vec
+
+
+def _mk(db):
+    searcher = m.VectorSearcher(db, _VS())
+    searcher._dim = _DIM
+    return searcher
+
+
+@pytest.fixture
+def stub_faiss(monkeypatch):
+    stub = _StubFaiss()
+    monkeypatch.setattr(m, "_import_faiss", lambda: stub)
+    return stub
+
+
+@pytest.mark.asyncio
+async def test_index_persists_and_reloads_without_rebuild(tmp_path, monkeypatch, stub_faiss):
+    monkeypatch.setattr(m, "is_vector_search_enabled", lambda: True)
+    db = _VecDB(tmp_path / "assets.sqlite")
+    for aid in (1, 2, 3):
+        db.put(aid, _unit(aid))
+
+    first = _mk(db)
+    res = await first._query_index(_unit(2), top_k=1, exclude_ids=set())
+    assert res.ok and res.data[0]["asset_id"] == 2
+    assert (tmp_path / "vectors" / "asset_embeddings.faiss").is_file()
+    # The persisted index reflects every logged change, so the log is pruned.
+    assert (await db.aquery("SELECT COUNT(*) AS n FROM vec.asset_embedding_changes")).data[0]["n"] == 0
+
+    second = _mk(db)
+
+    async def _no_rebuild():
+        raise AssertionError("persisted index should be reused")
+
+    monkeypatch.setattr(second, "_build_index", _no_rebuild)
+    res = await second._query_index(_unit(3), top_k=1, exclude_ids=set())
+    assert res.ok and res.data[0]["asset_id"] == 3
+    assert stub_faiss.reads == 1 and second._change_seq == 3
+
+
+@pytest.mark.asyncio
+async def test_invalidate_applies_incremental_delta(tmp_path, monkeypatch, stub_faiss):
+    db = _VecDB(tmp_path / "assets.sqlite")
+    for aid in (1, 2, 3):
+        db.put(aid, _unit(aid))
+    searcher = _mk(db)
+    await searcher._ensure_index()
+
+    db.delete(2)
+    db.put(4, _unit(2))
+    db.put(3, _unit(5))
+    searcher.invalidate()
+
+    async def _no_rebuild():
+        raise AssertionError("small deltas must not trigger a full rebuild")
+
+    monkeypatch.setattr(searcher, "_build_index", _no_rebuild)
+    res = await searcher._query_index(_unit(2), top_k=1, exclude_ids=set())
+    assert res.ok and res.data[0]["asset_id"] == 4
+    assert searcher._ids == {1, 3, 4} and searcher._index.ntotal == 3
+    assert searcher._change_seq == 6
+    res = await searcher._query_index(_unit(5), top_k=1, exclude_ids=set())
+    assert res.data[0]["asset_id"] == 3
+
+    # Nothing new in the log: the next sync reads no vectors.
+    searcher.invalidate()
+    monkeypatch.setattr(searcher, "_read_vectors", _no_rebuild)
+    await searcher._ensure_index()
+
+
+@pytest.mark.asyncio
+async def test_model_change_discards_persisted_index(tmp_path, stub_faiss):
+    db = _VecDB(tmp_path / "assets.sqlite")
+    db.put(1, _unit(1))
+    await _mk(db)._ensure_index()
+
+    other = _mk(db)
+    other.vs = type("_OtherVS", (), {"_model_name": "other-model"})()
+    await other._load_persisted_index()
+    assert other._index is None and stub_faiss.reads == 0
+
+
+@pytest.mark.asyncio
+async def test_replaced_vector_db_discards_persisted_index(tmp_path, stub_faiss):
+    db = _VecDB(tmp_path / "assets.sqlite")
+    db.put(1, _unit(1))
+    db.put(2, _unit(2))
+    await _mk(db)._ensure_index()
+
+    # A fresh vectors.sqlite restarts the change sequence below the saved one.
+    fresh = _VecDB(tmp_path / "assets.sqlite")
+    fresh.put(7, _unit(7))
+    searcher = _mk(fresh)
+    await searcher._load_persisted_index()
+    assert searcher._index is None
+    await searcher._ensure_index()
+    assert searcher._ids == {7}
+
+
+def test_plan_sync_diffs_changes_against_held_ids():
+    stale, removed, total = m._plan_sync({1, 2, 3}, changed={2, 3, 4, 9}, present={3, 4})
+    assert stale == {2, 3}
+    assert removed == {2}
+    assert total == 3
+
+
+def test_choose_tier_respects_ram_budget(monkeypatch):
+    monkeypatch.setattr(m, "VECTOR_INDEX_RAM_BUDGET_MB", 64)
+    assert m.VectorSearcher._choose_tier(100, 1152) == "flat"
+    assert m.VectorSearcher._choose_tier(10_000, 1152) == "ivf"
+    assert m.VectorSearcher._choose_tier(1_000_000, 1152) == "ivfpq"
+    assert 1152 % m.VectorSearcher._pq_subquantizers(1_000_000, 1152) == 0
+
+
+@pytest.mark.asyncio
+async def test_sync_retrains_when_the_tier_changes(tmp_path, monkeypatch, stub_faiss):
+    db = _VecDB(tmp_path / "assets.sqlite")
+    db.put(1, _unit(1))
+    searcher = _mk(db)
+    await searcher._ensure_index()
+    assert searcher._tier == "flat"
+
+    monkeypatch.setattr(m, "_IVF_THRESHOLD", 2)
+    db.put(2, _unit(2))
+    searcher.invalidate()
+    rebuilt = []
+
+    async def _build():
+        rebuilt.append(True)
+
+    monkeypatch.setattr(searcher, "_build_index", _build)
+    await searcher._ensure_index()
+    assert rebuilt == [True]
+
+
+@pytest.mark.asyncio
+async def test_compressed_tier_reranks_candidates_exactly(tmp_path, stub_faiss):
+    db = _VecDB(tmp_path / "assets.sqlite")
+    db.put(1, [1.0, 0.0] + [0.0] * (_DIM - 2))
+    db.put(2, [0.6, 0.8] + [0.0] * (_DIM - 2))
+    searcher = _mk(db)
+    await searcher._ensure_index()
+
+    class _Approximate:
+        ntotal = 2
+
+        def search(self, q, k):
+            # PQ codes rank the worse match first.
+            return np.array([[0.99, 0.5]]), np.array([[2, 1]])
+
+    searcher._index = _Approximate()
+    searcher._tier = "ivfpq"
+    res = await searcher._query_index([1.0, 0.1] + [0.0] * (_DIM - 2), top_k=1, exclude_ids=set())
+    assert res.ok and res.data[0]["asset_id"] == 1
+
+
+@pytest.mark.asyncio
+async def test_compressed_tier_indexes_everything_and_reranks_exactly(tmp_path, monkeypatch):
+    pytest.importorskip("faiss")
+    monkeypatch.setattr(m, "VECTOR_INDEX_RAM_BUDGET_MB", 0)
+    dim = 16
+    rng = np.random.default_rng(7)
+    db = _VecDB(tmp_path / "assets.sqlite")
+    vectors = rng.standard_normal((5_000, dim)).astype("float32")
+    for aid, vec in enumerate(vectors, start=1):
+        db.put(aid, vec.tolist())
+
+    searcher = _mk(db)
+    searcher._dim = dim
+    res = await searcher._query_index(vectors[1233].tolist(), top_k=3, exclude_ids=set())
+
+    assert searcher._tier == "ivfpq"
+    assert searcher._index.ntotal == 5_000
+    assert res.ok
+    assert res.data[0]["asset_id"] == 1234
+    assert res.data[0]["score"] == pytest.approx(1.0, abs=1e-3)
@@ -0,0 +1,33 @@
+import numpy as np
+from mjr_am_backend.features.index.vector_service import (
+    blob_to_vector,
+    blobs_to_matrix,
+    vector_to_blob,
+    vectors_to_blobs,
+)
+
+
+def test_blobs_to_matrix_matches_row_decoding_and_skips_bad_blobs() -> None:
+    blobs = [vector_to_blob([1.0, 2.0, 3.0]), None, b"short", vector_to_blob([4.0, 5.5, -6.0])]
+
+    mat, positions = blobs_to_matrix(blobs, 3)
+
+    assert positions == [0, 3]
+    assert mat.dtype == np.float32 and mat.shape == (2, 3)
+    assert mat.flags.writeable
+    assert mat[1].tolist() == blob_to_vector(blobs[3], 3)
+
+
+def test_blobs_to_matrix_empty_input_keeps_dimension() -> None:
+    mat, positions = blobs_to_matrix([], 4)
+    assert mat.shape == (0, 4)
+    assert positions == []
+
+
+def test_vectors_to_blobs_round_trips_with_single_vector_codec() -> None:
+    mat = np.arange(6, dtype=np.float64).reshape(2, 3)
+
+    blobs = vectors_to_blobs(mat)
+
+    assert blobs == [vector_to_blob([0.0, 1.0, 2.0]), vector_to_blob([3.0, 4.0, 5.0])]
+    assert blob_to_vector(blobs[1], 3) == [3.0, 4.0, 5.0]
@@ -104,3 +104,83 @@ def test_progress_bar_uses_comfyui_surface_when_available(monkeypatch, nodes_mod
 
     assert progress.total == 4
     assert updates == [1]
+
+
+def test_save_images_encodes_batch_in_parallel_with_shared_metadata(monkeypatch, nodes_module, tmp_path):
+    import numpy as np
+
+    nodes = nodes_module
+    (tmp_path / "Majoor_00006_.png").write_bytes(b"")
+    monkeypatch.setattr(nodes, "_tensor_to_bytes", lambda t: t)
+    built = []
+    real_build = nodes._build_metadata
+    monkeypatch.setattr(nodes, "_build_metadata", lambda *a, **k: built.append(1) or real_build(*a, **k))
+    levels = []
+    real_encode = nodes._encode_png
+    monkeypatch.setattr(
+        nodes, "_encode_png", lambda pixels, path, meta, level: levels.append(level) or real_encode(pixels, path, meta, level)
+    )
+
+    batch = [np.full((4, 6, 3), value, dtype=np.uint8) for value in (10, 120, 240)]
+    node = nodes.MajoorSaveImage()
+    node.output_dir = str(tmp_path)
+    out = node.save_images(batch, "Majoor", generation_time_ms=42, prompt={"1": {}}, fast_compression=True)
+
+    names = [item["filename"] for item in out["ui"]["images"]]
+    assert names == ["Majoor_00007_.png", "Majoor_00008_.png", "Majoor_00009_.png"]
+    assert built == [1]
+    assert levels == [nodes._PNG_FAST_COMPRESS_LEVEL] * 3
+    for name, expected in zip(names, (10, 120, 240), strict=True):
+        with Image.open(tmp_path / name) as saved:
+            assert saved.text["generation_time_ms"] == "42"
+            assert saved.getpixel((0, 0)) == (expected, expected, expected)
+
+
+def test_save_images_hands_outputs_to_direct_ingest(monkeypatch, nodes_module, tmp_path):
+    import numpy as np
+
+    nodes = nodes_module
+    monkeypatch.setattr(nodes, "_tensor_to_bytes", lambda t: t)
+    scheduled = []
+    import mjr_am_backend.runtime_activity as runtime_activity
+
+    monkeypatch.setattr(
+        runtime_activity,
+        "schedule_generated_output_ingestion",
+        lambda records, base_dir: scheduled.append((records, base_dir)) or True,
+    )
+
+    node = nodes.MajoorSaveImage()
+    node.output_dir = str(tmp_path)
+    batch = [np.zeros((4, 6, 3), dtype=np.uint8) for _ in range(2)]
+    node.save_images(batch, "Majoor", generation_time_ms=5, prompt={"9": {"class_type": "MajoorSaveImage"}}, unique_id="9")
+
+    records, base_dir = scheduled[0]
+    assert base_dir == str(tmp_path)
+    assert [r["filepath"] for r in records] == [str(tmp_path / "Majoor_00001_.png"), str(tmp_path / "Majoor_00002_.png")]
+    first = records[0]
+    assert first["size"] == (tmp_path / "Majoor_00001_.png").stat().st_size
+    assert (first["width"], first["height"], first["generation_time_ms"]) == (6, 4, 5)
+    assert first["execution"]["source_node_type"] == "MajoorSaveImage"
+
+
+def test_prefetched_frames_preserve_order_across_chunks(monkeypatch, nodes_module):
+    import numpy as np
+
+    nodes = nodes_module
+    monkeypatch.setattr(nodes, "_FRAME_CHUNK_SIZE", 3)
+    frames = np.stack([np.full((2, 2, 3), value / 255.0) for value in range(8)])
+
+    converted = list(nodes._iter_prefetched_frames(frames, lambda px: int(px[0, 0, 0]), chunk_size=3))
+
+    assert converted == list(range(8))
+
+
+def test_prefetched_frames_reraise_worker_errors(nodes_module):
+    import numpy as np
+
+    def _boom(_pixels):
+        raise ValueError("bad frame")
+
+    with pytest.raises(ValueError, match="bad frame"):
+        list(nodes_module._iter_prefetched_frames(np.zeros((4, 2, 2, 3)), _boom))
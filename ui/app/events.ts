@@ -33,6 +33,7 @@ export const EVENTS = Object.freeze({
     ASSET_INDEXING: "mjr.asset.indexing",
     ASSET_INDEXED: "mjr.asset.indexed",
     ASSET_INDEX_FAILED: "mjr.asset.index_failed",
+    ASSET_BATCH: "mjr.asset.batch", // coalesced asset-added/updated/indexed frames, detail: { seq, event, items, dropped }
     SCAN_PROGRESS: "mjr.scan.progress",
     RUNTIME_STATUS: "mjr.runtime.status",
     WATCHER_STATUS: "mjr.watcher.status",
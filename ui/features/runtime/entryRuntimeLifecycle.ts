@@ -33,6 +33,9 @@ export function removeApiHandlers(api: any, reportError: (e: any, ctx?: string)
         if (api._mjrAssetIndexedHandler) {
             api.removeEventListener(EVENTS.ASSET_INDEXED, api._mjrAssetIndexedHandler);
         }
+        if (api._mjrAssetBatchHandler) {
+            api.removeEventListener(EVENTS.ASSET_BATCH, api._mjrAssetBatchHandler);
+        }
         if (api._mjrExecutionStartHandler) {
             api.removeEventListener("execution_start", api._mjrExecutionStartHandler);
         }
@@ -569,6 +569,42 @@ export async function registerRealtimeListeners({
     };
     registerCleanableListener(runtime, api, EVENTS.ASSET_INDEXED, api._mjrAssetIndexedHandler);
 
+    // The backend coalesces per-asset notifications into one frame per event
+    // name and window. Replay each item through the matching handler; a gap
+    // in ``seq`` or a non-zero ``dropped`` means items were shed under
+    // backpressure, so the grid reloads instead.
+    api._mjrAssetBatchHandler = (event: any) => {
+        try {
+            const detail = event?.detail || {};
+            const seq = Number(detail?.seq);
+            const lastSeq = Number(api._mjrLastAssetBatchSeq || 0);
+            const hasGap = Number.isFinite(seq) && lastSeq > 0 && seq > lastSeq + 1;
+            if (Number.isFinite(seq)) api._mjrLastAssetBatchSeq = seq;
+            const handlers: Record<string, any> = {
+                "mjr-asset-added": api._mjrAssetAddedHandler,
+                "mjr-asset-updated": api._mjrAssetUpdatedHandler,
+                [EVENTS.ASSET_INDEXED]: api._mjrAssetIndexedHandler,
+            };
+            const handler = handlers[String(detail?.event || "")];
+            const items = Array.isArray(detail?.items) ? detail.items : [];
+            if (typeof handler === "function") {
+                for (const item of items) {
+                    if (item && typeof item === "object") handler({ detail: item });
+                }
+            }
+            if (hasGap || Number(detail?.dropped || 0) > 0) {
+                window.dispatchEvent(
+                    new CustomEvent(EVENTS.RELOAD_GRID, {
+                        detail: { reason: "asset-batch-overflow", seq, dropped: detail?.dropped || 0 },
+                    }),
+                );
+            }
+        } catch (error) {
+            reportError(error, "entry.asset_batch");
+        }
+    };
+    registerCleanableListener(runtime, api, EVENTS.ASSET_BATCH, api._mjrAssetBatchHandler);
+
     api._mjrEnrichmentStatusHandler = (event: any) => {
         try {
             const detail = event?.detail || {};
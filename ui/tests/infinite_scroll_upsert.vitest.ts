@@ -146,7 +146,7 @@ describe("InfiniteScroll upsert", () => {
         );
     });
 
-    it("uses offset pagination without sending stale cursors on later pages", async () => {
+    it("sends the keyset cursor on later pages but never on the head page", async () => {
         const buildListURL = vi.fn(() => "/mjr/am/list");
         const deps = {
             sanitizeQuery: (value) => value,
@@ -168,7 +168,20 @@ describe("InfiniteScroll upsert", () => {
         );
 
         expect(buildListURL).toHaveBeenCalledWith(
-            expect.objectContaining({ offset: 80, cursor: null }),
+            expect.objectContaining({ offset: 80, cursor: "cursor-from-previous-page" }),
+        );
+
+        await fetchPage(
+            { dataset: { mjrScope: "output", mjrSort: "mtime_desc" } },
+            "*",
+            100,
+            0,
+            deps,
+            { requestId: 1, cursor: "cursor-from-previous-page" },
+        );
+
+        expect(buildListURL).toHaveBeenLastCalledWith(
+            expect.objectContaining({ offset: 0, cursor: null }),
         );
     });
 
@@ -400,4 +400,120 @@ describe("registerRealtimeListeners", () => {
             }),
         );
     });
+
+    it("rejoue les frames mjr.asset.batch via les handlers par asset", async () => {
+        ensureBrowserShims();
+        const harness = createRuntimeHarness();
+        const registered = [];
+
+        await registerRealtimeListeners({
+            api: harness.api,
+            runtime: harness.runtime,
+            executionRuntime: harness.executionRuntime,
+            appRef: {},
+            liveStreamModule: null,
+            ensureExecutionRuntime: () => ({ queue_remaining: 0, active_prompt_id: null }),
+            emitRuntimeStatus: () => {},
+            getActiveGridContainer: () => harness.grid,
+            pushGeneratedAsset: harness.pushGeneratedAsset,
+            upsertAsset: harness.upsertAsset,
+            removeAssetsFromGrid: () => {},
+            getEnrichmentState: () => ({ active: false }),
+            setEnrichmentState: () => {},
+            comfyToast: () => {},
+            t: (_k, fallback) => fallback,
+            reportError: () => {},
+            registerCleanableListener: (_runtime, target, event, handler) => {
+                registered.push({ target, event, handler });
+            },
+        });
+
+        const batchHandler = registered.find(
+            (entry) => entry.target === harness.api && entry.event === EVENTS.ASSET_BATCH,
+        )?.handler;
+        expect(batchHandler).toBe(harness.api._mjrAssetBatchHandler);
+
+        const items = [46, 47].map((id) => ({
+            id,
+            kind: "image",
+            filename: `gen_00${id}.png`,
+            filepath: `output/gen_00${id}.png`,
+            type: "output",
+        }));
+        batchHandler({
+            detail: { seq: 1, event: EVENTS.ASSET_INDEXED, count: 2, items, dropped: 0 },
+        });
+
+        expect(harness.pushGeneratedAsset).toHaveBeenCalledTimes(2);
+        expect(harness.upsertAsset).toHaveBeenCalledTimes(2);
+        expect(harness.upsertAsset).toHaveBeenNthCalledWith(
+            2,
+            harness.grid,
+            expect.objectContaining(items[1]),
+        );
+        expect(harness.api._mjrLastAssetBatchSeq).toBe(1);
+    });
+
+    it("recharge la grille sur un trou de seq ou des items abandonnes", async () => {
+        ensureBrowserShims();
+        const harness = createRuntimeHarness();
+        const dispatched = [];
+        const previousDispatch = window.dispatchEvent;
+        window.dispatchEvent = (event) => {
+            dispatched.push(event);
+            return true;
+        };
+
+        try {
+            await registerRealtimeListeners({
+                api: harness.api,
+                runtime: harness.runtime,
+                executionRuntime: harness.executionRuntime,
+                appRef: {},
+                liveStreamModule: null,
+                ensureExecutionRuntime: () => ({ queue_remaining: 0, active_prompt_id: null }),
+                emitRuntimeStatus: () => {},
+                getActiveGridContainer: () => harness.grid,
+                pushGeneratedAsset: harness.pushGeneratedAsset,
+                upsertAsset: harness.upsertAsset,
+                removeAssetsFromGrid: () => {},
+                getEnrichmentState: () => ({ active: false }),
+                setEnrichmentState: () => {},
+                comfyToast: () => {},
+                t: (_k, fallback) => fallback,
+                reportError: () => {},
+                registerCleanableListener: () => {},
+            });
+
+            const reloads = () =>
+                dispatched.filter(
+                    (event) =>
+                        event.type === EVENTS.RELOAD_GRID &&
+                        event.detail?.reason === "asset-batch-overflow",
+                );
+
+            harness.api._mjrAssetBatchHandler({
+                detail: { seq: 1, event: "mjr-asset-updated", items: [{ id: 48 }], dropped: 0 },
+            });
+            harness.api._mjrAssetBatchHandler({
+                detail: { seq: 2, event: "mjr-asset-updated", items: [{ id: 48 }], dropped: 0 },
+            });
+            expect(reloads()).toHaveLength(0);
+
+            harness.api._mjrAssetBatchHandler({
+                detail: { seq: 4, event: "mjr-asset-updated", items: [], dropped: 0 },
+            });
+            expect(reloads()).toHaveLength(1);
+
+            harness.api._mjrAssetBatchHandler({
+                detail: { seq: 5, event: "mjr-asset-added", items: [], dropped: 3 },
+            });
+            expect(reloads()).toHaveLength(2);
+            expect(reloads()[1].detail).toEqual(
+                expect.objectContaining({ seq: 5, dropped: 3 }),
+            );
+        } finally {
+            window.dispatchEvent = previousDispatch;
+        }
+    });
 });
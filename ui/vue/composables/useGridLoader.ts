@@ -680,7 +680,12 @@ export function useGridLoader({
         return { ...page, total: null };
     }
 
-    async function fetchPage(query: any, limit: any, offset: any, { requestId = 0, signal = null as AbortSignal | null } = {}) {
+    async function fetchPage(
+        query: any,
+        limit: any,
+        offset: any,
+        { requestId = 0, signal = null as AbortSignal | null, cursor = undefined as string | null | undefined } = {},
+    ) {
         const gridContainer = getGridContainer();
         if (!gridContainer) {
             return { ok: false, error: "Grid unavailable" };
@@ -745,7 +750,11 @@ export function useGridLoader({
                 get,
                 getGridState: () => state,
             },
-            { requestId, signal: (signal ?? undefined) as undefined, cursor: state.cursor || null },
+            {
+                requestId,
+                signal: (signal ?? undefined) as undefined,
+                cursor: (cursor === undefined ? state.cursor : cursor) || null,
+            },
         );
         return normalizePageForPagination(page, { query, limit, offset });
     }
@@ -768,12 +777,21 @@ export function useGridLoader({
             },
             reset() {},
         },
-        fetchPage: async ({ query, limit, offset, requestId }: { query: any; limit: any; offset: any; requestId: any }) => {
+        fetchPage: async ({
+            query,
+            limit,
+            offset,
+            cursor,
+            requestId,
+        }: { query: any; limit: any; offset: any; cursor?: any; requestId: any }) => {
             const pageStartedAt = nowMs();
             metrics.pagesRequested += 1;
+            // Adaptive sub-pages advance the paged state's cursor before the
+            // legacy state is synced, so forward it explicitly.
             const page = await fetchPage(query, limit, offset, {
                 requestId,
                 signal: state.abortController?.signal || null,
+                cursor: cursor ?? null,
             });
             metrics.apiTimeMs += Math.max(0, nowMs() - pageStartedAt);
             return page;
@@ -387,7 +387,10 @@ export async function fetchPage(
             String(sortKey || "mtime_desc").toLowerCase() === "mtime_desc";
         const includeTotal = !(isOutputScope && (Number(offset ?? 0) > 0 || isDefaultOutputBrowse));
         const groupStacksForRequest = !!queryState.groupStacks;
-        const cursorForRequest = Number(offset ?? 0) > 0 ? null : cursor || null;
+        // Keyset pagination: past the first page the server seeks after the
+        // cursor and only echoes ``offset``, so deep pages cost the same as
+        // the first one. Head refreshes (offset 0) must never seek.
+        const cursorForRequest = Number(offset ?? 0) > 0 ? cursor || null : null;
         const url = deps.buildListURL({
             q: safeQuery,
             limit,